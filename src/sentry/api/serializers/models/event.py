@@ -11,6 +11,7 @@ import sqlparse
 from django.contrib.auth.models import AnonymousUser
 from sentry_relay.processing import meta_with_chunks
 
+from sentry import eventstore
 from sentry.api.serializers import Serializer, register, serialize
 from sentry.api.serializers.models.release import GroupEventReleaseSerializer
 from sentry.api.serializers.models.userreport import UserReportSerializerResponse
@@ -249,6 +250,7 @@ class EventSerializer(Serializer):
 
     def get_attrs(self, item_list, user, **kwargs):
         is_public = kwargs.pop("is_public", False)
+        eventstore.backend.defer_nodes(item_list)
         crash_files = get_crash_files(item_list)
         serialized_files = {
             file.event_id: serialized
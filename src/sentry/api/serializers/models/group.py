@@ -2,10 +2,13 @@ from __future__ import annotations
 
 import itertools
 import logging
+import time
 from abc import ABC, abstractmethod
 from collections import defaultdict
-from collections.abc import Callable, Iterable, Mapping, MutableMapping, Sequence
+from collections.abc import Callable, Generator, Iterable, Mapping, MutableMapping, Sequence
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
+from functools import cached_property
 from typing import Any, Protocol, TypedDict, TypeGuard
 
 import sentry_sdk
@@ -21,7 +24,7 @@ from sentry.app import env
 from sentry.auth.superuser import is_active_superuser
 from sentry.constants import LOG_LEVELS
 from sentry.integrations.mixins.issues import IssueBasicIntegration
-from sentry.integrations.services.integration import integration_service
+from sentry.integrations.services.integration import RpcIntegration, integration_service
 from sentry.issues.grouptype import GroupCategory
 from sentry.models.commit import Commit
 from sentry.models.environment import Environment
@@ -38,6 +41,7 @@ from sentry.models.groupsnooze import GroupSnooze
 from sentry.models.groupsubscription import GroupSubscription
 from sentry.models.organizationmember import OrganizationMember
 from sentry.models.orgauthtoken import is_org_auth_token_auth
+from sentry.models.project import Project
 from sentry.models.team import Team
 from sentry.notifications.helpers import (
     SubscriptionDetails,
@@ -59,9 +63,10 @@ from sentry.users.models.user import User
 from sentry.users.services.user.model import RpcUser
 from sentry.users.services.user.serial import serialize_generic_user
 from sentry.users.services.user.service import user_service
+from sentry.utils import metrics
 from sentry.utils.cache import cache
 from sentry.utils.safe import safe_execute
-from sentry.utils.snuba import aliased_query, raw_query
+from sentry.utils.snuba import SnubaQueryParams, aliased_query_params, bulk_raw_query, raw_query
 
 # TODO(jess): remove when snuba is primary backend
 snuba_tsdb = SnubaTSDB(**settings.SENTRY_TSDB_OPTIONS)
@@ -154,6 +159,72 @@ def is_seen_stats(o: object) -> TypeGuard[SeenStats]:
     return isinstance(o, dict) and "times_seen" in o
 
 
+class GroupAttrsContext:
+    """
+    Lookups shared by the helpers of `GroupSerializerBase.get_attrs` while
+    serializing one page of groups, so that the organization, integrations
+    and plugins of the page are resolved once instead of once per helper or
+    per group.
+
+    Every attr group of `get_attrs` runs within `measure`, which records how
+    long it took in `timings` and as a span of the serializer.
+    """
+
+    def __init__(self, item_list: Sequence[Group]) -> None:
+        self.item_list = item_list
+        self.groups_by_project = collect_groups_by_project(item_list)
+        self.timings: dict[str, float] = {}
+        self._plugins: dict[tuple[int, int], list[Any]] = {}
+
+    @cached_property
+    def organization_id(self) -> int:
+        organization_id_list = list({item.project.organization_id for item in self.item_list})
+        if len(organization_id_list) > 1:
+            # this should never happen but if it does we should know about it
+            logger.warning(
+                "Found multiple organizations for groups: %s, with orgs: %s",
+                [item.id for item in self.item_list],
+                organization_id_list,
+            )
+        # should only have 1 org at this point
+        return organization_id_list[0]
+
+    @cached_property
+    def integrations(self) -> list[RpcIntegration]:
+        return integration_service.get_integrations(organization_id=self.organization_id)
+
+    def plugins_for_project(self, project: Project, version: int) -> list[Any]:
+        """
+        The enabled plugins of `project`. Deprecated plugins are left out
+        for version 1, as is done when their annotations are resolved.
+        """
+        from sentry.plugins.base import plugins
+
+        key = (project.id, version)
+        if key not in self._plugins:
+            self._plugins[key] = [
+                plugin
+                for plugin in plugins.for_project(project=project, version=version)
+                if version != 1 or not is_plugin_deprecated(plugin, project)
+            ]
+        return self._plugins[key]
+
+    @contextmanager
+    def measure(self, attr_group: str) -> Generator[None]:
+        start = time.monotonic()
+        try:
+            with sentry_sdk.start_span(op=f"GroupSerializerBase.get_attrs.{attr_group}"):
+                yield
+        finally:
+            duration = time.monotonic() - start
+            self.timings[attr_group] = self.timings.get(attr_group, 0.0) + duration
+            metrics.timing(
+                "api.serializers.group.get_attrs.duration",
+                duration,
+                tags={"attr_group": attr_group},
+            )
+
+
 class GroupSerializerBase(Serializer, ABC):
     def __init__(
         self,
@@ -190,85 +261,96 @@ class GroupSerializerBase(Serializer, ABC):
     def get_attrs(
         self, item_list: Sequence[Group], user: User | RpcUser | AnonymousUser, **kwargs: Any
     ) -> dict[Group, dict[str, Any]]:
+        # if no groups, then we can't proceed but this seems to be a valid use case
+        if not item_list:
+            return {}
+
         GroupMeta.objects.populate_cache(item_list)
 
         # Note that organization is necessary here for use in `_get_permalink` to avoid
         # making unnecessary queries.
         prefetch_related_objects(item_list, "project__organization")
 
-        if user.is_authenticated and item_list:
-            bookmarks = set(
-                GroupBookmark.objects.filter(user_id=user.id, group__in=item_list).values_list(
-                    "group_id", flat=True
+        context = GroupAttrsContext(item_list)
+
+        with context.measure("user_state"):
+            if user.is_authenticated:
+                bookmarks = set(
+                    GroupBookmark.objects.filter(user_id=user.id, group__in=item_list).values_list(
+                        "group_id", flat=True
+                    )
                 )
-            )
-            seen_groups = dict(
-                GroupSeen.objects.filter(user_id=user.id, group__in=item_list).values_list(
-                    "group_id", "last_seen"
+                seen_groups = dict(
+                    GroupSeen.objects.filter(user_id=user.id, group__in=item_list).values_list(
+                        "group_id", "last_seen"
+                    )
                 )
-            )
-            subscriptions = self._get_subscriptions(item_list, user)
-        else:
-            bookmarks = set()
-            seen_groups = {}
-            subscriptions = defaultdict(lambda: (False, False, None))
+                subscriptions = self._get_subscriptions(item_list, user, context)
+            else:
+                bookmarks = set()
+                seen_groups = {}
+                subscriptions = defaultdict(lambda: (False, False, None))
 
-        resolved_assignees = self._serialize_assignees(item_list)
+        with context.measure("assignees"):
+            resolved_assignees = self._serialize_assignees(item_list)
 
-        ignore_items = {g.group_id: g for g in GroupSnooze.objects.filter(group__in=item_list)}
+        with context.measure("resolutions"):
+            ignore_items = {g.group_id: g for g in GroupSnooze.objects.filter(group__in=item_list)}
 
-        release_resolutions, commit_resolutions = self._resolve_resolutions(item_list, user)
+            release_resolutions, commit_resolutions = self._resolve_resolutions(item_list, user)
 
-        user_ids = {
-            user_id
-            for user_id in itertools.chain(
-                (r[-1] for r in release_resolutions.values()),
-                (r.actor_id for r in ignore_items.values()),
-            )
-            if user_id is not None
-        }
-        if user_ids:
-            serialized_users = user_service.serialize_many(
-                filter={"user_ids": user_ids, "is_active": True},
-                as_user=serialize_generic_user(user),
-            )
-            actors = {id: u for id, u in zip(user_ids, serialized_users)}
-        else:
-            actors = {}
+            user_ids = {
+                user_id
+                for user_id in itertools.chain(
+                    (r[-1] for r in release_resolutions.values()),
+                    (r.actor_id for r in ignore_items.values()),
+                )
+                if user_id is not None
+            }
+            if user_ids:
+                serialized_users = user_service.serialize_many(
+                    filter={"user_ids": user_ids, "is_active": True},
+                    as_user=serialize_generic_user(user),
+                )
+                actors = {id: u for id, u in zip(user_ids, serialized_users)}
+            else:
+                actors = {}
 
-        share_ids = dict(
-            GroupShare.objects.filter(group__in=item_list).values_list("group_id", "uuid")
-        )
+            share_ids = dict(
+                GroupShare.objects.filter(group__in=item_list).values_list("group_id", "uuid")
+            )
 
-        seen_stats = self._get_seen_stats(item_list, user)
+        with context.measure("seen_stats"):
+            seen_stats = self._get_seen_stats(item_list, user)
 
-        organization_id_list = list({item.project.organization_id for item in item_list})
-        # if no groups, then we can't proceed but this seems to be a valid use case
-        if not item_list:
-            return {}
-        if len(organization_id_list) > 1:
-            # this should never happen but if it does we should know about it
-            logger.warning(
-                "Found multiple organizations for groups: %s, with orgs: %s",
-                [item.id for item in item_list],
-                organization_id_list,
-            )
+        with context.measure("authorization"):
+            authorized = self._is_authorized(user, context.organization_id)
 
-        # should only have 1 org at this point
-        organization_id = organization_id_list[0]
+        with context.measure("annotations"):
+            annotations_by_group_id: MutableMapping[int, list[Any]] = defaultdict(list)
+            for annotations_by_group in itertools.chain.from_iterable(
+                [
+                    self._resolve_integration_annotations(context),
+                    [self._resolve_external_issue_annotations(item_list)],
+                ]
+            ):
+                merge_list_dictionaries(annotations_by_group_id, annotations_by_group)
 
-        authorized = self._is_authorized(user, organization_id)
+            annotations = {
+                item.id: self._resolve_and_extend_plugin_annotation(
+                    item, annotations_by_group_id[item.id], context
+                )
+                for item in item_list
+            }
 
-        annotations_by_group_id: MutableMapping[int, list[Any]] = defaultdict(list)
-        for annotations_by_group in itertools.chain.from_iterable(
-            [
-                self._resolve_integration_annotations(organization_id, item_list),
-                [self._resolve_external_issue_annotations(item_list)],
-            ]
-        ):
-            merge_list_dictionaries(annotations_by_group_id, annotations_by_group)
+        with context.measure("unhandled"):
+            snuba_stats = self._get_group_snuba_stats(item_list, seen_stats)
 
-        snuba_stats = self._get_group_snuba_stats(item_list, seen_stats)
+        # Expose the breakdown on the span of `serialize`, where it shows up
+        # in the profile of the endpoint.
+        span = sentry_sdk.get_current_span()
+        if span is not None:
+            span.set_data("attr_timings", context.timings)
 
         result = {}
         for item in item_list:
@@ -293,9 +375,7 @@ class GroupSerializerBase(Serializer, ABC):
                 "is_bookmarked": item.id in bookmarks,
                 "subscription": subscriptions[item.id],
                 "has_seen": seen_groups.get(item.id, active_date) > active_date,
-                "annotations": self._resolve_and_extend_plugin_annotation(
-                    item, annotations_by_group_id[item.id]
-                ),
+                "annotations": annotations[item.id],
                 "ignore_until": ignore_item,
                 "ignore_actor": actors.get(ignore_item.actor_id) if ignore_item else None,
                 "resolution": resolution,
@@ -462,10 +542,7 @@ class GroupSerializerBase(Serializer, ABC):
             return None
 
         # partition the item_list by type
-        error_issues = [group for group in item_list if GroupCategory.ERROR == group.issue_category]
-        generic_issues = [
-            group for group in item_list if group.issue_category != GroupCategory.ERROR
-        ]
+        error_issues, generic_issues = self._partition_by_category(item_list)
 
         # bulk query for the seen_stats by type
         error_stats = (self._seen_stats_error(error_issues, user) if error_issues else {}) or {}
@@ -476,6 +553,18 @@ class GroupSerializerBase(Serializer, ABC):
         # combine results back
         return {group: agg_stats[group] for group in item_list if group in agg_stats}
 
+    @staticmethod
+    def _partition_by_category(item_list: Sequence[Group]) -> tuple[list[Group], list[Group]]:
+        """
+        Splits `item_list` into error issues and generic issues, whose stats
+        are stored in different datasets.
+        """
+        error_issues = [group for group in item_list if GroupCategory.ERROR == group.issue_category]
+        generic_issues = [
+            group for group in item_list if group.issue_category != GroupCategory.ERROR
+        ]
+        return error_issues, generic_issues
+
     def _get_group_snuba_stats(
         self, item_list: Sequence[Group], seen_stats: Mapping[Group, SeenStats] | None
     ):
@@ -551,7 +640,7 @@ class GroupSerializerBase(Serializer, ABC):
 
     @staticmethod
     def _get_subscriptions(
-        groups: Iterable[Group], user: User | RpcUser
+        groups: Iterable[Group], user: User | RpcUser, context: GroupAttrsContext
     ) -> dict[int, tuple[bool, bool, GroupSubscription | None]]:
         """
         Returns a mapping of group IDs to a two-tuple of (is_disabled: bool,
@@ -565,7 +654,7 @@ class GroupSerializerBase(Serializer, ABC):
         if not groups:
             return {}
 
-        groups_by_project = collect_groups_by_project(groups)
+        groups_by_project = context.groups_by_project
         project_ids = list(groups_by_project.keys())
         enabled_settings = notifications_service.subscriptions_for_projects(
             user_id=user.id, project_ids=project_ids, type=NotificationSettingEnum.WORKFLOW
@@ -581,7 +670,6 @@ class GroupSerializerBase(Serializer, ABC):
                 group__in=query_groups, user_id=user.id
             )
         }
-        groups_by_project = collect_groups_by_project(groups)
 
         results: dict[int, tuple[bool, bool, GroupSubscription | None]] = {}
         for project_id, group_set in groups_by_project.items():
@@ -650,24 +738,24 @@ class GroupSerializerBase(Serializer, ABC):
 
     @staticmethod
     def _resolve_integration_annotations(
-        org_id: int, groups: Sequence[Group]
+        context: GroupAttrsContext,
     ) -> Sequence[Mapping[int, Sequence[Any]]]:
         from sentry.integrations.base import IntegrationFeatures
 
         integration_annotations = []
         # find all the integration installs that have issue tracking
-        integrations = integration_service.get_integrations(organization_id=org_id)
-        for integration in integrations:
+        for integration in context.integrations:
             if not (
                 integration.has_feature(feature=IntegrationFeatures.ISSUE_BASIC)
                 or integration.has_feature(feature=IntegrationFeatures.ISSUE_SYNC)
             ):
                 continue
 
-            install = integration.get_installation(organization_id=org_id)
+            install = integration.get_installation(organization_id=context.organization_id)
             assert isinstance(install, IssueBasicIntegration), install
             local_annotations_by_group_id = (
-                safe_execute(install.get_annotations_for_group_list, group_list=groups) or {}
+                safe_execute(install.get_annotations_for_group_list, group_list=context.item_list)
+                or {}
             )
             integration_annotations.append(local_annotations_by_group_id)
 
@@ -675,21 +763,18 @@ class GroupSerializerBase(Serializer, ABC):
 
     @staticmethod
     def _resolve_and_extend_plugin_annotation(
-        item: Group, current_annotations: list[Any]
+        item: Group, current_annotations: list[Any], context: GroupAttrsContext
     ) -> Sequence[Any]:
-        from sentry.plugins.base import plugins
-
         annotations_for_group = []
         annotations_for_group.extend(current_annotations)
 
         # add the annotations for plugins
         # note that the model GroupMeta(where all the information is stored) is already cached at the start of
-        # `get_attrs`, so these for loops doesn't make a bunch of queries
-        for plugin in plugins.for_project(project=item.project, version=1):
-            if is_plugin_deprecated(plugin, item.project):
-                continue
+        # `get_attrs`, and the plugins are looked up once per project, so these for loops doesn't make a bunch
+        # of queries
+        for plugin in context.plugins_for_project(item.project, version=1):
             safe_execute(plugin.tags, None, item, annotations_for_group)
-        for plugin in plugins.for_project(project=item.project, version=2):
+        for plugin in context.plugins_for_project(item.project, version=2):
             annotations_for_group.extend(safe_execute(plugin.get_annotations, group=item) or ())
 
         return annotations_for_group
@@ -859,6 +944,42 @@ class GroupSerializer(GroupSerializerBase):
         }
 
 
+class _SeenStatsFunc(Protocol):
+    def __call__(
+        self,
+        item_list,
+        start=None,
+        end=None,
+        conditions=None,
+        environment_ids=None,
+    ) -> SnubaQueryParams: ...
+
+
+class SeenStatsQueries:
+    """
+    Collects the Snuba queries for the seen stats of a page of groups, so
+    they are sent as one bulk query and run concurrently.
+    """
+
+    def __init__(self) -> None:
+        self._params: list[SnubaQueryParams] = []
+        self._results: list[Mapping[str, Any]] | None = None
+
+    def add(self, params: SnubaQueryParams) -> Callable[[], Mapping[str, Any]]:
+        """Adds a query, and returns a function getting its result once `run` was called."""
+        index = len(self._params)
+        self._params.append(params)
+
+        def get_result() -> Mapping[str, Any]:
+            assert self._results is not None, "seen stats queries did not run yet"
+            return self._results[index]
+
+        return get_result
+
+    def run(self) -> None:
+        self._results = bulk_raw_query(self._params) if self._params else []
+
+
 class SharedGroupSerializerResponse(TypedDict):
     culprit: str | None
     id: str
@@ -1012,39 +1133,88 @@ class GroupSerializerSnuba(GroupSerializerBase):
     def _seen_stats_error(
         self, error_issue_list: Sequence[Group], user
     ) -> Mapping[Group, SeenStats]:
-        return self._parse_seen_stats_results(
-            self._execute_error_seen_stats_query(
-                item_list=error_issue_list,
-                start=self.start,
-                end=self.end,
-                conditions=self.conditions,
-                environment_ids=self.environment_ids,
-            ),
-            error_issue_list,
-            bool(self.start or self.end or self.conditions),
-            self.environment_ids,
-        )
+        return self._run_seen_stats(error_issue_list, self._error_seen_stats_query_params)
 
     def _seen_stats_generic(
         self, generic_issue_list: Sequence[Group], user
     ) -> Mapping[Group, SeenStats]:
-        return self._parse_seen_stats_results(
-            self._execute_generic_seen_stats_query(
-                item_list=generic_issue_list,
+        return self._run_seen_stats(generic_issue_list, self._generic_seen_stats_query_params)
+
+    def _run_seen_stats(
+        self, issue_list: Sequence[Group], query_params_func: _SeenStatsFunc
+    ) -> Mapping[Group, SeenStats]:
+        queries = SeenStatsQueries()
+        parse_seen_stats = self._plan_seen_stats(issue_list, query_params_func, queries)
+        queries.run()
+        return parse_seen_stats()
+
+    def _get_seen_stats(self, item_list: Sequence[Group], user) -> Mapping[Group, SeenStats] | None:
+        if self._collapse("stats"):
+            return None
+
+        if not item_list:
+            return None
+
+        error_issues, generic_issues = self._partition_by_category(item_list)
+
+        # Rather than querying the issue categories one after the other, like
+        # `_seen_stats_error` and `_seen_stats_generic` do, the queries of both
+        # are planned first and then sent to Snuba concurrently.
+        queries = SeenStatsQueries()
+        pending = []
+        if error_issues:
+            pending.append(
+                self._plan_seen_stats(error_issues, self._error_seen_stats_query_params, queries)
+            )
+        if generic_issues:
+            pending.append(
+                self._plan_seen_stats(
+                    generic_issues, self._generic_seen_stats_query_params, queries
+                )
+            )
+        queries.run()
+
+        agg_stats: dict[Group, SeenStats] = {}
+        for parse_seen_stats in pending:
+            agg_stats.update(parse_seen_stats())
+        return {group: agg_stats[group] for group in item_list if group in agg_stats}
+
+    def _plan_seen_stats(
+        self,
+        issue_list: Sequence[Group],
+        query_params_func: _SeenStatsFunc,
+        queries: SeenStatsQueries,
+    ) -> Callable[[], Mapping[Group, SeenStats]]:
+        """
+        Adds the queries for the seen stats of `issue_list` to `queries`, and
+        returns a function parsing their results once `queries` ran.
+        """
+        result = queries.add(
+            query_params_func(
+                item_list=issue_list,
                 start=self.start,
                 end=self.end,
                 conditions=self.conditions,
                 environment_ids=self.environment_ids,
-            ),
-            generic_issue_list,
+            )
+        )
+        return lambda: self._parse_seen_stats_results(
+            result(),
+            issue_list,
             bool(self.start or self.end or self.conditions),
             self.environment_ids,
         )
 
     @staticmethod
-    def _execute_error_seen_stats_query(
-        item_list, start=None, end=None, conditions=None, environment_ids=None
-    ):
+    def _seen_stats_query_params(
+        dataset: Dataset,
+        referrer: str,
+        item_list: Sequence[Group],
+        start=None,
+        end=None,
+        conditions=None,
+        environment_ids=None,
+    ) -> SnubaQueryParams:
         project_ids = list({item.project_id for item in item_list})
         group_ids = [item.id for item in item_list]
         aggregations = [
@@ -1057,47 +1227,48 @@ class GroupSerializerSnuba(GroupSerializerBase):
         if environment_ids:
             filters["environment"] = environment_ids
 
-        return aliased_query(
-            dataset=Dataset.Events,
+        return SnubaQueryParams(
+            **aliased_query_params(
+                dataset=dataset,
+                start=start,
+                end=end,
+                groupby=["group_id"],
+                conditions=conditions,
+                filter_keys=filters,
+                aggregations=aggregations,
+                referrer=referrer,
+                tenant_ids=(
+                    {"organization_id": item_list[0].project.organization_id} if item_list else None
+                ),
+            )
+        )
+
+    @staticmethod
+    def _error_seen_stats_query_params(
+        item_list, start=None, end=None, conditions=None, environment_ids=None
+    ) -> SnubaQueryParams:
+        return GroupSerializerSnuba._seen_stats_query_params(
+            Dataset.Events,
+            "serializers.GroupSerializerSnuba._execute_error_seen_stats_query",
+            item_list,
             start=start,
             end=end,
-            groupby=["group_id"],
             conditions=conditions,
-            filter_keys=filters,
-            aggregations=aggregations,
-            referrer="serializers.GroupSerializerSnuba._execute_error_seen_stats_query",
-            tenant_ids=(
-                {"organization_id": item_list[0].project.organization_id} if item_list else None
-            ),
+            environment_ids=environment_ids,
         )
 
     @staticmethod
-    def _execute_generic_seen_stats_query(
+    def _generic_seen_stats_query_params(
         item_list, start=None, end=None, conditions=None, environment_ids=None
-    ):
-        project_ids = list({item.project_id for item in item_list})
-        group_ids = [item.id for item in item_list]
-        aggregations = [
-            ["count()", "", "times_seen"],
-            ["min", "timestamp", "first_seen"],
-            ["max", "timestamp", "last_seen"],
-            ["uniq", "tags[sentry:user]", "count"],
-        ]
-        filters = {"project_id": project_ids, "group_id": group_ids}
-        if environment_ids:
-            filters["environment"] = environment_ids
-        return aliased_query(
-            dataset=Dataset.IssuePlatform,
+    ) -> SnubaQueryParams:
+        return GroupSerializerSnuba._seen_stats_query_params(
+            Dataset.IssuePlatform,
+            "serializers.GroupSerializerSnuba._execute_generic_seen_stats_query",
+            item_list,
             start=start,
             end=end,
-            groupby=["group_id"],
             conditions=conditions,
-            filter_keys=filters,
-            aggregations=aggregations,
-            referrer="serializers.GroupSerializerSnuba._execute_generic_seen_stats_query",
-            tenant_ids=(
-                {"organization_id": item_list[0].project.organization_id} if item_list else None
-            ),
+            environment_ids=environment_ids,
         )
 
     @staticmethod
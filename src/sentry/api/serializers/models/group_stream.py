@@ -2,9 +2,9 @@ from __future__ import annotations
 
 import functools
 from abc import abstractmethod
-from collections.abc import Mapping, Sequence
+from collections.abc import Callable, Mapping, Sequence
 from datetime import datetime, timedelta
-from typing import Any, NamedTuple, NotRequired, Protocol, TypedDict
+from typing import Any, NamedTuple, NotRequired, TypedDict
 
 from django.contrib.auth.models import AnonymousUser
 from django.utils import timezone
@@ -19,6 +19,8 @@ from sentry.api.serializers.models.group import (
     GroupSerializerSnuba,
     GroupStatusDetailsResponseOptional,
     SeenStats,
+    SeenStatsQueries,
+    _SeenStatsFunc,
     is_seen_stats,
     snuba_tsdb,
 )
@@ -250,17 +252,6 @@ class StreamGroupSerializer(GroupSerializer, GroupStatsMixin):
         return stats
 
 
-class _SeenStatsFunc(Protocol):
-    def __call__(
-        self,
-        item_list,
-        start=None,
-        end=None,
-        conditions=None,
-        environment_ids=None,
-    ) -> Mapping[str, Any]: ...
-
-
 class StreamGroupSerializerSnubaResponse(TypedDict):
     id: str
     # from base response
@@ -588,67 +579,72 @@ class StreamGroupSerializerSnuba(GroupSerializerSnuba, GroupStatsMixin):
             )
         return results
 
-    def _seen_stats_error(
-        self, error_issue_list: Sequence[Group], user
-    ) -> Mapping[Group, SeenStats]:
-        return self.__seen_stats_impl(error_issue_list, self._execute_error_seen_stats_query)
-
-    def _seen_stats_generic(
-        self, generic_issue_list: Sequence[Group], user
-    ) -> Mapping[Group, SeenStats]:
-        return self.__seen_stats_impl(generic_issue_list, self._execute_generic_seen_stats_query)
-
-    def __seen_stats_impl(
+    def _plan_seen_stats(
         self,
-        error_issue_list: Sequence[Group],
-        seen_stats_func: _SeenStatsFunc,
-    ) -> Mapping[Any, SeenStats]:
-        partial_execute_seen_stats_query = functools.partial(
-            seen_stats_func,
-            item_list=error_issue_list,
+        issue_list: Sequence[Group],
+        query_params_func: _SeenStatsFunc,
+        queries: SeenStatsQueries,
+    ) -> Callable[[], Mapping[Group, SeenStats]]:
+        partial_query_params = functools.partial(
+            query_params_func,
+            item_list=issue_list,
             environment_ids=self.environment_ids,
             start=self.start,
             end=self.end,
         )
-        time_range_result = self._parse_seen_stats_results(
-            partial_execute_seen_stats_query(),
-            error_issue_list,
-            self.start or self.end or self.conditions,
-            self.environment_ids,
-        )
-        filtered_result = (
-            self._parse_seen_stats_results(
-                partial_execute_seen_stats_query(conditions=self.conditions),
-                error_issue_list,
-                self.start or self.end or self.conditions,
-                self.environment_ids,
-            )
+        use_result_first_seen_times_seen = bool(self.start or self.end or self.conditions)
+
+        time_range_query = queries.add(partial_query_params())
+        filtered_query = (
+            queries.add(partial_query_params(conditions=self.conditions))
             if self.conditions and not self._collapse("filtered")
             else None
         )
-        lifetime_result = (
-            (
+        lifetime_query = (
+            queries.add(partial_query_params(start=None, end=None))
+            if (self.start or self.end) and not self._collapse("lifetime")
+            else None
+        )
+
+        def parse_seen_stats() -> Mapping[Group, SeenStats]:
+            time_range_result = self._parse_seen_stats_results(
+                time_range_query(),
+                issue_list,
+                use_result_first_seen_times_seen,
+                self.environment_ids,
+            )
+            filtered_result = (
                 self._parse_seen_stats_results(
-                    partial_execute_seen_stats_query(start=None, end=None),
-                    error_issue_list,
-                    False,
+                    filtered_query(),
+                    issue_list,
+                    use_result_first_seen_times_seen,
                     self.environment_ids,
                 )
-                if self.start or self.end
-                else time_range_result
+                if filtered_query is not None
+                else None
             )
-            if not self._collapse("lifetime")
-            else None
-        )
+            if self._collapse("lifetime"):
+                lifetime_result = None
+            elif lifetime_query is not None:
+                lifetime_result = self._parse_seen_stats_results(
+                    lifetime_query(),
+                    issue_list,
+                    False,
+                    self.environment_ids,
+                )
+            else:
+                lifetime_result = time_range_result
+
+            for item in issue_list:
+                time_range_result[item].update(
+                    {
+                        "filtered": filtered_result.get(item) if filtered_result else None,
+                        "lifetime": lifetime_result.get(item) if lifetime_result else None,
+                    }
+                )
+            return time_range_result
 
-        for item in error_issue_list:
-            time_range_result[item].update(
-                {
-                    "filtered": filtered_result.get(item) if filtered_result else None,
-                    "lifetime": lifetime_result.get(item) if lifetime_result else None,
-                }
-            )
-        return time_range_result
+        return parse_seen_stats
 
     def _build_session_cache_key(self, project_id):
         start_key_dt = end_key_dt = None
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing.util
+import os
+import signal
+import threading
+import time
+from collections.abc import Callable
+from types import FrameType
+
+from sentry.buffer.base import BufferedIncr
+from sentry.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# How long a SIGTERM'd process waits for pending increments to be written.
+TERMINATE_FLUSH_TIMEOUT = 5.0
+
+
+class IncrAggregator:
+    """
+    Merges buffer increments in process before they are written to the
+    underlying buffer, so that a hot row incremented thousands of times per
+    second only results in one write per flush interval.
+
+    Increments are keyed by `key_func` (usually the buffer key of the model
+    row). Counters are summed, `extra` is last write wins and `signal_only` is
+    sticky, which mirrors how `RedisBuffer` merges increments of the same key.
+
+    Pending increments are flushed by a background thread every `interval`
+    seconds, as soon as `max_size` rows are pending, and when the process
+    (including a `multiprocessing` child) exits cleanly. `multiprocessing`
+    children that are terminated with SIGTERM (like arroyo pool subprocesses)
+    flush before they exit. Processes that exit in other ways, e.g. with
+    `os._exit`, have to call `flush` themselves, see
+    `Buffer.flush_local_increments`. At most `max_size` rows are kept pending:
+    if flushes fail, increments of further rows are written directly.
+    """
+
+    def __init__(
+        self,
+        key_func: Callable[[BufferedIncr], str],
+        flush_func: Callable[[BufferedIncr], None],
+        interval: Callable[[], float],
+        max_size: Callable[[], int],
+    ) -> None:
+        self.key_func = key_func
+        self.flush_func = flush_func
+        self.interval = interval
+        self.max_size = max_size
+
+        self._reset()
+        self._register_finalizer()
+        os.register_at_fork(after_in_child=self._reset)
+        # `multiprocessing` children drop finalizers inherited from their parent.
+        multiprocessing.util.register_after_fork(self, IncrAggregator._register_finalizer)
+
+    def _register_finalizer(self) -> None:
+        # Unlike `atexit` handlers, finalizers with an exit priority also run
+        # when a `multiprocessing` child process exits.
+        multiprocessing.util.Finalize(self, self.flush, exitpriority=10)
+
+    def _reset(self) -> None:
+        # Neither the lock nor the flusher thread survive a fork, and whatever
+        # is pending belongs to the parent.
+        self._lock = threading.Lock()
+        self._pending: dict[str, BufferedIncr] = {}
+        self._thread: threading.Thread | None = None
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="buffer-incr-aggregator", daemon=True
+            )
+            self._thread.start()
+            self._install_terminate_handler()
+
+    def _install_terminate_handler(self) -> None:
+        # `multiprocessing` pools terminate their children with SIGTERM, which
+        # skips finalizers. Only take over SIGTERM where nothing else handles
+        # it, and still terminate the process the same way afterwards.
+        if (
+            multiprocessing.parent_process() is None
+            or threading.current_thread() is not threading.main_thread()
+            or signal.getsignal(signal.SIGTERM) is not signal.SIG_DFL
+        ):
+            return
+        signal.signal(signal.SIGTERM, self._flush_and_terminate)
+
+    def _flush_and_terminate(self, signum: int, frame: FrameType | None) -> None:
+        # The signal may have interrupted this thread while it was holding the
+        # lock, so flush from another thread and give up after a while.
+        thread = threading.Thread(target=self.flush, daemon=True)
+        thread.start()
+        thread.join(timeout=TERMINATE_FLUSH_TIMEOUT)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval())
+            self.flush()
+
+    def _merge(self, item: BufferedIncr) -> None:
+        key = self.key_func(item)
+        existing = self._pending.get(key)
+        if existing is None:
+            self._pending[key] = BufferedIncr(
+                item.model, dict(item.columns), item.filters, dict(item.extra), item.signal_only
+            )
+            return
+
+        for column, amount in item.columns.items():
+            existing.columns[column] = existing.columns.get(column, 0) + amount
+        existing.extra.update(item.extra)
+        existing.signal_only = existing.signal_only or item.signal_only
+        metrics.incr("buffer.local-aggregation.merged", skip_internal=True)
+
+    def add(self, item: BufferedIncr) -> None:
+        with self._lock:
+            self._ensure_thread()
+            max_size = self.max_size()
+            # The pending rows only stay at `max_size` if flushing them failed.
+            overflow = len(self._pending) >= max_size and self.key_func(item) not in self._pending
+            full = False
+            if not overflow:
+                self._merge(item)
+                full = len(self._pending) >= max_size
+
+        if overflow:
+            metrics.incr("buffer.local-aggregation.overflow", skip_internal=True)
+            self.flush_func(item)
+        elif full:
+            metrics.incr("buffer.local-aggregation.flush-full", skip_internal=True)
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            items = list(self._pending.values())
+            self._pending = {}
+
+        if not items:
+            return
+
+        metrics.distribution("buffer.local-aggregation.flush-size", len(items))
+        for i, item in enumerate(items):
+            try:
+                self.flush_func(item)
+            except Exception:
+                logger.exception("buffer.local-aggregation.flush-failed")
+                # Keep the increments that were not written yet, they are
+                # retried with the next flush.
+                with self._lock:
+                    for remaining in items[i:]:
+                        self._merge(remaining)
+                return
@@ -1,15 +1,51 @@
+from collections import defaultdict
+from collections.abc import Sequence
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
 
+from django.db import connections, router
 from django.db.models import Expression, F
+from django.db.models.signals import post_save
 
 from sentry.db import models
 from sentry.signals import buffer_incr_complete
 from sentry.tasks.process_buffer import process_incr
+from sentry.utils import metrics
 from sentry.utils.services import Service
 
 BufferField = models.Model | str | int
 
+# Maximum number of rows updated by a single statement in `Buffer.process_many`.
+BULK_UPDATE_CHUNK_SIZE = 500
+
+
+@dataclass
+class BufferedIncr:
+    """
+    A single buffered increment, as passed to `Buffer.process`.
+    """
+
+    model: type[models.Model]
+    columns: dict[str, int] = field(default_factory=dict)
+    filters: dict[str, Any] = field(default_factory=dict)
+    extra: dict[str, Any] = field(default_factory=dict)
+    signal_only: bool | None = None
+
+    def get_pk(self) -> Any | None:
+        """
+        Returns the primary key of the row this increment applies to, if the
+        row is selected by primary key only.
+        """
+        if len(self.filters) != 1:
+            return None
+        ((key, value),) = self.filters.items()
+        if key != "pk" and key != self.model._meta.pk.name:
+            return None
+        if isinstance(value, models.Model):
+            return value.pk
+        return value
+
 
 class Buffer(Service):
     """
@@ -31,6 +67,7 @@ class Buffer(Service):
         "process",
         "process_pending",
         "process_batch",
+        "flush_local_increments",
         "validate",
         "push_to_sorted_set",
         "push_to_hash",
@@ -138,6 +175,13 @@ class Buffer(Service):
     def process_batch(self) -> None:
         return
 
+    def flush_local_increments(self) -> None:
+        """
+        Write out increments that are held in process, if the buffer holds any. Long running
+        processes call this before they shut down.
+        """
+        return
+
     def process(
         self,
         model: type[models.Model] | None,
@@ -188,3 +232,147 @@ class Buffer(Service):
             created=created,
             sender=model,
         )
+
+    def process_many(self, items: Sequence[BufferedIncr]) -> None:
+        """
+        Apply many buffered increments at once.
+
+        Increments of rows that are selected by primary key are merged per row
+        and written with a single `UPDATE ... FROM (VALUES ...)` statement per
+        model and set of columns. Everything else (including rows that do not
+        exist yet, which `process` would create) goes through `process`.
+
+        Like `process`, `buffer_incr_complete` is sent once per increment in
+        `items`, with that increment's own columns, not once per merged row.
+        """
+        from sentry.models.group import Group
+
+        merged: dict[tuple[type[models.Model], Any], BufferedIncr] = {}
+        originals: dict[tuple[type[models.Model], Any], list[BufferedIncr]] = defaultdict(list)
+        for item in items:
+            pk = item.get_pk()
+            if item.signal_only or pk is None:
+                # Subclasses may override `process` with a different signature.
+                Buffer.process(
+                    self, item.model, item.columns, item.filters, item.extra, item.signal_only
+                )
+                continue
+
+            pk = item.model._meta.pk.to_python(pk)
+            originals[(item.model, pk)].append(item)
+            existing = merged.get((item.model, pk))
+            if existing is None:
+                merged[(item.model, pk)] = BufferedIncr(
+                    item.model, dict(item.columns), item.filters, dict(item.extra or {})
+                )
+            else:
+                for column, amount in item.columns.items():
+                    existing.columns[column] = existing.columns.get(column, 0) + amount
+                existing.extra.update(item.extra or {})
+
+        metrics.distribution("buffer.process_many.merged", len(items) - len(merged))
+
+        statements: dict[
+            tuple[type[models.Model], tuple[str, ...], tuple[str, ...]], dict[Any, BufferedIncr]
+        ] = defaultdict(dict)
+        for (model, pk), item in merged.items():
+            statements[(model, tuple(sorted(item.columns)), tuple(sorted(item.extra)))][pk] = item
+
+        for (model, columns, extra_columns), rows in statements.items():
+            updated: set[Any] = set()
+            pks = list(rows)
+            for i in range(0, len(pks), BULK_UPDATE_CHUNK_SIZE):
+                chunk = {pk: rows[pk] for pk in pks[i : i + BULK_UPDATE_CHUNK_SIZE]}
+                updated.update(self._bulk_update(model, columns, extra_columns, chunk))
+
+            if model is Group:
+                # Mirror `process`, which goes through `Group.update` so that
+                # `post_save` receivers (e.g. the group cache) see the change.
+                for group in Group.objects.filter(id__in=updated):
+                    post_save.send_robust(
+                        sender=Group,
+                        instance=group,
+                        created=False,
+                        update_fields=[*columns, *extra_columns],
+                    )
+
+            for pk in rows:
+                for item in originals[(model, pk)]:
+                    # Groups that were deleted in the meantime are skipped, but still
+                    # signalled like `process` does.
+                    if pk not in updated and model is not Group:
+                        Buffer.process(self, model, item.columns, item.filters, item.extra)
+                        continue
+
+                    buffer_incr_complete.send_robust(
+                        model=model,
+                        columns=item.columns,
+                        filters=item.filters,
+                        extra=item.extra or {},
+                        created=False,
+                        sender=model,
+                    )
+
+    def _bulk_update(
+        self,
+        model: type[models.Model],
+        columns: tuple[str, ...],
+        extra_columns: tuple[str, ...],
+        rows: dict[Any, BufferedIncr],
+    ) -> set[Any]:
+        """
+        Increment `columns` and overwrite `extra_columns` of all `rows` with a
+        single statement. Returns the primary keys of the rows that exist.
+        """
+        using = router.db_for_write(model)
+        connection = connections[using]
+        quote = connection.ops.quote_name
+
+        pk_field = model._meta.pk
+        incr_fields = [model._meta.get_field(column) for column in columns]
+        extra_fields = [model._meta.get_field(column) for column in extra_columns]
+        value_fields = [pk_field, *incr_fields, *extra_fields]
+
+        placeholder = "({})".format(
+            ", ".join(f"%s::{f.cast_db_type(connection)}" for f in value_fields)
+        )
+        params: list[Any] = []
+        for pk, item in rows.items():
+            params.append(pk_field.get_db_prep_save(pk, connection))
+            for column, f in zip(columns, incr_fields):
+                params.append(f.get_db_prep_save(item.columns[column], connection))
+            for column, f in zip(extra_columns, extra_fields):
+                value = item.extra[column]
+                if isinstance(value, models.Model):
+                    value = value.pk
+                params.append(f.get_db_prep_save(value, connection))
+
+        table = quote(model._meta.db_table)
+        assignments = [
+            f"{quote(f.column)} = {table}.{quote(f.column)} + v.{quote(f.column)}"
+            for f in incr_fields
+        ]
+        assignments.extend(f"{quote(f.column)} = v.{quote(f.column)}" for f in extra_fields)
+        sql = """
+            UPDATE {table} SET {assignments}
+            FROM (VALUES {values}) AS v({columns})
+            WHERE {table}.{pk} = v.{pk}
+            RETURNING {table}.{pk}
+        """.format(
+            table=table,
+            assignments=", ".join(assignments),
+            values=", ".join([placeholder] * len(rows)),
+            columns=", ".join(quote(f.column) for f in value_fields),
+            pk=quote(pk_field.column),
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            updated = {pk_field.to_python(row[0]) for row in cursor.fetchall()}
+
+        metrics.distribution(
+            "buffer.process_many.rows",
+            len(rows),
+            tags={"model": model.__name__},
+        )
+        return updated
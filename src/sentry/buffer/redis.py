@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 import pickle
+from collections import defaultdict
 from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import date, datetime, timezone
@@ -13,7 +14,9 @@ import rb
 from django.utils.encoding import force_bytes, force_str
 from rediscluster import RedisCluster
 
-from sentry.buffer.base import Buffer, BufferField
+from sentry import options
+from sentry.buffer.aggregation import IncrAggregator
+from sentry.buffer.base import Buffer, BufferedIncr, BufferField
 from sentry.db import models
 from sentry.tasks.process_buffer import process_incr
 from sentry.utils import json, metrics
@@ -231,6 +234,7 @@ class RedisBuffer(Buffer):
         )
         self.incr_batch_size = incr_batch_size
         assert self.incr_batch_size > 0
+        self._aggregator: IncrAggregator | None = None
 
     def validate(self) -> None:
         validate_dynamic_cluster(self.is_redis_cluster, self.cluster)
@@ -463,7 +467,48 @@ class RedisBuffer(Buffer):
             - Perform a set (last write wins) on extra
             - Perform a set on signal_only (only if True)
         - Add hashmap key to pending flushes
+
+        If `buffer.local-aggregation.enabled` is set, increments are first
+        merged in process and written to Redis periodically, see
+        `IncrAggregator`.
         """
+        if options.get("buffer.local-aggregation.enabled"):
+            self._get_aggregator().add(
+                BufferedIncr(model, columns, filters, extra or {}, signal_only)
+            )
+        else:
+            self._incr(model, columns, filters, extra, signal_only)
+
+        metrics.incr(
+            "buffer.incr",
+            skip_internal=True,
+            tags={"module": model.__module__, "model": model.__name__},
+        )
+
+    def flush_local_increments(self) -> None:
+        if self._aggregator is not None:
+            self._aggregator.flush()
+
+    def _get_aggregator(self) -> IncrAggregator:
+        if self._aggregator is None:
+            self._aggregator = IncrAggregator(
+                key_func=lambda item: self._make_key(item.model, item.filters),
+                flush_func=lambda item: self._incr(
+                    item.model, item.columns, item.filters, item.extra, item.signal_only
+                ),
+                interval=lambda: options.get("buffer.local-aggregation.interval-ms") / 1000,
+                max_size=lambda: options.get("buffer.local-aggregation.max-size"),
+            )
+        return self._aggregator
+
+    def _incr(
+        self,
+        model: type[models.Model],
+        columns: dict[str, int],
+        filters: dict[str, BufferField],
+        extra: dict[str, Any] | None = None,
+        signal_only: bool | None = None,
+    ) -> None:
         key = self._make_key(model, filters)
         # We can't use conn.map() due to wanting to support multiple pending
         # keys (one per Redis partition)
@@ -497,20 +542,18 @@ class RedisBuffer(Buffer):
         pipe.zadd(self.pending_key, {key: time()})
         pipe.execute()
 
-        metrics.incr(
-            "buffer.incr",
-            skip_internal=True,
-            tags={"module": model.__module__, "model": model.__name__},
-        )
-
     def process_pending(self) -> None:
         client = get_cluster_routing_client(self.cluster, self.is_redis_cluster)
         lock_key = self._lock_key(client, self.pending_key, ex=60)
         if not lock_key:
             return
 
+        incr_batch_size = self.incr_batch_size
+        if options.get("buffer.bulk-flush.enabled"):
+            incr_batch_size = options.get("buffer.bulk-flush.batch-size")
+
         pending_buffers_router = redis_buffer_router.create_pending_buffers_router(
-            incr_batch_size=self.incr_batch_size
+            incr_batch_size=incr_batch_size
         )
 
         def _generate_process_incr_kwargs(model_key: str | None) -> dict[str, Any]:
@@ -609,6 +652,10 @@ class RedisBuffer(Buffer):
             batch_keys = [key]
 
         if batch_keys is not None:
+            if len(batch_keys) > 1 and options.get("buffer.bulk-flush.enabled"):
+                self._process_bulk_incr(batch_keys)
+                return
+
             for key in batch_keys:
                 self._process_single_incr(key)
 
@@ -637,39 +684,144 @@ class RedisBuffer(Buffer):
             pipe.delete(key)
             values = pipe.execute()[0]
 
-            # XXX(python3): In python2 this isn't as important since redis will
-            # return string tyes (be it, byte strings), but in py3 we get bytes
-            # back, and really we just want to deal with keys as strings.
-            values = {force_str(k): v for k, v in values.items()}
-
-            if not values:
-                metrics.incr("buffer.revoked", tags={"reason": "empty"}, skip_internal=False)
-                logger.debug("buffer.revoked.empty", extra={"redis_key": key})
+            item = self._load_incr(key, values)
+            if item is None:
                 return
 
-            model = import_string(force_str(values.pop("m")))
-
-            if values["f"].startswith(b"{" if not self.is_redis_cluster else "{"):
-                filters = self._load_values(json.loads(force_str(values.pop("f"))))
-            else:
-                # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                filters = pickle.loads(force_bytes(values.pop("f")))
-
-            incr_values = {}
-            extra_values = {}
-            signal_only = None
-            for k, v in values.items():
-                if k.startswith("i+"):
-                    incr_values[k[2:]] = int(v)
-                elif k.startswith("e+"):
-                    if v.startswith(b"[" if not self.is_redis_cluster else "["):
-                        extra_values[k[2:]] = self._load_value(json.loads(force_str(v)))
-                    else:
-                        # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                        extra_values[k[2:]] = pickle.loads(force_bytes(v))
-                elif k == "s":
-                    signal_only = bool(int(v))  # Should be 1 if set
-
-            self._base_process(model, incr_values, filters, extra_values, signal_only)
+            self._base_process(item.model, item.columns, item.filters, item.extra, item.signal_only)
         finally:
             client.delete(lock_key)
+
+    def _load_incr(self, key: str, values: dict[Any, Any]) -> BufferedIncr | None:
+        """
+        Decode the hash written by `incr` for a single model row.
+        """
+        # XXX(python3): In python2 this isn't as important since redis will
+        # return string tyes (be it, byte strings), but in py3 we get bytes
+        # back, and really we just want to deal with keys as strings.
+        values = {force_str(k): v for k, v in values.items()}
+
+        if not values:
+            metrics.incr("buffer.revoked", tags={"reason": "empty"}, skip_internal=False)
+            logger.debug("buffer.revoked.empty", extra={"redis_key": key})
+            return None
+
+        model = import_string(force_str(values.pop("m")))
+
+        if values["f"].startswith(b"{" if not self.is_redis_cluster else "{"):
+            filters = self._load_values(json.loads(force_str(values.pop("f"))))
+        else:
+            # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+            filters = pickle.loads(force_bytes(values.pop("f")))
+
+        incr_values = {}
+        extra_values = {}
+        signal_only = None
+        for k, v in values.items():
+            if k.startswith("i+"):
+                incr_values[k[2:]] = int(v)
+            elif k.startswith("e+"):
+                if v.startswith(b"[" if not self.is_redis_cluster else "["):
+                    extra_values[k[2:]] = self._load_value(json.loads(force_str(v)))
+                else:
+                    # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+                    extra_values[k[2:]] = pickle.loads(force_bytes(v))
+            elif k == "s":
+                signal_only = bool(int(v))  # Should be 1 if set
+
+        return BufferedIncr(model, incr_values, filters, extra_values, signal_only)
+
+    def _lock_keys(self, keys: list[str], ex: int) -> list[str]:
+        """
+        Like `_lock_key`, but locks many keys with a single round trip per
+        host. Returns the keys that were locked.
+        """
+        lock_keys = [self._make_lock_key(key) for key in keys]
+        if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
+            pipe = self.cluster.pipeline(transaction=False)
+            for lock_key in lock_keys:
+                pipe.set(lock_key, "1", nx=True, ex=ex)
+            results = pipe.execute()
+        elif is_instance_rb_cluster(self.cluster, self.is_redis_cluster):
+            with self.cluster.map() as conn:
+                promises = [conn.set(lock_key, "1", nx=True, ex=ex) for lock_key in lock_keys]
+            results = [promise.value for promise in promises]
+        else:
+            raise AssertionError("unreachable")
+
+        return [key for key, locked in zip(keys, results) if locked]
+
+    def _unlock_keys(self, keys: list[str]) -> None:
+        if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
+            pipe = self.cluster.pipeline(transaction=False)
+            for key in keys:
+                pipe.delete(self._make_lock_key(key))
+            pipe.execute()
+        elif is_instance_rb_cluster(self.cluster, self.is_redis_cluster):
+            with self.cluster.map() as conn:
+                for key in keys:
+                    conn.delete(self._make_lock_key(key))
+        else:
+            raise AssertionError("unreachable")
+
+    def _claim_keys(self, keys: list[str]) -> dict[str, dict[Any, Any]]:
+        """
+        Read and delete the hashes of many keys, pipelining all commands that
+        go to the same host.
+        """
+        if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
+            keys_by_pipeline = [(self.cluster.pipeline(transaction=False), keys)]
+        elif is_instance_rb_cluster(self.cluster, self.is_redis_cluster):
+            # With rb, each host has its own pending set, so the keys have to
+            # be removed from the pending set on the host they live on.
+            keys_by_host: dict[int, list[str]] = defaultdict(list)
+            router = self.cluster.get_router()
+            for key in keys:
+                keys_by_host[router.get_host_for_key(key)].append(key)
+            keys_by_pipeline = [
+                (self.cluster.get_local_client(host_id).pipeline(transaction=False), host_keys)
+                for host_id, host_keys in keys_by_host.items()
+            ]
+        else:
+            raise AssertionError("unreachable")
+
+        rv = {}
+        for pipe, pipe_keys in keys_by_pipeline:
+            for key in pipe_keys:
+                pipe.hgetall(key)
+                pipe.zrem(self.pending_key, key)
+                pipe.delete(key)
+            results = pipe.execute()
+            for i, key in enumerate(pipe_keys):
+                rv[key] = results[i * 3]
+        return rv
+
+    def _process_bulk_incr(self, batch_keys: list[str]) -> None:
+        """
+        Process a batch of keys at once: claim all of them in a few pipelines,
+        then apply the increments with `process_many`, which merges them per
+        model row and writes them with one statement per model.
+        """
+        keys = list(dict.fromkeys(batch_keys))
+        locked_keys = self._lock_keys(keys, ex=10)
+        if len(locked_keys) < len(keys):
+            metrics.incr(
+                "buffer.revoked",
+                amount=len(keys) - len(locked_keys),
+                tags={"reason": "locked"},
+                skip_internal=False,
+            )
+        if not locked_keys:
+            return
+
+        try:
+            items = []
+            for key, values in self._claim_keys(locked_keys).items():
+                item = self._load_incr(key, values)
+                if item is not None:
+                    items.append(item)
+
+            metrics.distribution("buffer.bulk-flush.keys", len(items))
+            self.process_many(items)
+        finally:
+            self._unlock_keys(locked_keys)
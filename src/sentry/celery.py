@@ -72,6 +72,15 @@ def celery_prefork_freeze_gc(**kwargs: object) -> None:
     gc.freeze()
 
 
+@signals.worker_process_shutdown.connect
+def celery_flush_local_buffer_increments(**kwargs: object) -> None:
+    # prefork children exit with `os._exit`, which skips exit handlers, so
+    # buffer increments aggregated in process are written out explicitly.
+    from sentry import buffer
+
+    buffer.backend.flush_local_increments()
+
+
 class SentryTask(Task):
     Request = "sentry.celery:SentryRequest"
 
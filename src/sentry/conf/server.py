@@ -330,6 +330,7 @@ MIDDLEWARE: tuple[str, ...] = (
     "sentry.middleware.health.HealthCheck",
     "sentry.middleware.security.SecurityHeadersMiddleware",
     "sentry.middleware.env.SentryEnvMiddleware",
+    "sentry.middleware.nodestore.NodestoreRequestCacheMiddleware",
     "sentry.middleware.proxy.SetRemoteAddrFromForwardedFor",
     "sentry.middleware.stats.RequestTimingMiddleware",
     "sentry.middleware.access_log.access_log_middleware",
@@ -1852,10 +1853,15 @@ SENTRY_DEFAULT_MAX_EVENTS_PER_MINUTE = "90%"
 SENTRY_SNUBA = os.environ.get("SNUBA", "http://127.0.0.1:1218")
 SENTRY_SNUBA_TIMEOUT = 30
 SENTRY_SNUBA_CACHE_TTL_SECONDS = 60
+# Number of threads, and of pooled connections, for running bulk Snuba queries
+SENTRY_SNUBA_QUERY_WORKERS = 10
 
 # Node storage backend
 SENTRY_NODESTORE = "sentry.nodestore.django.DjangoNodeStorage"
 SENTRY_NODESTORE_OPTIONS: dict[str, Any] = {}
+# Trained zstd dictionaries used for nodestore compression, keyed by event
+# platform (or "default"). See `sentry.nodestore.compression`.
+SENTRY_NODESTORE_ZSTD_DICTIONARIES: dict[str, str] = {}
 
 # Node storage backend used for ArtifactBundle indexing (aka FlatFileIndex aka BundleIndex)
 SENTRY_INDEXSTORE = "sentry.nodestore.django.DjangoNodeStorage"
@@ -1910,6 +1916,10 @@ SENTRY_METRICS_DISALLOW_BAD_TAGS = IS_DEV
 SENTRY_METRICS_INDEXER = "sentry.sentry_metrics.indexer.postgres.postgres_v2.PostgresIndexer"
 SENTRY_METRICS_INDEXER_OPTIONS: dict[str, Any] = {}
 SENTRY_METRICS_INDEXER_CACHE_TTL = 3600 * 2
+# In-process cache in front of the indexer cache, enabled with the
+# "sentry-metrics.indexer.local-cache.enabled" option. Misses of `resolve` are
+# remembered for `negative_ttl` seconds.
+SENTRY_METRICS_INDEXER_LOCAL_CACHE_OPTIONS = {"maxsize": 100_000, "ttl": 600, "negative_ttl": 10}
 SENTRY_METRICS_INDEXER_TRANSACTIONS_SAMPLE_RATE = 0.1  # relative to SENTRY_BACKEND_APM_SAMPLING
 
 SENTRY_METRICS_INDEXER_REINDEXED_INTS: dict[int, str] = {}
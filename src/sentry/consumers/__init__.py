@@ -87,9 +87,12 @@ def ingest_monitors_options() -> list[click.Option]:
     options = [
         click.Option(
             ["--mode", "mode"],
-            type=click.Choice(["serial", "batched-parallel"]),
+            type=click.Choice(["serial", "batched-parallel", "batched-bulk"]),
             default="batched-parallel",
-            help="The mode to process check-ins in. Parallel uses multithreading.",
+            help=(
+                "The mode to process check-ins in. Parallel uses multithreading, "
+                "bulk additionally batches check-in writes."
+            ),
         ),
         click.Option(
             ["--max-batch-size", "max_batch_size"],
@@ -113,6 +116,30 @@ def ingest_monitors_options() -> list[click.Option]:
     return options
 
 
+def monitors_clock_tasks_options() -> list[click.Option]:
+    """Return a list of monitors-clock-tasks options."""
+    return [
+        click.Option(
+            ["--mode", "mode"],
+            type=click.Choice(["serial", "batched"]),
+            default="serial",
+            help="The mode to process clock tasks in. Batched marks missed monitors in bulk.",
+        ),
+        click.Option(
+            ["--max-batch-size", "max_batch_size"],
+            type=int,
+            default=500,
+            help="Maximum number of clock tasks to batch before processing.",
+        ),
+        click.Option(
+            ["--max-batch-time", "max_batch_time"],
+            type=int,
+            default=1,
+            help="Maximum time spent batching clock tasks before processing.",
+        ),
+    ]
+
+
 def uptime_options() -> list[click.Option]:
     """Return a list of uptime-results options."""
     options = [
@@ -175,6 +202,27 @@ def ingest_events_options() -> list[click.Option]:
     return options
 
 
+def ingest_simple_events_options() -> list[click.Option]:
+    """
+    Options for the consumers of "simple" event topics: `events` and `feedback-events`.
+
+    This adds a `--batched-processing` option. If that option is specified, messages are collected
+    into batches of `--max-batch-size` that are deduplicated and written to the `processing_store`
+    together.
+    """
+    options = ingest_events_options()
+    options.append(
+        click.Option(
+            ["--batched-processing", "batched_processing"],
+            type=bool,
+            is_flag=True,
+            default=False,
+            help="Deduplicate and store events in batches instead of one by one.",
+        )
+    )
+    return options
+
+
 def ingest_transactions_options() -> list[click.Option]:
     options = ingest_events_options()
     options.append(
@@ -262,6 +310,7 @@ KAFKA_CONSUMERS: Mapping[str, ConsumerDefinition] = {
     "monitors-clock-tasks": {
         "topic": Topic.MONITORS_CLOCK_TASKS,
         "strategy_factory": "sentry.monitors.consumers.clock_tasks_consumer.MonitorClockTasksStrategyFactory",
+        "click_options": monitors_clock_tasks_options(),
     },
     "monitors-incident-occurrences": {
         "topic": Topic.MONITORS_INCIDENT_OCCURRENCES,
@@ -318,7 +367,7 @@ KAFKA_CONSUMERS: Mapping[str, ConsumerDefinition] = {
     "ingest-events": {
         "topic": Topic.INGEST_EVENTS,
         "strategy_factory": "sentry.ingest.consumer.factory.IngestStrategyFactory",
-        "click_options": ingest_events_options(),
+        "click_options": ingest_simple_events_options(),
         "static_args": {
             "consumer_type": ConsumerType.Events,
         },
@@ -328,7 +377,7 @@ KAFKA_CONSUMERS: Mapping[str, ConsumerDefinition] = {
     "ingest-feedback-events": {
         "topic": Topic.INGEST_FEEDBACK_EVENTS,
         "strategy_factory": "sentry.ingest.consumer.factory.IngestStrategyFactory",
-        "click_options": ingest_events_options(),
+        "click_options": ingest_simple_events_options(),
         "static_args": {
             "consumer_type": ConsumerType.Feedback,
         },
@@ -424,6 +473,12 @@ KAFKA_CONSUMERS: Mapping[str, ConsumerDefinition] = {
                 default=100,
                 help="The number of segments to download from redis at once. Defaults to 100.",
             ),
+            click.Option(
+                ["--max-flush-bytes", "max_flush_bytes"],
+                type=int,
+                default=64 * 1024 * 1024,
+                help="Roughly how many bytes of span payloads to hold in memory while flushing. Defaults to 64MiB.",
+            ),
             *multiprocessing_options(default_max_batch_size=100),
         ],
     },
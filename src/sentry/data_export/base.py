@@ -6,6 +6,7 @@ MAX_FRAGMENTS_PER_BATCH = 10
 EXPORTED_ROWS_LIMIT = 10000000
 SNUBA_MAX_RESULTS = 10000
 DEFAULT_EXPIRATION = timedelta(weeks=4)
+EXPORT_TIME_SLICES = 4
 
 
 class ExportError(Exception):
@@ -20,6 +21,29 @@ class ExportStatus(str, Enum):
     Expired = "EXPIRED"  # The download has been deleted
 
 
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class ExportCompression(str, Enum):
+    NONE = "none"
+    GZIP = "gzip"
+    ZSTD = "zstd"
+
+
+EXPORT_CONTENT_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.NDJSON: "application/x-ndjson",
+}
+
+# Content types of compressed exports, which are downloaded as they are stored.
+EXPORT_COMPRESSION_CONTENT_TYPES = {
+    ExportCompression.GZIP: "application/gzip",
+    ExportCompression.ZSTD: "application/zstd",
+}
+
+
 class ExportQueryType:
     ISSUES_BY_TAG = 0
     DISCOVER = 1
@@ -4,7 +4,7 @@ from rest_framework import serializers
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from sentry import features
+from sentry import features, options
 from sentry.api.api_publish_status import ApiPublishStatus
 from sentry.api.base import region_silo_endpoint
 from sentry.api.bases.organization import OrganizationDataExportPermission, OrganizationEndpoint
@@ -23,10 +23,10 @@ from sentry.snuba.errors import PARSER_CONFIG_OVERRIDES
 from sentry.utils import metrics
 from sentry.utils.snuba import MAX_FIELDS
 
-from ..base import ExportQueryType
+from ..base import ExportFormat, ExportQueryType
 from ..models import ExportedData
 from ..processors.discover import DiscoverProcessor
-from ..tasks import assemble_download
+from ..tasks import assemble_download, assemble_download_streamed
 
 # To support more datasets we may need to change the QueryBuilder being used
 SUPPORTED_DATASETS = {
@@ -40,6 +40,10 @@ SUPPORTED_DATASETS = {
 class DataExportQuerySerializer(serializers.Serializer):
     query_type = serializers.ChoiceField(choices=ExportQueryType.as_str_choices(), required=True)
     query_info = serializers.JSONField(required=True)
+    format = serializers.ChoiceField(
+        choices=[export_format.value for export_format in ExportFormat],
+        default=ExportFormat.CSV.value,
+    )
 
     def validate(self, data):
         organization = self.context["organization"]
@@ -132,6 +136,15 @@ class DataExportQuerySerializer(serializers.Serializer):
             except InvalidSearchQuery as err:
                 raise serializers.ValidationError(str(err))
 
+            if data["format"] != ExportFormat.CSV and not processor.supports_keyset:
+                raise serializers.ValidationError(
+                    f"{data['format']} exports are only supported for queries sorted by timestamp"
+                )
+        elif data["format"] != ExportFormat.CSV:
+            raise serializers.ValidationError(
+                f"{data['format']} exports are only supported for discover queries"
+            )
+
         return data
 
 
@@ -232,9 +245,23 @@ class DataExportEndpoint(OrganizationEndpoint):
                 metrics.incr(
                     "dataexport.enqueue", tags={"query_type": data["query_type"]}, sample_rate=1.0
                 )
-                assemble_download.delay(
-                    data_export_id=data_export.id, export_limit=limit, environment_id=environment_id
-                )
+                if query_type == ExportQueryType.DISCOVER and (
+                    options.get("data-export.discover-streamed-export")
+                    or data["format"] != ExportFormat.CSV
+                ):
+                    assemble_download_streamed.delay(
+                        data_export_id=data_export.id,
+                        export_limit=limit,
+                        environment_id=environment_id,
+                        export_format=data["format"],
+                        compression=options.get("data-export.discover-streamed-export.compression"),
+                    )
+                else:
+                    assemble_download.delay(
+                        data_export_id=data_export.id,
+                        export_limit=limit,
+                        environment_id=environment_id,
+                    )
                 status = 201
         except ValidationError as e:
             # This will handle invalid JSON requests
@@ -13,6 +13,7 @@ from sentry.models.organization import Organization
 from sentry.models.project import Project
 from sentry.utils import metrics
 
+from ..base import EXPORT_COMPRESSION_CONTENT_TYPES, ExportCompression
 from ..models import ExportedData
 
 
@@ -53,9 +54,16 @@ class DataExportDetailsEndpoint(OrganizationEndpoint):
     def download(self, data_export):
         metrics.incr("dataexport.download", sample_rate=1.0)
         file = data_export._get_file()
+        headers = file.headers or {}
+        content_type = headers.get("Content-Type", "text/csv")
+        if "Content-Encoding" in headers:
+            # Compressed exports are downloaded as they are stored, as archives
+            content_type = EXPORT_COMPRESSION_CONTENT_TYPES[
+                ExportCompression(headers["Content-Encoding"])
+            ]
         raw_file = file.getfile()
         response = StreamingHttpResponse(
-            iter(lambda: raw_file.read(4096), b""), content_type="text/csv"
+            iter(lambda: raw_file.read(4096), b""), content_type=content_type
         )
         response["Content-Length"] = file.size
         response["Content-Disposition"] = f'attachment; filename="{file.name}"'
@@ -1,4 +1,6 @@
 import logging
+from dataclasses import replace
+from datetime import datetime, timedelta
 
 from sentry_relay.consts import SPAN_STATUS_CODE_TO_NAME
 
@@ -6,7 +8,7 @@ from sentry.api.utils import get_date_range_from_params
 from sentry.models.environment import Environment
 from sentry.models.group import Group
 from sentry.models.project import Project
-from sentry.search.events.fields import get_function_alias
+from sentry.search.events.fields import get_function_alias, is_function
 from sentry.search.events.types import SnubaParams
 from sentry.snuba import discover
 from sentry.snuba.utils import get_dataset
@@ -15,6 +17,8 @@ from ..base import ExportError
 
 logger = logging.getLogger(__name__)
 
+KEYSET_COLUMNS = ("timestamp", "id")
+
 
 class DiscoverProcessor:
     """
@@ -49,6 +53,19 @@ class DiscoverProcessor:
             sort=discover_query.get("sort"),
             dataset=discover_query.get("dataset"),
         )
+        self.keyset_descending = self.get_keyset_direction(
+            fields=discover_query["field"],
+            equations=equations,
+            sort=discover_query.get("sort"),
+        )
+        if self.keyset_descending is not None:
+            self.keyset_data_fn = self.get_keyset_data_fn(
+                fields=discover_query["field"],
+                query=discover_query["query"],
+                snuba_params=self.snuba_params,
+                descending=self.keyset_descending,
+                dataset=discover_query.get("dataset"),
+            )
 
     @staticmethod
     def get_projects(organization_id, query):
@@ -101,6 +118,102 @@ class DiscoverProcessor:
 
         return data_fn
 
+    @staticmethod
+    def get_keyset_direction(fields, equations, sort):
+        """
+        Keyset pagination is only supported for queries over individual events
+        that are sorted by timestamp. Returns whether the keyset is walked in
+        descending order, or None when the query does not support it.
+        """
+        if equations or any(is_function(field) for field in fields):
+            return None
+        if isinstance(sort, list):
+            sort = sort[0] if len(sort) == 1 else ""
+        if sort in (None, "-timestamp"):
+            return True
+        if sort == "timestamp":
+            return False
+        return None
+
+    @staticmethod
+    def get_keyset_data_fn(fields, query, snuba_params, descending, dataset):
+        dataset = get_dataset(dataset)
+        if dataset is None:
+            dataset = discover
+
+        # The cursor columns must be selected to be able to sort by them
+        selected_columns = fields + [key for key in KEYSET_COLUMNS if key not in fields]
+        orderby = [f"-{key}" if descending else key for key in KEYSET_COLUMNS]
+
+        def data_fn(start, end, offset, limit):
+            return dataset.query(
+                selected_columns=selected_columns,
+                query=query,
+                snuba_params=replace(snuba_params, start=start, end=end),
+                offset=offset,
+                orderby=orderby,
+                limit=limit,
+                referrer="data_export.tasks.discover_keyset",
+                auto_fields=True,
+            )
+
+        return data_fn
+
+    @property
+    def supports_keyset(self) -> bool:
+        return self.keyset_descending is not None
+
+    def get_time_slices(self, count):
+        """
+        Splits the time range of the export into `count` contiguous slices,
+        ordered the same way as the rows of the export.
+        """
+        step = (self.end - self.start) / count
+        bounds = [self.start + step * i for i in range(count)] + [self.end]
+        slices = list(zip(bounds, bounds[1:]))
+        return slices[::-1] if self.keyset_descending else slices
+
+    def iter_keyset_pages(self, start, end, batch_size):
+        """
+        Yields pages of rows between `start` and `end` using a timestamp
+        cursor. Each page narrows the time range to the timestamp of the last
+        row and only uses an offset to skip the rows already seen within that
+        same second, so the cost of every page stays constant.
+
+        The rows are yielded as returned by snuba, `handle_fields` is left to
+        the caller as it queries the database.
+        """
+        cursor_ts = None
+        cursor_offset = 0
+        while True:
+            if cursor_ts is None:
+                page_start, page_end = start, end
+            elif self.keyset_descending:
+                page_start, page_end = start, cursor_ts + timedelta(seconds=1)
+            else:
+                page_start, page_end = cursor_ts, end
+
+            rows = self.keyset_data_fn(
+                start=page_start, end=page_end, offset=cursor_offset, limit=batch_size
+            )["data"]
+            if not rows:
+                return
+
+            yield rows
+
+            if len(rows) < batch_size:
+                return
+
+            row_seconds = [
+                datetime.fromisoformat(row["timestamp"]).replace(microsecond=0) for row in rows
+            ]
+            last_ts = row_seconds[-1]
+            same_second = row_seconds.count(last_ts)
+            if last_ts == cursor_ts:
+                cursor_offset += same_second
+            else:
+                cursor_ts, cursor_offset = last_ts, same_second
+
     def handle_fields(self, result_list):
         # Find issue short_id if present
         # (originally in `/api/bases/organization_events.py`)
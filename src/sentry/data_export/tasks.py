@@ -1,13 +1,18 @@
 import codecs
 import csv
+import io
+import itertools
 import logging
 import tempfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from hashlib import sha1
 
 import sentry_sdk
+import zstandard
 from celery.exceptions import MaxRetriesExceededError
 from django.core.files.base import ContentFile
-from django.db import IntegrityError, router
+from django.db import IntegrityError, connections, router
 from django.utils import timezone
 
 from sentry.models.files.file import File
@@ -17,17 +22,22 @@ from sentry.models.files.utils import DEFAULT_BLOB_SIZE, MAX_FILE_SIZE, Assemble
 from sentry.silo.base import SiloMode
 from sentry.tasks.base import instrumented_task
 from sentry.taskworker.retry import NoRetriesRemainingError, retry_task
-from sentry.utils import metrics
+from sentry.utils import json, metrics
 from sentry.utils.db import atomic_transaction
+from sentry.utils.iterators import chunked
 from sentry.utils.rollback_metrics import incr_rollback_metrics
 from sentry.utils.sdk import capture_exception
 
 from .base import (
+    EXPORT_CONTENT_TYPES,
+    EXPORT_TIME_SLICES,
     EXPORTED_ROWS_LIMIT,
     MAX_BATCH_SIZE,
     MAX_FRAGMENTS_PER_BATCH,
     SNUBA_MAX_RESULTS,
+    ExportCompression,
     ExportError,
+    ExportFormat,
     ExportQueryType,
 )
 from .models import ExportedData, ExportedDataBlob
@@ -194,6 +204,308 @@ def assemble_download(
                 merge_export_blobs.delay(data_export_id)
 
 
+@instrumented_task(
+    name="sentry.data_export.tasks.assemble_download_streamed",
+    queue="data_export",
+    default_retry_delay=60,
+    max_retries=3,
+    acks_late=True,
+    silo_mode=SiloMode.REGION,
+)
+def assemble_download_streamed(
+    data_export_id,
+    export_limit=EXPORTED_ROWS_LIMIT,
+    batch_size=SNUBA_MAX_RESULTS,
+    environment_id=None,
+    export_format=ExportFormat.CSV,
+    compression=ExportCompression.NONE,
+    export_retries=3,
+    **kwargs,
+):
+    """
+    Exports a discover query in a single pass.
+
+    The time range of the query is split into `EXPORT_TIME_SLICES` slices
+    which are fetched in parallel, each using keyset pagination (see
+    `DiscoverProcessor.iter_keyset_pages`). The rows are then encoded and
+    compressed directly into file blobs, so no separate merge pass is needed.
+
+    Queries that can not be paginated by keyset are exported by
+    `assemble_download` instead, as are CSV exports that keep failing, since
+    `assemble_download` can resume from the last batch it stored.
+    """
+    with sentry_sdk.start_span(op="assemble_streamed"):
+        logger.info("dataexport.start", extra={"data_export_id": data_export_id})
+        try:
+            data_export = ExportedData.objects.get(id=data_export_id)
+        except ExportedData.DoesNotExist as error:
+            metrics.incr("dataexport.start", tags={"success": False}, sample_rate=1.0)
+            logger.exception(str(error))
+            return
+        metrics.incr("dataexport.start", tags={"success": True}, sample_rate=1.0)
+
+        _set_data_on_scope(data_export)
+
+        if export_limit is None:
+            export_limit = EXPORTED_ROWS_LIMIT
+        else:
+            export_limit = min(export_limit, EXPORTED_ROWS_LIMIT)
+        export_format = ExportFormat(export_format)
+
+        try:
+            processor = get_processor(data_export, environment_id)
+            if data_export.query_type != ExportQueryType.DISCOVER or not processor.supports_keyset:
+                metrics.incr("dataexport.streamed.fallback", sample_rate=1.0)
+                assemble_download.delay(
+                    data_export_id=data_export_id,
+                    export_limit=export_limit,
+                    batch_size=batch_size,
+                    environment_id=environment_id,
+                )
+                return
+
+            slice_files = _export_keyset_slices(processor, export_limit, batch_size)
+            try:
+                file, row_count = _store_export_file(
+                    data_export,
+                    processor,
+                    slice_files,
+                    export_limit,
+                    export_format,
+                    ExportCompression(compression),
+                )
+            finally:
+                for slice_file in slice_files:
+                    slice_file.close()
+
+            with atomic_transaction(using=router.db_for_write(ExportedData)):
+                data_export.finalize_upload(file=file)
+        except ExportError as error:
+            if error.recoverable and export_retries > 0:
+                assemble_download_streamed.apply_async(
+                    args=[data_export_id],
+                    kwargs={
+                        "export_limit": export_limit,
+                        "batch_size": batch_size // 2,
+                        "environment_id": environment_id,
+                        "export_format": export_format.value,
+                        "compression": ExportCompression(compression).value,
+                        "export_retries": export_retries - 1,
+                    },
+                )
+                return
+            return data_export.email_failure(message=str(error))
+        except Exception as error:
+            metrics.incr("dataexport.error", tags={"error": str(error)}, sample_rate=1.0)
+            logger.exception(
+                "dataexport.error: %s",
+                str(error),
+                extra={"query": data_export.payload, "org": data_export.organization_id},
+            )
+            capture_exception(error)
+
+            try:
+                retry_task()
+            except (MaxRetriesExceededError, NoRetriesRemainingError):
+                if export_format == ExportFormat.CSV:
+                    metrics.incr("dataexport.streamed.fallback", sample_rate=1.0)
+                    assemble_download.delay(
+                        data_export_id=data_export_id,
+                        export_limit=export_limit,
+                        batch_size=batch_size,
+                        environment_id=environment_id,
+                    )
+                    return
+                metrics.incr(
+                    "dataexport.end",
+                    tags={"success": False, "error": str(error)},
+                    sample_rate=1.0,
+                )
+                return data_export.email_failure(message="Internal processing failure")
+        else:
+            metrics.distribution("dataexport.row_count", row_count, sample_rate=1.0)
+            metrics.distribution("dataexport.file_size", file.size, sample_rate=1.0, unit="byte")
+            time_elapsed = (timezone.now() - data_export.date_added).total_seconds()
+            metrics.timing("dataexport.duration", time_elapsed, sample_rate=1.0)
+            logger.info("dataexport.end", extra={"data_export_id": data_export_id})
+            metrics.incr("dataexport.end", tags={"success": True}, sample_rate=1.0)
+
+
+def _export_keyset_slices(processor, export_limit, batch_size):
+    """
+    Fetches every time slice of the export in parallel, see
+    `export_keyset_slice`.
+    """
+
+    def export_slice(*args):
+        # Worker threads open their own database connections, which are not
+        # cleaned up at the end of the task like the task thread's are.
+        try:
+            return export_keyset_slice(*args)
+        finally:
+            connections.close_all()
+
+    slices = processor.get_time_slices(EXPORT_TIME_SLICES)
+    # The number of rows fetched by each slice so far, shared by all slices.
+    row_counts = [0] * len(slices)
+    with ThreadPoolExecutor(max_workers=len(slices)) as pool:
+        futures = [
+            pool.submit(
+                export_slice,
+                processor,
+                start,
+                end,
+                export_limit,
+                batch_size,
+                row_counts,
+                slice_index,
+            )
+            for slice_index, (start, end) in enumerate(slices)
+        ]
+
+    # Re-raise the first failure, after every slice has finished
+    slice_files = []
+    error = None
+    for future in futures:
+        try:
+            slice_files.append(future.result())
+        except Exception as e:
+            error = error or e
+    if error is not None:
+        for slice_file in slice_files:
+            slice_file.close()
+        raise error
+    return slice_files
+
+
+def _store_export_file(
+    data_export, processor, slice_files, export_limit, export_format, compression
+):
+    """
+    Processes and encodes the spooled rows of every slice, in order, and
+    writes them into file blobs as they fill up. Returns the assembled file
+    and the number of rows written.
+    """
+    encode_rows = _get_row_encoder(processor.header_fields, export_format)
+    compress, flush = _get_compressor(compression)
+    file_checksum = sha1(b"")
+    blobs = []
+    size = 0
+    row_count = 0
+    pending = bytearray()
+
+    def write(data, final=False):
+        nonlocal size
+        pending.extend(data)
+        while len(pending) >= DEFAULT_BLOB_SIZE or (final and pending):
+            contents = bytes(pending[:DEFAULT_BLOB_SIZE])
+            del pending[:DEFAULT_BLOB_SIZE]
+            blob = FileBlob.from_file(ContentFile(contents), logger=logger)
+            blobs.append((blob, size))
+            file_checksum.update(contents)
+            size += blob.size
+
+    write(compress(encode_rows(None)))
+
+    for lines in chunked(itertools.chain.from_iterable(slice_files), SNUBA_MAX_RESULTS):
+        rows = processor.handle_fields(
+            [json.loads(line) for line in lines[: export_limit - row_count]]
+        )
+        row_count += len(rows)
+        write(compress(encode_rows(rows)))
+
+        # Same limit as `store_export_chunk_as_blob`, the export is cut off
+        # once the file gets too large.
+        if size + len(pending) >= min(MAX_FILE_SIZE, 2**30) or row_count >= export_limit:
+            break
+
+    write(flush(), final=True)
+
+    name = data_export.file_name
+    if export_format == ExportFormat.NDJSON:
+        name = name.removesuffix(".csv") + ".ndjson"
+    name += EXPORT_COMPRESSION_EXTENSIONS[compression]
+
+    headers = {"Content-Type": EXPORT_CONTENT_TYPES[export_format]}
+    if compression != ExportCompression.NONE:
+        headers["Content-Encoding"] = compression.value
+
+    with atomic_transaction(
+        using=(
+            router.db_for_write(File),
+            router.db_for_write(FileBlobIndex),
+        )
+    ):
+        file = File.objects.create(
+            name=name,
+            type=f"export.{export_format.value}",
+            headers=headers,
+        )
+        FileBlobIndex.objects.bulk_create(
+            FileBlobIndex(file=file, blob=blob, offset=offset) for blob, offset in blobs
+        )
+        file.size = size
+        file.checksum = file_checksum.hexdigest()
+        file.save()
+
+    return file, row_count
+
+
+EXPORT_COMPRESSION_EXTENSIONS = {
+    ExportCompression.NONE: "",
+    ExportCompression.GZIP: ".gz",
+    ExportCompression.ZSTD: ".zst",
+}
+
+
+def _get_row_encoder(header_fields, export_format):
+    """
+    Returns a function encoding a list of rows into bytes. Called with None
+    it returns the header of the file, if the format has one.
+    """
+    if export_format == ExportFormat.NDJSON:
+
+        def encode_ndjson(rows):
+            if rows is None:
+                return b""
+            return b"".join(
+                json.dumps({field: row.get(field) for field in header_fields}).encode("utf-8")
+                + b"\n"
+                for row in rows
+            )
+
+        return encode_ndjson
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, header_fields, escapechar="\\", extrasaction="ignore")
+
+    def encode_csv(rows):
+        if rows is None:
+            writer.writeheader()
+        else:
+            writer.writerows(rows)
+        data = buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+    return encode_csv
+
+
+def _get_compressor(compression):
+    """
+    Returns a pair of functions, one compressing the next piece of output and
+    one flushing the remaining compressed output.
+    """
+    if compression == ExportCompression.GZIP:
+        compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+        return compressor.compress, compressor.flush
+    if compression == ExportCompression.ZSTD:
+        zstd_compressor = zstandard.ZstdCompressor().compressobj()
+        return zstd_compressor.compress, zstd_compressor.flush
+    return (lambda data: data), (lambda: b"")
+
+
 def get_processor(data_export, environment_id):
     try:
         if data_export.query_type == ExportQueryType.ISSUES_BY_TAG:
@@ -242,6 +554,38 @@ def process_issues_by_tag(processor, limit, offset):
     return processor.get_serialized_data(limit=limit, offset=offset)
 
 
+@handle_snuba_errors(logger)
+def export_keyset_slice(
+    processor, start, end, export_limit, batch_size, row_counts=None, slice_index=0
+):
+    """
+    Spools the raw rows of one time slice to a temporary file as JSON lines,
+    so memory usage does not depend on the size of the export.
+
+    `row_counts` holds the number of rows fetched so far by every slice of
+    the export. Slices are exported in order, so a slice stops fetching as
+    soon as it and the slices before it hold `export_limit` rows.
+    """
+    if row_counts is None:
+        row_counts, slice_index = [0], 0
+
+    slice_file = tempfile.TemporaryFile(mode="w+b")
+    try:
+        pages = processor.iter_keyset_pages(start, end, batch_size)
+        while (remaining := export_limit - sum(row_counts[: slice_index + 1])) > 0:
+            rows = next(pages, None)
+            if rows is None:
+                break
+            for row in rows[:remaining]:
+                slice_file.write(json.dumps(row).encode("utf-8") + b"\n")
+            row_counts[slice_index] += min(len(rows), remaining)
+    except Exception:
+        slice_file.close()
+        raise
+    slice_file.seek(0)
+    return slice_file
+
+
 @handle_snuba_errors(logger)
 def process_discover(processor, limit, offset):
     raw_data_unicode = processor.data_fn(limit=limit, offset=offset)["data"]
@@ -132,6 +132,7 @@ class EventStorage(Service):
         "get_adjacent_event_ids",
         "get_adjacent_event_ids_snql",
         "bind_nodes",
+        "defer_nodes",
         "get_unfetched_transactions",
     )
 
@@ -325,6 +326,19 @@ class EventStorage(Service):
                 data = node_results.get(node.id) or {}
                 node.bind_data(data, ref=node.get_ref(item))
 
+    def defer_nodes(self, object_list: Sequence[Event | GroupEvent]) -> None:
+        """
+        For a list of Event objects whose data is about to be read, announce
+        the unfetched node ids to nodestore, so that the first read fetches all
+        of them with a single multi-get command. Unlike `bind_nodes`, nothing is
+        fetched if the data is never read, and the fetched blobs are shared
+        through the nodestore request cache.
+        """
+        for item in object_list:
+            node = item.data
+            if node.id and node._node_data is None:
+                nodestore.backend.defer(node.id)
+
     def get_unfetched_transactions(
         self,
         snuba_filter,
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import MutableMapping
+from collections.abc import MutableMapping, Sequence
 from datetime import timedelta
 from typing import Any
 
@@ -45,6 +45,17 @@ class EventProcessingStore(Service):
         self.inner.set(key, event, self.timeout)
         return key
 
+    def store_many(self, events: Sequence[Event], unprocessed: bool = False) -> list[str]:
+        """
+        Store several events with a single (pipelined, where the backend
+        supports it) write and return their keys in the same order.
+        """
+        keys = [cache_key_for_event(event) for event in events]
+        if unprocessed:
+            keys = [self.__get_unprocessed_key(key) for key in keys]
+        self.inner.set_many(list(zip(keys, events)), self.timeout)
+        return keys
+
     def get(self, key: str, unprocessed: bool = False) -> MutableMapping[str, Any] | None:
         if unprocessed:
             key = self.__get_unprocessed_key(key)
@@ -18,6 +18,7 @@ from sentry_ophio.enhancers import Enhancements as RustEnhancements
 
 from sentry import projectoptions
 from sentry.grouping.component import FrameGroupingComponent, StacktraceGroupingComponent
+from sentry.grouping.utils import BoundedCache
 from sentry.stacktraces.functions import set_in_app
 from sentry.utils.safe import get_path, set_path
 
@@ -32,6 +33,14 @@ logger = logging.getLogger(__name__)
 # So this leaves quite a bit of headroom for custom enhancement rules as well.
 RUST_CACHE = RustCache(1_000)
 
+# Results of `assemble_stacktrace_component`, keyed by the enhancements config and everything about
+# the stacktrace the rules can look at. Rules can match on neighbouring frames, so the decisions are
+# cached for whole stacktraces rather than per frame.
+StacktraceDecisions = tuple[list[tuple[bool, str | None]], bool, str | None, dict[str, int]]
+STACKTRACE_DECISIONS_CACHE: BoundedCache[tuple[Any, ...], StacktraceDecisions] = BoundedCache(
+    "grouping.enhancer.stacktrace_decisions_cache", maxsize=5_000
+)
+
 VERSIONS = [2]
 LATEST_VERSION = VERSIONS[-1]
 
@@ -157,6 +166,9 @@ class Enhancements:
         self.rules = rules
         self.version = version or LATEST_VERSION
         self.bases = bases or []
+        # The serialized config this instance was loaded from, if any. Used to key cached
+        # `assemble_stacktrace_component` results, which are not cached without it.
+        self.cache_key: bytes | None = None
 
         self.rust_enhancements = merge_rust_enhancements(self.bases, rust_enhancements)
 
@@ -205,6 +217,20 @@ class Enhancements:
         """
         # TODO: Fix this type to list[MatchFrame] once it's fixed in ophio
         match_frames: list[Any] = [create_match_frame(frame, platform) for frame in frames]
+        rust_exception_data = make_rust_exception_data(exception_data)
+
+        decisions_key = None
+        if self.cache_key is not None:
+            decisions_key = (
+                self.cache_key,
+                variant_name,
+                tuple(rust_exception_data.values()),
+                tuple(tuple(match_frame.values()) for match_frame in match_frames),
+                tuple((c.contributes, c.in_app, c.hint) for c in frame_components),
+            )
+            cached_decisions = STACKTRACE_DECISIONS_CACHE.get(decisions_key)
+            if cached_decisions is not None:
+                return self._apply_stacktrace_decisions(frame_components, cached_decisions)
 
         rust_frame_components = [RustComponent(contributes=c.contributes) for c in frame_components]
 
@@ -213,7 +239,7 @@ class Enhancements:
         # `apply_category_and_updated_in_app_to_frames`. Also, get `hint` and `contributes` values
         # for the overall stacktrace (returned in `rust_results`).
         rust_results = self.rust_enhancements.assemble_stacktrace_component(
-            match_frames, make_rust_exception_data(exception_data), rust_frame_components
+            match_frames, rust_exception_data, rust_frame_components
         )
 
         # Tally the number of each type of frame in the stacktrace. Later on, this will allow us to
@@ -290,8 +316,40 @@ class Enhancements:
             frame_counts=frame_counts,
         )
 
+        if decisions_key is not None:
+            STACKTRACE_DECISIONS_CACHE.set(
+                decisions_key,
+                (
+                    [(c.contributes, c.hint) for c in frame_components],
+                    stacktrace_contributes,
+                    stacktrace_hint,
+                    dict(frame_counts),
+                ),
+            )
+
         return stacktrace_component
 
+    def _apply_stacktrace_decisions(
+        self,
+        frame_components: list[FrameGroupingComponent],
+        decisions: StacktraceDecisions,
+    ) -> StacktraceGroupingComponent:
+        """
+        Build the `stacktrace` component from cached `assemble_stacktrace_component` results
+        instead of running the rules again.
+        """
+        frame_decisions, stacktrace_contributes, stacktrace_hint, frame_counts = decisions
+
+        for py_component, (contributes, hint) in zip(frame_components, frame_decisions):
+            py_component.update(contributes=contributes, hint=hint)
+
+        return StacktraceGroupingComponent(
+            values=frame_components,
+            hint=stacktrace_hint,
+            contributes=stacktrace_contributes,
+            frame_counts=Counter(frame_counts),
+        )
+
     def as_dict(self, with_rules: bool = False) -> EnhancementsDict:
         rv: EnhancementsDict = {
             "id": self.id,
@@ -351,7 +409,11 @@ class Enhancements:
 
             rust_enhancements = parse_rust_enhancements("config_structure", encoded)
 
-            return cls._from_config_structure(msgpack.loads(encoded, raw=False), rust_enhancements)
+            enhancements = cls._from_config_structure(
+                msgpack.loads(encoded, raw=False), rust_enhancements
+            )
+            enhancements.cache_key = data
+            return enhancements
         except (LookupError, AttributeError, TypeError, ValueError) as e:
             raise ValueError("invalid stack trace rule config: %s" % e)
 
@@ -6,6 +6,8 @@ from functools import lru_cache
 
 import tiktoken
 
+from sentry.grouping.utils import BoundedCache
+
 __all__ = [
     "ParameterizationCallable",
     "ParameterizationCallableExperiment",
@@ -24,6 +26,10 @@ class ParameterizationRegex:
     raw_pattern: str  # regex pattern w/o matching group name
     lookbehind: str | None = None  # positive lookbehind prefix if needed
     lookahead: str | None = None  # positive lookahead postfix if needed
+    # Regex which has to match somewhere in a string for the pattern to possibly match it. Patterns
+    # are only added to the combined regex if their prefilter matches, so this has to be a
+    # necessary condition, or matches will be missed.
+    prefilter: str | None = None
     counter: int = 0
 
     # These need to be used with `(?x)`, to tell the regex compiler to ignore comments
@@ -47,13 +53,26 @@ class ParameterizationRegex:
             self._compiled_pattern = re.compile(rf"(?x){self.pattern}")
         return self._compiled_pattern
 
+    @property
+    def compiled_prefilter(self) -> re.Pattern[str] | None:
+        if self.prefilter is None:
+            return None
+        if not hasattr(self, "_compiled_prefilter"):
+            self._compiled_prefilter = re.compile(self.prefilter)
+        return self._compiled_prefilter
+
 
 DEFAULT_PARAMETERIZATION_REGEXES = [
     ParameterizationRegex(
         name="email",
         raw_pattern=r"""[a-zA-Z0-9.!#$%&'*+/=?^_`{|}~-]+@[a-zA-Z0-9-]+(?:\.[a-zA-Z0-9-]+)*""",
+        prefilter="@",
+    ),
+    ParameterizationRegex(
+        name="url",
+        raw_pattern=r"""\b(wss?|https?|ftp)://[^\s/$.?#].[^\s]*""",
+        prefilter="://",
     ),
-    ParameterizationRegex(name="url", raw_pattern=r"""\b(wss?|https?|ftp)://[^\s/$.?#].[^\s]*"""),
     ParameterizationRegex(
         name="hostname",
         raw_pattern=r"""
@@ -66,6 +85,7 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
             )
             \b
         """,
+        prefilter=r"\.",
     ),
     ParameterizationRegex(
         name="ip",
@@ -93,10 +113,13 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
                 (25[0-5]|(2[0-4]|1{0,1}[0-9]){0,1}[0-9])\b
             )
         """,
+        # IPv6 addresses contain colons, IPv4 addresses contain dots
+        prefilter=r"[:.]",
     ),
     ParameterizationRegex(
         name="uuid",
         raw_pattern=r"""\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b""",
+        prefilter="-",
     ),
     ParameterizationRegex(name="sha1", raw_pattern=r"""\b[0-9a-fA-F]{40}\b"""),
     ParameterizationRegex(name="md5", raw_pattern=r"""\b[0-9a-fA-F]{32}\b"""),
@@ -152,11 +175,17 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
             ) |
             (datetime.datetime\(.*?\))
         """,
+        # Every format apart from `datetime.datetime(...)` contains a digit
+        prefilter=r"\d|datetime",
+    ),
+    ParameterizationRegex(
+        name="duration", raw_pattern=r"""\b(\d+ms) | (\d+(\.\d+)?s)\b""", prefilter=r"\d"
     ),
-    ParameterizationRegex(name="duration", raw_pattern=r"""\b(\d+ms) | (\d+(\.\d+)?s)\b"""),
-    ParameterizationRegex(name="hex", raw_pattern=r"""\b0[xX][0-9a-fA-F]+\b"""),
-    ParameterizationRegex(name="float", raw_pattern=r"""-\d+\.\d+\b | \b\d+\.\d+\b"""),
-    ParameterizationRegex(name="int", raw_pattern=r"""-\d+\b | \b\d+\b"""),
+    ParameterizationRegex(name="hex", raw_pattern=r"""\b0[xX][0-9a-fA-F]+\b""", prefilter="0"),
+    ParameterizationRegex(
+        name="float", raw_pattern=r"""-\d+\.\d+\b | \b\d+\.\d+\b""", prefilter=r"\d"
+    ),
+    ParameterizationRegex(name="int", raw_pattern=r"""-\d+\b | \b\d+\b""", prefilter=r"\d"),
     ParameterizationRegex(
         name="quoted_str",
         raw_pattern=r"""# Using `=`lookbehind which guarantees we'll only match the value half of key-value pairs,
@@ -164,6 +193,7 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
             '([^']+)' | "([^"]+)"
         """,
         lookbehind="=",
+        prefilter="=",
     ),
     ParameterizationRegex(
         name="bool",
@@ -175,11 +205,30 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
             false
         """,
         lookbehind="=",
+        prefilter="=",
     ),
 ]
 
 
 DEFAULT_PARAMETERIZATION_REGEXES_MAP = {r.name: r.pattern for r in DEFAULT_PARAMETERIZATION_REGEXES}
+DEFAULT_PARAMETERIZATION_PREFILTERS = {
+    r.name: r.compiled_prefilter for r in DEFAULT_PARAMETERIZATION_REGEXES
+}
+
+# The same messages are parameterized over and over again, so the results of
+# `Parameterizer.parametrize_w_regex` are cached along with the matches they counted. Longer
+# messages aren't cached to keep the cache's size in check.
+PARAMETERIZED_MESSAGE_CACHE: BoundedCache[
+    tuple[tuple[str, ...], str], tuple[str, tuple[tuple[str, int], ...]]
+] = BoundedCache("grouping.parameterization.message_cache", maxsize=2_000)
+PARAMETERIZED_MESSAGE_CACHE_MAX_LENGTH = 4_096
+
+
+@lru_cache(maxsize=256)
+def _compile_regex_from_patterns(pattern_keys: tuple[str, ...]) -> re.Pattern[str]:
+    return re.compile(
+        rf"(?x){'|'.join(DEFAULT_PARAMETERIZATION_REGEXES_MAP[k] for k in pattern_keys)}"
+    )
 
 
 @dataclasses.dataclass
@@ -237,7 +286,11 @@ class _UniqueId:
     TOKEN_LENGTH_RATIO_LONG = 0.4
 
     @staticmethod
+    @lru_cache(maxsize=10_000)
     def is_probably_uniq_id(token_str: str) -> bool:
+        # Cached, since the same words show up in most messages and tokenizing them is the
+        # expensive part. The token ratio can't be predicted from the string itself, so there's no
+        # cheaper way to skip tokenizing tokens which won't be replaced.
         token_str = token_str.strip("\"'[]{}():;")
         if len(token_str) < _UniqueId.TOKEN_LENGTH_MINIMUM:
             return False
@@ -281,7 +334,8 @@ class Parameterizer:
         regex_pattern_keys: Sequence[str],
         experiments: Sequence[ParameterizationExperiment] = (),
     ):
-        self._parameterization_regex = self._make_regex_from_patterns(regex_pattern_keys)
+        self._pattern_keys = tuple(regex_pattern_keys)
+        self._parameterization_regex = self._make_regex_from_patterns(self._pattern_keys)
         self._experiments = experiments
 
         self.matches_counter: defaultdict[str, int] = defaultdict(int)
@@ -297,11 +351,34 @@ class Parameterizer:
 
         The `(?x)` tells the regex compiler to ignore comments and unescaped whitespace,
         so we can use newlines and indentation for better legibility in patterns above.
+
+        Compiled patterns are cached, as a new `Parameterizer` is created for every message.
         """
 
-        return re.compile(
-            rf"(?x){'|'.join(DEFAULT_PARAMETERIZATION_REGEXES_MAP[k] for k in pattern_keys)}"
-        )
+        return _compile_regex_from_patterns(tuple(pattern_keys))
+
+    def _get_regex_for_content(self, content: str) -> re.Pattern[str] | None:
+        """
+        Returns the combined regex of only those patterns whose prefilters match the content, or
+        None if none of them do. A pattern whose prefilter doesn't match can't match anywhere in the
+        content, so leaving it out of the alternation doesn't change the result.
+        """
+        prefilter_results: dict[re.Pattern[str], bool] = {}
+        pattern_keys = []
+        for key in self._pattern_keys:
+            prefilter = DEFAULT_PARAMETERIZATION_PREFILTERS[key]
+            if prefilter is not None:
+                if prefilter not in prefilter_results:
+                    prefilter_results[prefilter] = prefilter.search(content) is not None
+                if not prefilter_results[prefilter]:
+                    continue
+            pattern_keys.append(key)
+
+        if not pattern_keys:
+            return None
+        if len(pattern_keys) == len(self._pattern_keys):
+            return self._parameterization_regex
+        return _compile_regex_from_patterns(tuple(pattern_keys))
 
     def parametrize_w_regex(self, content: str) -> str:
         """
@@ -313,18 +390,39 @@ class Parameterizer:
 
         @returns: The content with all matches replaced with placeholders.
         """
+        cacheable = len(content) <= PARAMETERIZED_MESSAGE_CACHE_MAX_LENGTH
+        cached = (
+            PARAMETERIZED_MESSAGE_CACHE.get((self._pattern_keys, content)) if cacheable else None
+        )
+        if cached is not None:
+            result, matches = cached
+            for key, count in matches:
+                self.matches_counter[key] += count
+            return result
+
+        matches_counter: defaultdict[str, int] = defaultdict(int)
 
         def _handle_regex_match(match: re.Match[str]) -> str:
-            # Find the first (should be only) non-None match entry, and sub in the placeholder. For
-            # example, given the groupdict item `('hex', '0x40000015')`, this returns '<hex>' as a
-            # replacement for the original value in the string.
-            for key, value in match.groupdict().items():
-                if value is not None:
-                    self.matches_counter[key] += 1
-                    return f"<{key}>"
-            return ""
+            # The named group of every pattern encloses all of its other groups, so it's the last
+            # group to close and its name is the key of the matched pattern. For example, for a
+            # match of `0x40000015` this returns '<hex>' as the replacement in the string.
+            key = match.lastgroup
+            if key is None:
+                return ""
+            matches_counter[key] += 1
+            return f"<{key}>"
+
+        regex = self._get_regex_for_content(content)
+        result = regex.sub(_handle_regex_match, content) if regex is not None else content
+
+        for key, count in matches_counter.items():
+            self.matches_counter[key] += count
+        if cacheable:
+            PARAMETERIZED_MESSAGE_CACHE.set(
+                (self._pattern_keys, content), (result, tuple(matches_counter.items()))
+            )
 
-        return self._parameterization_regex.sub(_handle_regex_match, content)
+        return result
 
     def parametrize_w_experiments(
         self, content: str, should_run: Callable[[str], bool] = lambda _: True
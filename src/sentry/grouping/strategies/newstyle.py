@@ -29,7 +29,7 @@ from sentry.grouping.strategies.base import (
 )
 from sentry.grouping.strategies.message import normalize_message_for_grouping
 from sentry.grouping.strategies.utils import has_url_origin, remove_non_stacktrace_variants
-from sentry.grouping.utils import hash_from_values
+from sentry.grouping.utils import BoundedCache, hash_from_values
 from sentry.interfaces.exception import Exception as ChainedException
 from sentry.interfaces.exception import Mechanism, SingleException
 from sentry.interfaces.stacktrace import Frame, Stacktrace
@@ -106,6 +106,19 @@ RECURSION_COMPARISON_FIELDS = [
 # TODO(markus)
 StacktraceEncoderReturnValue = Any
 
+# The same frames show up in a huge number of events, so the result of the `frame` strategy is
+# cached by grouping config and the frame data it looks at. Callers mutate the components they get
+# back, so hits are returned as copies.
+FRAME_COMPONENT_CACHE: BoundedCache[tuple[Any, ...], FrameGroupingComponent] = BoundedCache(
+    "grouping.frame_component_cache", maxsize=50_000
+)
+
+
+def _copy_frame_component(frame_component: FrameGroupingComponent) -> FrameGroupingComponent:
+    copy = frame_component.shallow_copy()
+    copy.values = [value.shallow_copy() for value in frame_component.values]
+    return copy
+
 
 def is_recursive_frames(frame1: Frame, frame2: Frame | None) -> bool:
     """
@@ -299,6 +312,26 @@ def frame(
 ) -> ReturnedVariants:
     frame = interface
     platform = frame.platform or event.platform
+    sourcemap_used = frame.data and frame.data.get("sourcemap") is not None
+
+    cache_key = None
+    if context.config.id is not None:
+        cache_key = (
+            context.config.id,
+            platform,
+            frame.abs_path,
+            frame.filename,
+            frame.module,
+            frame.function,
+            frame.raw_function,
+            frame.context_line,
+            frame.in_app,
+            bool(sourcemap_used),
+            context["is_recursion"],
+        )
+        cached_component = FRAME_COMPONENT_CACHE.get(cache_key)
+        if cached_component is not None:
+            return {context["variant"]: _copy_frame_component(cached_component)}
 
     # Safari throws [native code] frames in for calls like ``forEach``
     # whereas Chrome ignores these. Let's remove it from the hashing algo
@@ -331,7 +364,7 @@ def frame(
         function=frame.function,
         raw_function=frame.raw_function,
         platform=platform,
-        sourcemap_used=frame.data and frame.data.get("sourcemap") is not None,
+        sourcemap_used=sourcemap_used,
         context_line_available=context_line_available,
     )
 
@@ -376,6 +409,9 @@ def frame(
     if context["is_recursion"]:
         frame_component.update(contributes=False, hint="ignored due to recursion")
 
+    if cache_key is not None:
+        FRAME_COMPONENT_CACHE.set(cache_key, _copy_frame_component(frame_component))
+
     return {context["variant"]: frame_component}
 
 
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import re
-from collections.abc import Iterable, Mapping
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable, Mapping
 from hashlib import md5
 from re import Match
 from typing import TYPE_CHECKING, Any, Literal
@@ -11,6 +13,7 @@ from django.utils.encoding import force_bytes
 
 from sentry.db.models.fields.node import NodeData
 from sentry.stacktraces.processing import get_crash_frame_from_event_data
+from sentry.utils import metrics
 from sentry.utils.safe import get_path
 
 if TYPE_CHECKING:
@@ -49,6 +52,60 @@ def hash_from_values(values: Iterable[str | int | UUID | ExceptionGroupingCompon
     return result.hexdigest()
 
 
+class BoundedCache[K: Hashable, V]:
+    """
+    A thread-safe LRU cache used to memoize grouping results across events.
+
+    Keys have to contain everything the cached result depends on, including the version of the
+    grouping config that produced it. Hits and misses are counted locally and emitted as the
+    `<name>.lookups` metric every `metrics_interval` lookups, to keep the metrics overhead off the
+    per-frame path.
+    """
+
+    def __init__(self, name: str, maxsize: int, metrics_interval: int = 1000):
+        self.name = name
+        self.maxsize = maxsize
+        self.metrics_interval = metrics_interval
+        self._data: OrderedDict[K, V] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self._misses += 1
+            else:
+                self._data.move_to_end(key)
+                self._hits += 1
+
+            if self._hits + self._misses < self.metrics_interval:
+                return value
+
+            hits, misses = self._hits, self._misses
+            self._hits = self._misses = 0
+
+        metrics.incr(f"{self.name}.lookups", amount=hits, tags={"result": "hit"})
+        metrics.incr(f"{self.name}.lookups", amount=misses, tags={"result": "miss"})
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._hits = self._misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
 def get_fingerprint_type(
     fingerprint: list[str] | None,
 ) -> Literal["default", "hybrid", "custom"] | None:
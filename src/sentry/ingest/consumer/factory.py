@@ -6,6 +6,7 @@ from typing import NamedTuple, TypeVar
 
 from arroyo.backends.kafka.consumer import KafkaPayload
 from arroyo.processing.strategies import (
+    BatchStep,
     CommitOffsets,
     FilterStep,
     ProcessingStrategy,
@@ -19,7 +20,11 @@ from sentry.processing.backpressure.arroyo import HealthChecker, create_backpres
 from sentry.utils.arroyo import MultiprocessingPool, run_task_with_multiprocessing
 
 from .attachment_event import decode_and_process_chunks, process_attachments_and_events
-from .simple_event import process_simple_event_message
+from .simple_event import (
+    decode_simple_event_message,
+    process_simple_event_batch,
+    process_simple_event_message,
+)
 
 
 class MultiProcessConfig(NamedTuple):
@@ -69,11 +74,17 @@ class IngestStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
         max_batch_time: int,
         input_block_size: int | None,
         output_block_size: int | None,
+        batched_processing: bool = False,
     ):
         self.consumer_type = consumer_type
         self.is_attachment_topic = consumer_type == ConsumerType.Attachments
         self.reprocess_only_stuck_events = reprocess_only_stuck_events
         self.stop_at_timestamp = stop_at_timestamp
+        self.max_batch_size = max_batch_size
+        self.max_batch_time = max_batch_time
+        # Not supported on the attachments topic, whose messages have to be
+        # processed in order across the two steps below.
+        self.batched_processing = batched_processing and not self.is_attachment_topic
 
         self.multi_process = None
         self._pool = MultiprocessingPool(num_processes)
@@ -100,6 +111,31 @@ class IngestStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
 
         final_step = CommitOffsets(commit)
 
+        if self.batched_processing:
+            # Messages are decoded and parsed one by one (possibly in multiple
+            # processes) so that malformed ones can still be DLQed. The
+            # resulting batches share a single dedupe lookup and processing
+            # store write.
+            batch_processor = RunTask(
+                function=partial(
+                    process_simple_event_batch,
+                    consumer_type=self.consumer_type,
+                    reprocess_only_stuck_events=self.reprocess_only_stuck_events,
+                ),
+                next_step=final_step,
+            )
+            batch_step = BatchStep(
+                max_batch_size=self.max_batch_size,
+                max_batch_time=self.max_batch_time,
+                next_step=batch_processor,
+            )
+            filter_step = FilterStep(
+                function=lambda msg: msg.payload is not None, next_step=batch_step
+            )
+            decode_function = partial(decode_simple_event_message, consumer_type=self.consumer_type)
+            next_step = maybe_multiprocess_step(mp, decode_function, filter_step, self._pool)
+            return create_backpressure_step(health_checker=self.health_checker, next_step=next_step)
+
         if not self.is_attachment_topic:
             event_function = partial(
                 process_simple_event_message,
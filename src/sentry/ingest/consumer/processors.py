@@ -1,8 +1,8 @@
 import functools
 import logging
 import os
-from collections.abc import Mapping, MutableMapping
-from typing import Any
+from collections.abc import Mapping, MutableMapping, Sequence
+from typing import Any, NamedTuple
 
 import orjson
 import sentry_sdk
@@ -14,10 +14,11 @@ from sentry import eventstore, features
 from sentry.attachments import CachedAttachment, attachment_cache
 from sentry.event_manager import EventManager, save_attachment
 from sentry.eventstore.processing import event_processing_store, transaction_processing_store
+from sentry.eventstore.processing.base import EventProcessingStore
 from sentry.feedback.usecases.create_feedback import FeedbackCreationSource, is_in_feedback_denylist
 from sentry.ingest.types import ConsumerType
 from sentry.ingest.userreport import Conflict, save_userreport
-from sentry.killswitches import killswitch_matches_context
+from sentry.killswitches import KillswitchMatcher, killswitch_matches_context
 from sentry.models.organization import Organization
 from sentry.models.project import Project
 from sentry.signals import event_accepted
@@ -163,12 +164,7 @@ def process_event(
     with sentry_sdk.start_span(op="orjson.loads"):
         data = orjson.loads(payload)
 
-    # We also need to check "type" as transactions are also sent to ingest-attachments
-    # along with other event types if they have attachments.
-    if consumer_type == ConsumerType.Transactions or data.get("type") == "transaction":
-        processing_store = transaction_processing_store
-    else:
-        processing_store = event_processing_store
+    processing_store = get_processing_store(consumer_type, data)
 
     sentry_sdk.set_extra("event_type", data.get("type"))
 
@@ -213,71 +209,16 @@ def process_event(
 
             save_attachments(attachments, cache_key)
 
-        try:
-            # Records rc-processing usage broken down by
-            # event type.
-            event_type = data.get("type")
-            if event_type == "error":
-                app_feature = "errors"
-            elif event_type == "transaction":
-                app_feature = "transactions"
-            else:
-                app_feature = None
-
-            if app_feature is not None:
-                record(settings.EVENT_PROCESSING_STORE, app_feature, len(payload), UsageUnit.BYTES)
-        except Exception:
-            pass
-
-        project.set_cached_field_value(
-            "organization", Organization.objects.get_from_cache(id=project.organization_id)
+        dispatch_event(
+            data,
+            payload,
+            project,
+            event_id,
+            cache_key,
+            attachments,
+            start_time,
+            no_celery_mode,
         )
-        if data.get("type") == "transaction":
-            if no_celery_mode:
-                with sentry_sdk.start_span(op="ingest_consumer.process_transaction_no_celery"):
-                    sentry_sdk.set_tag("no_celery_mode", True)
-
-                    process_transaction_no_celery(data, project_id, attachments, start_time)
-            else:
-                assert cache_key is not None
-                # No need for preprocess/process for transactions thus submit
-                # directly transaction specific save_event task.
-                save_event_transaction.delay(
-                    cache_key=cache_key,
-                    data=None,
-                    start_time=start_time,
-                    event_id=event_id,
-                    project_id=project_id,
-                )
-
-            try:
-                collect_span_metrics(project, data)
-            except Exception:
-                pass
-        elif data.get("type") == "feedback":
-            if not is_in_feedback_denylist(project.organization):
-                save_event_feedback.delay(
-                    cache_key=None,  # no need to cache as volume is low
-                    data=data,
-                    start_time=start_time,
-                    event_id=event_id,
-                    project_id=project_id,
-                )
-            else:
-                metrics.incr("feedback.ingest.filtered", tags={"reason": "org.denylist"})
-        else:
-            # Preprocess this event, which spawns either process_event or
-            # save_event. Pass data explicitly to avoid fetching it again from the
-            # cache.
-            with sentry_sdk.start_span(op="ingest_consumer.process_event.preprocess_event"):
-                preprocess_event(
-                    cache_key=cache_key,
-                    data=data,
-                    start_time=start_time,
-                    event_id=event_id,
-                    project=project,
-                    has_attachments=bool(attachments),
-                )
 
         # remember for an 1 hour that we saved this event (deduplication protection)
         with sentry_sdk.start_span(op="cache.set"):
@@ -294,6 +235,222 @@ def process_event(
         raise Retriable(exc)
 
 
+class ParsedEvent(NamedTuple):
+    message: IngestMessage
+    project: Project
+    data: MutableMapping[str, Any]
+
+
+@trace_func(name="ingest_consumer.process_event_batch")
+@metrics.wraps("ingest_consumer.process_event_batch")
+def process_event_batch(
+    consumer_type: str,
+    events: Sequence[ParsedEvent],
+    reprocess_only_stuck_events: bool = False,
+) -> None:
+    """
+    Batched variant of `process_event` for events that were already decoded,
+    parsed and checked against the unparsed pipeline killswitch.
+
+    Deduplication is a single `get_many`, the parsed pipeline killswitch is
+    normalized once for the whole batch, and events are written to their
+    processing store with one `store_many` per store.
+    """
+    sentry_sdk.set_extra("batch_size", len(events))
+
+    deduplication_keys = [
+        f"ev:{int(event.message['project_id'])}:{event.message['event_id']}" for event in events
+    ]
+
+    with sentry_sdk.start_span(op="deduplication_check"):
+        try:
+            cached_values = cache.get_many(deduplication_keys)
+        except Exception as exc:
+            raise Retriable(exc)
+
+    killswitch = KillswitchMatcher("store.load-shed-parsed-pipeline-projects")
+    accepted: list[tuple[str, ParsedEvent]] = []
+    seen: set[str] = set()
+
+    for deduplication_key, event in zip(deduplication_keys, events):
+        # The same event can show up twice within one batch, which the
+        # per-message path would have caught through the cache.
+        if deduplication_key in cached_values or deduplication_key in seen:
+            logger.warning(
+                "pre-process-forwarder detected a duplicated event" " with id:%s for project:%s.",
+                event.message["event_id"],
+                event.project.id,
+            )
+            continue
+        seen.add(deduplication_key)
+
+        if killswitch.matches(
+            {
+                "organization_id": event.project.organization_id,
+                "project_id": event.project.id,
+                "event_type": event.data.get("type") or "null",
+                "has_attachments": bool(event.message.get("attachments")),
+                "event_id": event.message["event_id"],
+            }
+        ):
+            continue
+
+        accepted.append((deduplication_key, event))
+
+    killswitch.emit_metrics()
+
+    # Everything below talks to the network, a failure retries the whole batch.
+    # Events that were already handed off are remembered in the deduplication
+    # cache first so the retry skips them.
+    dispatched: list[str] = []
+    try:
+        try:
+            by_store: dict[EventProcessingStore, list[tuple[str, ParsedEvent]]] = {}
+            for deduplication_key, event in accepted:
+                processing_store = get_processing_store(consumer_type, event.data)
+
+                if reprocess_only_stuck_events:
+                    with sentry_sdk.start_span(op="event_processing_store.exists"):
+                        if not processing_store.exists(event.data):
+                            continue
+
+                by_store.setdefault(processing_store, []).append((deduplication_key, event))
+
+            for processing_store, store_batch in by_store.items():
+                with metrics.timer("ingest_consumer._store_event_batch"):
+                    cache_keys = processing_store.store_many(
+                        [event.data for _, event in store_batch]
+                    )
+
+                for cache_key, (deduplication_key, event) in zip(cache_keys, store_batch):
+                    attachments = event.message.get("attachments") or ()
+                    save_attachments(attachments, cache_key)
+
+                    dispatch_event(
+                        event.data,
+                        event.message["payload"],
+                        event.project,
+                        event.message["event_id"],
+                        cache_key,
+                        attachments,
+                        float(event.message["start_time"]),
+                    )
+                    dispatched.append(deduplication_key)
+
+                    with sentry_sdk.start_span(op="event_accepted.send_robust"):
+                        event_accepted.send_robust(
+                            ip=event.message.get("remote_addr"),
+                            data=event.data,
+                            project=event.project,
+                            sender=process_event,
+                        )
+        finally:
+            if dispatched:
+                # remember for an 1 hour that we saved these events (deduplication protection)
+                with sentry_sdk.start_span(op="cache.set_many"):
+                    cache.set_many(dict.fromkeys(dispatched, ""), CACHE_TIMEOUT)
+    except Exception as exc:
+        raise Retriable(exc)
+
+    metrics.distribution(
+        "ingest_consumer.process_event_batch.dispatched",
+        len(dispatched),
+        tags={"consumer": consumer_type},
+    )
+
+
+def get_processing_store(consumer_type: str, data: Mapping[str, Any]) -> EventProcessingStore:
+    # We also need to check "type" as transactions are also sent to ingest-attachments
+    # along with other event types if they have attachments.
+    if consumer_type == ConsumerType.Transactions or data.get("type") == "transaction":
+        return transaction_processing_store
+    else:
+        return event_processing_store
+
+
+def dispatch_event(
+    data: MutableMapping[str, Any],
+    payload: str | bytes,
+    project: Project,
+    event_id: str,
+    cache_key: str | None,
+    attachments: Any,
+    start_time: float,
+    no_celery_mode: bool = False,
+) -> None:
+    """
+    Hand an event that already went through the processing store off to the
+    task (or in-consumer save) responsible for its event type.
+    """
+    project_id = project.id
+
+    try:
+        # Records rc-processing usage broken down by
+        # event type.
+        event_type = data.get("type")
+        if event_type == "error":
+            app_feature = "errors"
+        elif event_type == "transaction":
+            app_feature = "transactions"
+        else:
+            app_feature = None
+
+        if app_feature is not None:
+            record(settings.EVENT_PROCESSING_STORE, app_feature, len(payload), UsageUnit.BYTES)
+    except Exception:
+        pass
+
+    project.set_cached_field_value(
+        "organization", Organization.objects.get_from_cache(id=project.organization_id)
+    )
+    if data.get("type") == "transaction":
+        if no_celery_mode:
+            with sentry_sdk.start_span(op="ingest_consumer.process_transaction_no_celery"):
+                sentry_sdk.set_tag("no_celery_mode", True)
+
+                process_transaction_no_celery(data, project_id, attachments, start_time)
+        else:
+            assert cache_key is not None
+            # No need for preprocess/process for transactions thus submit
+            # directly transaction specific save_event task.
+            save_event_transaction.delay(
+                cache_key=cache_key,
+                data=None,
+                start_time=start_time,
+                event_id=event_id,
+                project_id=project_id,
+            )
+
+        try:
+            collect_span_metrics(project, data)
+        except Exception:
+            pass
+    elif data.get("type") == "feedback":
+        if not is_in_feedback_denylist(project.organization):
+            save_event_feedback.delay(
+                cache_key=None,  # no need to cache as volume is low
+                data=data,
+                start_time=start_time,
+                event_id=event_id,
+                project_id=project_id,
+            )
+        else:
+            metrics.incr("feedback.ingest.filtered", tags={"reason": "org.denylist"})
+    else:
+        # Preprocess this event, which spawns either process_event or
+        # save_event. Pass data explicitly to avoid fetching it again from the
+        # cache.
+        with sentry_sdk.start_span(op="ingest_consumer.process_event.preprocess_event"):
+            preprocess_event(
+                cache_key=cache_key,
+                data=data,
+                start_time=start_time,
+                event_id=event_id,
+                project=project,
+                has_attachments=bool(attachments),
+            )
+
+
 def save_attachments(attachments: Any, cache_key: str) -> None:
     if attachments:
         with sentry_sdk.start_span(op="ingest_consumer.set_attachment_cache"):
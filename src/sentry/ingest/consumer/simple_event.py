@@ -1,14 +1,24 @@
 import logging
 
 import msgpack
+import orjson
 from arroyo.backends.kafka.consumer import KafkaPayload
 from arroyo.dlq import InvalidMessage
+from arroyo.processing.strategies.batching import ValuesBatch
 from arroyo.types import BrokerValue, Message
 
+from sentry.killswitches import killswitch_matches_context
 from sentry.models.project import Project
 from sentry.utils import metrics
+from sentry.utils.cache import cache_key_for_event
 
-from .processors import IngestMessage, Retriable, process_event
+from .processors import (
+    IngestMessage,
+    ParsedEvent,
+    Retriable,
+    process_event,
+    process_event_batch,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -74,3 +84,79 @@ def process_simple_event_message(
         raw_value = raw_message.value
         assert isinstance(raw_value, BrokerValue)
         raise InvalidMessage(raw_value.partition, raw_value.offset) from exc
+
+
+def decode_simple_event_message(
+    raw_message: Message[KafkaPayload],
+    consumer_type: str,
+) -> ParsedEvent | None:
+    """
+    Decodes and parses a single Kafka Message containing a "simple" Event
+    payload so it can be processed as part of a batch.
+
+    Everything that can make a single message invalid happens here, so that
+    malformed messages are still sent to the DLQ one by one. Returns `None`
+    for messages that should be dropped.
+    """
+
+    raw_payload = raw_message.payload.value
+    metrics.distribution(
+        "ingest_consumer.payload_size",
+        len(raw_payload),
+        tags={"consumer": consumer_type},
+        unit="byte",
+    )
+
+    try:
+        message: IngestMessage = msgpack.unpackb(raw_payload, use_list=False)
+
+        message_type = message["type"]
+        project_id = message["project_id"]
+
+        if message_type != "event":
+            raise ValueError(f"Unsupported message type: {message_type}")
+
+        try:
+            with metrics.timer("ingest_consumer.fetch_project"):
+                project = Project.objects.get_from_cache(id=project_id)
+        except Project.DoesNotExist:
+            return None
+
+        if killswitch_matches_context(
+            "store.load-shed-pipeline-projects",
+            {
+                "project_id": project_id,
+                "event_id": message["event_id"],
+                "has_attachments": bool(message.get("attachments")),
+            },
+        ):
+            return None
+
+        data = orjson.loads(message["payload"])
+
+        # These lookups fail for malformed events. Doing them here keeps such an
+        # event from failing (and retrying) every other event in its batch.
+        float(message["start_time"])
+        cache_key_for_event(data)
+
+        return ParsedEvent(message, project, data)
+
+    except Exception as exc:
+        raw_value = raw_message.value
+        assert isinstance(raw_value, BrokerValue)
+        raise InvalidMessage(raw_value.partition, raw_value.offset) from exc
+
+
+def process_simple_event_batch(
+    message: Message[ValuesBatch[ParsedEvent]],
+    consumer_type: str,
+    reprocess_only_stuck_events: bool,
+) -> None:
+    """
+    Processes a batch of messages decoded by `decode_simple_event_message`.
+
+    Any failure here is retriable and retries the whole batch.
+    """
+    events = [value.payload for value in message.payload]
+    if events:
+        process_event_batch(consumer_type, events, reprocess_only_stuck_events)
@@ -265,6 +265,59 @@ def killswitch_matches_context(killswitch_name: str, context: Context, emit_metr
     return rv
 
 
+class KillswitchMatcher:
+    """
+    Evaluates a single killswitch against many contexts.
+
+    The option is read and normalized once when the matcher is created, so
+    callers that check a whole batch of messages should create one matcher per
+    batch instead of calling `killswitch_matches_context` per message.
+    Decisions are counted locally and emitted with `emit_metrics`.
+    """
+
+    def __init__(self, killswitch_name: str):
+        assert killswitch_name in ALL_KILLSWITCH_OPTIONS
+        self.killswitch_name = killswitch_name
+        self.fields = frozenset(ALL_KILLSWITCH_OPTIONS[killswitch_name].fields)
+        self.conditions = [
+            tuple((field, value) for field, value in condition.items() if value is not None)
+            for condition in normalize_value(killswitch_name, options.get(killswitch_name))
+        ]
+        self.matched = 0
+        self.passed = 0
+
+    def matches(self, context: Context) -> bool:
+        assert self.fields == set(context)
+
+        rv = False
+        for condition in self.conditions:
+            for field, matching_value in condition:
+                value = context[field]
+                if value is None or str(value) != matching_value:
+                    break
+            else:
+                rv = True
+                break
+
+        if rv:
+            self.matched += 1
+        else:
+            self.passed += 1
+
+        return rv
+
+    def emit_metrics(self) -> None:
+        for decision, amount in (("matched", self.matched), ("passed", self.passed)):
+            if amount:
+                metrics.incr(
+                    "killswitches.run",
+                    amount=amount,
+                    tags={"killswitch_name": self.killswitch_name, "decision": decision},
+                )
+
+        self.matched = self.passed = 0
+
+
 def _value_matches(
     killswitch_name: str, raw_option_value: LegacyKillswitchConfig, context: Context
 ) -> bool:
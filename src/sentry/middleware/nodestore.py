@@ -0,0 +1,16 @@
+from collections.abc import Callable
+
+from django.http.request import HttpRequest
+from django.http.response import HttpResponseBase
+
+from sentry import nodestore
+
+
+def NodestoreRequestCacheMiddleware(
+    get_response: Callable[[HttpRequest], HttpResponseBase]
+) -> Callable[[HttpRequest], HttpResponseBase]:
+    def NodestoreRequestCacheMiddleware_impl(request: HttpRequest) -> HttpResponseBase:
+        with nodestore.backend.request_cache():
+            return get_response(request)
+
+    return NodestoreRequestCacheMiddleware_impl
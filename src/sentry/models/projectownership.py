@@ -19,6 +19,7 @@ from sentry.models.activity import Activity
 from sentry.models.group import Group
 from sentry.models.groupowner import OwnerRuleType
 from sentry.ownership.grammar import Matcher, Rule, load_schema, resolve_actors
+from sentry.ownership.index import get_ownership_index
 from sentry.types.activity import ActivityType
 from sentry.types.actor import Actor
 from sentry.utils import metrics
@@ -384,6 +385,15 @@ class ProjectOwnership(Model):
             tags={"ownership_type": ownership_type},
         )
 
+        if options.get("ownership.compiled-index.enabled"):
+            index = get_ownership_index(ownership.schema)
+            metrics.distribution(
+                key="projectownership.matching_ownership_rules.rules",
+                value=len(index.rules),
+                tags={"ownership_type": ownership_type},
+            )
+            return index.matching_rules(data, munged_data)
+
         rules = load_schema(ownership.schema)
         metrics.distribution(
             key="projectownership.matching_ownership_rules.rules",
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import uuid
 from collections.abc import Sequence
 from enum import Enum, IntEnum
 from typing import Any, ClassVar, Self
 
 from django.conf import settings
 from django.db import models
+from django.db.models.signals import post_save
 from django.utils import timezone
 
 from sentry.backup.scopes import RelocationScope
@@ -96,6 +98,20 @@ class Rule(Model):
             cache.set(cache_key, rules_list, 60)
         return rules_list
 
+    @classmethod
+    def get_rules_version(cls, project_id: int) -> str:
+        """
+        Returns a token that changes whenever any rule of the project is
+        changed, for caches of data derived from `get_for_project`.
+        """
+        cache_key = f"project:{project_id}:rules:version"
+        version = cache.get(cache_key)
+        if version is None:
+            version = uuid.uuid4().hex
+            if not cache.add(cache_key, version, 3600):
+                version = cache.get(cache_key, version)
+        return version
+
     @property
     def created_by_id(self):
         try:
@@ -134,8 +150,9 @@ class Rule(Model):
         return rv
 
     def _clear_project_rule_cache(self) -> None:
-        cache_key = f"project:{self.project_id}:rules"
-        cache.delete(cache_key)
+        cache.delete_many(
+            [f"project:{self.project_id}:rules", f"project:{self.project_id}:rules:version"]
+        )
 
     def get_audit_log_data(self):
         return {
@@ -162,6 +179,20 @@ class Rule(Model):
         return None
 
 
+def _clear_project_rule_cache_on_update(instance: Rule, created: bool, **kwargs: Any) -> None:
+    # `Model.update` does not go through `save`, but still sends `post_save`.
+    if not created:
+        instance._clear_project_rule_cache()
+
+
+post_save.connect(
+    _clear_project_rule_cache_on_update,
+    sender=Rule,
+    dispatch_uid="clear_project_rule_cache_on_update",
+    weak=False,
+)
+
+
 class RuleActivityType(Enum):
     CREATED = 1
     DELETED = 2
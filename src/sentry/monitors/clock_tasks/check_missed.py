@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Sequence
 from datetime import datetime
 
+from arroyo.backends.abstract import ProducerFuture
 from arroyo.backends.kafka import KafkaPayload
 from django.db.models import Q
 from sentry_kafka_schemas.schema_types.monitors_clock_tasks_v1 import MarkMissing
@@ -13,17 +15,16 @@ from sentry.monitors.models import CheckInStatus, MonitorCheckIn, MonitorEnviron
 from sentry.monitors.schedule import get_prev_schedule
 from sentry.utils import metrics
 
-from .producer import MONITORS_CLOCK_TASKS_CODEC, produce_task
+from .producer import (
+    MONITORS_CLOCK_TASKS_CODEC,
+    iter_scan_pages,
+    produce_task,
+    wait_for_tasks,
+)
 
 logger = logging.getLogger(__name__)
 
 
-# This is the MAXIMUM number of MONITOR this job will check.
-#
-# NOTE: We should keep an eye on this as we have more and more usage of
-# monitors the larger the number of checkins to check will exist.
-MONITOR_LIMIT = 10_000
-
 # re-use the monitor exclusion query node across dispatch_check_missing and
 # mark_environment_missing.
 IGNORE_MONITORS = ~Q(
@@ -48,38 +49,45 @@ def dispatch_check_missing(ts: datetime):
     should have
 
     This will dispatch MarkMissing messages into monitors-clock-tasks.
+
+    Monitor environments are scanned in keyset paginated pages, see
+    `iter_scan_pages`. The tasks of each page are produced together and
+    flushed before the next page is fetched.
     """
-    missed_envs = list(
-        MonitorEnvironment.objects.filter(
-            IGNORE_MONITORS,
-            next_checkin_latest__lte=ts,
-        ).values(
-            "id"
-        )[:MONITOR_LIMIT]
-    )
+    missed_envs = MonitorEnvironment.objects.filter(
+        IGNORE_MONITORS,
+        next_checkin_latest__lte=ts,
+    ).values("id", "next_checkin_latest")
+
+    count = 0
+
+    for page in iter_scan_pages(missed_envs, "next_checkin_latest"):
+        count += len(page)
+        wait_for_tasks([_produce_mark_missing(env["id"], ts) for env in page])
 
     metrics.gauge(
         "sentry.monitors.tasks.check_missing.count",
-        len(missed_envs),
+        count,
         sample_rate=1.0,
     )
 
-    for monitor_environment in missed_envs:
-        message: MarkMissing = {
-            "type": "mark_missing",
-            "ts": ts.timestamp(),
-            "monitor_environment_id": monitor_environment["id"],
-        }
-        # XXX(epurkhiser): Partitioning by monitor_environment.id is important
-        # here as these task messages will be consumed in a multi-consumer
-        # setup. If we backlogged clock-ticks we may produce multiple missed
-        # tasks for the same monitor_environment. These MUST happen in-order.
-        payload = KafkaPayload(
-            str(monitor_environment["id"]).encode(),
-            MONITORS_CLOCK_TASKS_CODEC.encode(message),
-            [],
-        )
-        produce_task(payload)
+
+def _produce_mark_missing(monitor_environment_id: int, ts: datetime) -> ProducerFuture:
+    message: MarkMissing = {
+        "type": "mark_missing",
+        "ts": ts.timestamp(),
+        "monitor_environment_id": monitor_environment_id,
+    }
+    # XXX(epurkhiser): Partitioning by monitor_environment.id is important
+    # here as these task messages will be consumed in a multi-consumer
+    # setup. If we backlogged clock-ticks we may produce multiple missed
+    # tasks for the same monitor_environment. These MUST happen in-order.
+    payload = KafkaPayload(
+        str(monitor_environment_id).encode(),
+        MONITORS_CLOCK_TASKS_CODEC.encode(message),
+        [],
+    )
+    return produce_task(payload)
 
 
 def mark_environment_missing(monitor_environment_id: int, ts: datetime):
@@ -101,6 +109,67 @@ def mark_environment_missing(monitor_environment_id: int, ts: datetime):
         # (or the environment was deleted)
         return
 
+    checkin = _build_missed_checkin(monitor_environment, ts)
+    checkin.save()
+    _mark_missing(monitor_environment, checkin, ts)
+
+
+def mark_environments_missing(monitor_environment_ids: Sequence[int], ts: datetime) -> None:
+    """
+    Bulk variant of `mark_environment_missing`. The missed check-ins of all
+    monitor environments are created with a single insert, should that fail
+    each environment is marked individually instead.
+
+    Environments are then marked as failed one by one, outside of any shared
+    transaction. Marking an environment as failed produces issue occurrences
+    and sends signals, which cannot be rolled back.
+    """
+    logger.info(
+        "mark_missing_bulk",
+        extra={"monitor_environment_ids": list(monitor_environment_ids)},
+    )
+
+    monitor_environments = list(
+        MonitorEnvironment.objects.select_related("monitor").filter(
+            IGNORE_MONITORS,
+            id__in=monitor_environment_ids,
+            # See the note in mark_environment_missing
+            next_checkin_latest__lte=ts,
+        )
+    )
+    if not monitor_environments:
+        return
+
+    try:
+        checkins = MonitorCheckIn.objects.bulk_create(
+            [_build_missed_checkin(env, ts) for env in monitor_environments]
+        )
+    except Exception:
+        logger.exception("mark_missing_bulk_failed")
+        for monitor_environment in monitor_environments:
+            try:
+                mark_environment_missing(monitor_environment.id, ts)
+            except Exception:
+                logger.exception("mark_missing_failed")
+        return
+
+    metrics.distribution("sentry.monitors.tasks.mark_missing.bulk_size", len(checkins))
+
+    for monitor_environment, checkin in zip(monitor_environments, checkins):
+        try:
+            _mark_missing(monitor_environment, checkin, ts)
+        except Exception:
+            logger.exception(
+                "mark_missing_failed",
+                extra={"monitor_environment_id": monitor_environment.id},
+            )
+
+
+def _build_missed_checkin(monitor_environment: MonitorEnvironment, ts: datetime) -> MonitorCheckIn:
+    """
+    Build the (unsaved) missed check-in for a monitor environment that was
+    detected as missed at the given clock tick.
+    """
     monitor = monitor_environment.monitor
     # next_checkin must be set, since detecting this monitor as missed means
     # there must have been an initial user check-in.
@@ -112,9 +181,9 @@ def mark_environment_missing(monitor_environment_id: int, ts: datetime):
     # XXX(epurkhiser): The date_added is backdated so that this missed
     # check-in correctly reflects the time of when the checkin SHOULD
     # have happened. It is the same as the expected_time.
-    checkin = MonitorCheckIn.objects.create(
-        project_id=monitor_environment.monitor.project_id,
-        monitor=monitor_environment.monitor,
+    return MonitorCheckIn(
+        project_id=monitor.project_id,
+        monitor=monitor,
         monitor_environment=monitor_environment,
         status=CheckInStatus.MISSED,
         date_added=expected_time,
@@ -123,6 +192,15 @@ def mark_environment_missing(monitor_environment_id: int, ts: datetime):
         monitor_config=monitor.get_validated_config(),
     )
 
+
+def _mark_missing(
+    monitor_environment: MonitorEnvironment,
+    checkin: MonitorCheckIn,
+    ts: datetime,
+) -> None:
+    monitor = monitor_environment.monitor
+    expected_time = checkin.expected_time
+
     # Compute when the check-in *should* have happened given the current
     # reference timestamp. This is different from the expected_time usage above
     # as it is computing that most recent expected check-in time using our
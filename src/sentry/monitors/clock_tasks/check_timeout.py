@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime
+from typing import Any
 
+from arroyo.backends.abstract import ProducerFuture
 from arroyo.backends.kafka import KafkaPayload
 from sentry_kafka_schemas.schema_types.monitors_clock_tasks_v1 import MarkTimeout
 
@@ -11,16 +13,15 @@ from sentry.monitors.models import CheckInStatus, MonitorCheckIn
 from sentry.monitors.schedule import get_prev_schedule
 from sentry.utils import metrics
 
-from .producer import MONITORS_CLOCK_TASKS_CODEC, produce_task
+from .producer import (
+    MONITORS_CLOCK_TASKS_CODEC,
+    iter_scan_pages,
+    produce_task,
+    wait_for_tasks,
+)
 
 logger = logging.getLogger(__name__)
 
-# This is the MAXIMUM number of pending MONITOR CHECKINS this job will check.
-#
-# NOTE: We should keep an eye on this as we have more and more usage of
-# monitors the larger the number of checkins to check will exist.
-CHECKINS_LIMIT = 10_000
-
 
 def dispatch_check_timeout(ts: datetime):
     """
@@ -28,40 +29,47 @@ def dispatch_check_timeout(ts: datetime):
     timeout_at.
 
     This will dispatch MarkTimeout messages into monitors-clock-tasks.
+
+    Check-ins are scanned in keyset paginated pages, see `iter_scan_pages`.
+    The tasks of each page are produced together and flushed before the next
+    page is fetched.
     """
-    timed_out_checkins = list(
-        MonitorCheckIn.objects.filter(
-            status=CheckInStatus.IN_PROGRESS,
-            timeout_at__lte=ts,
-        ).values(
-            "id", "monitor_environment_id"
-        )[:CHECKINS_LIMIT]
-    )
+    timed_out_checkins = MonitorCheckIn.objects.filter(
+        status=CheckInStatus.IN_PROGRESS,
+        timeout_at__lte=ts,
+    ).values("id", "monitor_environment_id", "timeout_at")
+
+    count = 0
+
+    # check for any monitors which are still running and have exceeded their maximum runtime
+    for page in iter_scan_pages(timed_out_checkins, "timeout_at"):
+        count += len(page)
+        wait_for_tasks([_produce_mark_timeout(checkin, ts) for checkin in page])
 
     metrics.gauge(
         "sentry.monitors.tasks.check_timeout.count",
-        len(timed_out_checkins),
+        count,
         sample_rate=1.0,
     )
 
-    # check for any monitors which are still running and have exceeded their maximum runtime
-    for checkin in timed_out_checkins:
-        message: MarkTimeout = {
-            "type": "mark_timeout",
-            "ts": ts.timestamp(),
-            "monitor_environment_id": checkin["monitor_environment_id"],
-            "checkin_id": checkin["id"],
-        }
-        # XXX(epurkhiser): Partitioning by monitor_environment.id is important
-        # here as these task messages will be consumed in a multi-consumer
-        # setup. If we backlogged clock-ticks we may produce multiple timeout
-        # tasks for the same monitor_environment. These MUST happen in-order.
-        payload = KafkaPayload(
-            str(checkin["monitor_environment_id"]).encode(),
-            MONITORS_CLOCK_TASKS_CODEC.encode(message),
-            [],
-        )
-        produce_task(payload)
+
+def _produce_mark_timeout(checkin: dict[str, Any], ts: datetime) -> ProducerFuture:
+    message: MarkTimeout = {
+        "type": "mark_timeout",
+        "ts": ts.timestamp(),
+        "monitor_environment_id": checkin["monitor_environment_id"],
+        "checkin_id": checkin["id"],
+    }
+    # XXX(epurkhiser): Partitioning by monitor_environment.id is important
+    # here as these task messages will be consumed in a multi-consumer
+    # setup. If we backlogged clock-ticks we may produce multiple timeout
+    # tasks for the same monitor_environment. These MUST happen in-order.
+    payload = KafkaPayload(
+        str(checkin["monitor_environment_id"]).encode(),
+        MONITORS_CLOCK_TASKS_CODEC.encode(message),
+        [],
+    )
+    return produce_task(payload)
 
 
 def mark_checkin_timeout(checkin_id: int, ts: datetime) -> None:
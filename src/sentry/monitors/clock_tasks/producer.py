@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator
+from typing import Any
+
 from arroyo import Topic as ArroyoTopic
+from arroyo.backends.abstract import ProducerFuture
 from arroyo.backends.kafka import KafkaPayload, KafkaProducer, build_kafka_configuration
+from django.db.models import Q, QuerySet
 from sentry_kafka_schemas.codecs import Codec
 from sentry_kafka_schemas.schema_types.monitors_clock_tasks_v1 import MonitorsClockTasks
 
+from sentry import options
 from sentry.conf.types.kafka_definition import Topic, get_topic_codec
 from sentry.utils.arroyo_producer import SingletonProducer
 from sentry.utils.kafka_config import get_kafka_producer_cluster_options, get_topic_definition
@@ -23,6 +29,50 @@ def _get_producer() -> KafkaProducer:
 _clock_task_producer = SingletonProducer(_get_producer)
 
 
-def produce_task(payload: KafkaPayload):
+def produce_task(payload: KafkaPayload) -> ProducerFuture:
     topic = get_topic_definition(Topic.MONITORS_CLOCK_TASKS)["real_topic_name"]
-    _clock_task_producer.produce(ArroyoTopic(topic), payload)
+    return _clock_task_producer.produce(ArroyoTopic(topic), payload)
+
+
+def wait_for_tasks(futures: Iterable[ProducerFuture]) -> None:
+    """
+    Blocks until every produced task has been acknowledged. Used to flush a
+    page of tasks at once instead of waiting on each task individually.
+    """
+    for future in futures:
+        future.result()
+
+
+def get_scan_page_size() -> int:
+    """
+    The number of rows fetched per keyset page when the clock tasks scan for
+    monitor environments and check-ins to dispatch tasks for.
+    """
+    return options.get("crons.clock_tasks.scan_page_size")
+
+
+def iter_scan_pages(
+    queryset: QuerySet[Any, dict[str, Any]], order_field: str
+) -> Iterator[list[dict[str, Any]]]:
+    """
+    Yields the rows of a clock task scan in pages of `get_scan_page_size`
+    rows. Pages are keyset paginated on `(order_field, id)`, so that every
+    page is bounded by the index on the column the scan filters on. The rows
+    must include `order_field` and `id`.
+    """
+    page_size = get_scan_page_size()
+    queryset = queryset.order_by(order_field, "id")
+
+    page = list(queryset[:page_size])
+    while page:
+        yield page
+        if len(page) < page_size:
+            return
+
+        last = page[-1]
+        page = list(
+            queryset.filter(
+                Q(**{f"{order_field}__gt": last[order_field]})
+                | Q(**{order_field: last[order_field], "id__gt": last["id"]})
+            )[:page_size]
+        )
@@ -3,10 +3,11 @@ from __future__ import annotations
 import logging
 from collections.abc import Mapping
 from datetime import datetime, timezone
-from typing import TypeGuard
+from typing import Literal, TypeGuard
 
 from arroyo.backends.kafka.consumer import KafkaPayload
 from arroyo.processing.strategies.abstract import ProcessingStrategy, ProcessingStrategyFactory
+from arroyo.processing.strategies.batching import BatchStep, ValuesBatch
 from arroyo.processing.strategies.commit import CommitOffsets
 from arroyo.processing.strategies.run_task import RunTask
 from arroyo.types import BrokerValue, Commit, FilteredPayload, Message, Partition
@@ -19,7 +20,10 @@ from sentry_kafka_schemas.schema_types.monitors_clock_tasks_v1 import (
 )
 
 from sentry.conf.types.kafka_definition import Topic, get_topic_codec
-from sentry.monitors.clock_tasks.check_missed import mark_environment_missing
+from sentry.monitors.clock_tasks.check_missed import (
+    mark_environment_missing,
+    mark_environments_missing,
+)
 from sentry.monitors.clock_tasks.check_timeout import mark_checkin_timeout
 from sentry.monitors.clock_tasks.mark_unknown import mark_checkin_unknown
 
@@ -40,40 +44,131 @@ def is_mark_missing(wrapper: MonitorsClockTasks) -> TypeGuard[MarkMissing]:
     return wrapper["type"] == "mark_missing"
 
 
+def run_clock_task(wrapper: MonitorsClockTasks) -> None:
+    ts = datetime.fromtimestamp(wrapper["ts"], tz=timezone.utc)
+
+    if is_mark_timeout(wrapper):
+        mark_checkin_timeout(int(wrapper["checkin_id"]), ts)
+        return
+
+    if is_mark_unknown(wrapper):
+        mark_checkin_unknown(int(wrapper["checkin_id"]), ts)
+        return
+
+    if is_mark_missing(wrapper):
+        mark_environment_missing(int(wrapper["monitor_environment_id"]), ts)
+        return
+
+    logger.error("Unsupported clock-tick task type: %s", wrapper["type"])
+
+
 def process_clock_task(message: Message[KafkaPayload | FilteredPayload]):
     assert not isinstance(message.payload, FilteredPayload)
     assert isinstance(message.value, BrokerValue)
 
     try:
         wrapper = MONITORS_CLOCK_TASKS_CODEC.decode(message.payload.value)
-        ts = datetime.fromtimestamp(wrapper["ts"], tz=timezone.utc)
+        run_clock_task(wrapper)
+    except Exception:
+        logger.exception("Failed to process clock tick task")
 
-        if is_mark_timeout(wrapper):
-            mark_checkin_timeout(int(wrapper["checkin_id"]), ts)
-            return
 
-        if is_mark_unknown(wrapper):
-            mark_checkin_unknown(int(wrapper["checkin_id"]), ts)
-            return
+def process_clock_task_batch(message: Message[ValuesBatch[KafkaPayload]]) -> None:
+    """
+    Processes a batch of clock tasks in order. Consecutive MarkMissing tasks
+    produced by the same clock tick are marked together using
+    `mark_environments_missing`.
+
+    A run of MarkMissing tasks is ended by any other task, a task for a
+    different tick, or a second task for a monitor environment already part
+    of the run, so tasks for a monitor environment still happen in-order.
+    """
+    missing_ts: datetime | None = None
+    missing_ids: list[int] = []
+
+    def flush_missing() -> None:
+        nonlocal missing_ts
+        if missing_ts is not None and missing_ids:
+            try:
+                mark_environments_missing(list(missing_ids), missing_ts)
+            except Exception:
+                logger.exception("Failed to process clock tick task")
+        missing_ts = None
+        missing_ids.clear()
+
+    for item in message.payload:
+        assert isinstance(item, BrokerValue)
+
+        try:
+            wrapper = MONITORS_CLOCK_TASKS_CODEC.decode(item.payload.value)
+        except Exception:
+            logger.exception("Failed to process clock tick task")
+            continue
 
         if is_mark_missing(wrapper):
-            mark_environment_missing(int(wrapper["monitor_environment_id"]), ts)
-            return
+            ts = datetime.fromtimestamp(wrapper["ts"], tz=timezone.utc)
+            monitor_environment_id = int(wrapper["monitor_environment_id"])
+            if ts != missing_ts or monitor_environment_id in missing_ids:
+                flush_missing()
+                missing_ts = ts
+            missing_ids.append(monitor_environment_id)
+            continue
 
-        logger.error("Unsupported clock-tick task type: %s", wrapper["type"])
-    except Exception:
-        logger.exception("Failed to process clock tick task")
+        flush_missing()
+        try:
+            run_clock_task(wrapper)
+        except Exception:
+            logger.exception("Failed to process clock tick task")
+
+    flush_missing()
 
 
 class MonitorClockTasksStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
-    def __init__(self) -> None:
-        pass
+    batched = False
+    """
+    Are clock tasks processed in batches? Allows MarkMissing tasks to be
+    marked in bulk.
+    """
+
+    max_batch_size = 500
+    """
+    How many messages will be batched at once when in batched mode.
+    """
+
+    max_batch_time = 1
+    """
+    The maximum time in seconds to accumulate a batch of clock tasks.
+    """
+
+    def __init__(
+        self,
+        mode: Literal["batched", "serial"] | None = None,
+        max_batch_size: int | None = None,
+        max_batch_time: int | None = None,
+    ) -> None:
+        if mode == "batched":
+            self.batched = True
+
+        if max_batch_size is not None:
+            self.max_batch_size = max_batch_size
+        if max_batch_time is not None:
+            self.max_batch_time = max_batch_time
 
     def create_with_partitions(
         self,
         commit: Commit,
         partitions: Mapping[Partition, int],
     ) -> ProcessingStrategy[KafkaPayload]:
+        if self.batched:
+            return BatchStep(
+                max_batch_size=self.max_batch_size,
+                max_batch_time=self.max_batch_time,
+                next_step=RunTask(
+                    function=process_clock_task_batch,
+                    next_step=CommitOffsets(commit),
+                ),
+            )
+
         # XXX(epurkihser): We're going to want to add some form of parallelism
         # here, but we'll need to be careful that we keep tasks grouped by
         # their partitions.
@@ -6,6 +6,7 @@ from collections import defaultdict
 from collections.abc import Mapping
 from concurrent.futures import ThreadPoolExecutor, wait
 from copy import deepcopy
+from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
 from functools import partial
 from typing import Any, Literal, NotRequired, TypedDict
@@ -17,7 +18,7 @@ from arroyo.processing.strategies.batching import BatchStep, ValuesBatch
 from arroyo.processing.strategies.commit import CommitOffsets
 from arroyo.processing.strategies.run_task import RunTask
 from arroyo.types import BrokerValue, Commit, FilteredPayload, Message, Partition
-from django.db import router, transaction
+from django.db import IntegrityError, router, transaction
 from sentry_kafka_schemas.codecs import Codec
 from sentry_kafka_schemas.schema_types.ingest_monitors_v1 import IngestMonitorMessage
 from sentry_sdk.tracing import Span, Transaction
@@ -27,6 +28,7 @@ from sentry.conf.types.kafka_definition import Topic, get_topic_codec
 from sentry.constants import DataCategory, ObjectStatus
 from sentry.db.postgres.transactions import in_test_hide_transaction_boundary
 from sentry.killswitches import killswitch_matches_context
+from sentry.models.environment import Environment
 from sentry.models.project import Project
 from sentry.monitors.clock_dispatch import try_monitor_clock_tick
 from sentry.monitors.constants import PermitCheckInStatus
@@ -40,6 +42,7 @@ from sentry.monitors.models import (
     MonitorEnvironmentLimitsExceeded,
     MonitorEnvironmentValidationFailed,
     MonitorLimitsExceeded,
+    MonitorStatus,
 )
 from sentry.monitors.processing_errors.errors import (
     CheckinEnvironmentMismatch,
@@ -86,19 +89,55 @@ CHECKIN_QUOTA_LIMIT = 6
 CHECKIN_QUOTA_WINDOW = 60
 
 
+@dataclass
+class _BufferedCheckIn:
+    item: CheckinItem
+    check_in: MonitorCheckIn
+    metric_kwargs: dict[str, str]
+    start_time: datetime
+
+
+@dataclass
+class CheckinGroupContext:
+    """
+    State shared by the check-ins of one check-in group (a single monitor
+    environment) when the consumer processes batches in bulk mode.
+
+    The monitor, monitor environment and existing check-in guids of every
+    group of a batch are loaded up front with a few queries for the whole
+    batch, see `load_checkin_group_contexts`.
+
+    New check-ins that neither fail nor resolve an incident are buffered
+    instead of being inserted one at a time. The monitor environment updates
+    they would each make are applied to the loaded monitor environment and
+    collapsed into a single write. Buffered check-ins are written with one
+    bulk insert by `flush_checkin_group`, which runs before any check-in of
+    the group that has to be processed directly, so check-ins are still
+    applied in order.
+    """
+
+    monitor: Monitor | None = None
+    monitor_environment: MonitorEnvironment | None = None
+    existing_guids: set[uuid.UUID] = field(default_factory=set)
+    buffered: list[_BufferedCheckIn] = field(default_factory=list)
+    environment_update: tuple[datetime, dict[str, datetime]] | None = None
+
+
 def _ensure_monitor_with_config(
     project: Project,
     monitor_slug: str,
     config: dict[str, Any] | None,
+    monitor: Monitor | None = None,
 ) -> Monitor | None:
-    try:
-        monitor = Monitor.objects.get(
-            slug=monitor_slug,
-            project_id=project.id,
-            organization_id=project.organization_id,
-        )
-    except Monitor.DoesNotExist:
-        monitor = None
+    if monitor is None:
+        try:
+            monitor = Monitor.objects.get(
+                slug=monitor_slug,
+                project_id=project.id,
+                organization_id=project.organization_id,
+            )
+        except Monitor.DoesNotExist:
+            monitor = None
 
     if not config:
         return monitor
@@ -415,7 +454,231 @@ def update_existing_check_in(
     existing_check_in.update(**updated_checkin)
 
 
-def _process_checkin(item: CheckinItem, txn: Transaction | Span) -> None:
+def _new_check_in_fields(
+    item: CheckinItem,
+    monitor: Monitor,
+    monitor_environment: MonitorEnvironment,
+    start_time: datetime,
+    status: int,
+    duration: int | None,
+    trace_id: str | None,
+) -> dict[str, Any]:
+    """
+    Computes the fields of a brand new check-in, excluding the identifying
+    project, monitor, monitor environment and guid.
+    """
+    # Infer the original start time of the check-in from the duration.
+    # Note that the clock of this worker may be off from what Relay is reporting.
+    date_added = start_time
+    if duration is not None:
+        date_added -= timedelta(milliseconds=duration)
+
+    # When was this check-in expected to have happened?
+    expected_time = monitor_environment.next_checkin
+
+    # denormalize the monitor configration into the check-in.
+    # Useful to show details about the configuration of the
+    # monitor at the time of the check-in
+    monitor_config = monitor.get_validated_config()
+    timeout_at = get_timeout_at(monitor_config, status, date_added)
+
+    # The "date_clock" is recorded as the "clock time" of when the
+    # check-in was processed. The clock time is derived from the
+    # kafka item timestamps (which are monotonic, thus why they
+    # drive our clock).
+    #
+    # XXX: They are NOT timezone aware date times, set the timezone
+    # to UTC
+    clock_time = item.ts.replace(tzinfo=UTC)
+
+    return {
+        "duration": duration,
+        "status": status,
+        "date_added": date_added,
+        "date_clock": clock_time,
+        "date_updated": start_time,
+        "expected_time": expected_time,
+        "timeout_at": timeout_at,
+        "monitor_config": monitor_config,
+        "trace_id": trace_id,
+    }
+
+
+def _record_completed_checkin(
+    item: CheckinItem,
+    metric_kwargs: dict[str, str],
+    start_time: datetime,
+) -> None:
+    # track how much time it took for the message to make it through
+    # relay into kafka. This should help us understand when missed
+    # check-ins may be slipping in, since we use the `item.ts` to click
+    # the clock forward, if that is delayed it's possible for the
+    # check-in to come in late
+    kafka_delay = item.ts - start_time.replace(tzinfo=None)
+    metrics.timing("monitors.checkin.relay_kafka_delay", kafka_delay.total_seconds())
+
+    # how long in wall-clock time did it take for us to process this
+    # check-in. This records from when the message was first appended
+    # into the Kafka topic until we just completed processing.
+    #
+    # XXX: We are ONLY recording this metric for completed check-ins.
+    delay = datetime.now() - item.ts
+    metrics.timing("monitors.checkin.completion_time", delay.total_seconds())
+
+    metrics.incr(
+        "monitors.checkin.result",
+        tags={**metric_kwargs, "status": "complete"},
+    )
+
+
+def _can_buffer_check_in(
+    group: CheckinGroupContext,
+    guid: uuid.UUID,
+    use_latest_checkin: bool,
+    status: int,
+) -> bool:
+    """
+    A check-in may only be buffered when it is guaranteed to create a new
+    check-in and when marking it as OK can not resolve an incident.
+    """
+    monitor_environment = group.monitor_environment
+    if monitor_environment is None or use_latest_checkin:
+        return False
+
+    if guid in group.existing_guids or any(b.check_in.guid == guid for b in group.buffered):
+        return False
+
+    # In-progress check-ins never resolve incidents, OK check-ins only when
+    # the environment is not already OK.
+    if status == CheckInStatus.IN_PROGRESS:
+        return True
+    return status == CheckInStatus.OK and monitor_environment.status == MonitorStatus.OK
+
+
+def _buffer_check_in(group: CheckinGroupContext, buffered: _BufferedCheckIn) -> None:
+    """
+    Buffers a new check-in and applies the monitor environment update
+    `mark_ok` would have made for it to the loaded monitor environment.
+    """
+    assert group.monitor_environment is not None
+    monitor_environment = group.monitor_environment
+    monitor = monitor_environment.monitor
+    succeeded_at = buffered.start_time
+
+    group.buffered.append(buffered)
+
+    # Mirrors the `last_checkin__gt` exclusion of `mark_ok`
+    last_checkin = monitor_environment.last_checkin
+    if last_checkin is not None and last_checkin > succeeded_at:
+        return
+
+    params = {
+        "last_checkin": buffered.check_in.date_added,
+        "next_checkin": monitor.get_next_expected_checkin(succeeded_at),
+        "next_checkin_latest": monitor.get_next_expected_checkin_latest(succeeded_at),
+    }
+    for key, value in params.items():
+        setattr(monitor_environment, key, value)
+    group.environment_update = (succeeded_at, params)
+
+
+def flush_checkin_group(group: CheckinGroupContext) -> None:
+    """
+    Writes the check-ins buffered for a check-in group with a single bulk
+    insert, followed by a single update of the monitor environment.
+    """
+    if not group.buffered:
+        return
+
+    buffered = group.buffered
+    environment_update = group.environment_update
+    group.buffered = []
+    group.environment_update = None
+
+    monitor_environment = buffered[0].check_in.monitor_environment
+    monitor = monitor_environment.monitor
+    project = Project.objects.get_from_cache(id=monitor.project_id)
+    created: list[_BufferedCheckIn] = []
+
+    try:
+        with transaction.atomic(router.db_for_write(Monitor)):
+            try:
+                with transaction.atomic(router.db_for_write(MonitorCheckIn)):
+                    MonitorCheckIn.objects.bulk_create([b.check_in for b in buffered])
+                created = buffered
+            except IntegrityError:
+                # A check-in with one of the guids was created concurrently,
+                # fall back to writing the check-ins one at a time.
+                metrics.incr("monitors.checkin.bulk_create_conflict", tags={"source": "consumer"})
+                for b in buffered:
+                    _, was_created = MonitorCheckIn.objects.get_or_create(
+                        guid=b.check_in.guid,
+                        defaults={
+                            "project_id": b.check_in.project_id,
+                            "monitor": b.check_in.monitor,
+                            "monitor_environment": b.check_in.monitor_environment,
+                            "duration": b.check_in.duration,
+                            "status": b.check_in.status,
+                            "date_added": b.check_in.date_added,
+                            "date_clock": b.check_in.date_clock,
+                            "date_updated": b.check_in.date_updated,
+                            "expected_time": b.check_in.expected_time,
+                            "timeout_at": b.check_in.timeout_at,
+                            "monitor_config": b.check_in.monitor_config,
+                            "trace_id": b.check_in.trace_id,
+                        },
+                    )
+                    if was_created:
+                        created.append(b)
+                    else:
+                        metrics.incr(
+                            "monitors.checkin.result",
+                            tags={**b.metric_kwargs, "status": "guid_conflict"},
+                        )
+
+            if environment_update is not None:
+                succeeded_at, params = environment_update
+                MonitorEnvironment.objects.filter(id=monitor_environment.id).exclude(
+                    last_checkin__gt=succeeded_at
+                ).update(**params)
+
+            if created:
+                with in_test_hide_transaction_boundary():
+                    signal_first_checkin(project, monitor)
+    except Exception:
+        metrics.incr(
+            "monitors.checkin.result",
+            tags={"source": "consumer", "status": "error"},
+            amount=len(buffered),
+        )
+        logger.exception("Failed to flush buffered check-ins")
+        return
+
+    group.existing_guids.update(b.check_in.guid for b in buffered)
+    metrics.distribution("monitors.checkin.bulk_create_size", len(created))
+
+    for b in created:
+        metrics.incr(
+            "monitors.checkin.result",
+            tags={**b.metric_kwargs, "status": "created_new_checkin"},
+        )
+        track_outcome(
+            org_id=project.organization_id,
+            project_id=project.id,
+            key_id=None,
+            outcome=Outcome.ACCEPTED,
+            reason=None,
+            timestamp=b.start_time,
+            category=DataCategory.MONITOR,
+        )
+        _record_completed_checkin(b.item, b.metric_kwargs, b.start_time)
+
+
+def _process_checkin(
+    item: CheckinItem,
+    txn: Transaction | Span,
+    group: CheckinGroupContext | None = None,
+) -> None:
     params = item.payload
 
     # XXX: The start_time is when relay recieved the original envelope store
@@ -561,6 +824,7 @@ def _process_checkin(item: CheckinItem, txn: Transaction | Span) -> None:
             project,
             monitor_slug,
             monitor_config,
+            monitor=group.monitor if group is not None else None,
         )
     except ProcessingErrorsException as e:
         ensure_config_errors = list(e.processing_errors)
@@ -621,6 +885,9 @@ def _process_checkin(item: CheckinItem, txn: Transaction | Span) -> None:
         ensure_config_errors.append(monitor_missing_error)
         raise ProcessingErrorsException(ensure_config_errors)
 
+    if group is not None:
+        group.monitor = monitor
+
     # When a monitor was accepted for upsert but is disabled we were unable to
     # assign a seat. Discard the check-in in this case.
     if (
@@ -670,9 +937,18 @@ def _process_checkin(item: CheckinItem, txn: Transaction | Span) -> None:
     # 02
     # Retrieve or upsert monitor environment for this check-in
     try:
-        monitor_environment = MonitorEnvironment.objects.ensure_environment(
-            project, monitor, environment
-        )
+        if (
+            group is not None
+            and group.monitor_environment is not None
+            and group.monitor_environment.monitor_id == monitor.id
+        ):
+            monitor_environment = group.monitor_environment
+        else:
+            monitor_environment = MonitorEnvironment.objects.ensure_environment(
+                project, monitor, environment
+            )
+            if group is not None:
+                group.monitor_environment = monitor_environment
     except MonitorEnvironmentLimitsExceeded as e:
         metrics.incr(
             "monitors.checkin.result",
@@ -734,13 +1010,34 @@ def _process_checkin(item: CheckinItem, txn: Transaction | Span) -> None:
 
     # 03
     # Create or update check-in
+    status = getattr(CheckInStatus, validated_params["status"].upper())
+    trace_id = validated_params.get("contexts", {}).get("trace", {}).get("trace_id")
+    duration = validated_params.get("duration")
+
+    if group is not None:
+        if _can_buffer_check_in(group, guid, use_latest_checkin, status):
+            txn.set_tag("outcome", "buffer_new_checkin")
+            check_in = MonitorCheckIn(
+                project_id=project_id,
+                monitor=monitor,
+                monitor_environment=monitor_environment,
+                guid=guid,
+                **_new_check_in_fields(
+                    item, monitor, monitor_environment, start_time, status, duration, trace_id
+                ),
+            )
+            _buffer_check_in(group, _BufferedCheckIn(item, check_in, metric_kwargs, start_time))
+            return
+
+        # Everything buffered so far has to be written before this check-in,
+        # which is then processed directly. It writes the monitor environment
+        # by itself, so the loaded one is stale afterwards.
+        flush_checkin_group(group)
+        group.monitor_environment = None
+        group.existing_guids.add(guid)
 
     try:
         with transaction.atomic(router.db_for_write(Monitor)):
-            status = getattr(CheckInStatus, validated_params["status"].upper())
-            trace_id = validated_params.get("contexts", {}).get("trace", {}).get("trace_id")
-            duration = validated_params.get("duration")
-
             # 03-A
             # Retrieve existing check-in for update
             try:
@@ -811,42 +1108,10 @@ def _process_checkin(item: CheckinItem, txn: Transaction | Span) -> None:
             # 03-B
             # Create a brand new check-in object
             except MonitorCheckIn.DoesNotExist:
-                # Infer the original start time of the check-in from the duration.
-                # Note that the clock of this worker may be off from what Relay is reporting.
-                date_added = start_time
-                if duration is not None:
-                    date_added -= timedelta(milliseconds=duration)
-
-                # When was this check-in expected to have happened?
-                expected_time = monitor_environment.next_checkin
-
-                # denormalize the monitor configration into the check-in.
-                # Useful to show details about the configuration of the
-                # monitor at the time of the check-in
-                monitor_config = monitor.get_validated_config()
-                timeout_at = get_timeout_at(monitor_config, status, date_added)
-
-                # The "date_clock" is recorded as the "clock time" of when the
-                # check-in was processed. The clock time is derived from the
-                # kafka item timestamps (which are monotonic, thus why they
-                # drive our clock).
-                #
-                # XXX: They are NOT timezone aware date times, set the timezone
-                # to UTC
-                clock_time = item.ts.replace(tzinfo=UTC)
-
                 check_in, created = MonitorCheckIn.objects.get_or_create(
-                    defaults={
-                        "duration": duration,
-                        "status": status,
-                        "date_added": date_added,
-                        "date_clock": clock_time,
-                        "date_updated": start_time,
-                        "expected_time": expected_time,
-                        "timeout_at": timeout_at,
-                        "monitor_config": monitor_config,
-                        "trace_id": trace_id,
-                    },
+                    defaults=_new_check_in_fields(
+                        item, monitor, monitor_environment, start_time, status, duration, trace_id
+                    ),
                     project_id=project_id,
                     monitor=monitor,
                     monitor_environment=monitor_environment,
@@ -900,26 +1165,7 @@ def _process_checkin(item: CheckinItem, txn: Transaction | Span) -> None:
             else:
                 mark_ok(check_in, succeeded_at=start_time)
 
-            # track how much time it took for the message to make it through
-            # relay into kafka. This should help us understand when missed
-            # check-ins may be slipping in, since we use the `item.ts` to click
-            # the clock forward, if that is delayed it's possible for the
-            # check-in to come in late
-            kafka_delay = item.ts - start_time.replace(tzinfo=None)
-            metrics.timing("monitors.checkin.relay_kafka_delay", kafka_delay.total_seconds())
-
-            # how long in wall-clock time did it take for us to process this
-            # check-in. This records from when the message was first appended
-            # into the Kafka topic until we just completed processing.
-            #
-            # XXX: We are ONLY recording this metric for completed check-ins.
-            delay = datetime.now() - item.ts
-            metrics.timing("monitors.checkin.completion_time", delay.total_seconds())
-
-            metrics.incr(
-                "monitors.checkin.result",
-                tags={**metric_kwargs, "status": "complete"},
-            )
+            _record_completed_checkin(item, metric_kwargs, start_time)
     except Exception as e:
         if isinstance(e, ProcessingErrorsException):
             raise
@@ -932,7 +1178,7 @@ def _process_checkin(item: CheckinItem, txn: Transaction | Span) -> None:
         logger.exception("Failed to process check-in")
 
 
-def process_checkin(item: CheckinItem) -> None:
+def process_checkin(item: CheckinItem, group: CheckinGroupContext | None = None) -> None:
     """
     Process an individual check-in
     """
@@ -943,24 +1189,117 @@ def process_checkin(item: CheckinItem) -> None:
         ) as txn:
             # Deepcopy the checkin here so that it's not modified. We need the original when we get a
             # `ProcessingErrorsException`
-            _process_checkin(deepcopy(item), txn)
+            _process_checkin(deepcopy(item), txn, group)
     except ProcessingErrorsException as e:
         handle_processing_errors(item, e)
     except Exception:
         logger.exception("Failed to process check-in")
 
 
-def process_checkin_group(items: list[CheckinItem]) -> None:
+def process_checkin_group(
+    items: list[CheckinItem],
+    group: CheckinGroupContext | None = None,
+) -> None:
     """
     Process a group of related check-ins (all part of the same monitor)
     completely serially.
+
+    When a `CheckinGroupContext` is provided new check-ins are buffered and
+    written in bulk, see `CheckinGroupContext`.
     """
     for item in items:
-        process_checkin(item)
+        process_checkin(item, group)
+
+    if group is not None:
+        flush_checkin_group(group)
+
+
+def load_checkin_group_contexts(
+    checkin_mapping: Mapping[str, list[CheckinItem]],
+) -> dict[str, CheckinGroupContext]:
+    """
+    Loads the monitors, monitor environments and already existing check-in
+    guids referenced by all check-in groups of a batch using a fixed number
+    of queries.
+
+    Monitors or environments that do not exist yet are left unset and will be
+    created while processing the first check-in of their group.
+    """
+    contexts = {key: CheckinGroupContext() for key in checkin_mapping}
+
+    group_guids: dict[str, set[uuid.UUID]] = defaultdict(set)
+    for key, items in checkin_mapping.items():
+        for item in items:
+            try:
+                guid = uuid.UUID(item.payload["check_in_id"])
+            except (KeyError, ValueError):
+                continue
+            if guid.int != 0:
+                group_guids[key].add(guid)
+
+    all_guids = set().union(*group_guids.values())
+    if all_guids:
+        existing_guids = set(
+            MonitorCheckIn.objects.filter(guid__in=all_guids).values_list("guid", flat=True)
+        )
+        for key, guids in group_guids.items():
+            contexts[key].existing_guids = guids & existing_guids
+
+    group_monitors = {
+        key: (int(items[0].message["project_id"]), items[0].valid_monitor_slug)
+        for key, items in checkin_mapping.items()
+    }
+    monitors = {
+        (monitor.project_id, monitor.slug): monitor
+        for monitor in Monitor.objects.filter(
+            project_id__in={project_id for project_id, _ in group_monitors.values()},
+            slug__in={slug for _, slug in group_monitors.values()},
+        )
+    }
+
+    group_environments: dict[str, str] = {}
+    for key, monitor_key in group_monitors.items():
+        monitor = monitors.get(monitor_key)
+        if monitor is None:
+            continue
+        contexts[key].monitor = monitor
+        group_environments[key] = checkin_mapping[key][0].payload.get("environment") or "production"
+
+    if not group_environments:
+        return contexts
+
+    environments = {
+        (environment.organization_id, environment.name): environment.id
+        for environment in Environment.objects.filter(
+            organization_id__in={monitor.organization_id for monitor in monitors.values()},
+            name__in=set(group_environments.values()),
+        )
+    }
+    monitor_environments = {
+        (monitor_environment.monitor_id, monitor_environment.environment_id): monitor_environment
+        for monitor_environment in MonitorEnvironment.objects.filter(
+            monitor_id__in={monitor.id for monitor in monitors.values()},
+            environment_id__in=set(environments.values()),
+        )
+    }
+
+    for key, environment_name in group_environments.items():
+        context = contexts[key]
+        assert context.monitor is not None
+        environment_id = environments.get((context.monitor.organization_id, environment_name))
+        monitor_environment = monitor_environments.get((context.monitor.id, environment_id))
+        if monitor_environment is None:
+            continue
+        monitor_environment.monitor = context.monitor
+        context.monitor_environment = monitor_environment
+
+    return contexts
 
 
 def process_batch(
-    executor: ThreadPoolExecutor, message: Message[ValuesBatch[KafkaPayload]]
+    executor: ThreadPoolExecutor,
+    message: Message[ValuesBatch[KafkaPayload]],
+    bulk_writes: bool = False,
 ) -> None:
     """
     Receives batches of check-in messages. This function will take the batch
@@ -1008,8 +1347,17 @@ def process_batch(
 
     # Submit check-in groups for processing
     with sentry_sdk.start_transaction(op="process_batch", name="monitors.monitor_consumer"):
+        contexts: dict[str, CheckinGroupContext] = {}
+        if bulk_writes:
+            try:
+                contexts = load_checkin_group_contexts(checkin_mapping)
+            except Exception:
+                logger.exception("Failed to load check-in group contexts")
+                contexts = {key: CheckinGroupContext() for key in checkin_mapping}
+
         futures = [
-            executor.submit(process_checkin_group, group) for group in checkin_mapping.values()
+            executor.submit(process_checkin_group, group, contexts.get(key))
+            for key, group in checkin_mapping.items()
         ]
         wait(futures)
 
@@ -1063,6 +1411,11 @@ class StoreMonitorCheckInStrategyFactory(ProcessingStrategyFactory[KafkaPayload]
     Does the consumer process unrelated check-ins in parallel?
     """
 
+    bulk_writes = False
+    """
+    Are new check-ins of a batch written in bulk? Only used in parallel mode.
+    """
+
     max_batch_size = 500
     """
     How many messages will be batched at once when in parallel mode.
@@ -1075,13 +1428,14 @@ class StoreMonitorCheckInStrategyFactory(ProcessingStrategyFactory[KafkaPayload]
 
     def __init__(
         self,
-        mode: Literal["batched-parallel", "serial"] | None = None,
+        mode: Literal["batched-parallel", "batched-bulk", "serial"] | None = None,
         max_batch_size: int | None = None,
         max_batch_time: int | None = None,
         max_workers: int | None = None,
     ) -> None:
-        if mode == "batched-parallel":
+        if mode in ("batched-parallel", "batched-bulk"):
             self.batched_parallel = True
+            self.bulk_writes = mode == "batched-bulk"
             self.parallel_executor = ThreadPoolExecutor(max_workers=max_workers)
 
         if max_batch_size is not None:
@@ -1096,7 +1450,7 @@ class StoreMonitorCheckInStrategyFactory(ProcessingStrategyFactory[KafkaPayload]
     def create_parallel_worker(self, commit: Commit) -> ProcessingStrategy[KafkaPayload]:
         assert self.parallel_executor is not None
         batch_processor = RunTask(
-            function=partial(process_batch, self.parallel_executor),
+            function=partial(process_batch, self.parallel_executor, bulk_writes=self.bulk_writes),
             next_step=CommitOffsets(commit),
         )
         return BatchStep(
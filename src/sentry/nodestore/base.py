@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from collections.abc import Mapping
+import struct
+from collections.abc import Generator, Mapping
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from threading import local
 from typing import Any
@@ -10,6 +12,8 @@ from django.core.cache import BaseCache, InvalidCacheBackendError, caches
 from django.utils.functional import cached_property
 
 from sentry import options
+from sentry.nodestore import compression
+from sentry.nodestore.request_cache import NodeRequestCache
 from sentry.utils import json, metrics
 from sentry.utils.services import Service
 
@@ -28,6 +32,68 @@ json_dumps = json.JSONEncoder(
 
 json_loads = json.loads
 
+# Blobs in the indexed format start with this magic number, followed by the
+# format version and the number of entries in the offset table. Legacy blobs
+# are newline-separated JSON and always start with `{`.
+INDEXED_MAGIC = b"\x00NSI"
+INDEXED_VERSION = 1
+_indexed_header = struct.Struct("<4sBH")
+# Each entry of the offset table is the length of the subkey (the default
+# payload uses an empty subkey), the subkey itself, and the offset and
+# length of its JSON payload relative to the start of the data section.
+_indexed_key_length = struct.Struct("<B")
+_indexed_entry = struct.Struct("<II")
+
+
+def is_indexed(value: bytes) -> bool:
+    return value.startswith(INDEXED_MAGIC)
+
+
+def encode_indexed(payloads: list[tuple[bytes, bytes]]) -> bytes:
+    """
+    Encode a list of `(subkey, json)` pairs into the indexed blob format. The
+    default payload must come first and use an empty subkey.
+    """
+    header = [_indexed_header.pack(INDEXED_MAGIC, INDEXED_VERSION, len(payloads))]
+    offset = 0
+    for key, value in payloads:
+        header.append(_indexed_key_length.pack(len(key)))
+        header.append(key)
+        header.append(_indexed_entry.pack(offset, len(value)))
+        offset += len(value)
+
+    return b"".join(header + [value for _, value in payloads])
+
+
+def decode_indexed(value: bytes, subkey: str | None) -> Any | None:
+    """
+    Decode a single subkey from a blob in the indexed format. Only the offset
+    table and the requested payload are read, the rest of the blob is never
+    copied or parsed.
+    """
+    _, version, count = _indexed_header.unpack_from(value, 0)
+    if version != INDEXED_VERSION:
+        raise ValueError(f"Unsupported nodestore blob version {version}")
+
+    _subkey = b"" if subkey is None else subkey.encode("ascii")
+    found = None
+    pos = _indexed_header.size
+    for _ in range(count):
+        (key_length,) = _indexed_key_length.unpack_from(value, pos)
+        pos += _indexed_key_length.size
+        key = value[pos : pos + key_length]
+        pos += key_length
+        if found is None and key == _subkey:
+            found = _indexed_entry.unpack_from(value, pos)
+        pos += _indexed_entry.size
+
+    if found is None:
+        return None
+
+    offset, length = found
+    start = pos + offset
+    return json_loads(value[start : start + length])
+
 
 class NodeStorage(local, Service):
     """
@@ -62,6 +128,18 @@ class NodeStorage(local, Service):
 
     This is used in reprocessing to store a snapshot of the event from multiple
     stages of the pipeline.
+
+    When the `nodestore.indexed-format.enabled` option is set, payloads are
+    written in a versioned format with a small offset table in front, which
+    allows reading a single subkey without splitting the whole blob. Blobs in
+    the legacy newline-separated format remain readable.
+
+    Payloads can additionally be compressed with zstd (optionally using
+    trained per-platform dictionaries) before they are handed to the backend,
+    see `sentry.nodestore.compression`.
+
+    Reads can be deduplicated for the duration of a request or task with
+    `request_cache`, see `NodeRequestCache`.
     """
 
     __all__ = (
@@ -78,6 +156,46 @@ class NodeStorage(local, Service):
         "bootstrap",
     )
 
+    _request_cache: NodeRequestCache | None = None
+
+    @contextmanager
+    def request_cache(self) -> Generator[None]:
+        """
+        Cache all nodes read or written within the block, and coalesce reads
+        of deferred nodes into a single `get_multi` call. Nested blocks share
+        the outermost cache.
+
+        >>> with nodestore.request_cache():
+        ...     nodestore.defer('key1')
+        ...     nodestore.get('key2')  # fetches key1 and key2
+        ...     nodestore.get('key1')  # served from the request cache
+        """
+        if self._request_cache is not None or not options.get("nodestore.request-cache.enabled"):
+            yield
+            return
+
+        self._request_cache = NodeRequestCache(
+            max_bytes=options.get("nodestore.request-cache.max-bytes"),
+            max_batch_size=options.get("nodestore.request-cache.max-batch-size"),
+        )
+        try:
+            yield
+        finally:
+            # Drop the cache, including deferred ids, before anything else can
+            # fail, so that nothing is carried over into the next request or
+            # task handled by this thread.
+            request_cache, self._request_cache = self._request_cache, None
+            request_cache.record_metrics()
+
+    def defer(self, id: str) -> None:
+        """
+        Announce that `id` will likely be read soon, so it can be fetched
+        together with the next read that goes to the backend. This is a no-op
+        outside of `request_cache`.
+        """
+        if self._request_cache is not None:
+            self._request_cache.defer(id)
+
     def delete(self, id: str) -> None:
         """
         >>> nodestore.delete('key1')
@@ -100,6 +218,10 @@ class NodeStorage(local, Service):
         if value is None:
             return None
 
+        value = compression.decompress(value)
+        if is_indexed(value):
+            return decode_indexed(value, subkey)
+
         lines_iter = iter(value.splitlines())
         try:
             if subkey is not None:
@@ -125,7 +247,43 @@ class NodeStorage(local, Service):
         >>> nodestore._get_bytes('key1')
         b'{"message": "hello world"}'
         """
-        return self._get_bytes(id)
+        return self._get_bytes_request_cached(id)
+
+    def _get_bytes_request_cached(self, id: str) -> bytes | None:
+        request_cache = self._request_cache
+        if request_cache is None:
+            return self._get_bytes(id)
+
+        if id not in request_cache:
+            id_list = request_cache.take_pending([id])
+            if len(id_list) == 1:
+                value = self._get_bytes(id)
+                request_cache.set(id, value)
+            else:
+                values = self._get_bytes_multi(id_list)
+                request_cache.set_many(id_list, values)
+                value = values.get(id)
+            # The request cache may be full, in which case the value is
+            # served without being cached.
+            return value
+
+        return request_cache.get(id)
+
+    def _get_bytes_multi_request_cached(self, id_list: list[str]) -> dict[str, bytes | None]:
+        request_cache = self._request_cache
+        if request_cache is None:
+            return self._get_bytes_multi(id_list)
+
+        cached = {id: request_cache.get(id) for id in id_list if id in request_cache}
+        fetch_ids = request_cache.take_pending(id_list)
+        fetched = self._get_bytes_multi(fetch_ids) if fetch_ids else {}
+        request_cache.set_many(fetch_ids, fetched)
+
+        # Deferred ids are fetched along with the requested ones, but only the
+        # requested ones are returned.
+        rv = {id: fetched[id] for id in id_list if id in fetched}
+        rv.update(cached)
+        return rv
 
     def _get_bytes(self, id: str) -> bytes | None:
         raise NotImplementedError
@@ -147,7 +305,7 @@ class NodeStorage(local, Service):
                     return item_from_cache
 
             span.set_tag("subkey", str(subkey))
-            bytes_data = self._get_bytes(id)
+            bytes_data = self._get_bytes_request_cached(id)
             rv = self._decode(bytes_data, subkey=subkey)
             if subkey is None:
                 # set cache item only after we know decoding did not fail
@@ -196,7 +354,7 @@ class NodeStorage(local, Service):
             with sentry_sdk.start_span(op="nodestore._get_bytes_multi_and_decode") as span:
                 items = {
                     id: self._decode(value, subkey=subkey)
-                    for id, value in self._get_bytes_multi(uncached_ids).items()
+                    for id, value in self._get_bytes_multi_request_cached(uncached_ids).items()
                 }
             if subkey is None:
                 self._set_cache_items(items)
@@ -213,23 +371,39 @@ class NodeStorage(local, Service):
         independently. A `None` key must always be present which is served as
         the "default" subkey (the regular event payload).
 
+        The result is compressed according to the `nodestore.compression`
+        option, using the dictionary for the platform of the default payload.
+
         >>> _encode({"unprocessed": {}, None: {"stacktrace": {}}})
         b'{"stacktrace": {}}\nunprocessed\n{}'
         """
-        lines = [json_dumps(data.pop(None)).encode("utf8")]
+        default = data.pop(None)
+        payloads = [(b"", json_dumps(default).encode("utf8"))]
         for key, value in data.items():
             if key is not None:
-                lines.append(key.encode("ascii"))
-                lines.append(json_dumps(value).encode("utf8"))
+                payloads.append((key.encode("ascii"), json_dumps(value).encode("utf8")))
+
+        if options.get("nodestore.indexed-format.enabled"):
+            rv = encode_indexed(payloads)
+        else:
+            lines = [payloads[0][1]]
+            for key_bytes, value_bytes in payloads[1:]:
+                lines.append(key_bytes)
+                lines.append(value_bytes)
+            rv = b"\n".join(lines)
 
-        return b"\n".join(lines)
+        platform = default.get("platform") if isinstance(default, Mapping) else None
+        return compression.compress(rv, platform=platform)
 
     def set_bytes(self, item_id: str, data: bytes, ttl: timedelta | None = None) -> None:
         """
         >>> nodestore.set_bytes('key1', b"{'foo': 'bar'}")
         """
         metrics.distribution("nodestore.set_bytes", len(data))
-        return self._set_bytes(item_id, data, ttl)
+        rv = self._set_bytes(item_id, data, ttl)
+        if self._request_cache is not None:
+            self._request_cache.set(item_id, data)
+        return rv
 
     def _set_bytes(self, item_id: str, data: bytes, ttl: timedelta | None = None) -> None:
         raise NotImplementedError
@@ -294,10 +468,15 @@ class NodeStorage(local, Service):
             self.cache.set_many(items)
 
     def _delete_cache_item(self, item_id: str) -> None:
+        if self._request_cache is not None:
+            self._request_cache.delete(item_id)
         if self.cache:
             self.cache.delete(item_id)
 
     def _delete_cache_items(self, id_list: list[str]) -> None:
+        if self._request_cache is not None:
+            for item_id in id_list:
+                self._request_cache.delete(item_id)
         if self.cache:
             self.cache.delete_many([item_id for item_id in id_list])
 
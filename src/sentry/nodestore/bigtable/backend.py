@@ -21,7 +21,9 @@ class BigtableNodeStorage(NodeStorage):
     :param default_ttl: How many days keys should be stored (and considered
         valid for reading + returning)
     :param compression: A boolean whether to enable zlib-compression, or the
-        string "zstd" to use zstd.
+        string "zstd" to use zstd. This should be left disabled when the
+        ``nodestore.compression`` option is used, since payloads are then
+        already compressed by ``NodeStorage``.
 
     >>> from datetime import timedelta
     >>> BigtableNodeStorage(
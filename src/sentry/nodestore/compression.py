@@ -0,0 +1,128 @@
+"""
+Compression for nodestore payloads.
+
+Blobs are compressed with zstd inside of ``NodeStorage`` itself, so every
+backend (Django, Bigtable, filesystem) benefits from it. Event payloads are
+highly repetitive across events of the same platform, which is why we support
+trained dictionaries per platform. Dictionaries are configured via
+``SENTRY_NODESTORE_ZSTD_DICTIONARIES``, a mapping of platform name (or
+``"default"``) to the path of a dictionary trained with
+:func:`train_dictionary`.
+
+The dictionary used to compress a blob is identified by the dictionary id
+zstd writes into the frame header, so blobs stay readable for as long as the
+dictionary is still configured, regardless of which platform it was
+registered for. Blobs written without compression (plain JSON, or pickle in
+the case of the Django backend) do not start with the zstd magic number and
+are passed through untouched.
+"""
+
+from __future__ import annotations
+
+import functools
+from collections.abc import Mapping, Sequence
+
+import zstandard
+from django.conf import settings
+
+from sentry import options
+from sentry.utils import metrics
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+DEFAULT_DICTIONARY = "default"
+
+
+class NodeCompressionError(Exception):
+    pass
+
+
+class ZstdDictionaryRegistry:
+    """
+    Holds the trained zstd dictionaries, addressable both by the platform
+    they are used for when writing and by their dictionary id when reading.
+    """
+
+    def __init__(self, dictionaries: Mapping[str, bytes]) -> None:
+        self.by_platform: dict[str, zstandard.ZstdCompressionDict] = {}
+        self.by_id: dict[int, zstandard.ZstdCompressionDict] = {}
+
+        for platform, data in dictionaries.items():
+            dictionary = zstandard.ZstdCompressionDict(data)
+            self.by_platform[platform] = dictionary
+            self.by_id[dictionary.dict_id()] = dictionary
+
+    @classmethod
+    def from_paths(cls, paths: Mapping[str, str]) -> ZstdDictionaryRegistry:
+        dictionaries = {}
+        for platform, path in paths.items():
+            with open(path, "rb") as f:
+                dictionaries[platform] = f.read()
+        return cls(dictionaries)
+
+    def for_platform(self, platform: str | None) -> zstandard.ZstdCompressionDict | None:
+        if platform is not None and platform in self.by_platform:
+            return self.by_platform[platform]
+        return self.by_platform.get(DEFAULT_DICTIONARY)
+
+
+@functools.cache
+def get_dictionary_registry() -> ZstdDictionaryRegistry:
+    return ZstdDictionaryRegistry.from_paths(settings.SENTRY_NODESTORE_ZSTD_DICTIONARIES)
+
+
+def train_dictionary(samples: Sequence[bytes], dict_size: int = 110 * 1024) -> bytes:
+    """
+    Train a zstd dictionary from a sample of encoded nodestore payloads of a
+    single platform. The result can be written to disk and referenced from
+    ``SENTRY_NODESTORE_ZSTD_DICTIONARIES``.
+    """
+    return zstandard.train_dictionary(dict_size, list(samples)).as_bytes()
+
+
+def is_compressed(value: bytes) -> bool:
+    return value.startswith(ZSTD_MAGIC)
+
+
+def compress(value: bytes, platform: str | None = None) -> bytes:
+    """
+    Compress an encoded nodestore payload according to the
+    ``nodestore.compression`` option. Returns the value unchanged if
+    compression is disabled.
+    """
+    codec = options.get("nodestore.compression")
+    if codec != "zstd":
+        return value
+
+    dictionary = get_dictionary_registry().for_platform(platform)
+    compressor = zstandard.ZstdCompressor(
+        level=options.get("nodestore.compression.level"),
+        dict_data=dictionary,
+        write_content_size=True,
+    )
+    rv = compressor.compress(value)
+
+    metrics.distribution(
+        "nodestore.compression.ratio",
+        len(rv) / len(value) if value else 1.0,
+        tags={"codec": codec, "dictionary": dictionary is not None},
+    )
+    return rv
+
+
+def decompress(value: bytes) -> bytes:
+    """
+    Decompress a nodestore payload if it was written by :func:`compress`,
+    otherwise return it unchanged.
+    """
+    if not is_compressed(value):
+        return value
+
+    dict_id = zstandard.get_frame_parameters(value).dict_id
+    dictionary = None
+    if dict_id:
+        dictionary = get_dictionary_registry().by_id.get(dict_id)
+        if dictionary is None:
+            raise NodeCompressionError(f"Unknown zstd dictionary id {dict_id}")
+
+    return zstandard.ZstdDecompressor(dict_data=dictionary).decompress(value)
@@ -1,22 +1,40 @@
 from __future__ import annotations
 
+import base64
 import logging
 import math
 import pickle
+import zlib
 from datetime import datetime, timedelta
 from typing import Any
 
 from django.utils import timezone
 
 from sentry.db.models.query import create_or_update
-from sentry.nodestore.base import NodeStorage
-from sentry.utils.strings import compress, decompress
+from sentry.nodestore import compression
+from sentry.nodestore.base import NodeStorage, is_indexed
+from sentry.utils.strings import compress
 
 from .models import Node
 
 logger = logging.getLogger("sentry")
 
 
+def _compress_data(data: bytes) -> str:
+    # Payloads compressed by `NodeStorage` are only base64 encoded, to not
+    # compress them twice.
+    if compression.is_compressed(data):
+        return base64.b64encode(data).decode("utf-8")
+    return compress(data)
+
+
+def _decompress_data(data: str) -> bytes:
+    value = base64.b64decode(data)
+    if compression.is_compressed(value):
+        return value
+    return zlib.decompress(value)
+
+
 class DjangoNodeStorage(NodeStorage):
     def delete(self, id: str) -> None:
         Node.objects.filter(id=id).delete()
@@ -27,12 +45,17 @@ class DjangoNodeStorage(NodeStorage):
             return None
 
         try:
-            if value.startswith(b"{"):
+            if value.startswith(b"{") or compression.is_compressed(value) or is_indexed(value):
                 return NodeStorage._decode(self, value, subkey=subkey)
 
             if subkey is None:
                 return pickle.loads(value)
 
+            return None
+        except compression.NodeCompressionError:
+            # Treat blobs that can not be decompressed as missing, rather
+            # than as empty events.
+            logger.exception("nodestore.decompression_failed")
             return None
         except Exception as e:
             logger.exception(str(e))
@@ -41,19 +64,21 @@ class DjangoNodeStorage(NodeStorage):
     def _get_bytes(self, id: str) -> bytes | None:
         try:
             data = Node.objects.get(id=id).data
-            return decompress(data)
+            return _decompress_data(data)
         except Node.DoesNotExist:
             return None
 
     def _get_bytes_multi(self, id_list: list[str]) -> dict[str, bytes | None]:
-        return {n.id: decompress(n.data) for n in Node.objects.filter(id__in=id_list)}
+        return {n.id: _decompress_data(n.data) for n in Node.objects.filter(id__in=id_list)}
 
     def delete_multi(self, id_list: list[str]) -> None:
         Node.objects.filter(id__in=id_list).delete()
         self._delete_cache_items(id_list)
 
     def _set_bytes(self, id: str, data: Any, ttl: timedelta | None = None) -> None:
-        create_or_update(Node, id=id, values={"data": compress(data), "timestamp": timezone.now()})
+        create_or_update(
+            Node, id=id, values={"data": _compress_data(data), "timestamp": timezone.now()}
+        )
 
     def cleanup(self, cutoff_timestamp: datetime) -> None:
         from sentry.db.deletion import BulkDeleteQuery
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from sentry.utils import metrics
+
+
+class NodeRequestCache:
+    """
+    A read-through cache of raw nodestore blobs that lives for the duration of
+    a single request or task, see `NodeStorage.request_cache`.
+
+    Blobs are cached as bytes rather than decoded payloads, so that callers
+    never share (and accidentally mutate) the same dictionaries, and so that
+    reads of different subkeys of the same node are served from one fetch.
+
+    Node ids can be announced ahead of time with `defer`. The next read that
+    misses the cache fetches all deferred ids together with a single
+    `get_multi` round trip. Only callers which know they are about to read the
+    nodes should defer them, as deferred nodes are fetched whether or not they
+    are read later on.
+    """
+
+    def __init__(self, max_bytes: int, max_batch_size: int) -> None:
+        self.max_bytes = max_bytes
+        self.max_batch_size = max_batch_size
+
+        self.items: dict[str, bytes | None] = {}
+        self.pending: dict[str, None] = {}
+        self.size = 0
+
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, id: str) -> bool:
+        return id in self.items
+
+    def get(self, id: str) -> bytes | None:
+        self.hits += 1
+        return self.items[id]
+
+    def defer(self, id: str) -> None:
+        if id not in self.items and len(self.pending) < self.max_batch_size:
+            self.pending[id] = None
+
+    def take_pending(self, id_list: list[str]) -> list[str]:
+        """
+        Return the ids that need to be fetched to serve a read of `id_list`,
+        including any deferred ids. The deferred ids are consumed.
+        """
+        ids = dict.fromkeys(id for id in id_list if id not in self.items)
+        self.misses += len(ids)
+        for id in ids:
+            self.pending.pop(id, None)
+
+        if ids and self.pending:
+            metrics.distribution("nodestore.request_cache.coalesced", len(self.pending))
+            ids.update(self.pending)
+            self.pending.clear()
+
+        return list(ids)
+
+    def set(self, id: str, value: bytes | None) -> None:
+        self.delete(id)
+        if value is not None:
+            if self.size + len(value) > self.max_bytes:
+                return
+            self.size += len(value)
+        self.items[id] = value
+
+    def set_many(self, id_list: list[str], values: dict[str, bytes | None]) -> None:
+        for id in id_list:
+            self.set(id, values.get(id))
+
+    def delete(self, id: str) -> None:
+        self.pending.pop(id, None)
+        value = self.items.pop(id, None)
+        if value is not None:
+            self.size -= len(value)
+
+    def record_metrics(self) -> None:
+        metrics.incr("nodestore.request_cache", amount=self.hits, tags={"result": "hit"})
+        metrics.incr("nodestore.request_cache", amount=self.misses, tags={"result": "miss"})
+        if self.hits or self.misses:
+            metrics.distribution(
+                "nodestore.request_cache.hit_rate", self.hits / (self.hits + self.misses)
+            )
@@ -751,7 +751,41 @@ register("snuba.search.chunk-growth-rate", default=1.5, flags=FLAG_AUTOMATOR_MOD
 register("snuba.search.max-chunk-size", default=2000, flags=FLAG_AUTOMATOR_MODIFIABLE)
 register("snuba.search.max-total-chunk-time-seconds", default=30.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
 register("snuba.search.hits-sample-size", default=100, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Post-filter Snuba results against a cached set of the groups matching the
+# Postgres filters, instead of querying Postgres for every chunk.
+register(
+    "snuba.search.candidate-index.enabled",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+register(
+    "snuba.search.candidate-index.max-size",
+    type=Int,
+    default=250_000,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+register(
+    "snuba.search.candidate-index.ttl",
+    type=Int,
+    default=30,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
 register("snuba.track-outcomes-sample-rate", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Result caching of Snuba queries by referrer, for example
+# {"api.dashboards.widget.line-chart": {"ttl": 60, "granularity": 60}}
+register(
+    "snuba.query-cache.referrer-policies",
+    type=Dict,
+    default={},
+    flags=FLAG_ALLOW_EMPTY | FLAG_AUTOMATOR_MODIFIABLE,
+)
+# How long a cache miss holds the lock of its query, and how long identical
+# queries wait for its result before running the query themselves.
+register("snuba.query-cache.lock-timeout", default=10, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# The maximum number of queries of a single bulk Snuba query that run at the
+# same time, out of the SENTRY_SNUBA_QUERY_WORKERS shared by the process.
+register("snuba.bulk-query.batch-concurrency", default=5, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
 # The percentage of tagkeys that we want to cache. Set to 1.0 in order to cache everything, <=0.0 to stop caching
 register(
@@ -1434,6 +1468,13 @@ register(
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
 
+# An option to enable the in-process cache in front of the caching indexer
+register(
+    "sentry-metrics.indexer.local-cache.enabled",
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # Option to control sampling percentage of schema validation on the generic metrics pipeline
 # based on namespace.
 register(
@@ -2093,6 +2134,42 @@ register("txnames.bump-lifetime-sample-rate", default=0.1, flags=FLAG_AUTOMATOR_
 register(
     "nodestore.set-subkeys.enable-set-cache-item", default=True, flags=FLAG_AUTOMATOR_MODIFIABLE
 )
+# Codec used to compress nodestore payloads before they are written to the
+# backend. Either "none" or "zstd". Reads always support all codecs.
+register("nodestore.compression", type=String, default="none", flags=FLAG_AUTOMATOR_MODIFIABLE)
+register("nodestore.compression.level", type=Int, default=3, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Write nodestore payloads in the indexed format, which allows reading
+# subkeys without decoding the whole blob. Reads support both formats.
+register("nodestore.indexed-format.enabled", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Deduplicate and batch nodestore reads within a request or task. The cache is
+# bounded in total bytes, and in the number of deferred nodes fetched at once.
+register("nodestore.request-cache.enabled", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register(
+    "nodestore.request-cache.max-bytes",
+    type=Int,
+    default=50 * 1024 * 1024,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+register(
+    "nodestore.request-cache.max-batch-size", type=Int, default=100, flags=FLAG_AUTOMATOR_MODIFIABLE
+)
+
+# === Buffer related runtime options ===
+
+# Flush pending buffer keys in bulk: claim a whole batch of keys with a few
+# pipelines and apply increments with one multi-row UPDATE per model.
+register("buffer.bulk-flush.enabled", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Number of keys handed to a single `process_incr` task in bulk flush mode.
+register("buffer.bulk-flush.batch-size", type=Int, default=100, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Merge increments in process before writing them to Redis. Pending increments
+# are written every `interval-ms`, or as soon as `max-size` rows are pending.
+register("buffer.local-aggregation.enabled", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register(
+    "buffer.local-aggregation.interval-ms", type=Int, default=1000, flags=FLAG_AUTOMATOR_MODIFIABLE
+)
+register(
+    "buffer.local-aggregation.max-size", type=Int, default=1000, flags=FLAG_AUTOMATOR_MODIFIABLE
+)
 
 # === Backpressure related runtime options ===
 
@@ -2143,6 +2220,20 @@ register(
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
 
+# Exports discover queries that can be paginated by timestamp in a single pass,
+# fetching time slices in parallel and writing the file blobs directly.
+register(
+    "data-export.discover-streamed-export",
+    default=False,
+    flags=FLAG_BOOL | FLAG_AUTOMATOR_MODIFIABLE,
+)
+# The compression (none, gzip or zstd) of files written by streamed exports.
+register(
+    "data-export.discover-streamed-export.compression",
+    default="none",
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # Killswitch for monitor check-ins
 register(
     "crons.organization.disable-check-in",
@@ -2203,6 +2294,16 @@ register(
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
 
+# The number of monitor environments (or check-ins) fetched per page when the
+# clock tasks scan for missed and timed out check-ins. Tasks for each page are
+# produced together and flushed before the next page is fetched.
+register(
+    "crons.clock_tasks.scan_page_size",
+    type=Int,
+    default=1000,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # Determines how many check-ins per-minute will be allowed per monitor. This is
 # used when computing the QuotaConfig for the DataCategory.MONITOR (check-ins)
 #
@@ -2947,6 +3048,56 @@ register(
     default=False,
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
+# Process delayed rules of many projects per task, sharing identical Snuba
+# queries between projects of the same organization.
+register(
+    "delayed_processing.cross_project_batching.enabled",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+register(
+    "delayed_processing.cross_project_batch_size",
+    type=Int,
+    default=10,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Match ownership rules and code owners through a compiled literal index
+# instead of testing every rule against every frame.
+register(
+    "ownership.compiled-index.enabled",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Cache compiled issue alert rules per project in process, see `RuleProcessor`.
+register(
+    "rules.plan-cache.enabled",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+register(
+    "rules.plan-cache.ttl",
+    type=Int,
+    default=60,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# How often cached plans check the rules version of their project in the cache.
+register(
+    "rules.plan-cache.version-ttl",
+    type=Int,
+    default=5,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Filters (matched by substring of their id) that query the database or Snuba,
+# which are evaluated after the cheap filters of a rule.
+register(
+    "rules.slow-filter-matches",
+    type=Sequence,
+    default=["latest_release", "latest_adopted_release", "issue_occurrences"],
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
 register(
     "delayed_workflow.rollout",
     type=Bool,
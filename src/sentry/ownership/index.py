@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from collections import deque
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any
+
+import orjson
+from cachetools import LRUCache
+
+from sentry.ownership.grammar import CODEOWNERS, MODULE, PATH, URL, Rule, load_schema
+from sentry.utils.event_frames import find_stack_frames
+from sentry.utils.safe import get_path
+
+# Patterns are split into literal pieces at wildcards and path separators.
+# Patterns using character classes, alternatives or escapes are not indexed
+# and always tested.
+_LITERAL_SPLIT_RE = re.compile(r"[*?/]+")
+_UNINDEXABLE_RE = re.compile(r"[\[\]{}\\]")
+
+
+def required_literal(pattern: str) -> str | None:
+    """
+    Returns a lowercased substring that every value matched by the glob
+    `pattern` must contain, or None if there is no such substring we can
+    safely derive.
+    """
+    if not pattern.isascii() or _UNINDEXABLE_RE.search(pattern):
+        return None
+    literal = max(_LITERAL_SPLIT_RE.split(pattern), key=len)
+    return literal.lower() or None
+
+
+class LiteralAutomaton:
+    """
+    An Aho-Corasick automaton finding all of a set of literals that occur in
+    a text, in a single pass over the text.
+    """
+
+    def __init__(self, literals: Iterable[str]) -> None:
+        self.literals: list[str] = []
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[frozenset[int]] = [frozenset()]
+
+        outputs: list[set[int]] = [set()]
+        for literal in literals:
+            state = 0
+            for char in literal:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    outputs.append(set())
+                state = next_state
+            outputs[state].add(len(self.literals))
+            self.literals.append(literal)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                outputs[next_state] |= outputs[self._fail[next_state]]
+
+        self._out = [frozenset(output) for output in outputs]
+
+    def search(self, text: str, found: set[int]) -> None:
+        """Adds the ids of all literals occurring in `text` to `found`."""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found.update(out[state])
+
+
+class _LiteralIndex:
+    def __init__(self) -> None:
+        self.rules_by_literal: dict[str, list[int]] = {}
+        self.automaton: LiteralAutomaton | None = None
+
+    def add(self, literal: str, rule_index: int) -> None:
+        self.rules_by_literal.setdefault(literal, []).append(rule_index)
+
+    def compile(self) -> None:
+        if self.rules_by_literal:
+            self.automaton = LiteralAutomaton(self.rules_by_literal)
+
+    def collect(self, values: Iterable[Any], candidates: set[int]) -> None:
+        if self.automaton is None:
+            return
+
+        found: set[int] = set()
+        for value in values:
+            if value:
+                self.automaton.search(str(value).lower(), found)
+
+        literals = self.automaton.literals
+        for literal_id in found:
+            candidates.update(self.rules_by_literal[literals[literal_id]])
+
+
+class OwnershipIndex:
+    """
+    A compiled form of an ownership schema that finds the rules matching an
+    event without testing every rule against every frame.
+
+    Path, codeowners, module and url rules are indexed by a literal their
+    pattern requires. The frame values of an event are scanned once to find
+    the rules whose literal occurs, and only those candidates (plus the rules
+    that cannot be indexed, such as tag rules) are tested with `Rule.test`,
+    so the result is identical to testing all rules.
+    """
+
+    def __init__(self, rules: Sequence[Rule]) -> None:
+        self.rules = rules
+        self._unindexed: list[int] = []
+        self._paths = _LiteralIndex()
+        self._modules = _LiteralIndex()
+        self._urls = _LiteralIndex()
+
+        indexes_by_type = {
+            PATH: self._paths,
+            CODEOWNERS: self._paths,
+            MODULE: self._modules,
+            URL: self._urls,
+        }
+        for rule_index, rule in enumerate(rules):
+            literal_index = indexes_by_type.get(rule.matcher.type)
+            literal = required_literal(rule.matcher.pattern) if literal_index else None
+            if literal_index is None or literal is None:
+                self._unindexed.append(rule_index)
+            else:
+                literal_index.add(literal, rule_index)
+
+        for literal_index in (self._paths, self._modules, self._urls):
+            literal_index.compile()
+
+    def matching_rules(
+        self,
+        data: Mapping[str, Any],
+        munged_data: tuple[Sequence[Mapping[str, Any]], Sequence[str]],
+    ) -> list[Rule]:
+        candidates = set(self._unindexed)
+
+        frames, keys = munged_data
+        self._paths.collect((frame.get(key) for frame in frames for key in keys), candidates)
+        if self._modules.automaton is not None:
+            self._modules.collect(
+                (frame.get("module") for frame in find_stack_frames(data)), candidates
+            )
+        self._urls.collect([get_path(data, "request", "url")], candidates)
+
+        return [
+            self.rules[rule_index]
+            for rule_index in sorted(candidates)
+            if self.rules[rule_index].test(data, munged_data)
+        ]
+
+
+_index_cache: LRUCache[str, OwnershipIndex] = LRUCache(maxsize=1000)
+_index_cache_lock = threading.Lock()
+
+
+def get_ownership_index(schema: Mapping[str, Any]) -> OwnershipIndex:
+    """
+    Returns the compiled `OwnershipIndex` of an ownership schema. Indexes
+    are cached in process by the contents of the schema, so any change to
+    the ownership rules or code owners results in a new index.
+    """
+    key = hashlib.md5(orjson.dumps(schema)).hexdigest()
+    with _index_cache_lock:
+        index = _index_cache.get(key)
+    if index is None:
+        index = OwnershipIndex(load_schema(schema))
+        with _index_cache_lock:
+            _index_cache[key] = index
+    return index
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import itertools
 import uuid
 import zlib
+from collections import deque
 from collections.abc import Iterator
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Any
 
@@ -33,7 +35,7 @@ from sentry.replays.lib.storage import (
     storage_kv,
 )
 from sentry.replays.models import ReplayRecordingSegment
-from sentry.replays.usecases.pack import unpack
+from sentry.replays.usecases.pack import HEADER_OFFSET, Encoding, unpack
 from sentry.utils.snuba import raw_snql_query
 
 # METADATA QUERY BEHAVIOR.
@@ -250,20 +252,50 @@ def segment_row_to_storage_meta(
 # BLOB DOWNLOAD BEHAVIOR.
 
 
+SEGMENT_PREFETCH_WINDOW = 10
+"""The maximum number of segments being downloaded ahead of the segment being streamed."""
+
+SEGMENT_CHUNK_SIZE = 256 * 1024
+"""The maximum number of decompressed bytes held in memory per streamed segment."""
+
+
 def download_segments(segments: list[RecordingSegmentStorageMeta]) -> Iterator[bytes]:
-    """Download segment data from remote storage."""
+    """Download segment data from remote storage.
+
+    Segments are streamed in order as soon as they are available. At most
+    `SEGMENT_PREFETCH_WINDOW` segments are downloaded ahead of the segment being
+    streamed and each segment is decompressed incrementally, so memory usage is
+    bounded regardless of the number of segments.
+    """
     yield b"["
 
-    with ThreadPoolExecutor(max_workers=10) as pool:
-        segment_data = pool.map(_download_segment, segments)
+    pool = ThreadPoolExecutor(max_workers=SEGMENT_PREFETCH_WINDOW)
+    try:
+        pending: deque[Future[bytes | None]] = deque()
+        remaining = iter(segments)
+
+        for segment in itertools.islice(remaining, SEGMENT_PREFETCH_WINDOW):
+            pending.append(pool.submit(_download_compressed_segment, segment))
+
+        i = 0
+        while pending:
+            result = pending.popleft().result()
+
+            # Keep the window full while the current segment is streamed.
+            for segment in itertools.islice(remaining, 1):
+                pending.append(pool.submit(_download_compressed_segment, segment))
+
+            if result is None:
+                yield b"[]"
+            else:
+                yield from iter_segment_rrweb(result)
 
-    for i, result in enumerate(segment_data):
-        if result is None:
-            yield b"[]"
-        else:
-            yield result[1]
             if i < len(segments) - 1:
                 yield b","
+            i += 1
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
     yield b"]"
 
 
@@ -287,10 +319,13 @@ def download_video(segment: RecordingSegmentStorageMeta) -> bytes | None:
         return video
 
 
-def _download_segment(segment: RecordingSegmentStorageMeta) -> tuple[bytes | None, bytes] | None:
+def _download_compressed_segment(segment: RecordingSegmentStorageMeta) -> bytes | None:
     driver = filestore if segment.file_id else storage
+    return driver.get(segment)
 
-    result = driver.get(segment)
+
+def _download_segment(segment: RecordingSegmentStorageMeta) -> tuple[bytes | None, bytes] | None:
+    result = _download_compressed_segment(segment)
     if result is None:
         return None
 
@@ -308,3 +343,61 @@ def decompress(buffer: bytes) -> bytes:
         return buffer
 
     return zlib.decompress(buffer, zlib.MAX_WBITS | 32)
+
+
+def iter_decompressed(buffer: bytes, chunk_size: int = SEGMENT_CHUNK_SIZE) -> Iterator[bytes]:
+    """Return decompressed output in chunks of at most `chunk_size` bytes.
+
+    Equivalent to `decompress` but never holds more than one chunk of
+    decompressed output in memory.
+    """
+    if buffer.startswith(b"["):
+        yield buffer
+        return
+
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 32)
+    data = buffer
+    while data:
+        chunk = decompressor.decompress(data, chunk_size)
+        if chunk:
+            yield chunk
+        data = decompressor.unconsumed_tail
+
+    chunk = decompressor.flush()
+    if chunk:
+        yield chunk
+
+
+def iter_segment_rrweb(buffer: bytes, chunk_size: int = SEGMENT_CHUNK_SIZE) -> Iterator[bytes]:
+    """Return the rrweb payload of a stored segment in chunks.
+
+    Incremental equivalent of `unpack(decompress(buffer))[1]`. Any video
+    payload packed in front of the rrweb payload is skipped without being
+    held in memory.
+    """
+    chunks = iter_decompressed(buffer, chunk_size)
+
+    # Read enough bytes to parse the packed header.
+    head = b""
+    for chunk in chunks:
+        head += chunk
+        if len(head) >= HEADER_OFFSET:
+            break
+
+    if not head:
+        return
+
+    if head[0] == Encoding.RRWEB.value:
+        head = head[1:]
+    elif head[0] == Encoding.VIDEO.value and len(head) >= HEADER_OFFSET:
+        skip = int.from_bytes(head[1:HEADER_OFFSET]) + HEADER_OFFSET
+        while len(head) < skip:
+            skip -= len(head)
+            head = next(chunks, b"")
+            if not head:
+                return
+        head = head[skip:]
+
+    if head:
+        yield head
+    yield from chunks
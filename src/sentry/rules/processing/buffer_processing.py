@@ -2,6 +2,7 @@ import logging
 import math
 import uuid
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from itertools import islice
@@ -14,6 +15,7 @@ from sentry.buffer.base import BufferField
 from sentry.buffer.redis import BufferHookEvent, redis_buffer_registry
 from sentry.db import models
 from sentry.utils import metrics
+from sentry.utils.iterators import chunked
 from sentry.utils.registry import NoRegistrationExistsError, Registry
 
 logger = logging.getLogger("sentry.delayed_processing")
@@ -33,6 +35,9 @@ class BufferHashKeys:
 class DelayedProcessingBase(ABC):
     buffer_key: ClassVar[str]
     option: ClassVar[str | None]
+    # Task processing a list of (project id, batch key) pairs at once, used
+    # when `delayed_processing.cross_project_batching.enabled` is set.
+    bulk_processing_task: ClassVar[Task | None] = None
 
     def __init__(self, project_id: int):
         self.project_id = project_id
@@ -71,7 +76,11 @@ def bucket_num_groups(num_groups: int) -> str:
     return "1"
 
 
-def process_in_batches(project_id: int, processing_type: str) -> None:
+def process_in_batches(
+    project_id: int,
+    processing_type: str,
+    schedule: Callable[..., object] | None = None,
+) -> None:
     """
     This will check the number of alertgroup_to_event_data items in the Redis buffer for a project.
 
@@ -84,7 +93,8 @@ def process_in_batches(project_id: int, processing_type: str) -> None:
     as arguments could be problematic. Finally, we can't use a pagination system on the data because
     redis doesn't maintain the sort order of the hash keys.
 
-    `processing_task` will fetch the batch from redis and process the rules.
+    `processing_task` will fetch the batch from redis and process the rules. If `schedule` is
+    given, it is called with the arguments for `processing_task` instead of scheduling the task.
     """
     batch_size = options.get("delayed_processing.batch_size")
     should_emit_logs = options.get("delayed_processing.emit_logs")
@@ -98,6 +108,8 @@ def process_in_batches(project_id: int, processing_type: str) -> None:
 
     hash_args = processing_info.hash_args
     task = processing_info.processing_task
+    if schedule is None:
+        schedule = task.delay
     filters: dict[str, BufferField] = asdict(hash_args.filters)
 
     event_count = buffer.backend.get_hash_length(model=hash_args.model, field=filters)
@@ -106,7 +118,8 @@ def process_in_batches(project_id: int, processing_type: str) -> None:
     )
 
     if event_count < batch_size:
-        return task.delay(project_id)
+        schedule(project_id)
+        return
 
     if should_emit_logs:
         logger.info(
@@ -132,7 +145,7 @@ def process_in_batches(project_id: int, processing_type: str) -> None:
             # remove the batched items from the project alertgroup_to_event_data
             buffer.backend.delete_hash(**asdict(hash_args), fields=list(batch.keys()))
 
-            task.delay(project_id, batch_key)
+            schedule(project_id, batch_key)
 
 
 def process_buffer() -> None:
@@ -156,8 +169,26 @@ def process_buffer() -> None:
                 log_name = f"{processing_type}.project_id_list"
                 logger.info(log_name, extra={"project_ids": log_str})
 
-            for project_id, _ in project_ids:
-                process_in_batches(project_id, processing_type)
+            if handler.bulk_processing_task is not None and options.get(
+                "delayed_processing.cross_project_batching.enabled"
+            ):
+                # Collect the batches of all due projects, so that their
+                # queries can be shared.
+                pending: list[tuple[int, str | None]] = []
+
+                def schedule(project_id: int, batch_key: str | None = None) -> None:
+                    pending.append((project_id, batch_key))
+
+                for project_id, _ in project_ids:
+                    process_in_batches(project_id, processing_type, schedule)
+
+                for chunk in chunked(
+                    pending, options.get("delayed_processing.cross_project_batch_size")
+                ):
+                    handler.bulk_processing_task.delay(chunk)
+            else:
+                for project_id, _ in project_ids:
+                    process_in_batches(project_id, processing_type)
 
             buffer.backend.delete_key(handler.buffer_key, min=0, max=fetch_time.timestamp())
 
@@ -25,7 +25,9 @@ from sentry.rules.conditions.event_frequency import (
     DEFAULT_COMPARISON_INTERVAL,
     BaseEventFrequencyCondition,
     ComparisonType,
+    EventFrequencyCondition,
     EventFrequencyConditionData,
+    EventUniqueUserFrequencyCondition,
     percent_increase,
 )
 from sentry.rules.processing.buffer_processing import (
@@ -52,6 +54,13 @@ from sentry.utils.safe import safe_execute
 logger = logging.getLogger("sentry.rules.delayed_processing")
 EVENT_LIMIT = 100
 COMPARISON_INTERVALS_VALUES = {k: v[1] for k, v in COMPARISON_INTERVALS.items()}
+# Conditions whose batch query only depends on the group ids, so identical
+# queries of projects in the same organization can be merged into one. Percent
+# conditions are not included, as their query also depends on the session
+# count of the project.
+CROSS_PROJECT_CONDITIONS = frozenset(
+    [EventFrequencyCondition.id, EventUniqueUserFrequencyCondition.id]
+)
 
 
 class UniqueConditionQuery(NamedTuple):
@@ -84,6 +93,15 @@ class DataAndGroups(NamedTuple):
         )
 
 
+class DelayedProjectData(NamedTuple):
+    project: Project
+    batch_key: str | None
+    rulegroup_to_event_data: dict[str, str]
+    rules_to_groups: DefaultDict[int, set[int]]
+    alert_rules: list[Rule]
+    condition_groups: dict[UniqueConditionQuery, DataAndGroups]
+
+
 def fetch_project(project_id: int) -> Project | None:
     try:
         return Project.objects.get_from_cache(id=project_id)
@@ -376,6 +394,66 @@ def get_condition_group_results(
     return condition_group_results
 
 
+def get_condition_group_results_bulk(
+    projects: Sequence[DelayedProjectData],
+) -> dict[int, dict[UniqueConditionQuery, dict[int, int | float]]]:
+    """
+    Like `get_condition_group_results`, but for many projects at once. Unique
+    condition queries of `CROSS_PROJECT_CONDITIONS` that are identical across
+    projects of the same organization are merged into a single query, and the
+    results are split back up per project. Returns the results by project id.
+    """
+    merged: dict[tuple[int, UniqueConditionQuery], tuple[Project, DataAndGroups]] = {}
+    results: dict[int, dict[UniqueConditionQuery, dict[int, int | float]]] = {}
+
+    for data in projects:
+        project_condition_groups = {}
+        for unique_condition, data_and_groups in data.condition_groups.items():
+            if unique_condition.cls_id not in CROSS_PROJECT_CONDITIONS:
+                project_condition_groups[unique_condition] = data_and_groups
+                continue
+
+            key = (data.project.organization_id, unique_condition)
+            if key in merged:
+                merged[key][1].group_ids.update(data_and_groups.group_ids)
+            else:
+                merged[key] = (
+                    data.project,
+                    data_and_groups._replace(group_ids=set(data_and_groups.group_ids)),
+                )
+
+        results[data.project.id] = (
+            get_condition_group_results(project_condition_groups, data.project) or {}
+        )
+
+    num_queries = sum(len(data.condition_groups) for data in projects)
+    metrics.incr(
+        "delayed_processing.cross_project.merged_queries",
+        amount=num_queries - sum(len(r) for r in results.values()) - len(merged),
+    )
+
+    for (organization_id, unique_condition), (project, data_and_groups) in merged.items():
+        result = (
+            get_condition_group_results({unique_condition: data_and_groups}, project) or {}
+        ).get(unique_condition)
+        if result is None:
+            continue
+
+        for data in projects:
+            if data.project.organization_id != organization_id:
+                continue
+            if (project_data_and_groups := data.condition_groups.get(unique_condition)) is None:
+                continue
+            # Copy to keep the semantics of the result type, the frequency
+            # conditions return defaultdicts.
+            project_result = result.copy()
+            for group_id in result.keys() - project_data_and_groups.group_ids:
+                del project_result[group_id]
+            results[data.project.id][unique_condition] = project_result
+
+    return results
+
+
 def passes_comparison(
     condition_group_results: dict[UniqueConditionQuery, dict[int, int | float]],
     condition_data: EventFrequencyConditionData,
@@ -559,9 +637,71 @@ def apply_delayed(project_id: int, batch_key: str | None = None, *args: Any, **k
     """
     Grab rules, groups, and events from the Redis buffer, evaluate the "slow" conditions in a bulk snuba query, and fire them if they pass
     """
+    data = prepare_delayed_project(project_id, batch_key)
+    if data is None:
+        return
+
+    with metrics.timer("delayed_processing.get_condition_group_results.duration"):
+        condition_group_results = get_condition_group_results(data.condition_groups, data.project)
+
+    fire_delayed_project(data, condition_group_results)
+
+
+@instrumented_task(
+    name="sentry.rules.processing.delayed_processing_bulk",
+    queue="delayed_rules",
+    default_retry_delay=5,
+    max_retries=5,
+    soft_time_limit=150,
+    time_limit=160,
+    silo_mode=SiloMode.REGION,
+)
+def apply_delayed_bulk(
+    projects: Sequence[tuple[int, str | None]], *args: Any, **kwargs: Any
+) -> None:
+    """
+    Like `apply_delayed` for multiple (project id, batch key) pairs, sharing
+    identical Snuba queries across projects of the same organization.
+
+    Projects that fail to be prepared or fired are logged and skipped, so that
+    neither a retry of the task fires the other projects again, nor a single
+    project holds up the rest. Their data stays in the buffer.
+    """
+    prepared = []
+    for project_id, batch_key in projects:
+        try:
+            data = prepare_delayed_project(project_id, batch_key)
+        except Exception:
+            logger.exception(
+                "delayed_processing.cross_project.prepare_failed",
+                extra={"project_id": project_id, "batch_key": batch_key},
+            )
+            continue
+        if data is not None:
+            prepared.append(data)
+
+    metrics.distribution("delayed_processing.cross_project.num_projects", len(prepared))
+    with metrics.timer("delayed_processing.get_condition_group_results.duration"):
+        results = get_condition_group_results_bulk(prepared)
+
+    for data in prepared:
+        try:
+            fire_delayed_project(data, results[data.project.id])
+        except Exception:
+            logger.exception(
+                "delayed_processing.cross_project.fire_failed",
+                extra={"project_id": data.project.id, "batch_key": data.batch_key},
+            )
+
+
+def prepare_delayed_project(project_id: int, batch_key: str | None) -> DelayedProjectData | None:
+    """
+    Grab rules, groups, and events of a project from the Redis buffer and
+    build the unique condition queries that need to be made for them.
+    """
     project = fetch_project(project_id)
     if not project:
-        return
+        return None
 
     rulegroup_to_event_data = fetch_rulegroup_to_event_data(project_id, batch_key)
     rules_to_groups = get_rules_to_groups(rulegroup_to_event_data)
@@ -575,9 +715,28 @@ def apply_delayed(project_id: int, batch_key: str | None = None, *args: Any, **k
             "rules_to_groups": rules_to_groups,
         },
     )
+    return DelayedProjectData(
+        project=project,
+        batch_key=batch_key,
+        rulegroup_to_event_data=rulegroup_to_event_data,
+        rules_to_groups=rules_to_groups,
+        alert_rules=alert_rules,
+        condition_groups=condition_groups,
+    )
 
-    with metrics.timer("delayed_processing.get_condition_group_results.duration"):
-        condition_group_results = get_condition_group_results(condition_groups, project)
+
+def fire_delayed_project(
+    data: DelayedProjectData,
+    condition_group_results: dict[UniqueConditionQuery, dict[int, int | float]] | None,
+) -> None:
+    """
+    Fire the rules of a project whose slow conditions passed, and remove the
+    processed data from the Redis buffer.
+    """
+    project = data.project
+    project_id = project.id
+    rules_to_groups = data.rules_to_groups
+    alert_rules = data.alert_rules
 
     has_workflow_engine = features.has(
         "organizations:workflow-engine-process-workflows", project.organization
@@ -623,17 +782,18 @@ def apply_delayed(project_id: int, batch_key: str | None = None, *args: Any, **k
                 extra={"rules_to_fire": list(rules_to_fire.keys()), "project_id": project_id},
             )
 
-    parsed_rulegroup_to_event_data = parse_rulegroup_to_event_data(rulegroup_to_event_data)
+    parsed_rulegroup_to_event_data = parse_rulegroup_to_event_data(data.rulegroup_to_event_data)
     with metrics.timer("delayed_processing.fire_rules.duration"):
         fire_rules(rules_to_fire, parsed_rulegroup_to_event_data, alert_rules, project)
 
-    cleanup_redis_buffer(project_id, rules_to_groups, batch_key)
+    cleanup_redis_buffer(project_id, rules_to_groups, data.batch_key)
 
 
 @delayed_processing_registry.register("delayed_processing")  # default delayed processing
 class DelayedRule(DelayedProcessingBase):
     buffer_key = PROJECT_ID_BUFFER_LIST_KEY
     option = None
+    bulk_processing_task = apply_delayed_bulk
 
     @property
     def hash_args(self) -> BufferHashKeys:
@@ -2,8 +2,11 @@ from __future__ import annotations
 
 import logging
 import random
+import threading
+import time
 import uuid
 from collections.abc import Callable, Collection, Mapping, MutableMapping, Sequence
+from dataclasses import dataclass, replace
 from datetime import timedelta
 from random import randrange
 from typing import Any
@@ -11,7 +14,7 @@ from typing import Any
 from django.core.cache import cache
 from django.utils import timezone
 
-from sentry import analytics, buffer, features
+from sentry import analytics, buffer, features, options
 from sentry.eventstore.models import GroupEvent
 from sentry.models.environment import Environment
 from sentry.models.group import Group
@@ -83,6 +86,125 @@ def split_conditions_and_filters(
     return condition_list, filter_list
 
 
+def is_filter_slow(condition: Mapping[str, Any]) -> bool:
+    return any(
+        slow_filter in condition["id"]
+        for slow_filter in options.get("rules.slow-filter-matches")
+    )
+
+
+@dataclass(frozen=True)
+class CompiledCondition:
+    """
+    A condition or filter along with its registered class. Instances of
+    conditions hold the project they were created for, so they are created
+    for every evaluation with the project of the event, see `bind`.
+    """
+
+    condition_cls: type[EventCondition | EventFilter]
+    data: dict[str, Any]
+
+    def bind(self, project: Project, rule: Rule) -> EventCondition | EventFilter:
+        return self.condition_cls(project=project, data=self.data, rule=rule)
+
+
+def compile_condition(condition: dict[str, Any]) -> CompiledCondition | None:
+    condition_cls = rules.get(condition["id"])
+    if condition_cls is None or not issubclass(condition_cls, (EventCondition, EventFilter)):
+        logger.warning("Unregistered condition %r", condition["id"])
+        return None
+    return CompiledCondition(condition_cls=condition_cls, data=condition)
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """
+    A rule with its conditions and filters split, ordered by cost and
+    resolved in the rule registry, so that evaluating it for an event does
+    not need to touch the registry. Unregistered conditions are kept as
+    `None` and never pass.
+    """
+
+    rule: Rule
+    condition_match: str
+    filter_match: str
+    frequency: int
+    filters: Sequence[CompiledCondition | None]
+    fast_conditions: Sequence[CompiledCondition | None]
+    slow_conditions: Sequence[EventFrequencyConditionData]
+
+
+def compile_rule(rule: Rule) -> CompiledRule:
+    condition_list, filter_list = split_conditions_and_filters(rule.data.get("conditions", ()))
+    # The match functions short circuit, so evaluate cheap filters first.
+    filter_list.sort(key=is_filter_slow)
+
+    fast_conditions = []
+    slow_conditions: list[EventFrequencyConditionData] = []
+    for condition in condition_list:
+        if is_condition_slow(condition):
+            slow_conditions.append(condition)  # type: ignore[arg-type]
+        else:
+            fast_conditions.append(condition)
+
+    return CompiledRule(
+        rule=rule,
+        condition_match=rule.data.get("action_match") or Rule.DEFAULT_CONDITION_MATCH,
+        filter_match=rule.data.get("filter_match") or Rule.DEFAULT_FILTER_MATCH,
+        frequency=rule.data.get("frequency") or Rule.DEFAULT_FREQUENCY,
+        filters=[compile_condition(f) for f in filter_list],
+        fast_conditions=[compile_condition(c) for c in fast_conditions],
+        slow_conditions=slow_conditions,
+    )
+
+
+@dataclass(frozen=True)
+class RulePlan:
+    version: str
+    expires_at: float
+    version_expires_at: float
+    rules: Sequence[CompiledRule]
+
+
+_rule_plans: dict[int, RulePlan] = {}
+_rule_plans_lock = threading.Lock()
+
+
+def get_rule_plan(project: Project) -> Sequence[CompiledRule]:
+    """
+    Returns the compiled rules of a project. Plans are cached in process for
+    `rules.plan-cache.ttl` seconds and invalidated when any rule of the
+    project changes, see `Rule.get_rules_version`. The version is checked
+    again at most every `rules.plan-cache.version-ttl` seconds.
+    """
+    now = time.monotonic()
+    plan = _rule_plans.get(project.id)
+    if plan is not None and plan.expires_at > now and plan.version_expires_at > now:
+        metrics.incr("rules.plan_cache", tags={"result": "hit"}, skip_internal=True)
+        return plan.rules
+
+    version = Rule.get_rules_version(project.id)
+    version_expires_at = now + options.get("rules.plan-cache.version-ttl")
+    if plan is not None and plan.expires_at > now and plan.version == version:
+        metrics.incr("rules.plan_cache", tags={"result": "hit"}, skip_internal=True)
+        plan = replace(plan, version_expires_at=version_expires_at)
+    else:
+        metrics.incr("rules.plan_cache", tags={"result": "miss"}, skip_internal=True)
+        plan = RulePlan(
+            version=version,
+            expires_at=now + options.get("rules.plan-cache.ttl"),
+            version_expires_at=version_expires_at,
+            rules=[compile_rule(rule) for rule in Rule.get_for_project(project.id)],
+        )
+
+    with _rule_plans_lock:
+        # Drop expired plans of projects which stopped sending events.
+        for project_id in [k for k, v in _rule_plans.items() if v.expires_at <= now]:
+            del _rule_plans[project_id]
+        _rule_plans[project.id] = plan
+    return plan.rules
+
+
 def build_rule_status_cache_key(rule_id: int, group_id: int) -> str:
     return "grouprulestatus:1:%s" % hash_values([group_id, rule_id])
 
@@ -231,21 +353,12 @@ class RuleProcessor:
         rules_: Sequence[Rule] = Rule.get_for_project(self.project.id)
         return rules_
 
-    def condition_matches(
-        self,
-        condition: dict[str, Any],
-        state: EventState,
-        rule: Rule,
+    def compiled_condition_matches(
+        self, condition: CompiledCondition | None, state: EventState, rule: Rule
     ) -> bool | None:
-        condition_cls = rules.get(condition["id"])
-        if condition_cls is None:
-            logger.warning("Unregistered condition %r", condition["id"])
-            return None
-
-        condition_inst = condition_cls(project=self.project, data=condition, rule=rule)
-        if not isinstance(condition_inst, (EventCondition, EventFilter)):
-            logger.warning("Unregistered condition %r", condition["id"])
+        if condition is None:
             return None
+        condition_inst = condition.bind(self.project, rule)
         return safe_execute(condition_inst.passes, self.event, state) or False
 
     def get_state(self) -> EventState:
@@ -257,20 +370,6 @@ class RuleProcessor:
             has_escalated=self.has_escalated,
         )
 
-    def group_conditions_by_speed(
-        self, conditions: list[dict[str, Any]]
-    ) -> tuple[list[dict[str, str]], list[EventFrequencyConditionData]]:
-        fast_conditions = []
-        slow_conditions: list[EventFrequencyConditionData] = []
-
-        for condition in conditions:
-            if is_condition_slow(condition):
-                slow_conditions.append(condition)  # type: ignore[arg-type]
-            else:
-                fast_conditions.append(condition)
-
-        return fast_conditions, slow_conditions
-
     def enqueue_rule(self, rule: Rule) -> None:
         if random.random() < 0.01:
             logger.info(
@@ -290,13 +389,19 @@ class RuleProcessor:
         )
         metrics.incr("delayed_rule.group_added")
 
-    def apply_rule(self, rule: Rule, status: GroupRuleStatus) -> None:
+    def apply_rule(
+        self, rule: Rule, status: GroupRuleStatus, compiled: CompiledRule | None = None
+    ) -> None:
         """
         If all conditions and filters pass, execute every action.
 
         :param rule: `Rule` object
+        :param compiled: the `CompiledRule` of `rule`, compiled on demand if not given
         :return: void
         """
+        if compiled is None:
+            compiled = compile_rule(rule)
+
         logging_details = {
             "rule_id": rule.id,
             "group_id": self.group.id,
@@ -309,9 +414,9 @@ class RuleProcessor:
             "new_group_environment": self.is_new_group_environment,
         }
 
-        condition_match = rule.data.get("action_match") or Rule.DEFAULT_CONDITION_MATCH
-        filter_match = rule.data.get("filter_match") or Rule.DEFAULT_FILTER_MATCH
-        frequency = rule.data.get("frequency") or Rule.DEFAULT_FREQUENCY
+        condition_match = compiled.condition_match
+        filter_match = compiled.filter_match
+        frequency = compiled.frequency
         try:
             environment = self.event.get_environment()
         except Environment.DoesNotExist:
@@ -326,13 +431,13 @@ class RuleProcessor:
             return
 
         state = self.get_state()
-        condition_list, filter_list = split_conditions_and_filters(rule.data.get("conditions", ()))
-        fast_conditions, slow_conditions = self.group_conditions_by_speed(condition_list)
-        condition_list = fast_conditions
+        filter_list = compiled.filters
+        fast_conditions = compiled.fast_conditions
+        slow_conditions = compiled.slow_conditions
 
         # evaluate all filters and return if they fail, then do the enqueue logic for conditions
         if filter_list:
-            predicate_iter = (self.condition_matches(f, state, rule) for f in filter_list)
+            predicate_iter = (self.compiled_condition_matches(f, state, rule) for f in filter_list)
             predicate_func = get_match_function(filter_match)
             if predicate_func:
                 if not predicate_func(predicate_iter):
@@ -359,7 +464,9 @@ class RuleProcessor:
             return
 
         if slow_conditions or fast_conditions:
-            predicate_iter = (self.condition_matches(f, state, rule) for f in condition_list)
+            predicate_iter = (
+                self.compiled_condition_matches(c, state, rule) for c in fast_conditions
+            )
             result = False
             if predicate_func:
                 result = predicate_func(predicate_iter)
@@ -430,13 +537,18 @@ class RuleProcessor:
             return {}.values()
 
         self.grouped_futures.clear()
-        rules = self.get_rules()
+        if options.get("rules.plan-cache.enabled"):
+            compiled_rules = get_rule_plan(self.project)
+        else:
+            compiled_rules = [compile_rule(rule) for rule in self.get_rules()]
+        rules = [compiled.rule for compiled in compiled_rules]
+
         snoozed_rules = RuleSnooze.objects.filter(rule__in=rules, user_id=None).values_list(
             "rule", flat=True
         )
         rule_statuses = bulk_get_rule_status(rules, self.group, self.project)
-        for rule in rules:
-            if rule.id not in snoozed_rules:
-                self.apply_rule(rule, rule_statuses[rule.id])
+        for compiled in compiled_rules:
+            if compiled.rule.id not in snoozed_rules:
+                self.apply_rule(compiled.rule, rule_statuses[compiled.rule.id], compiled)
 
         return self.grouped_futures.values()
@@ -313,6 +313,22 @@ def taskworker_scheduler(redis_cluster: str, **options: Any) -> None:
     help="The name of the processing pool being used",
     default="unknown",
 )
+@click.option(
+    "--rpc-batch-size",
+    help="The maximum number of tasks fetched, and results sent, with one batch of RPCs",
+    default=taskworker_constants.DEFAULT_RPC_BATCH_SIZE,
+)
+@click.option(
+    "--child-threads",
+    help="Number of activations of thread safe tasks each child process executes concurrently",
+    default=taskworker_constants.DEFAULT_CHILD_THREADS,
+)
+@click.option(
+    "--fork-server",
+    is_flag=True,
+    default=False,
+    help="Fork child processes from a pre-warmed template process instead of the worker process.",
+)
 @log_options()
 @configuration
 def taskworker(**options: Any) -> None:
@@ -335,6 +351,9 @@ def run_taskworker(
     result_queue_maxsize: int,
     rebalance_after: int,
     processing_pool_name: str,
+    fork_server: bool,
+    rpc_batch_size: int,
+    child_threads: int,
     **options: Any,
 ) -> None:
     """
@@ -353,6 +372,9 @@ def run_taskworker(
             result_queue_maxsize=result_queue_maxsize,
             rebalance_after=rebalance_after,
             processing_pool_name=processing_pool_name,
+            fork_server=fork_server,
+            rpc_batch_size=rpc_batch_size,
+            child_threads=child_threads,
             **options,
         )
         exitcode = worker.start()
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import zlib
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Sequence
+from datetime import datetime
+from hashlib import md5
+from itertools import accumulate, pairwise
+
+from django.core.cache import cache
+
+from sentry import options
+from sentry.db.models.manager.base_query_set import BaseQuerySet
+from sentry.utils import metrics
+
+# Candidate sets larger than this are not cached, to stay below the item size
+# limit of memcached (1MB by default).
+MAX_CACHED_SIZE = 1000 * 1000
+
+
+class CandidateSet:
+    """
+    A compact, sorted set of the ids of the groups matching the Postgres-only
+    filters of an issue search.
+
+    Post-filtering the groups returned by Snuba is a set intersection against
+    this set, instead of a `group_id IN (...)` query per chunk. The set is
+    stored delta encoded and compressed, which takes a few bytes per
+    candidate.
+    """
+
+    def __init__(self, group_ids: Iterable[int]) -> None:
+        self._ids = array("q", sorted(set(group_ids)))
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, group_id: int) -> bool:
+        i = bisect_left(self._ids, group_id)
+        return i < len(self._ids) and self._ids[i] == group_id
+
+    @property
+    def max_id(self) -> int:
+        return self._ids[-1] if self._ids else 0
+
+    def dumps(self) -> bytes:
+        deltas = array("q", self._ids[:1])
+        deltas.extend(b - a for a, b in pairwise(self._ids))
+        return zlib.compress(deltas.tobytes(), 1)
+
+    @classmethod
+    def loads(cls, value: bytes) -> CandidateSet:
+        deltas = array("q")
+        deltas.frombytes(zlib.decompress(value))
+
+        rv = cls(())
+        rv._ids = array("q", accumulate(deltas))
+        return rv
+
+
+def _get_cache_key(group_queryset: BaseQuerySet, ttl: int) -> str:
+    sql, params = group_queryset.values_list("id").query.sql_with_params()
+    # Time bounds like the retention window are relative to the time of the
+    # search, so they are truncated to the TTL for searches to share the set.
+    params = tuple(
+        int(param.timestamp()) // ttl if isinstance(param, datetime) else param
+        for param in params
+    )
+    digest = md5(f"{sql}:{params!r}".encode()).hexdigest()
+    return f"search:candidates:{digest}"
+
+
+def get_candidate_set(group_queryset: BaseQuerySet) -> CandidateSet | None:
+    """
+    Get the candidate set of the Postgres filters in `group_queryset`, or None
+    if more groups than `snuba.search.candidate-index.max-size` match them.
+
+    Candidate sets are shared between searches with the same filters for
+    `snuba.search.candidate-index.ttl` seconds, with time bounds truncated to
+    that TTL. Groups can change within that time, see `filter_group_ids` and
+    check final results against the queryset.
+    """
+    max_size = options.get("snuba.search.candidate-index.max-size")
+    ttl = max(options.get("snuba.search.candidate-index.ttl"), 1)
+    cache_key = _get_cache_key(group_queryset, ttl)
+
+    cached = cache.get(cache_key)
+    if cached is not None:
+        metrics.incr("snuba.search.candidate_index", tags={"result": "hit"})
+        return CandidateSet.loads(cached) if cached else None
+    metrics.incr("snuba.search.candidate_index", tags={"result": "miss"})
+
+    with metrics.timer("snuba.search.candidate_index.build"):
+        group_ids = list(
+            group_queryset.using_replica()
+            .order_by()
+            .values_list("id", flat=True)[: max_size + 1]
+            .iterator()
+        )
+
+    candidates = None
+    value = b""
+    if len(group_ids) <= max_size:
+        candidates = CandidateSet(group_ids)
+        value = candidates.dumps()
+        metrics.distribution("snuba.search.candidate_index.size", len(candidates))
+        metrics.distribution("snuba.search.candidate_index.bytes", len(value))
+        if len(value) > MAX_CACHED_SIZE:
+            candidates = None
+            value = b""
+
+    # Searches exceeding the limits are remembered as well, so they are not
+    # retried by every request.
+    cache.set(cache_key, value, ttl)
+    return candidates
+
+
+def filter_group_ids(
+    group_queryset: BaseQuerySet, candidates: CandidateSet, group_ids: Sequence[int]
+) -> list[int]:
+    """
+    Returns the `group_ids` which match the filters of `group_queryset`, in
+    order. Groups created after the candidate set was built are missing from
+    it, so groups newer than any candidate are checked in Postgres. Older
+    groups are trusted to the candidate set, which may be stale for as long
+    as it is cached.
+    """
+    missing = [group_id for group_id in group_ids if group_id > candidates.max_id]
+    metrics.distribution("snuba.search.candidate_index.missing", len(missing))
+    matching: set[int] = set()
+    if missing:
+        matching = set(group_queryset.filter(id__in=missing).values_list("id", flat=True))
+    return [group_id for group_id in group_ids if group_id in matching or group_id in candidates]
@@ -64,6 +64,7 @@ from sentry.models.team import Team
 from sentry.search.events.builder.discover import UnresolvedQuery
 from sentry.search.events.filter import convert_search_filter_to_snuba_query, format_search_filter
 from sentry.search.events.types import SnubaParams
+from sentry.search.snuba.candidates import CandidateSet, filter_group_ids, get_candidate_set
 from sentry.snuba.dataset import Dataset
 from sentry.users.models.user import User
 from sentry.users.services.user.model import RpcUser
@@ -906,6 +907,10 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
             too_many_candidates = True
             group_ids = []
 
+        candidates: CandidateSet | None = None
+        if too_many_candidates and options.get("snuba.search.candidate-index.enabled"):
+            candidates = get_candidate_set(group_queryset)
+
         sort_field = self.sort_strategies[sort_by]
         chunk_growth = options.get("snuba.search.chunk-growth-rate")
         max_chunk_size = options.get("snuba.search.max-chunk-size")
@@ -993,9 +998,15 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
             else:
                 # pre-filtered candidates were *not* passed down to Snuba,
                 # so we need to do post-filtering to verify Sentry DB predicates
-                filtered_group_ids = group_queryset.filter(
-                    id__in=[gid for gid, _ in snuba_groups]
-                ).values_list("id", flat=True)
+                filtered_group_ids: Sequence[int]
+                if candidates is not None:
+                    filtered_group_ids = filter_group_ids(
+                        group_queryset, candidates, [gid for gid, _ in snuba_groups]
+                    )
+                else:
+                    filtered_group_ids = group_queryset.filter(
+                        id__in=[gid for gid, _ in snuba_groups]
+                    ).values_list("id", flat=True)
 
                 group_to_score = dict(snuba_groups)
                 for group_id in filtered_group_ids:
@@ -1044,7 +1055,12 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
 
         metrics.distribution("snuba.search.num_chunks", num_chunks)
 
-        groups = Group.objects.in_bulk(paginator_results.results)
+        if candidates is not None:
+            # The candidate set may be slightly stale, so groups that stopped
+            # matching the Postgres filters are dropped while loading the page.
+            groups = group_queryset.order_by().in_bulk(paginator_results.results)
+        else:
+            groups = Group.objects.in_bulk(paginator_results.results)
         paginator_results.results = [groups[k] for k in paginator_results.results if k in groups]
 
         metrics.timing(
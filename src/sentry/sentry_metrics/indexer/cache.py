@@ -2,9 +2,11 @@ from __future__ import annotations
 
 import logging
 import random
+import threading
 from collections.abc import Collection, Iterable, Mapping, MutableMapping, Sequence
 from datetime import datetime, timedelta
 
+from cachetools import TTLCache
 from django.conf import settings
 from django.core.cache import caches
 
@@ -37,9 +39,12 @@ _INDEXER_CACHE_STALE_KEYS_METRIC = "sentry_metrics.indexer.memcache.stale-keys"
 # only used to compare to the older version of the PGIndexer
 _INDEXER_CACHE_FETCH_METRIC = "sentry_metrics.indexer.memcache.fetch"
 
+_INDEXER_LOCAL_CACHE_METRIC = "sentry_metrics.indexer.local_cache"
+
 
 NAMESPACED_WRITE_FEAT_FLAG = "sentry-metrics.indexer.write-new-cache-namespace"
 NAMESPACED_READ_FEAT_FLAG = "sentry-metrics.indexer.read-new-cache-namespace"
+LOCAL_CACHE_FEAT_FLAG = "sentry-metrics.indexer.local-cache.enabled"
 
 BULK_RECORD_CACHE_NAMESPACE = "br"
 RESOLVE_CACHE_NAMESPACE = "res"
@@ -205,10 +210,84 @@ class StringIndexerCache:
             )
 
 
+class LocalIndexerCache:
+    """
+    A bounded in-process tier in front of `StringIndexerCache`.
+
+    Keys are formatted like "use_case_id:org_id:string" for strings, and
+    "use_case_id:org_id:id" for the reverse lookup. Once assigned, ids never
+    change, so entries only expire after `ttl` to bound the memory used by
+    strings that are no longer seen. Strings that failed to resolve are
+    remembered for `negative_ttl`, which should be short since they can be
+    recorded by another process at any time.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, negative_ttl: float) -> None:
+        self._lock = threading.Lock()
+        self._ids: TTLCache[str, int] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._strings: TTLCache[str, str] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._missing: TTLCache[str, bool] = TTLCache(maxsize=maxsize, ttl=negative_ttl)
+
+    def get(self, key: str) -> int | None:
+        with self._lock:
+            return self._ids.get(key)
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, int]:
+        with self._lock:
+            return {key: id for key in keys if (id := self._ids.get(key)) is not None}
+
+    def set_many(self, key_values: Mapping[str, int]) -> None:
+        with self._lock:
+            for key, id in key_values.items():
+                self._ids[key] = id
+                self._missing.pop(key, None)
+                use_case_id, org_id, string = key.split(":", 2)
+                self._strings[f"{use_case_id}:{org_id}:{id}"] = string
+
+    def is_missing(self, key: str) -> bool:
+        with self._lock:
+            return key in self._missing
+
+    def set_missing(self, key: str) -> None:
+        with self._lock:
+            self._missing[key] = True
+
+    def get_string(self, key: str) -> str | None:
+        with self._lock:
+            return self._strings.get(key)
+
+    def set_strings(self, key_values: Mapping[str, str]) -> None:
+        with self._lock:
+            self._strings.update(key_values)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ids.clear()
+            self._strings.clear()
+            self._missing.clear()
+
+
+def _record_local_cache_metric(caller: str, result: str, amount: int = 1) -> None:
+    if amount:
+        metrics.incr(
+            _INDEXER_LOCAL_CACHE_METRIC,
+            tags={"caller": caller, "result": result},
+            amount=amount,
+        )
+
+
 class CachingIndexer(StringIndexer):
-    def __init__(self, cache: StringIndexerCache, indexer: StringIndexer) -> None:
+    def __init__(
+        self,
+        cache: StringIndexerCache,
+        indexer: StringIndexer,
+        local_cache: LocalIndexerCache | None = None,
+    ) -> None:
         self.cache = cache
         self.indexer = indexer
+        self.local_cache = local_cache or LocalIndexerCache(
+            **settings.SENTRY_METRICS_INDEXER_LOCAL_CACHE_OPTIONS
+        )
 
     def bulk_record(
         self, strings: Mapping[UseCaseID, Mapping[OrgId, set[str]]]
@@ -216,7 +295,21 @@ class CachingIndexer(StringIndexer):
         cache_keys = UseCaseKeyCollection(strings)
         metrics.gauge("sentry_metrics.indexer.lookups_per_batch", value=cache_keys.size)
         cache_key_strs = cache_keys.as_strings()
+
+        use_local_cache = options.get(LOCAL_CACHE_FEAT_FLAG)
+        local_results: dict[str, int] = {}
+        if use_local_cache:
+            local_results = self.local_cache.get_many(cache_key_strs)
+            _record_local_cache_metric("bulk_record", "hit", len(local_results))
+            _record_local_cache_metric(
+                "bulk_record", "miss", len(cache_key_strs) - len(local_results)
+            )
+            cache_key_strs = [k for k in cache_key_strs if k not in local_results]
+
         cache_results = self.cache.get_many(BULK_RECORD_CACHE_NAMESPACE, cache_key_strs)
+        if use_local_cache:
+            self.local_cache.set_many({k: v for k, v in cache_results.items() if v is not None})
+            cache_results.update(local_results)
 
         hits = [k for k, v in cache_results.items() if v is not None]
 
@@ -256,9 +349,10 @@ class CachingIndexer(StringIndexer):
             }
         )
 
-        self.cache.set_many(
-            BULK_RECORD_CACHE_NAMESPACE, db_record_key_results.get_mapped_strings_to_ints()
-        )
+        db_mapped_strings = db_record_key_results.get_mapped_strings_to_ints()
+        self.cache.set_many(BULK_RECORD_CACHE_NAMESPACE, db_mapped_strings)
+        if use_local_cache:
+            self.local_cache.set_many(db_mapped_strings)
 
         return cache_key_results.merge(db_record_key_results)
 
@@ -269,6 +363,18 @@ class CachingIndexer(StringIndexer):
     @metric_path_key_compatible_resolve
     def resolve(self, use_case_id: UseCaseID, org_id: int, string: str) -> int | None:
         key = f"{use_case_id.value}:{org_id}:{string}"
+
+        use_local_cache = options.get(LOCAL_CACHE_FEAT_FLAG)
+        if use_local_cache:
+            local_result = self.local_cache.get(key)
+            if local_result is not None:
+                _record_local_cache_metric("resolve", "hit")
+                return local_result
+            if self.local_cache.is_missing(key):
+                _record_local_cache_metric("resolve", "negative_hit")
+                return None
+            _record_local_cache_metric("resolve", "miss")
+
         result = self.cache.get(RESOLVE_CACHE_NAMESPACE, key)
 
         if result and isinstance(result, int):
@@ -276,9 +382,16 @@ class CachingIndexer(StringIndexer):
                 _INDEXER_CACHE_RESOLVE_METRIC,
                 tags={"cache_hit": "true", "use_case": use_case_id.value},
             )
+            if use_local_cache:
+                self.local_cache.set_many({key: result})
             return result
 
         id = self.indexer.resolve(use_case_id, org_id, string)
+        if use_local_cache:
+            if id is None:
+                self.local_cache.set_missing(key)
+            else:
+                self.local_cache.set_many({key: id})
         if id is not None:
             metrics.incr(
                 _INDEXER_CACHE_RESOLVE_METRIC,
@@ -298,12 +411,46 @@ class CachingIndexer(StringIndexer):
 
     @metric_path_key_compatible_rev_resolve
     def reverse_resolve(self, use_case_id: UseCaseID, org_id: int, id: int) -> str | None:
-        return self.indexer.reverse_resolve(use_case_id, org_id, id)
+        if not options.get(LOCAL_CACHE_FEAT_FLAG):
+            return self.indexer.reverse_resolve(use_case_id, org_id, id)
+
+        key = f"{use_case_id.value}:{org_id}:{id}"
+        string = self.local_cache.get_string(key)
+        if string is not None:
+            _record_local_cache_metric("reverse_resolve", "hit")
+            return string
+
+        _record_local_cache_metric("reverse_resolve", "miss")
+        string = self.indexer.reverse_resolve(use_case_id, org_id, id)
+        if string is not None:
+            self.local_cache.set_strings({key: string})
+        return string
 
     def bulk_reverse_resolve(
         self, use_case_id: UseCaseID, org_id: int, ids: Collection[int]
     ) -> Mapping[int, str]:
-        return self.indexer.bulk_reverse_resolve(use_case_id, org_id, ids)
+        if not options.get(LOCAL_CACHE_FEAT_FLAG):
+            return self.indexer.bulk_reverse_resolve(use_case_id, org_id, ids)
+
+        results: dict[int, str] = {}
+        missing_ids = []
+        for id in ids:
+            string = self.local_cache.get_string(f"{use_case_id.value}:{org_id}:{id}")
+            if string is not None:
+                results[id] = string
+            else:
+                missing_ids.append(id)
+
+        _record_local_cache_metric("bulk_reverse_resolve", "hit", len(results))
+        _record_local_cache_metric("bulk_reverse_resolve", "miss", len(missing_ids))
+
+        if missing_ids:
+            fetched = self.indexer.bulk_reverse_resolve(use_case_id, org_id, missing_ids)
+            self.local_cache.set_strings(
+                {f"{use_case_id.value}:{org_id}:{id}": string for id, string in fetched.items()}
+            )
+            results.update(fetched)
+        return results
 
     def resolve_shared_org(self, string: str) -> int | None:
         raise NotImplementedError(
@@ -64,9 +64,10 @@ Glossary for types of keys:
 from __future__ import annotations
 
 import itertools
-from collections.abc import MutableMapping, Sequence
+from collections.abc import Collection, Generator, MutableMapping, Sequence
 from typing import Any, NamedTuple
 
+import orjson
 import rapidjson
 from django.conf import settings
 from django.utils.functional import cached_property
@@ -104,6 +105,11 @@ def get_redis_client() -> RedisCluster[bytes] | StrictRedis[bytes]:
 
 add_buffer_script = redis.load_redis_script("spans/add-buffer.lua")
 
+# Defaults for the number of segments and the size of span payloads loaded from
+# Redis at once when flushing, see `SpansBuffer.iter_flush_segments`.
+DEFAULT_FLUSH_CHUNK_SIZE = 100
+DEFAULT_FLUSH_MAX_BYTES = 64 * 1024 * 1024
+
 
 # NamedTuples are faster to construct than dataclasses
 class Span(NamedTuple):
@@ -134,6 +140,11 @@ class FlushedSegment(NamedTuple):
     spans: list[OutputSpan]
 
 
+class FlushChunk(NamedTuple):
+    shard: int
+    segments: dict[SegmentKey, FlushedSegment]
+
+
 class SpansBuffer:
     def __init__(
         self,
@@ -307,6 +318,31 @@ class SpansBuffer:
         return trees
 
     def flush_segments(self, now: int, max_segments: int = 0) -> dict[SegmentKey, FlushedSegment]:
+        return_segments = {}
+        for chunk in self.iter_flush_segments(now, max_segments=max_segments):
+            return_segments.update(chunk.segments)
+        return return_segments
+
+    def iter_flush_segments(
+        self,
+        now: int,
+        max_segments: int = 0,
+        max_bytes: int = DEFAULT_FLUSH_MAX_BYTES,
+    ) -> Generator[FlushChunk]:
+        """
+        Load and decode all segments that are due for flushing, in chunks.
+
+        Segment data is loaded from Redis one chunk at a time, and each chunk
+        only contains segments of one shard. The size of the next chunk is
+        adjusted based on the size of the previous one, such that a chunk
+        holds roughly `max_bytes` of span payloads. Callers are expected to
+        produce and `done_flush_segments` each chunk before requesting the
+        next one, which bounds the memory used by large segments.
+
+        :param max_segments: The maximum number of segments per shard to
+            flush, and the maximum number of segments in a chunk.
+        :param max_bytes: The targeted size of span payloads per chunk.
+        """
         cutoff = now
 
         queue_keys = []
@@ -323,76 +359,100 @@ class SpansBuffer:
 
                 result = iter(p.execute())
 
-        segment_keys: list[tuple[QueueKey, SegmentKey]] = []
-        queue_sizes = []
-
-        with metrics.timer("spans.buffer.flush_segments.load_segment_data"):
-            with self.client.pipeline(transaction=False) as p:
-                # ZRANGEBYSCORE output
-                for queue_key, segment_span_ids in zip(queue_keys, result):
-                    # process return value of zrevrangebyscore
-                    for segment_key in segment_span_ids:
-                        segment_keys.append((queue_key, segment_key))
-                        p.smembers(segment_key)
-
-                    # ZCARD output
-                    queue_sizes.append(next(result))
-
-                segments = p.execute()
-
-        for shard_i, queue_size in zip(self.assigned_shards, queue_sizes):
+        segment_keys_by_shard: list[tuple[int, QueueKey, list[SegmentKey]]] = []
+        for shard, queue_key, segment_keys in zip(self.assigned_shards, queue_keys, result):
+            segment_keys_by_shard.append((shard, queue_key, segment_keys))
+            # ZCARD output
             metrics.timing(
                 "spans.buffer.flush_segments.queue_size",
-                queue_size,
-                tags={"shard_i": shard_i},
+                next(result),
+                tags={"shard_i": shard},
             )
 
-        return_segments = {}
-
+        max_chunk_size = max_segments or DEFAULT_FLUSH_CHUNK_SIZE
+        num_segments = 0
         num_has_root_spans = 0
 
-        for (queue_key, segment_key), segment in zip(segment_keys, segments):
-            segment_span_id = _segment_key_to_span_id(segment_key).decode("ascii")
+        for shard, queue_key, segment_keys in segment_keys_by_shard:
+            tags = {"shard_i": shard}
+            chunk_size = max_chunk_size
 
-            output_spans = []
-            has_root_span = False
-            metrics.timing("spans.buffer.flush_segments.num_spans_per_segment", len(segment))
-            for payload in segment:
-                val = rapidjson.loads(payload)
-                old_segment_id = val.get("segment_id")
-                outcome = "same" if old_segment_id == segment_span_id else "different"
+            while segment_keys:
+                batch, segment_keys = segment_keys[:chunk_size], segment_keys[chunk_size:]
 
-                is_segment = val["is_segment"] = segment_span_id == val["span_id"]
-                if is_segment:
-                    has_root_span = True
+                with metrics.timer("spans.buffer.flush_segments.load_segment_data", tags=tags):
+                    with self.client.pipeline(transaction=False) as p:
+                        for segment_key in batch:
+                            p.smembers(segment_key)
+                        segments = p.execute()
 
-                val_data = val.setdefault("data", {})
-                if isinstance(val_data, dict):
-                    val_data["__sentry_internal_span_buffer_outcome"] = outcome
+                chunk_bytes = 0
+                chunk: dict[SegmentKey, FlushedSegment] = {}
+                with metrics.timer("spans.buffer.flush_segments.decode_segments", tags=tags):
+                    for segment_key, segment in zip(batch, segments):
+                        chunk_bytes += sum(len(payload) for payload in segment)
+                        output_spans, has_root_span = self._decode_segment(segment_key, segment)
+                        chunk[segment_key] = FlushedSegment(queue_key=queue_key, spans=output_spans)
+                        num_has_root_spans += int(has_root_span)
 
-                    if old_segment_id:
-                        val_data["__sentry_internal_old_segment_id"] = old_segment_id
+                metrics.timing("spans.buffer.flush_segments.chunk_bytes", chunk_bytes, tags=tags)
+                num_segments += len(chunk)
+                del segments
 
-                val["segment_id"] = segment_span_id
+                yield FlushChunk(shard=shard, segments=chunk)
 
-                metrics.incr(
-                    "spans.buffer.flush_segments.is_same_segment",
-                    tags={
-                        "outcome": outcome,
-                        "is_segment_span": is_segment,
-                        "old_segment_is_null": "true" if old_segment_id is None else "false",
-                    },
-                )
+                if chunk_bytes:
+                    chunk_size = max(1, min(max_chunk_size, max_bytes * len(batch) // chunk_bytes))
 
-                output_spans.append(OutputSpan(payload=val))
+        metrics.timing("spans.buffer.flush_segments.num_segments", num_segments)
+        metrics.timing("spans.buffer.flush_segments.has_root_span", num_has_root_spans)
 
-            return_segments[segment_key] = FlushedSegment(queue_key=queue_key, spans=output_spans)
-            num_has_root_spans += int(has_root_span)
+    def _decode_segment(
+        self, segment_key: SegmentKey, segment: Collection[bytes]
+    ) -> tuple[list[OutputSpan], bool]:
+        segment_span_id = _segment_key_to_span_id(segment_key).decode("ascii")
+
+        metrics.timing("spans.buffer.flush_segments.num_spans_per_segment", len(segment))
+
+        # Parse all payloads of the segment with a single call by joining them
+        # into one JSON array. orjson does not support integers larger than 64
+        # bits, fall back to parsing payloads individually if it fails.
+        try:
+            vals = orjson.loads(b"[" + b",".join(segment) + b"]")
+        except orjson.JSONDecodeError:
+            vals = [rapidjson.loads(payload) for payload in segment]
+
+        output_spans = []
+        has_root_span = False
+        for val in vals:
+            old_segment_id = val.get("segment_id")
+            outcome = "same" if old_segment_id == segment_span_id else "different"
+
+            is_segment = val["is_segment"] = segment_span_id == val["span_id"]
+            if is_segment:
+                has_root_span = True
+
+            val_data = val.setdefault("data", {})
+            if isinstance(val_data, dict):
+                val_data["__sentry_internal_span_buffer_outcome"] = outcome
+
+                if old_segment_id:
+                    val_data["__sentry_internal_old_segment_id"] = old_segment_id
+
+            val["segment_id"] = segment_span_id
+
+            metrics.incr(
+                "spans.buffer.flush_segments.is_same_segment",
+                tags={
+                    "outcome": outcome,
+                    "is_segment_span": is_segment,
+                    "old_segment_is_null": "true" if old_segment_id is None else "false",
+                },
+            )
 
-        metrics.timing("spans.buffer.flush_segments.num_segments", len(return_segments))
-        metrics.timing("spans.buffer.flush_segments.has_root_span", num_has_root_spans)
+            output_spans.append(OutputSpan(payload=val))
 
-        return return_segments
+        return output_spans, has_root_span
 
     def done_flush_segments(self, segment_keys: dict[SegmentKey, FlushedSegment]):
         metrics.timing("spans.buffer.done_flush_segments.num_segments", len(segment_keys))
@@ -11,7 +11,7 @@ from arroyo.processing.strategies.commit import CommitOffsets
 from arroyo.processing.strategies.run_task import RunTask
 from arroyo.types import Commit, FilteredPayload, Message, Partition
 
-from sentry.spans.buffer import Span, SpansBuffer
+from sentry.spans.buffer import DEFAULT_FLUSH_MAX_BYTES, Span, SpansBuffer
 from sentry.spans.consumers.process.flusher import SpanFlusher
 from sentry.utils.arroyo import MultiprocessingPool, run_task_with_multiprocessing
 
@@ -37,6 +37,7 @@ class ProcessSpansStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
         input_block_size: int | None,
         output_block_size: int | None,
         produce_to_pipe: Callable[[KafkaPayload], None] | None = None,
+        max_flush_bytes: int = DEFAULT_FLUSH_MAX_BYTES,
     ):
         super().__init__()
 
@@ -44,6 +45,7 @@ class ProcessSpansStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
         self.max_batch_size = max_batch_size
         self.max_batch_time = max_batch_time
         self.max_flush_segments = max_flush_segments
+        self.max_flush_bytes = max_flush_bytes
         self.input_block_size = input_block_size
         self.output_block_size = output_block_size
         self.num_processes = num_processes
@@ -69,6 +71,7 @@ class ProcessSpansStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
             self.max_flush_segments,
             self.produce_to_pipe,
             next_step=committer,
+            max_flush_bytes=self.max_flush_bytes,
         )
 
         if self.num_processes != 1:
@@ -2,7 +2,9 @@ import multiprocessing
 import threading
 import time
 from collections.abc import Callable
+from typing import Any
 
+import orjson
 import rapidjson
 from arroyo import Topic as ArroyoTopic
 from arroyo.backends.kafka import KafkaPayload, KafkaProducer, build_kafka_configuration
@@ -10,11 +12,20 @@ from arroyo.processing.strategies.abstract import ProcessingStrategy
 from arroyo.types import FilteredPayload, Message
 
 from sentry.conf.types.kafka_definition import Topic
-from sentry.spans.buffer import SpansBuffer
+from sentry.spans.buffer import DEFAULT_FLUSH_MAX_BYTES, SpansBuffer
 from sentry.utils import metrics
 from sentry.utils.kafka_config import get_kafka_producer_cluster_options, get_topic_definition
 
 
+def _encode_segment(spans: list[dict[str, Any]]) -> bytes:
+    # orjson does not support integers larger than 64 bits, which spans may
+    # contain (see `SpansBuffer._decode_segment`), fall back to rapidjson then.
+    try:
+        return orjson.dumps({"spans": spans})
+    except orjson.JSONEncodeError:
+        return rapidjson.dumps({"spans": spans}).encode("utf8")
+
+
 class SpanFlusher(ProcessingStrategy[FilteredPayload | int]):
     """
     A background thread that polls Redis for new segments to flush and to produce to Kafka.
@@ -26,6 +37,8 @@ class SpanFlusher(ProcessingStrategy[FilteredPayload | int]):
 
     :param topic: The topic to send segments to.
     :param max_flush_segments: How many segments to flush at once in a single Redis call.
+    :param max_flush_bytes: Roughly how many bytes of span payloads to hold in memory at once
+        while flushing. Segments are loaded, produced and deleted in chunks of this size.
     :param produce_to_pipe: For unit-testing, produce to this multiprocessing Pipe instead of creating a kafka consumer.
     """
 
@@ -35,9 +48,11 @@ class SpanFlusher(ProcessingStrategy[FilteredPayload | int]):
         max_flush_segments: int,
         produce_to_pipe: Callable[[KafkaPayload], None] | None,
         next_step: ProcessingStrategy[FilteredPayload | int],
+        max_flush_bytes: int = DEFAULT_FLUSH_MAX_BYTES,
     ):
         self.buffer = buffer
         self.max_flush_segments = max_flush_segments
+        self.max_flush_bytes = max_flush_bytes
         self.next_step = next_step
 
         self.stopped = multiprocessing.Value("i", 0)
@@ -61,6 +76,7 @@ class SpanFlusher(ProcessingStrategy[FilteredPayload | int]):
                 self.current_drift,
                 self.buffer,
                 self.max_flush_segments,
+                self.max_flush_bytes,
                 produce_to_pipe,
             ),
             daemon=True,
@@ -75,6 +91,7 @@ class SpanFlusher(ProcessingStrategy[FilteredPayload | int]):
         current_drift,
         buffer: SpansBuffer,
         max_flush_segments: int,
+        max_flush_bytes: int,
         produce_to_pipe: Callable[[KafkaPayload], None] | None,
     ) -> None:
         try:
@@ -100,35 +117,43 @@ class SpanFlusher(ProcessingStrategy[FilteredPayload | int]):
 
             while not stopped.value:
                 now = int(time.time()) + current_drift.value
-                flushed_segments = buffer.flush_segments(max_segments=max_flush_segments, now=now)
+                flushed_any = False
 
-                if not flushed_segments:
-                    time.sleep(1)
-                    continue
-
-                for _, flushed_segment in flushed_segments.items():
-                    if not flushed_segment.spans:
-                        # This is a bug, most likely the input topic is not
-                        # partitioned by trace_id so multiple consumers are writing
-                        # over each other. The consequence is duplicated segments,
-                        # worst-case.
-                        metrics.incr("sentry.spans.buffer.empty_segments")
+                for chunk in buffer.iter_flush_segments(
+                    now=now, max_segments=max_flush_segments, max_bytes=max_flush_bytes
+                ):
+                    flushed_segments = chunk.segments
+                    if not flushed_segments:
                         continue
+                    flushed_any = True
 
-                    spans = [span.payload for span in flushed_segment.spans]
+                    with metrics.timer(
+                        "spans.buffer.flusher.produce", tags={"shard_i": chunk.shard}
+                    ):
+                        for _, flushed_segment in flushed_segments.items():
+                            if not flushed_segment.spans:
+                                # This is a bug, most likely the input topic is not
+                                # partitioned by trace_id so multiple consumers are writing
+                                # over each other. The consequence is duplicated segments,
+                                # worst-case.
+                                metrics.incr("sentry.spans.buffer.empty_segments")
+                                continue
 
-                    kafka_payload = KafkaPayload(
-                        None, rapidjson.dumps({"spans": spans}).encode("utf8"), []
-                    )
+                            spans = [span.payload for span in flushed_segment.spans]
 
-                    produce(kafka_payload)
+                            kafka_payload = KafkaPayload(None, _encode_segment(spans), [])
 
-                for future in producer_futures:
-                    future.result()
+                            produce(kafka_payload)
 
-                producer_futures.clear()
+                        for future in producer_futures:
+                            future.result()
 
-                buffer.done_flush_segments(flushed_segments)
+                        producer_futures.clear()
+
+                    buffer.done_flush_segments(flushed_segments)
+
+                if not flushed_any:
+                    time.sleep(1)
 
             if producer is not None:
                 producer.close()
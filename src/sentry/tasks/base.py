@@ -11,7 +11,7 @@ from celery import Task
 from django.conf import settings
 from django.db.models import Model
 
-from sentry import options
+from sentry import nodestore, options
 from sentry.celery import app
 from sentry.silo.base import SiloLimit, SiloMode
 from sentry.taskworker.config import TaskworkerConfig
@@ -183,6 +183,7 @@ def instrumented_task(
             with (
                 metrics.timer(key, instance=instance),
                 track_memory_usage("jobs.memory_change", instance=instance),
+                nodestore.backend.request_cache(),
             ):
                 result = func(*args, **kwargs)
 
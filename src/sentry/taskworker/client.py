@@ -1,8 +1,9 @@
+import dataclasses
 import hashlib
 import hmac
 import logging
 import random
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from typing import TYPE_CHECKING, Any
 
 import grpc
@@ -82,6 +83,15 @@ class RequestSignatureInterceptor(InterceptorBase):
         return continuation(call_details_with_meta, request)
 
 
+@dataclasses.dataclass(frozen=True)
+class UpdateTaskResult:
+    """Outcome of a single status update sent with `TaskworkerClient.update_tasks`"""
+
+    task_id: str
+    next_task: TaskActivation | None = None
+    error: grpc.RpcError | None = None
+
+
 class TaskworkerClient:
     """
     Taskworker RPC client wrapper
@@ -133,15 +143,15 @@ class TaskworkerClient:
         domain, port = pattern.split(":")
         return [f"{domain}-{i}:{port}" for i in range(0, num_brokers)]
 
-    def _get_cur_stub(self) -> tuple[str, ConsumerServiceStub]:
-        if self._num_tasks_before_rebalance == 0:
+    def _get_cur_stub(self, num_tasks: int = 1) -> tuple[str, ConsumerServiceStub]:
+        if self._num_tasks_before_rebalance <= 0:
             self._cur_host = random.choice(self._hosts)
             self._num_tasks_before_rebalance = self._max_tasks_before_rebalance
 
         if self._cur_host not in self._host_to_stubs:
             self._host_to_stubs[self._cur_host] = self._connect_to_host(self._cur_host)
 
-        self._num_tasks_before_rebalance -= 1
+        self._num_tasks_before_rebalance -= num_tasks
         return self._cur_host, self._host_to_stubs[self._cur_host]
 
     def get_task(self, namespace: str | None = None) -> TaskActivation | None:
@@ -152,6 +162,7 @@ class TaskworkerClient:
         This will return None if there are no tasks to fetch.
         """
         request = GetTaskRequest(namespace=namespace)
+        metrics.incr("taskworker.client.rpc", tags={"method": "GetTask"})
         try:
             with metrics.timer("taskworker.get_task.rpc"):
                 host, stub = self._get_cur_stub()
@@ -172,6 +183,47 @@ class TaskworkerClient:
             return response.task
         return None
 
+    def get_tasks(self, namespace: str | None = None, count: int = 1) -> list[TaskActivation]:
+        """
+        Fetch up to `count` pending tasks.
+
+        The broker hands out one task per GetTask call, so the calls are
+        pipelined on the channel of a single broker and share one round trip.
+        Fewer tasks are returned when the broker runs out of pending tasks.
+        """
+        request = GetTaskRequest(namespace=namespace)
+        tasks: list[TaskActivation] = []
+        error: grpc.RpcError | None = None
+        with metrics.timer("taskworker.get_tasks.rpc"):
+            host, stub = self._get_cur_stub(count)
+            futures = [stub.GetTask.future(request) for _ in range(count)]
+            for future in futures:
+                try:
+                    response = future.result()
+                except grpc.RpcError as err:
+                    metrics.incr(
+                        "taskworker.client.rpc_error",
+                        tags={"method": "GetTask", "status": err.code().name},
+                    )
+                    if err.code() != grpc.StatusCode.NOT_FOUND:
+                        error = err
+                    continue
+                if response.HasField("task"):
+                    metrics.incr(
+                        "taskworker.client.get_task",
+                        tags={"namespace": response.task.namespace},
+                    )
+                    self._task_id_to_host[response.task.id] = host
+                    tasks.append(response.task)
+
+        metrics.incr("taskworker.client.rpc", amount=count, tags={"method": "GetTask"})
+        metrics.distribution("taskworker.client.get_tasks.batch_size", len(tasks))
+        # Tasks that were handed out must not be dropped because of a
+        # failure of another call in the batch.
+        if error is not None and not tasks:
+            raise error
+        return tasks
+
     def update_task(
         self,
         task_id: str,
@@ -195,6 +247,7 @@ class TaskworkerClient:
                     metrics.incr("taskworker.client.task_id_not_in_client")
                     return None
                 host = self._task_id_to_host.pop(task_id)
+                metrics.incr("taskworker.client.rpc", tags={"method": "SetTaskStatus"})
                 response = self._host_to_stubs[host].SetTaskStatus(request)
         except grpc.RpcError as err:
             metrics.incr(
@@ -208,3 +261,59 @@ class TaskworkerClient:
             self._task_id_to_host[response.task.id] = host
             return response.task
         return None
+
+    def update_tasks(
+        self,
+        updates: Sequence[tuple[str, TaskActivationStatus.ValueType]],
+        fetch_next_task: FetchNextTask | None = None,
+        fetch_count: int = 0,
+    ) -> list[UpdateTaskResult]:
+        """
+        Update the status of several task activations at once.
+
+        Updates are pipelined to the brokers that handed out the tasks. The
+        first `fetch_count` updates request the next task to execute, which is
+        returned in the `next_task` of their result. Failed updates carry the
+        error of their call so that they can be retried individually.
+        """
+        results: list[UpdateTaskResult | None] = [None] * len(updates)
+        pending: list[tuple[int, str, Any]] = []
+        with metrics.timer("taskworker.update_tasks.rpc"):
+            for i, (task_id, status) in enumerate(updates):
+                host = self._task_id_to_host.pop(task_id, None)
+                if host is None:
+                    metrics.incr("taskworker.client.task_id_not_in_client")
+                    results[i] = UpdateTaskResult(task_id=task_id)
+                    continue
+
+                request = SetTaskStatusRequest(
+                    id=task_id,
+                    status=status,
+                    fetch_next_task=fetch_next_task if len(pending) < fetch_count else None,
+                )
+                pending.append((i, host, self._host_to_stubs[host].SetTaskStatus.future(request)))
+
+            for i, host, future in pending:
+                task_id = updates[i][0]
+                try:
+                    response = future.result()
+                except grpc.RpcError as err:
+                    metrics.incr(
+                        "taskworker.client.rpc_error",
+                        tags={"method": "SetTaskStatus", "status": err.code().name},
+                    )
+                    if err.code() == grpc.StatusCode.NOT_FOUND:
+                        results[i] = UpdateTaskResult(task_id=task_id)
+                    else:
+                        results[i] = UpdateTaskResult(task_id=task_id, error=err)
+                    continue
+
+                next_task = None
+                if response.HasField("task"):
+                    next_task = response.task
+                    self._task_id_to_host[next_task.id] = host
+                results[i] = UpdateTaskResult(task_id=task_id, next_task=next_task)
+
+        metrics.incr("taskworker.client.rpc", amount=len(pending), tags={"method": "SetTaskStatus"})
+        metrics.distribution("taskworker.client.update_tasks.batch_size", len(updates))
+        return [result for result in results if result is not None]
@@ -21,3 +21,15 @@ DEFAULT_CHILD_TASK_COUNT = 10000
 The number of tasks a worker child process will process
 before being restarted.
 """
+
+DEFAULT_RPC_BATCH_SIZE = 1
+"""
+The maximum number of tasks a worker fetches, and the
+maximum number of results it sends, with one batch of RPCs.
+"""
+
+DEFAULT_CHILD_THREADS = 1
+"""
+The number of activations of thread safe tasks a worker
+child process executes concurrently.
+"""
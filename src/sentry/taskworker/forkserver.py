@@ -0,0 +1,40 @@
+"""
+Preload module of the taskworker fork server, see `TaskWorker(fork_server=True)`.
+
+The multiprocessing fork server imports this module once, in a fresh single
+threaded interpreter, and forks every child process from that template. Work
+done here is inherited by all children, so that replacing a child that
+reached its max_task_count does not pay for configuring Sentry and importing
+the task modules again.
+"""
+
+from __future__ import annotations
+
+import gc
+
+
+def warmup() -> None:
+    from sentry.runner import configure
+
+    # Configuration is read from SENTRY_CONF, which `sentry run` exports to
+    # the environment the fork server inherits.
+    configure()
+
+    from django.conf import settings
+    from django.db import connections
+
+    for module in settings.TASKWORKER_IMPORTS:
+        __import__(module)
+
+    # Sockets must not be shared between forked children. Anything opened
+    # while importing is closed so every child connects on first use.
+    connections.close_all()
+
+    # Move everything allocated so far out of the collector's reach, which
+    # keeps the inherited pages shared between children instead of being
+    # copied when the garbage collector touches them.
+    gc.collect()
+    gc.freeze()
+
+
+warmup()
@@ -43,12 +43,14 @@ class TaskNamespace:
         retry: Retry | None,
         expires: int | datetime.timedelta | None = None,
         processing_deadline_duration: int = DEFAULT_PROCESSING_DEADLINE,
+        thread_safe: bool = False,
     ):
         self.name = name
         self.router = router
         self.default_retry = retry
         self.default_expires = expires  # seconds
         self.default_processing_deadline_duration = processing_deadline_duration  # seconds
+        self.default_thread_safe = thread_safe
         self._registered_tasks: dict[str, Task[Any, Any]] = {}
         self._producers: dict[Topic, SingletonProducer] = {}
 
@@ -81,6 +83,7 @@ class TaskNamespace:
         processing_deadline_duration: int | datetime.timedelta | None = None,
         at_most_once: bool = False,
         wait_for_delivery: bool = False,
+        thread_safe: bool | None = None,
     ) -> Callable[[Callable[P, R]], Task[P, R]]:
         """
         Register a task.
@@ -106,6 +109,11 @@ class TaskNamespace:
         wait_for_delivery: bool
             If true, the task will wait for the delivery report to be received
             before returning.
+        thread_safe: bool | None
+            Allow the task to run concurrently with other thread safe tasks
+            on the thread pool of taskworker children. Intended for tasks that
+            spend most of their time waiting on the network. If none the
+            namespace default will be used.
         """
 
         def wrapped(func: Callable[P, R]) -> Task[P, R]:
@@ -123,6 +131,7 @@ class TaskNamespace:
                 ),
                 at_most_once=at_most_once,
                 wait_for_delivery=wait_for_delivery,
+                thread_safe=self.default_thread_safe if thread_safe is None else thread_safe,
             )
             # TODO(taskworker) tasks should be registered into the registry
             # so that we can ensure task names are globally unique
@@ -228,6 +237,7 @@ class TaskRegistry:
         retry: Retry | None = None,
         expires: int | datetime.timedelta | None = None,
         processing_deadline_duration: int = DEFAULT_PROCESSING_DEADLINE,
+        thread_safe: bool = False,
     ) -> TaskNamespace:
         """
         Create a namespaces.
@@ -243,6 +253,7 @@ class TaskRegistry:
             retry=retry,
             expires=expires,
             processing_deadline_duration=processing_deadline_duration,
+            thread_safe=thread_safe,
         )
         self._namespaces[name] = namespace
 
@@ -39,6 +39,7 @@ class Task(Generic[P, R]):
         processing_deadline_duration: int | datetime.timedelta | None = None,
         at_most_once: bool = False,
         wait_for_delivery: bool = False,
+        thread_safe: bool = False,
     ):
         self.name = name
         self._func = func
@@ -58,6 +59,7 @@ class Task(Generic[P, R]):
         self._retry = retry
         self.at_most_once = at_most_once
         self.wait_for_delivery = wait_for_delivery
+        self.thread_safe = thread_safe
         update_wrapper(self, func)
 
     @property
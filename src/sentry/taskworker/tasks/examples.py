@@ -86,3 +86,9 @@ def at_most_once_task() -> None:
 def timed_task(sleep_seconds: float | str) -> None:
     sleep(float(sleep_seconds))
     logger.debug("timed_task complete")
+
+
+@exampletasks.register(name="examples.timed_thread_safe", thread_safe=True)
+def timed_thread_safe_task(sleep_seconds: float | str) -> None:
+    sleep(float(sleep_seconds))
+    logger.debug("timed_thread_safe_task complete")
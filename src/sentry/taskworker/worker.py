@@ -5,17 +5,20 @@ import contextlib
 import dataclasses
 import logging
 import multiprocessing
+import multiprocessing.queues
+import os
 import queue
 import signal
 import sys
 import threading
 import time
 from collections.abc import Callable, Generator
-from concurrent.futures import ThreadPoolExecutor
-from multiprocessing.context import ForkProcess
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from multiprocessing.context import BaseContext
+from multiprocessing.process import BaseProcess
 from multiprocessing.synchronize import Event
 from types import FrameType, TracebackType
-from typing import Any
+from typing import Any, NoReturn
 
 import grpc
 import orjson
@@ -34,14 +37,25 @@ from sentry_sdk.consts import OP, SPANDATA, SPANSTATUS
 from sentry_sdk.crons import MonitorStatus, capture_checkin
 
 from sentry.taskworker.client import TaskworkerClient
-from sentry.taskworker.constants import DEFAULT_REBALANCE_AFTER, DEFAULT_WORKER_QUEUE_SIZE
+from sentry.taskworker.constants import (
+    DEFAULT_CHILD_THREADS,
+    DEFAULT_REBALANCE_AFTER,
+    DEFAULT_RPC_BATCH_SIZE,
+    DEFAULT_WORKER_QUEUE_SIZE,
+)
 from sentry.taskworker.registry import taskregistry
-from sentry.taskworker.state import clear_current_task, current_task, set_current_task
+from sentry.taskworker.state import (
+    CurrentTaskState,
+    clear_current_task,
+    current_task,
+    set_current_task,
+)
 from sentry.taskworker.task import Task
 from sentry.utils import metrics
 from sentry.utils.memory import track_memory_usage
 
 mp_context = multiprocessing.get_context("fork")
+FORK_SERVER_PRELOAD = ["sentry.taskworker.forkserver"]
 logger = logging.getLogger("sentry.taskworker.worker")
 
 AT_MOST_ONCE_TIMEOUT = 60 * 60 * 24  # 1 day
@@ -102,16 +116,253 @@ def _get_known_task(activation: TaskActivation) -> Task[Any, Any] | None:
     return namespace.get(activation.taskname)
 
 
+def get_mp_context(fork_server: bool) -> BaseContext:
+    """
+    Get the multiprocessing context children are started with.
+
+    In fork server mode children are forked from a template process that has
+    loaded `FORK_SERVER_PRELOAD`, instead of from the worker process itself.
+    """
+    if not fork_server:
+        return mp_context
+
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(FORK_SERVER_PRELOAD)
+    return context
+
+
+def _traceback_from_frame(frame: FrameType) -> TracebackType:
+    trace = TracebackType(None, frame, frame.f_lasti, frame.f_lineno)
+    while frame.f_back:
+        trace = TracebackType(trace, frame.f_back, frame.f_back.f_lasti, frame.f_back.f_lineno)
+        frame = frame.f_back
+    return trace
+
+
+def _report_deadline_exceeded(
+    activation: TaskActivation | CurrentTaskState,
+    processed_tasks: queue.Queue[ProcessingResult],
+    processing_pool_name: str,
+    frame: FrameType | None,
+) -> None:
+    processed_tasks.put(
+        ProcessingResult(task_id=activation.id, status=TASK_ACTIVATION_STATUS_FAILURE)
+    )
+    with sentry_sdk.isolation_scope() as scope:
+        scope.fingerprint = [
+            "taskworker.processing_deadline_exceeded",
+            activation.namespace,
+            activation.taskname,
+        ]
+        err = ProcessingDeadlineExceeded(
+            f"execution deadline of {activation.processing_deadline_duration} seconds exceeded"
+        )
+        if frame:
+            err.with_traceback(_traceback_from_frame(frame))
+
+        sentry_sdk.capture_exception(err)
+        sentry_sdk.flush()
+
+    metrics.incr(
+        "taskworker.worker.processing_deadline_exceeded",
+        tags={
+            "processing_pool": processing_pool_name,
+            "namespace": activation.namespace,
+            "taskname": activation.taskname,
+        },
+    )
+
+
+def _run_activation(
+    task_func: Task[Any, Any],
+    activation: TaskActivation,
+    processed_tasks: queue.Queue[ProcessingResult],
+    processing_pool_name: str,
+    handle_alarm: Callable[[int, FrameType | None], None] | None = None,
+) -> None:
+    """
+    Execute an activation and push its result to `processed_tasks`.
+
+    Activations on the main thread of a child are interrupted by
+    `handle_alarm` when they exceed their processing deadline. Activations on
+    the thread pool are watched by `ThreadedActivations` instead.
+    """
+    set_current_task(activation)
+
+    next_state = TASK_ACTIVATION_STATUS_FAILURE
+    # Use time.time() so we can measure against activation.received_at
+    execution_start_time = time.time()
+    try:
+        if handle_alarm is not None:
+            with timeout_alarm(activation.processing_deadline_duration, handle_alarm):
+                _execute_activation(task_func, activation)
+        else:
+            _execute_activation(task_func, activation)
+        next_state = TASK_ACTIVATION_STATUS_COMPLETE
+    except Exception as err:
+        if task_func.should_retry(activation.retry_state, err):
+            logger.info(
+                "taskworker.task.retry",
+                extra={
+                    "namespace": activation.namespace,
+                    "taskname": activation.taskname,
+                    "processing_pool": processing_pool_name,
+                },
+            )
+            next_state = TASK_ACTIVATION_STATUS_RETRY
+
+        if next_state != TASK_ACTIVATION_STATUS_RETRY:
+            sentry_sdk.capture_exception(err)
+
+    clear_current_task()
+
+    # Get completion time before pushing to queue, so we can measure queue append time
+    execution_complete_time = time.time()
+    with metrics.timer(
+        "taskworker.worker.processed_tasks.put.duration",
+        tags={
+            "processing_pool": processing_pool_name,
+        },
+    ):
+        processed_tasks.put(ProcessingResult(task_id=activation.id, status=next_state))
+
+    record_task_execution(
+        activation,
+        next_state,
+        execution_start_time,
+        execution_complete_time,
+        processing_pool_name,
+    )
+
+
+def _flush_local_increments() -> None:
+    # Exit handlers don't run when a child exits with `os._exit`, so buffer
+    # increments aggregated in process are written out explicitly.
+    from sentry import buffer
+
+    try:
+        buffer.backend.flush_local_increments()
+    except Exception:
+        logger.exception("taskworker.worker.flush_local_increments_failed")
+
+
+def _exit_child(processed_tasks: queue.Queue[ProcessingResult]) -> NoReturn:
+    # Threads running activations cannot be interrupted and would block a
+    # regular interpreter shutdown. Flush pending results and exit right away.
+    _flush_local_increments()
+    if isinstance(processed_tasks, multiprocessing.queues.Queue):
+        processed_tasks.close()
+        processed_tasks.join_thread()
+    os._exit(1)
+
+
+class ThreadedActivations:
+    """
+    The activations of thread safe tasks that a child executes on its thread
+    pool, see `Task.thread_safe`.
+
+    Threads cannot be interrupted like the main thread is with SIGALRM, so
+    the main thread of the child checks the processing deadlines of in
+    flight activations between activations and while waiting for them. When an activation exceeds
+    its deadline a failure is reported for it and the child exits, as it does
+    when an activation on the main thread exceeds its deadline. Activations
+    that were still running in the child are retried by the broker once their
+    own processing deadline has passed.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        processed_tasks: queue.Queue[ProcessingResult],
+        processing_pool_name: str,
+    ) -> None:
+        self.size = size
+        self._processed_tasks = processed_tasks
+        self._processing_pool_name = processing_pool_name
+        self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="taskworker-child")
+        self._in_flight: dict[Future[None], tuple[TaskActivation, float]] = {}
+        self._thread_ids: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+    def submit(self, task_func: Task[Any, Any], activation: TaskActivation) -> None:
+        deadline = time.monotonic() + activation.processing_deadline_duration
+        future = self._executor.submit(self._run, task_func, activation)
+        self._in_flight[future] = (activation, deadline)
+
+    def _run(self, task_func: Task[Any, Any], activation: TaskActivation) -> None:
+        self._thread_ids[activation.id] = threading.get_ident()
+        try:
+            _run_activation(
+                task_func, activation, self._processed_tasks, self._processing_pool_name
+            )
+        finally:
+            self._thread_ids.pop(activation.id, None)
+
+    def wait(self, return_when: str = FIRST_COMPLETED) -> None:
+        """
+        Wait for in flight activations to complete, while enforcing their
+        processing deadlines.
+        """
+        while self._in_flight:
+            timeout = min(deadline for _, deadline in self._in_flight.values()) - time.monotonic()
+            done, _ = wait(self._in_flight, timeout=max(timeout, 0), return_when=return_when)
+            for future in done:
+                self._in_flight.pop(future)
+            self.check_deadlines()
+
+            if done and return_when == FIRST_COMPLETED:
+                return
+
+    def check_deadlines(self) -> None:
+        for future in [future for future in self._in_flight if future.done()]:
+            self._in_flight.pop(future)
+
+        now = time.monotonic()
+        expired = [
+            activation for activation, deadline in self._in_flight.values() if deadline <= now
+        ]
+        if not expired:
+            return
+
+        frames = sys._current_frames()
+        for activation in expired:
+            thread_id = self._thread_ids.get(activation.id)
+            _report_deadline_exceeded(
+                activation,
+                self._processed_tasks,
+                self._processing_pool_name,
+                frames.get(thread_id) if thread_id is not None else None,
+            )
+        _exit_child(self._processed_tasks)
+
+    def shutdown(self) -> None:
+        self.wait(ALL_COMPLETED)
+        self._executor.shutdown()
+
+
 def child_worker(
     child_tasks: queue.Queue[TaskActivation],
     processed_tasks: queue.Queue[ProcessingResult],
     shutdown_event: Event,
     max_task_count: int | None,
     processing_pool_name: str,
+    spawn_time: float | None = None,
+    thread_pool_size: int = DEFAULT_CHILD_THREADS,
 ) -> None:
     for module in settings.TASKWORKER_IMPORTS:
         __import__(module)
 
+    if spawn_time is not None:
+        # Time between the parent requesting a child, and the child being
+        # ready to process tasks.
+        metrics.distribution(
+            "taskworker.worker.child_startup.duration",
+            time.time() - spawn_time,
+            tags={"processing_pool": processing_pool_name},
+        )
+
     processed_task_count = 0
 
     def handle_alarm(signum: int, frame: FrameType | None) -> None:
@@ -123,41 +374,16 @@ def child_worker(
         """
         current = current_task()
         if current:
-            processed_tasks.put(
-                ProcessingResult(task_id=current.id, status=TASK_ACTIVATION_STATUS_FAILURE)
-            )
-            with sentry_sdk.isolation_scope() as scope:
-                scope.fingerprint = [
-                    "taskworker.processing_deadline_exceeded",
-                    current.namespace,
-                    current.taskname,
-                ]
-                err = ProcessingDeadlineExceeded(
-                    f"execution deadline of {current.processing_deadline_duration} seconds exceeded"
-                )
-                if frame:
-                    trace = TracebackType(None, frame, frame.f_lasti, frame.f_lineno)
-                    while frame.f_back:
-                        trace = TracebackType(
-                            trace, frame.f_back, frame.f_back.f_lasti, frame.f_back.f_lineno
-                        )
-                        frame = frame.f_back
-                    err.with_traceback(trace)
-
-                sentry_sdk.capture_exception(err)
-                sentry_sdk.flush()
-
-            metrics.incr(
-                "taskworker.worker.processing_deadline_exceeded",
-                tags={
-                    "processing_pool": processing_pool_name,
-                    "namespace": current.namespace,
-                    "taskname": current.taskname,
-                },
-            )
+            _report_deadline_exceeded(current, processed_tasks, processing_pool_name, frame)
 
+        if threaded is not None:
+            _exit_child(processed_tasks)
         sys.exit(1)
 
+    threaded: ThreadedActivations | None = None
+    if thread_pool_size > 1:
+        threaded = ThreadedActivations(thread_pool_size, processed_tasks, processing_pool_name)
+
     while True:
         if max_task_count and processed_task_count >= max_task_count:
             metrics.incr(
@@ -171,6 +397,12 @@ def child_worker(
             logger.info("taskworker.worker.shutdown_event")
             break
 
+        if threaded is not None:
+            threaded.check_deadlines()
+            if len(threaded) >= threaded.size:
+                threaded.wait(FIRST_COMPLETED)
+                continue
+
         try:
             activation = child_tasks.get(timeout=1.0)
         except queue.Empty:
@@ -217,50 +449,19 @@ def child_worker(
                 )
                 continue
 
-        set_current_task(activation)
-
-        next_state = TASK_ACTIVATION_STATUS_FAILURE
-        # Use time.time() so we can measure against activation.received_at
-        execution_start_time = time.time()
-        try:
-            with timeout_alarm(activation.processing_deadline_duration, handle_alarm):
-                _execute_activation(task_func, activation)
-            next_state = TASK_ACTIVATION_STATUS_COMPLETE
-        except Exception as err:
-            if task_func.should_retry(activation.retry_state, err):
-                logger.info(
-                    "taskworker.task.retry",
-                    extra={
-                        "namespace": activation.namespace,
-                        "taskname": activation.taskname,
-                        "processing_pool": processing_pool_name,
-                    },
-                )
-                next_state = TASK_ACTIVATION_STATUS_RETRY
-
-            if next_state != TASK_ACTIVATION_STATUS_RETRY:
-                sentry_sdk.capture_exception(err)
-
-        clear_current_task()
         processed_task_count += 1
+        if threaded is not None:
+            if task_func.thread_safe:
+                threaded.submit(task_func, activation)
+                continue
+            # Tasks that are not thread safe never run alongside other tasks.
+            threaded.wait(ALL_COMPLETED)
 
-        # Get completion time before pushing to queue, so we can measure queue append time
-        execution_complete_time = time.time()
-        with metrics.timer(
-            "taskworker.worker.processed_tasks.put.duration",
-            tags={
-                "processing_pool": processing_pool_name,
-            },
-        ):
-            processed_tasks.put(ProcessingResult(task_id=activation.id, status=next_state))
-
-        record_task_execution(
-            activation,
-            next_state,
-            execution_start_time,
-            execution_complete_time,
-            processing_pool_name,
-        )
+        _run_activation(task_func, activation, processed_tasks, processing_pool_name, handle_alarm)
+
+    if threaded is not None:
+        threaded.shutdown()
+    _flush_local_increments()
 
 
 def _execute_activation(task_func: Task[Any, Any], activation: TaskActivation) -> None:
@@ -390,21 +591,34 @@ class TaskWorker:
         result_queue_maxsize: int = DEFAULT_WORKER_QUEUE_SIZE,
         rebalance_after: int = DEFAULT_REBALANCE_AFTER,
         processing_pool_name: str | None = None,
+        fork_server: bool = False,
+        rpc_batch_size: int = DEFAULT_RPC_BATCH_SIZE,
+        child_threads: int = DEFAULT_CHILD_THREADS,
         **options: dict[str, Any],
     ) -> None:
         self.options = options
+        self._mp_context = get_mp_context(fork_server)
         self._max_child_task_count = max_child_task_count
         self._namespace = namespace
         self._concurrency = concurrency
+        self._rpc_batch_size = rpc_batch_size
+        self._child_threads = child_threads
+        self._child_tasks_queue_maxsize = child_tasks_queue_maxsize
         self.client = TaskworkerClient(rpc_host, num_brokers, rebalance_after)
-        self._child_tasks: multiprocessing.Queue[TaskActivation] = mp_context.Queue(
+        # Queues and events have to come from the same context as the
+        # children they are shared with.
+        self._child_tasks: multiprocessing.Queue[TaskActivation] = self._mp_context.Queue(
             maxsize=child_tasks_queue_maxsize
         )
-        self._processed_tasks: multiprocessing.Queue[ProcessingResult] = mp_context.Queue(
+        # Slots of the child tasks queue reserved for tasks that are being
+        # fetched, see `_reserve_child_task_slots`.
+        self._child_tasks_lock = threading.Lock()
+        self._child_tasks_reserved = 0
+        self._processed_tasks: multiprocessing.Queue[ProcessingResult] = self._mp_context.Queue(
             maxsize=result_queue_maxsize
         )
-        self._children: list[ForkProcess] = []
-        self._shutdown_event = mp_context.Event()
+        self._children: list[BaseProcess] = []
+        self._shutdown_event = self._mp_context.Event()
         self._task_receive_timing: dict[str, float] = {}
         self._result_thread: threading.Thread | None = None
 
@@ -468,10 +682,50 @@ class TaskWorker:
             except queue.Empty:
                 break
 
+    def _reserve_child_task_slots(self, count: int) -> int:
+        """
+        Reserve up to `count` slots of the child tasks queue for tasks that are
+        about to be fetched, and return the number of reserved slots. The main
+        loop and the result threads share the reservations, so that together
+        they never fetch more tasks than the queue has room for. Reservations
+        are released by `_put_child_tasks`.
+        """
+        with self._child_tasks_lock:
+            try:
+                free = self._child_tasks_queue_maxsize - self._child_tasks.qsize()
+            except NotImplementedError:
+                # qsize() is not implemented on macOS
+                free = 0 if self._child_tasks.full() else 1
+            reserved = max(min(count, free - self._child_tasks_reserved), 0)
+            self._child_tasks_reserved += reserved
+            return reserved
+
+    def _put_child_tasks(self, tasks: list[TaskActivation], reserved: int) -> None:
+        """
+        Queue fetched tasks for children and release the slots that were
+        reserved for them. The tasks were already received from the broker, so
+        wait for room rather than dropping them.
+        """
+        try:
+            for task in tasks:
+                start_time = time.monotonic()
+                self._child_tasks.put(task)
+                metrics.distribution(
+                    "taskworker.worker.child_task.put.duration",
+                    time.monotonic() - start_time,
+                    tags={"processing_pool": self._processing_pool_name},
+                )
+        finally:
+            with self._child_tasks_lock:
+                self._child_tasks_reserved -= reserved
+
     def _add_task(self) -> bool:
         """
         Add a task to child tasks queue. Returns False if no new task was fetched.
         """
+        if self._rpc_batch_size > 1:
+            return self._add_tasks()
+
         if self._child_tasks.full():
             return False
 
@@ -494,6 +748,22 @@ class TaskWorker:
         else:
             return False
 
+    def _add_tasks(self) -> bool:
+        """
+        Fill the free slots of the child tasks queue with one batch of fetches.
+        Returns False if no new task was fetched.
+        """
+        count = self._reserve_child_task_slots(self._rpc_batch_size)
+        if count == 0:
+            return False
+
+        tasks: list[TaskActivation] = []
+        try:
+            tasks = self.fetch_tasks(count)
+        finally:
+            self._put_child_tasks(tasks, count)
+        return bool(tasks)
+
     def start_result_thread(self) -> None:
         """
         Start a thread that delivers results and fetches new tasks.
@@ -512,7 +782,10 @@ class TaskWorker:
                 while not self._shutdown_event.is_set():
                     try:
                         result = self._processed_tasks.get(timeout=1.0)
-                        executor.submit(self._send_result, result)
+                        if self._rpc_batch_size > 1:
+                            executor.submit(self._send_results, self._drain_results(result))
+                        else:
+                            executor.submit(self._send_result, result)
                     except queue.Empty:
                         metrics.incr(
                             "taskworker.worker.result_thread.queue_empty",
@@ -561,6 +834,79 @@ class TaskWorker:
         self._send_update_task(result, fetch_next=None)
         return True
 
+    def _drain_results(self, first: ProcessingResult) -> list[ProcessingResult]:
+        """
+        Coalesce the results that are already waiting in `processed_tasks`
+        with `first`, up to the RPC batch size.
+        """
+        results = [first]
+        while len(results) < self._rpc_batch_size:
+            try:
+                results.append(self._processed_tasks.get_nowait())
+            except queue.Empty:
+                break
+        return results
+
+    def _send_results(self, results: list[ProcessingResult]) -> None:
+        """
+        Send a batch of results to the brokers, and fetch as many tasks as
+        the child tasks queue has room for with the same RPCs.
+
+        Run in the result thread pool, see `start_result_thread`
+        """
+        now = time.monotonic()
+        for result in results:
+            task_received = self._task_receive_timing.pop(result.task_id, None)
+            if task_received is not None:
+                metrics.distribution(
+                    "taskworker.worker.complete_duration",
+                    now - task_received,
+                    tags={"processing_pool": self._processing_pool_name},
+                )
+        metrics.distribution(
+            "taskworker.worker.send_results.batch_size",
+            len(results),
+            tags={"processing_pool": self._processing_pool_name},
+        )
+
+        fetch_count = self._reserve_child_task_slots(len(results))
+        try:
+            # Use the shutdown_event as a sleep mechanism
+            self._shutdown_event.wait(self._setstatus_backoff_seconds)
+            update_results = self.client.update_tasks(
+                [(result.task_id, result.status) for result in results],
+                fetch_next_task=FetchNextTask(namespace=self._namespace),
+                fetch_count=fetch_count,
+            )
+        except BaseException:
+            self._put_child_tasks([], fetch_count)
+            raise
+
+        failed = False
+        next_tasks = []
+        statuses = {result.task_id: result for result in results}
+        for update in update_results:
+            if update.error is not None:
+                failed = True
+                if update.error.code() == grpc.StatusCode.UNAVAILABLE:
+                    self._processed_tasks.put(statuses[update.task_id])
+                logger.error(
+                    "taskworker.send_update_task.failed",
+                    extra={"task_id": update.task_id, "error": update.error},
+                )
+                continue
+
+            if update.next_task:
+                self._task_receive_timing[update.next_task.id] = time.monotonic()
+                next_tasks.append(update.next_task)
+
+        self._put_child_tasks(next_tasks, fetch_count)
+
+        if failed:
+            self._setstatus_backoff_seconds = min(self._setstatus_backoff_seconds + 1, 10)
+        else:
+            self._setstatus_backoff_seconds = 0
+
     def _send_update_task(
         self, result: ProcessingResult, fetch_next: FetchNextTask | None
     ) -> TaskActivation | None:
@@ -600,7 +946,7 @@ class TaskWorker:
         if len(active_children) >= self._concurrency:
             return
         for _ in range(self._concurrency - len(active_children)):
-            process = mp_context.Process(
+            process = self._mp_context.Process(
                 target=child_worker,
                 args=(
                     self._child_tasks,
@@ -608,13 +954,19 @@ class TaskWorker:
                     self._shutdown_event,
                     self._max_child_task_count,
                     self._processing_pool_name,
+                    time.time(),
+                    self._child_threads,
                 ),
             )
             process.start()
             active_children.append(process)
             logger.info(
                 "taskworker.spawn_child",
-                extra={"pid": process.pid, "processing_pool": self._processing_pool_name},
+                extra={
+                    "pid": process.pid,
+                    "processing_pool": self._processing_pool_name,
+                    "start_method": self._mp_context.get_start_method(),
+                },
             )
 
         self._children = active_children
@@ -649,3 +1001,37 @@ class TaskWorker:
         self._gettask_backoff_seconds = 0
         self._task_receive_timing[activation.id] = time.monotonic()
         return activation
+
+    def fetch_tasks(self, count: int) -> list[TaskActivation]:
+        """Fetch up to `count` tasks with one batch of RPCs, see `fetch_task`"""
+        # Use the shutdown_event as a sleep mechanism
+        self._shutdown_event.wait(self._gettask_backoff_seconds)
+        try:
+            activations = self.client.get_tasks(self._namespace, count)
+        except grpc.RpcError as e:
+            logger.info(
+                "taskworker.fetch_task.failed",
+                extra={"error": e, "processing_pool": self._processing_pool_name},
+            )
+
+            self._gettask_backoff_seconds = min(self._gettask_backoff_seconds + 1, 10)
+            return []
+
+        metrics.distribution(
+            "taskworker.worker.fetch_tasks.batch_size",
+            len(activations),
+            tags={"processing_pool": self._processing_pool_name},
+        )
+        if not activations:
+            metrics.incr(
+                "taskworker.worker.fetch_task.not_found",
+                tags={"processing_pool": self._processing_pool_name},
+            )
+            self._gettask_backoff_seconds = min(self._gettask_backoff_seconds + 1, 10)
+            return []
+
+        self._gettask_backoff_seconds = 0
+        now = time.monotonic()
+        for activation in activations:
+            self._task_receive_timing[activation.id] = now
+        return activations
@@ -44,4 +44,11 @@ def run_processor_with_signals(processor, quantized_rebalance_delay_secs: int |
 
     signal.signal(signal.SIGINT, handler)
     signal.signal(signal.SIGTERM, handler)
-    processor.run()
+    try:
+        processor.run()
+    finally:
+        from sentry import buffer
+
+        # Buffer increments aggregated in this process are written out once
+        # the processor has stopped, rather than only at interpreter exit.
+        buffer.backend.flush_local_increments()
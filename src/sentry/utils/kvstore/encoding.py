@@ -34,6 +34,11 @@ class KVStorageCodecWrapper(KVStorage[K, TDecoded]):
     def set(self, key: K, value: TDecoded, ttl: timedelta | None = None) -> None:
         return self.store.set(key, self.value_codec.encode(value), ttl)
 
+    def set_many(self, items: Sequence[tuple[K, TDecoded]], ttl: timedelta | None = None) -> None:
+        return self.store.set_many(
+            [(key, self.value_codec.encode(value)) for key, value in items], ttl
+        )
+
     def delete(self, key: K) -> None:
         return self.store.delete(key)
 
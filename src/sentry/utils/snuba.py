@@ -9,12 +9,12 @@ import re
 import time
 from collections import namedtuple
 from collections.abc import Callable, Collection, Mapping, MutableMapping, Sequence
-from concurrent.futures import ThreadPoolExecutor
-from contextlib import contextmanager
-from copy import deepcopy
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import ExitStack, contextmanager
+from copy import copy, deepcopy
 from datetime import datetime, timedelta, timezone
 from hashlib import sha1
-from typing import Any
+from typing import Any, TypeVar
 from urllib.parse import urlparse
 
 import sentry_sdk
@@ -23,9 +23,11 @@ import urllib3
 from dateutil.parser import parse as parse_datetime
 from django.conf import settings
 from django.core.cache import cache
-from snuba_sdk import DeleteQuery, MetricsQuery, Request
+from snuba_sdk import Condition, DeleteQuery, MetricsQuery, Op, Query, Request
 from snuba_sdk.legacy import json_to_snql
 
+from sentry import options
+from sentry.locks import locks
 from sentry.models.environment import Environment
 from sentry.models.group import Group
 from sentry.models.grouprelease import GroupRelease
@@ -41,6 +43,8 @@ from sentry.snuba.query_sources import QuerySource
 from sentry.snuba.referrer import validate_referrer
 from sentry.utils import json, metrics
 from sentry.utils.dates import outside_retention_with_modified_start
+from sentry.utils.locking import UnableToAcquireLock
+from sentry.utils.locking.lock import Lock
 
 logger = logging.getLogger(__name__)
 
@@ -551,9 +555,74 @@ _snuba_pool = connection_from_url(
         allowed_methods={"GET", "POST", "DELETE"},
     ),
     timeout=settings.SENTRY_SNUBA_TIMEOUT,
-    maxsize=10,
+    maxsize=settings.SENTRY_SNUBA_QUERY_WORKERS,
 )
-_query_thread_pool = ThreadPoolExecutor(max_workers=10)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class BulkQueryExecutor:
+    """
+    Runs the queries of bulk Snuba requests concurrently, on a thread pool
+    shared by the whole process.
+
+    Each batch has at most `snuba.bulk-query.batch-concurrency` queries in
+    flight, so that a request issuing dozens of queries does not take every
+    worker from the other requests of the process. As soon as a query of a
+    batch fails, the queries of that batch that have not started yet are
+    cancelled and the error is raised.
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="snuba-query"
+        )
+
+    def map(self, fn: Callable[[T], R], items: Sequence[T]) -> list[R]:
+        """Call `fn` with every item, and return the results in order."""
+        if len(items) == 1:
+            # No need to submit to the thread pool if we're just performing a single query
+            return [fn(items[0])]
+
+        concurrency = max(
+            1, min(options.get("snuba.bulk-query.batch-concurrency"), self.max_workers)
+        )
+        metrics.distribution("snuba.bulk_query.batch_size", len(items))
+
+        results: dict[int, R] = {}
+        pending: dict[Future[R], int] = {}
+        next_index = 0
+
+        def submit_next() -> None:
+            nonlocal next_index
+            if next_index < len(items):
+                pending[self._executor.submit(fn, items[next_index])] = next_index
+                next_index += 1
+
+        for _ in range(concurrency):
+            submit_next()
+
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    results[index] = future.result()
+                    submit_next()
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            metrics.incr(
+                "snuba.bulk_query.cancelled", amount=len(pending) + len(items) - next_index
+            )
+            raise
+
+        return [results[index] for index in range(len(items))]
+
+
+_query_executor = BulkQueryExecutor(max_workers=settings.SENTRY_SNUBA_QUERY_WORKERS)
 
 
 epoch_naive = datetime(1970, 1, 1, tzinfo=None)
@@ -1062,16 +1131,22 @@ def bulk_raw_query(
     """
     Used to make queries using the (very) old JSON format for Snuba queries. Queries submitted here
     will be converted to SnQL queries before being sent to Snuba.
+
+    Without a `referrer`, every query uses the referrer of its `SnubaQueryParams`.
     """
-    params = [_prepare_query_params(param, referrer) for param in snuba_param_list]
+    referrers = [referrer or param.referrer for param in snuba_param_list]
+    params = [
+        _prepare_query_params(param, param_referrer)
+        for param, param_referrer in zip(snuba_param_list, referrers)
+    ]
     snuba_requests = [
         SnubaRequest(
             request=json_to_snql(query, query["dataset"]),
-            referrer=referrer,
+            referrer=param_referrer,
             forward=forward,
             reverse=reverse,
         )
-        for query, forward, reverse in params
+        for (query, forward, reverse), param_referrer in zip(params, referrers)
     ]
     return _apply_cache_and_build_results(snuba_requests, use_cache=use_cache)
 
@@ -1086,6 +1161,153 @@ def get_cache_key(query: Request) -> str:
     return f"sqc:{sha1(hashable.encode('utf-8')).hexdigest()}"
 
 
+@dataclasses.dataclass(frozen=True)
+class QueryCachePolicy:
+    ttl: int
+    # Size in seconds of the buckets the time range of a query is widened to
+    # in its cache key, so that sliding windows like "last 24h" share cache
+    # entries. The query itself keeps its exact time range.
+    granularity: int = 0
+
+
+def get_query_cache_policy(referrer: str | None, use_cache: bool | None) -> QueryCachePolicy | None:
+    """
+    Get the caching policy of a query. Referrers listed in the
+    `snuba.query-cache.referrer-policies` option are always cached, other
+    queries are only cached when the caller asks for it.
+    """
+    policies = options.get("snuba.query-cache.referrer-policies")
+    policy = policies.get(referrer) if referrer else None
+    if policy is not None:
+        return QueryCachePolicy(
+            ttl=policy.get("ttl", settings.SENTRY_SNUBA_CACHE_TTL_SECONDS),
+            granularity=policy.get("granularity", 0),
+        )
+    if use_cache:
+        return QueryCachePolicy(ttl=settings.SENTRY_SNUBA_CACHE_TTL_SECONDS)
+    return None
+
+
+def _bucket_datetime(value: datetime, granularity: int, round_up: bool) -> datetime:
+    aware = value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    timestamp = int(aware.timestamp())
+    bucketed = timestamp // granularity * granularity
+    if round_up and bucketed < aware.timestamp():
+        bucketed += granularity
+    result = datetime.fromtimestamp(bucketed, tz=aware.tzinfo)
+    return result if value.tzinfo else result.replace(tzinfo=None)
+
+
+def bucket_time_range(request: Request, granularity: int) -> Request:
+    """
+    Returns a copy of a SnQL request with its time range widened to whole
+    buckets of `granularity` seconds, lower bounds rounded down and upper
+    bounds up. This is only used to build cache keys, running the copy would
+    change the aggregates of the query.
+    """
+    query = request.query
+    if not isinstance(query, Query) or not query.where:
+        return request
+
+    where = []
+    for condition in query.where:
+        if isinstance(condition, Condition) and isinstance(condition.rhs, datetime):
+            if condition.op in (Op.GT, Op.GTE):
+                condition = Condition(
+                    condition.lhs, condition.op, _bucket_datetime(condition.rhs, granularity, False)
+                )
+            elif condition.op in (Op.LT, Op.LTE):
+                condition = Condition(
+                    condition.lhs, condition.op, _bucket_datetime(condition.rhs, granularity, True)
+                )
+        where.append(condition)
+    bucketed = copy(request)
+    bucketed.query = query.set_where(where)
+    return bucketed
+
+
+def _query_cache_lock(cache_key: str) -> Lock:
+    return locks.get(
+        f"{cache_key}:lock",
+        duration=options.get("snuba.query-cache.lock-timeout"),
+        name="snuba_query_cache",
+    )
+
+
+def _is_query_cache_locked(cache_key: str) -> bool:
+    # Errors of the lock backend are handled like a released lock, so that
+    # the query is run instead of failing.
+    try:
+        return _query_cache_lock(cache_key).locked()
+    except Exception:
+        logger.warning("snuba.query_cache.lock_error", exc_info=True)
+        metrics.incr("snuba.query_cache.lock_error")
+        return False
+
+
+CachedQuery = tuple[int, SnubaRequest, str, QueryCachePolicy]
+
+
+def _wait_for_cached_results(
+    waiting: list[CachedQuery],
+) -> tuple[list[tuple[int, Any]], list[CachedQuery]]:
+    """
+    Wait for the processes holding the locks of `waiting` queries to fill
+    the cache. Returns the results that showed up, and the queries that have
+    to be run because their lock was released without a result or the wait
+    timed out.
+    """
+    results: list[tuple[int, Any]] = []
+    to_query: list[CachedQuery] = []
+    stop = time.monotonic() + options.get("snuba.query-cache.lock-timeout")
+    interval = 0.05
+    with metrics.timer("snuba.query_cache.wait"):
+        while waiting and time.monotonic() < stop:
+            time.sleep(interval)
+            interval = min(interval * 2, 0.5)
+
+            cache_data = cache.get_many([cache_key for _, _, cache_key, _ in waiting])
+            still_waiting = []
+            for item in waiting:
+                query_pos, snuba_request, cache_key, _ = item
+                cached_result = cache_data.get(cache_key)
+                if cached_result is not None:
+                    metrics.incr(
+                        "snuba.query_cache.coalesced",
+                        tags={"referrer": snuba_request.referrer or "unknown"},
+                    )
+                    results.append((query_pos, json.loads(cached_result)))
+                elif _is_query_cache_locked(cache_key):
+                    still_waiting.append(item)
+                else:
+                    # The query failed for the lock holder, or the lock
+                    # backend is unavailable.
+                    to_query.append(item)
+            waiting = still_waiting
+
+    for _, snuba_request, _, _ in waiting:
+        metrics.incr(
+            "snuba.query_cache.wait_timeout",
+            tags={"referrer": snuba_request.referrer or "unknown"},
+        )
+    return results, to_query + waiting
+
+
+def _query_and_cache(
+    to_query: Sequence[tuple[int, SnubaRequest, str | None, QueryCachePolicy | None]],
+) -> list[tuple[int, Any]]:
+    if not to_query:
+        return []
+
+    results = []
+    query_results = _bulk_snuba_query([item[1] for item in to_query])
+    for result, (query_pos, _, cache_key, policy) in zip(query_results, to_query):
+        if cache_key is not None and policy is not None:
+            cache.set(cache_key, json.dumps(result), policy.ttl)
+        results.append((query_pos, result))
+    return results
+
+
 def _apply_cache_and_build_results(
     snuba_requests: Sequence[SnubaRequest],
     use_cache: bool | None = False,
@@ -1095,47 +1317,57 @@ def _apply_cache_and_build_results(
     if scope.transaction:
         parent_api = scope.transaction.name
 
+    results: list[tuple[int, Any]] = []
+    to_query: list[tuple[int, SnubaRequest, str | None, QueryCachePolicy | None]] = []
+    to_cache: list[CachedQuery] = []
+
     # Store the original position of the query so that we can maintain the order
-    snuba_requests_list: list[tuple[int, SnubaRequest]] = []
-    for i, snuba_request in enumerate(snuba_requests):
+    for query_pos, snuba_request in enumerate(snuba_requests):
         snuba_request.request.parent_api = parent_api
-        snuba_requests_list.append((i, snuba_request))
 
-    results = []
-
-    to_query: list[tuple[int, SnubaRequest, str | None]] = []
+        policy = get_query_cache_policy(snuba_request.referrer, use_cache)
+        if policy is None:
+            to_query.append((query_pos, snuba_request, None, None))
+            continue
+        cache_request = snuba_request.request
+        if policy.granularity:
+            cache_request = bucket_time_range(cache_request, policy.granularity)
+        to_cache.append((query_pos, snuba_request, get_cache_key(cache_request), policy))
+
+    waiting: list[CachedQuery] = []
+    with ExitStack() as held_locks:
+        if to_cache:
+            cache_data = cache.get_many([cache_key for _, _, cache_key, _ in to_cache])
+            for item in to_cache:
+                query_pos, snuba_request, cache_key, _ = item
+                cached_result = cache_data.get(cache_key)
+                metric_tags = (
+                    {"referrer": snuba_request.referrer} if snuba_request.referrer else None
+                )
+                if cached_result is not None:
+                    metrics.incr("snuba.query_cache.hit", tags=metric_tags)
+                    results.append((query_pos, json.loads(cached_result)))
+                    continue
 
-    if use_cache:
-        cache_keys = [
-            get_cache_key(snuba_request.request) for _, snuba_request in snuba_requests_list
-        ]
-        cache_data = cache.get_many(cache_keys)
-        for (query_pos, snuba_request), cache_key in zip(snuba_requests_list, cache_keys):
-            cached_result = cache_data.get(cache_key)
-            metric_tags = {"referrer": snuba_request.referrer} if snuba_request.referrer else None
-            if cached_result is None:
                 metrics.incr("snuba.query_cache.miss", tags=metric_tags)
-                to_query.append((query_pos, snuba_request, cache_key))
-            else:
-                metrics.incr("snuba.query_cache.hit", tags=metric_tags)
-                results.append((query_pos, json.loads(cached_result)))
-    else:
-        for query_pos, snuba_request in snuba_requests_list:
-            to_query.append((query_pos, snuba_request, None))
-
-    if to_query:
-        query_results = _bulk_snuba_query([item[1] for item in to_query])
-        for result, (query_pos, _, opt_cache_key) in zip(query_results, to_query):
-            if opt_cache_key:
-                cache.set(
-                    opt_cache_key,
-                    json.dumps(result),
-                    settings.SENTRY_SNUBA_CACHE_TTL_SECONDS,
-                )
-            results.append((query_pos, result))
+                # Identical queries are only run by one process at a time, the
+                # others wait for its result to show up in the cache.
+                try:
+                    held_locks.enter_context(_query_cache_lock(cache_key).acquire())
+                except UnableToAcquireLock:
+                    waiting.append(item)
+                else:
+                    to_query.append(item)
+
+        results.extend(_query_and_cache(to_query))
+
+    if waiting:
+        coalesced, remaining = _wait_for_cached_results(waiting)
+        results.extend(coalesced)
+        results.extend(_query_and_cache(remaining))
 
     # Sort so that we get the results back in the original param list order
-    results.sort()
+    results.sort(key=lambda result: result[0])
     # Drop the sort order val
     return [result[1] for result in results]
 
@@ -1155,31 +1387,17 @@ def _bulk_snuba_query(snuba_requests: Sequence[SnubaRequest]) -> ResultSet:
     with sentry_sdk.start_span(op="snuba_query") as span:
         span.set_tag("snuba.num_queries", len(snuba_requests_list))
 
-        if len(snuba_requests_list) > 1:
-            query_results = list(
-                _query_thread_pool.map(
-                    _snuba_query,
-                    [
-                        (
-                            sentry_sdk.Scope.get_isolation_scope(),
-                            sentry_sdk.Scope.get_current_scope(),
-                            snuba_request,
-                        )
-                        for snuba_request in snuba_requests_list
-                    ],
+        query_results = _query_executor.map(
+            _snuba_query,
+            [
+                (
+                    sentry_sdk.Scope.get_isolation_scope(),
+                    sentry_sdk.Scope.get_current_scope(),
+                    snuba_request,
                 )
-            )
-        else:
-            # No need to submit to the thread pool if we're just performing a single query
-            query_results = [
-                _snuba_query(
-                    (
-                        sentry_sdk.Scope.get_isolation_scope(),
-                        sentry_sdk.Scope.get_current_scope(),
-                        snuba_requests_list[0],
-                    )
-                )
-            ]
+                for snuba_request in snuba_requests_list
+            ],
+        )
 
         results = []
         for index, item in enumerate(query_results):
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import os
-from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from functools import partial
 from typing import Protocol, TypeVar
@@ -40,7 +39,7 @@ from sentry_protos.snuba.v1.endpoint_trace_item_table_pb2 import (
 from sentry_protos.snuba.v1.error_pb2 import Error as ErrorProto
 from urllib3.response import BaseHTTPResponse
 
-from sentry.utils.snuba import SnubaError, _snuba_pool
+from sentry.utils.snuba import SnubaError, _query_executor, _snuba_pool
 
 RPCResponseType = TypeVar("RPCResponseType", bound=ProtobufMessage)
 
@@ -50,7 +49,6 @@ SNUBA_INFO_FILE = os.environ.get("SENTRY_SNUBA_INFO_FILE", "")
 SNUBA_INFO = (
     os.environ.get("SENTRY_SNUBA_INFO", "false").lower() in ("true", "1") or SNUBA_INFO_FILE
 )
-_query_thread_pool = ThreadPoolExecutor(max_workers=10)
 
 
 @dataclass(frozen=True)
@@ -125,17 +123,11 @@ def _make_rpc_requests(
         thread_isolation_scope=sentry_sdk.Scope.get_isolation_scope(),
         thread_current_scope=sentry_sdk.Scope.get_current_scope(),
     )
-    response = [
-        result
-        for result in _query_thread_pool.map(
-            partial_request,
-            endpoint_names,
-            # Currently assuming everything is v1
-            ["v1"] * len(referrers),
-            referrers,
-            requests,
-        )
-    ]
+    response = _query_executor.map(
+        lambda args: partial_request(*args),
+        # Currently assuming everything is v1
+        list(zip(endpoint_names, ["v1"] * len(referrers), referrers, requests)),
+    )
 
     # Split the results back up, the thread pool will return them back in order so we can use the type in the
     # requests list to determine which request goes where
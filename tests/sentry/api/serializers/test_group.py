@@ -4,6 +4,7 @@ from unittest.mock import patch
 from django.utils import timezone
 
 from sentry.api.serializers import serialize
+from sentry.api.serializers.models.group import GroupSerializer
 from sentry.integrations.types import ExternalProviderEnum
 from sentry.models.group import Group, GroupStatus
 from sentry.models.grouplink import GroupLink
@@ -404,3 +405,26 @@ class GroupSerializerTest(TestCase, PerformanceIssueTestCase):
         assert serialized["count"] == "1"
         assert serialized["issueCategory"] == "performance"
         assert serialized["issueType"] == "performance_n_plus_one_db_queries"
+
+    @patch("sentry.plugins.base.plugins.for_project", return_value=[])
+    def test_get_attrs_shared_lookups(self, mock_for_project):
+        user = self.create_user()
+        groups = [self.create_group(), self.create_group()]
+
+        with patch("sentry.api.serializers.models.group.metrics") as mock_metrics:
+            attrs = GroupSerializer().get_attrs(groups, user)
+
+        assert [attrs[group]["annotations"] for group in groups] == [[], []]
+        # plugins are looked up once per project and version, not once per group
+        assert mock_for_project.call_count == 2
+        assert {
+            call.kwargs["tags"]["attr_group"] for call in mock_metrics.timing.call_args_list
+        } == {
+            "user_state",
+            "assignees",
+            "resolutions",
+            "seen_stats",
+            "authorization",
+            "annotations",
+            "unhandled",
+        }
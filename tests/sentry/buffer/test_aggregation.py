@@ -0,0 +1,114 @@
+import os
+import signal
+from unittest import mock
+
+from sentry.buffer.aggregation import IncrAggregator
+from sentry.buffer.base import BufferedIncr
+from sentry.models.group import Group
+from sentry.models.project import Project
+
+
+def _aggregator(flushed: list[BufferedIncr], max_size: int = 100) -> IncrAggregator:
+    return IncrAggregator(
+        key_func=lambda item: f"{item.model.__name__}:{sorted(item.filters.items())}",
+        flush_func=flushed.append,
+        interval=lambda: 3600,
+        max_size=lambda: max_size,
+    )
+
+
+def test_merges_increments() -> None:
+    flushed: list[BufferedIncr] = []
+    aggregator = _aggregator(flushed)
+
+    aggregator.add(BufferedIncr(Group, {"times_seen": 1}, {"id": 1}, {"message": "a"}))
+    aggregator.add(BufferedIncr(Group, {"times_seen": 2}, {"id": 1}, {"message": "b"}))
+    aggregator.add(BufferedIncr(Group, {"times_seen": 1}, {"id": 2}))
+    aggregator.add(BufferedIncr(Project, {"times_seen": 1}, {"id": 1}, signal_only=True))
+    aggregator.add(BufferedIncr(Project, {"times_seen": 1}, {"id": 1}))
+    assert flushed == []
+
+    aggregator.flush()
+    assert flushed == [
+        BufferedIncr(Group, {"times_seen": 3}, {"id": 1}, {"message": "b"}),
+        BufferedIncr(Group, {"times_seen": 1}, {"id": 2}),
+        BufferedIncr(Project, {"times_seen": 2}, {"id": 1}, signal_only=True),
+    ]
+
+    aggregator.flush()
+    assert len(flushed) == 3
+
+
+def test_flushes_when_full() -> None:
+    flushed: list[BufferedIncr] = []
+    aggregator = _aggregator(flushed, max_size=2)
+
+    aggregator.add(BufferedIncr(Group, {"times_seen": 1}, {"id": 1}))
+    aggregator.add(BufferedIncr(Group, {"times_seen": 1}, {"id": 1}))
+    assert flushed == []
+    aggregator.add(BufferedIncr(Group, {"times_seen": 1}, {"id": 2}))
+    assert flushed == [
+        BufferedIncr(Group, {"times_seen": 2}, {"id": 1}),
+        BufferedIncr(Group, {"times_seen": 1}, {"id": 2}),
+    ]
+
+
+def test_failed_flush_is_retried() -> None:
+    flushed: list[BufferedIncr] = []
+    aggregator = _aggregator(flushed)
+    aggregator.add(BufferedIncr(Group, {"times_seen": 1}, {"id": 1}))
+    aggregator.add(BufferedIncr(Group, {"times_seen": 1}, {"id": 2}))
+
+    with mock.patch.object(
+        aggregator, "flush_func", side_effect=[None, Exception("boom")]
+    ) as flush_func:
+        aggregator.flush()
+    assert flush_func.call_count == 2
+
+    # only the increment that failed to be written is retried
+    aggregator.add(BufferedIncr(Group, {"times_seen": 1}, {"id": 2}))
+    aggregator.flush()
+    assert flushed == [BufferedIncr(Group, {"times_seen": 2}, {"id": 2})]
+
+
+def test_pending_rows_are_bounded() -> None:
+    flushed: list[BufferedIncr] = []
+    aggregator = _aggregator(flushed, max_size=2)
+    aggregator.add(BufferedIncr(Group, {"times_seen": 1}, {"id": 1}))
+
+    with mock.patch.object(aggregator, "flush_func", side_effect=Exception("boom")):
+        aggregator.add(BufferedIncr(Group, {"times_seen": 1}, {"id": 2}))
+
+    # the failed flush left the aggregator full, so increments of other rows
+    # are written directly while increments of pending rows are still merged
+    aggregator.add(BufferedIncr(Group, {"times_seen": 1}, {"id": 3}))
+    assert flushed == [BufferedIncr(Group, {"times_seen": 1}, {"id": 3})]
+
+    aggregator.add(BufferedIncr(Group, {"times_seen": 1}, {"id": 1}))
+    assert flushed[1:] == [
+        BufferedIncr(Group, {"times_seen": 2}, {"id": 1}),
+        BufferedIncr(Group, {"times_seen": 1}, {"id": 2}),
+    ]
+
+
+def test_flushes_on_terminate() -> None:
+    flushed: list[BufferedIncr] = []
+    aggregator = _aggregator(flushed)
+
+    with (
+        mock.patch("multiprocessing.parent_process", return_value=mock.Mock()),
+        mock.patch("signal.getsignal", return_value=signal.SIG_DFL),
+        mock.patch("signal.signal") as signal_signal,
+        mock.patch("os.kill") as kill,
+    ):
+        aggregator.add(BufferedIncr(Group, {"times_seen": 1}, {"id": 1}))
+        ((signum, handler),) = (call.args for call in signal_signal.call_args_list)
+        assert signum == signal.SIGTERM
+
+        handler(signal.SIGTERM, None)
+
+    # pending increments are written out before the process is terminated
+    # like it would have been without the handler
+    assert flushed == [BufferedIncr(Group, {"times_seen": 1}, {"id": 1})]
+    signal_signal.assert_called_with(signal.SIGTERM, signal.SIG_DFL)
+    kill.assert_called_once_with(os.getpid(), signal.SIGTERM)
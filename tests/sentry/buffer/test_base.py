@@ -4,7 +4,7 @@ from unittest import mock
 from django.utils import timezone
 from pytest import raises
 
-from sentry.buffer.base import Buffer, BufferField
+from sentry.buffer.base import Buffer, BufferedIncr, BufferField
 from sentry.models.group import Group
 from sentry.models.organization import Organization
 from sentry.models.project import Project
@@ -58,6 +58,57 @@ class BufferTest(TestCase):
         assert group_.times_seen == group.times_seen + 1
         assert group_.last_seen == the_date
 
+    @mock.patch("sentry.buffer.base.buffer_incr_complete")
+    def test_process_many_signals_deleted_groups(self, buffer_incr_complete):
+        columns = {"times_seen": 1}
+        filters = {"id": 1234567}
+        self.buf.process_many([BufferedIncr(Group, columns, filters)])
+
+        # like `process`, rows of deleted groups are skipped but still signalled
+        assert not Group.objects.filter(id=1234567).exists()
+        buffer_incr_complete.send_robust.assert_called_once_with(
+            model=Group,
+            columns=columns,
+            filters=filters,
+            extra={},
+            created=False,
+            sender=Group,
+        )
+
+    @mock.patch("sentry.buffer.base.buffer_incr_complete")
+    def test_process_many_signals_each_increment(self, buffer_incr_complete):
+        group = Group.objects.create(project=Project(id=1))
+        the_date = timezone.now() + timedelta(days=5)
+        self.buf.process_many(
+            [
+                BufferedIncr(Group, {"times_seen": 1}, {"id": group.id}),
+                BufferedIncr(Group, {"times_seen": 2}, {"id": group.id}, {"last_seen": the_date}),
+            ]
+        )
+
+        # increments are merged into a single update, but signalled one by one
+        group_ = Group.objects.get(id=group.id)
+        assert group_.times_seen == group.times_seen + 3
+        assert group_.last_seen == the_date
+        assert buffer_incr_complete.send_robust.call_args_list == [
+            mock.call(
+                model=Group,
+                columns={"times_seen": 1},
+                filters={"id": group.id},
+                extra={},
+                created=False,
+                sender=Group,
+            ),
+            mock.call(
+                model=Group,
+                columns={"times_seen": 2},
+                filters={"id": group.id},
+                extra={"last_seen": the_date},
+                created=False,
+                sender=Group,
+            ),
+        ]
+
     def test_increments_when_null(self):
         org = Organization.objects.create(slug="test-org")
         team = Team.objects.create(organization=org, slug="test-team")
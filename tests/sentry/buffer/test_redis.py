@@ -21,6 +21,7 @@ from sentry.models.group import Group
 from sentry.models.project import Project
 from sentry.rules.processing.buffer_processing import process_buffer
 from sentry.rules.processing.processor import PROJECT_ID_BUFFER_LIST_KEY
+from sentry.testutils.helpers import override_options
 from sentry.testutils.helpers.datetime import freeze_time
 from sentry.testutils.pytest.fixtures import django_db_all
 from sentry.utils import json
@@ -628,6 +629,57 @@ class TestRedisBuffer:
         # signal_only should not increment the times_seen column
         assert group.times_seen == orig_times_seen
 
+    def test_incr_local_aggregation(self):
+        client = get_cluster_routing_client(self.buf.cluster, self.buf.is_redis_cluster)
+        model = mock.Mock()
+        model.__name__ = "Mock"
+        filters = {"pk": 1}
+        key = self.buf._make_key(model, filters=filters)
+
+        with override_options({"buffer.local-aggregation.enabled": True}):
+            self.buf.incr(model, {"times_seen": 1}, filters)
+            self.buf.incr(model, {"times_seen": 2}, filters)
+            assert client.zrange("b:p", 0, -1) == []
+
+            self.buf.flush_local_increments()
+
+        result = _hgetall_decode_keys(client, key, self.buf.is_redis_cluster)
+        assert int(result["i+times_seen"]) == 3
+        assert len(client.zrange("b:p", 0, -1)) == 1
+
+    @django_db_all
+    @freeze_time()
+    def test_bulk_flush(self, default_project, default_group, task_runner):
+        other_group = Group.objects.create(project=default_project, times_seen=10)
+        orig_times_seen = Group.objects.get_from_cache(id=default_group.id).times_seen
+        last_seen = timezone.now()
+
+        self.buf.incr(Group, {"times_seen": 2}, {"pk": default_group.id}, {"last_seen": last_seen})
+        self.buf.incr(Group, {"times_seen": 3}, {"pk": default_group.id}, {"last_seen": last_seen})
+        self.buf.incr(Group, {"times_seen": 1}, {"id": other_group.id}, {"last_seen": last_seen})
+
+        with (
+            override_options({"buffer.bulk-flush.enabled": True}),
+            task_runner(),
+            mock.patch("sentry.buffer.backend", self.buf),
+            mock.patch.object(self.buf, "_bulk_update", wraps=self.buf._bulk_update) as bulk_update,
+            mock.patch("sentry.buffer.base.Buffer.process") as process,
+        ):
+            self.buf.process_pending()
+
+        # both groups are written with a single statement, and nothing falls
+        # back to processing rows one by one
+        assert bulk_update.call_count == 1
+        assert process.call_count == 0
+
+        group = Group.objects.get_from_cache(id=default_group.id)
+        assert group.times_seen == orig_times_seen + 5
+        assert group.last_seen == last_seen
+        assert Group.objects.get(id=other_group.id).times_seen == 11
+
+        client = get_cluster_routing_client(self.buf.cluster, self.buf.is_redis_cluster)
+        assert client.zrange("b:p", 0, -1) == []
+
 
 @pytest.mark.parametrize(
     "value",
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from typing import Any
+from unittest.mock import patch
 
 from sentry.data_export.base import ExportQueryType, ExportStatus
 from sentry.data_export.models import ExportedData
@@ -368,6 +369,24 @@ class DataExportTest(APITestCase):
             response = self.get_response(self.org.slug, **payload)
         assert response.status_code == 400
 
+    @patch("sentry.data_export.endpoints.data_export.assemble_download_streamed.delay")
+    def test_ndjson_format(self, assemble_download_streamed_delay):
+        payload = self.make_payload("discover")
+        with self.feature(["organizations:discover-query"]):
+            self.get_success_response(self.org.slug, status_code=201, format="ndjson", **payload)
+        assert assemble_download_streamed_delay.call_args[1]["export_format"] == "ndjson"
+
+    def test_ndjson_format_unsupported(self):
+        # NDJSON is only written by the streamed export, which needs the
+        # rows to be sorted by timestamp
+        payload = self.make_payload("discover", {"field": ["title", "count()"]})
+        with self.feature(["organizations:discover-query"]):
+            self.get_error_response(self.org.slug, status_code=400, format="ndjson", **payload)
+
+        payload = self.make_payload("issue")
+        with self.feature(["organizations:discover-query"]):
+            self.get_error_response(self.org.slug, status_code=400, format="ndjson", **payload)
+
     def test_is_query(self):
         """
         is queries should work with the errors dataset
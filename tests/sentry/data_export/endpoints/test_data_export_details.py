@@ -91,6 +91,25 @@ class DataExportDetailsTest(APITestCase):
         assert response.data["checksum"] == sha1(contents).hexdigest()
         assert response.data["fileName"] == "test.csv"
 
+    def test_download_content_type(self):
+        for headers, content_type in [
+            ({"Content-Type": "text/csv"}, "text/csv"),
+            ({"Content-Type": "application/x-ndjson"}, "application/x-ndjson"),
+            (
+                {"Content-Type": "application/x-ndjson", "Content-Encoding": "zstd"},
+                "application/zstd",
+            ),
+        ]:
+            file = File.objects.create(name="test", type="export.csv", headers=headers)
+            file.putfile(BytesIO(b"test"))
+            self.data_export.update(file_id=file.id)
+            with self.feature("organizations:discover-query"):
+                response = self.get_success_response(
+                    self.organization.slug, self.data_export.id, qs_params={"download": "true"}
+                )
+            assert response["Content-Type"] == content_type
+            assert b"".join(response.streaming_content) == b"test"
+
     def test_invalid_organization(self):
         invalid_user = self.create_user()
         invalid_organization = self.create_organization(owner=invalid_user)
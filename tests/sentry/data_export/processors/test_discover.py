@@ -143,3 +143,24 @@ class DiscoverIssuesProcessorTest(TestCase, PerformanceIssueTestCase):
         result = processor.data_fn(0, 1)
         assert len(result["data"]) == 1
         assert result["data"][0]["title"] == "N+1 Query"
+
+    def test_get_keyset_direction(self):
+        assert DiscoverProcessor.get_keyset_direction(["title"], [], None) is True
+        assert DiscoverProcessor.get_keyset_direction(["title"], [], "-timestamp") is True
+        assert DiscoverProcessor.get_keyset_direction(["title"], [], "timestamp") is False
+        assert DiscoverProcessor.get_keyset_direction(["title"], [], "-title") is None
+        assert DiscoverProcessor.get_keyset_direction(["count(id)"], [], None) is None
+        assert DiscoverProcessor.get_keyset_direction(["title"], ["1 + 1"], None) is None
+
+    def test_get_time_slices(self):
+        self.discover_query = {**self.discover_query, "field": ["title"]}
+        processor = DiscoverProcessor(organization=self.org, discover_query=self.discover_query)
+        assert processor.supports_keyset
+
+        slices = processor.get_time_slices(4)
+        assert len(slices) == 4
+        # Newest slice first, since the export is sorted by -timestamp
+        assert slices[0][1] == processor.end
+        assert slices[-1][0] == processor.start
+        for (_, older_end), (newer_start, _) in zip(slices[1:], slices):
+            assert older_end == newer_start
@@ -1,15 +1,23 @@
-from unittest.mock import patch
+import gzip
+from unittest.mock import Mock, patch
 
 from django.db import IntegrityError
 
-from sentry.data_export.base import ExportQueryType
+from sentry.data_export.base import ExportCompression, ExportFormat, ExportQueryType
 from sentry.data_export.models import ExportedData
-from sentry.data_export.tasks import assemble_download, merge_export_blobs
+from sentry.data_export.tasks import (
+    assemble_download,
+    assemble_download_streamed,
+    export_keyset_slice,
+    merge_export_blobs,
+)
 from sentry.exceptions import InvalidSearchQuery
 from sentry.models.files.file import File
 from sentry.search.events.constants import TIMEOUT_ERROR_MESSAGE
+from sentry.taskworker.retry import NoRetriesRemainingError
 from sentry.testutils.cases import SnubaTestCase, TestCase
 from sentry.testutils.helpers.datetime import before_now
+from sentry.utils import json
 from sentry.utils.samples import load_data
 from sentry.utils.snuba import (
     DatasetSelectionError,
@@ -685,6 +693,115 @@ class AssembleDownloadLargeTest(TestCase, SnubaTestCase):
         assert emailer.called
 
 
+class AssembleDownloadStreamedTest(TestCase, SnubaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user()
+        self.org = self.create_organization()
+        self.project = self.create_project(organization=self.org)
+        for i in range(5):
+            self.store_event(
+                data={
+                    "message": f"message {i}",
+                    "timestamp": before_now(minutes=5 - i).isoformat(),
+                },
+                project_id=self.project.id,
+            )
+
+    def create_export(self, **query_info):
+        return ExportedData.objects.create(
+            user_id=self.user.id,
+            organization=self.org,
+            query_type=ExportQueryType.DISCOVER,
+            query_info={"project": [self.project.id], "query": "", **query_info},
+        )
+
+    def test_task_persistent_name(self):
+        assert (
+            assemble_download_streamed.name == "sentry.data_export.tasks.assemble_download_streamed"
+        )
+
+    @patch("sentry.data_export.models.ExportedData.email_success")
+    def test_discover_csv(self, emailer):
+        de = self.create_export(field=["message"])
+        with self.tasks():
+            assemble_download_streamed(de.id, batch_size=2)
+        de = ExportedData.objects.get(id=de.id)
+        assert de.date_finished is not None
+        file = de._get_file()
+        assert file.headers == {"Content-Type": "text/csv"}
+        assert file.name.endswith(".csv")
+        with file.getfile() as f:
+            header, *rows = f.read().strip().split(b"\r\n")
+        assert header == b"message"
+        assert rows == [f"message {i}".encode() for i in reversed(range(5))]
+        assert emailer.called
+
+    @patch("sentry.data_export.models.ExportedData.email_success")
+    def test_discover_ndjson_gzip(self, emailer):
+        de = self.create_export(field=["message"], sort="timestamp")
+        with self.tasks():
+            assemble_download_streamed(
+                de.id,
+                batch_size=2,
+                export_limit=3,
+                export_format=ExportFormat.NDJSON,
+                compression=ExportCompression.GZIP,
+            )
+        de = ExportedData.objects.get(id=de.id)
+        file = de._get_file()
+        assert file.name.endswith(".ndjson.gz")
+        assert file.headers == {"Content-Type": "application/x-ndjson", "Content-Encoding": "gzip"}
+        with file.getfile() as f:
+            lines = gzip.decompress(f.read()).strip().split(b"\n")
+        assert [json.loads(line) for line in lines] == [
+            {"message": f"message {i}"} for i in range(3)
+        ]
+
+    def test_slices_share_export_limit(self):
+        processor = Mock()
+        processor.iter_keyset_pages.side_effect = lambda start, end, batch_size: (
+            [{"id": i} for i in range(page, min(page + batch_size, end))]
+            for page in range(start, end, batch_size)
+        )
+
+        # Slices are exported in order, so once the earlier slices hold
+        # `export_limit` rows, later slices fetch nothing
+        row_counts = [0, 0, 0]
+        slice_files = [
+            export_keyset_slice(processor, start, start + 5, 7, 2, row_counts, slice_index)
+            for slice_index, start in enumerate([0, 100, 200])
+        ]
+        assert row_counts == [5, 2, 0]
+        assert [len(f.read().splitlines()) for f in slice_files] == [5, 2, 0]
+        assert processor.iter_keyset_pages.call_count == 3
+
+    @patch("sentry.data_export.tasks.assemble_download.delay")
+    def test_aggregate_query_falls_back(self, assemble_download_delay):
+        de = self.create_export(field=["count()"])
+        assemble_download_streamed(de.id)
+        assert assemble_download_delay.call_count == 1
+
+    @patch("sentry.data_export.models.ExportedData.email_failure")
+    @patch("sentry.data_export.tasks.assemble_download.delay")
+    @patch("sentry.data_export.tasks.retry_task", side_effect=NoRetriesRemainingError)
+    @patch("sentry.data_export.tasks._export_keyset_slices", side_effect=Exception("boom"))
+    def test_failure_falls_back_once_retries_run_out(
+        self, export_slices, retry, assemble_download_delay, emailer
+    ):
+        # CSV exports are handed off to the resumable chunked export
+        de = self.create_export(field=["message"])
+        assemble_download_streamed(de.id)
+        assert retry.call_count == 1
+        assert assemble_download_delay.call_count == 1
+        assert not emailer.called
+
+        # which can not write NDJSON
+        assemble_download_streamed(de.id, export_format=ExportFormat.NDJSON)
+        assert assemble_download_delay.call_count == 1
+        assert emailer.call_args[1]["message"] == "Internal processing failure"
+
+
 class MergeExportBlobsTest(TestCase, SnubaTestCase):
     def test_task_persistent_name(self):
         assert merge_export_blobs.name == "sentry.data_export.tasks.merge_blobs"
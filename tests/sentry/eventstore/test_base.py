@@ -1,8 +1,13 @@
+from unittest import mock
+
+from sentry import nodestore
 from sentry.eventstore.base import EventStorage
 from sentry.eventstore.models import Event
+from sentry.nodestore.django import DjangoNodeStorage
 from sentry.snuba.dataset import Dataset
 from sentry.testutils.cases import TestCase
 from sentry.testutils.helpers.datetime import before_now
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.skips import requires_snuba
 
 pytestmark = [requires_snuba]
@@ -38,3 +43,40 @@ class EventStorageTest(TestCase):
         assert before is None
         assert after is not None
         assert event.data["user"]["id"] == "user1"
+
+    @override_options(
+        {
+            "nodestore.set-subkeys.enable-set-cache-item": False,
+            "nodestore.request-cache.enabled": True,
+        }
+    )
+    def test_defer_nodes(self):
+        """
+        Test that deferred nodes are fetched together on the first read
+        """
+        min_ago = before_now(minutes=1).isoformat()
+        self.store_event(
+            data={"event_id": "a" * 32, "timestamp": min_ago, "user": {"id": "user1"}},
+            project_id=self.project.id,
+        )
+        self.store_event(
+            data={"event_id": "b" * 32, "timestamp": min_ago, "user": {"id": "user2"}},
+            project_id=self.project.id,
+        )
+
+        event = Event(project_id=self.project.id, event_id="a" * 32)
+        event2 = Event(project_id=self.project.id, event_id="b" * 32)
+        with (
+            nodestore.backend.request_cache(),
+            mock.patch.object(
+                DjangoNodeStorage,
+                "_get_bytes_multi",
+                autospec=True,
+                side_effect=DjangoNodeStorage._get_bytes_multi,
+            ) as get_multi,
+        ):
+            self.eventstorage.defer_nodes([event, event2])
+            assert event.data._node_data is None
+            assert event.data["user"]["id"] == "user1"
+            assert event2.data["user"]["id"] == "user2"
+            assert get_multi.call_count == 1
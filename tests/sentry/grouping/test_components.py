@@ -10,6 +10,7 @@ from sentry.grouping.component import (
     StacktraceGroupingComponent,
     ThreadsGroupingComponent,
 )
+from sentry.grouping.strategies.newstyle import FRAME_COMPONENT_CACHE
 from sentry.testutils.cases import TestCase
 
 
@@ -104,6 +105,39 @@ class ComponentTest(TestCase):
 
             assert [frame_component.in_app for frame_component in frame_components] == [False, True]
 
+    def test_frame_components_are_cached_across_events(self):
+        FRAME_COMPONENT_CACHE.clear()
+        self.event.data["exception"]["values"][0]["stacktrace"] = {
+            "frames": [
+                self.contributing_system_frame,
+                self.contributing_in_app_frame,
+            ]
+        }
+
+        first_variants = self.event.get_grouping_variants(normalize_stacktraces=True)
+        cache_size = len(FRAME_COMPONENT_CACHE)
+        assert cache_size > 0
+
+        second_variants = self.event.get_grouping_variants(normalize_stacktraces=True)
+        assert len(FRAME_COMPONENT_CACHE) == cache_size
+
+        for variant_name in ["app", "system"]:
+            first_component = first_variants[variant_name].component
+            second_component = second_variants[variant_name].component
+            assert first_component.as_dict() == second_component.as_dict()
+
+            # Cache hits are copies, so that the app variant marking system frames as
+            # non-contributing doesn't leak into other variants or events
+            first_frames = find_given_child_component(
+                first_component.values[0], StacktraceGroupingComponent
+            ).values
+            second_frames = find_given_child_component(
+                second_component.values[0], StacktraceGroupingComponent
+            ).values
+            for first_frame, second_frame in zip(first_frames, second_frames):
+                assert first_frame is not second_frame
+                assert first_frame.values[0] is not second_frame.values[0]
+
     def test_stacktrace_component_tallies_frame_types_simple(self):
         self.event.data["exception"]["values"][0]["stacktrace"] = {
             "frames": (
@@ -9,6 +9,7 @@ import pytest
 
 from sentry.grouping.component import FrameGroupingComponent, StacktraceGroupingComponent
 from sentry.grouping.enhancer import (
+    STACKTRACE_DECISIONS_CACHE,
     Enhancements,
     is_valid_profiling_action,
     is_valid_profiling_matcher,
@@ -914,3 +915,45 @@ class AssembleStacktraceComponentTest(TestCase):
 
             assert stacktrace_component2.contributes is False
             assert stacktrace_component2.hint is None
+
+    def test_caches_decisions_for_loaded_enhancements(self):
+        STACKTRACE_DECISIONS_CACHE.clear()
+
+        enhancements = Enhancements.loads(Enhancements.from_config_string("").base64_string)
+        mock_rust_enhancements = MockRustEnhancements(
+            frame_results=[(False, "ignored by stacktrace rule (...)"), (True, None)],
+            stacktrace_results=(True, None),
+        )
+        expected_frame_results = [(False, "ignored by stacktrace rule (...)"), (True, None)]
+
+        with (
+            mock.patch.object(enhancements, "rust_enhancements", mock_rust_enhancements),
+            mock.patch.object(
+                mock_rust_enhancements,
+                "assemble_stacktrace_component",
+                wraps=mock_rust_enhancements.assemble_stacktrace_component,
+            ) as mock_assemble,
+        ):
+            stacktrace_components = [
+                enhancements.assemble_stacktrace_component(
+                    variant_name="system",
+                    frame_components=[system_frame(True, None), in_app_frame(True, None)],
+                    frames=[{"function": "foo"}, {"function": "bar"}],
+                    platform="python",
+                    exception_data={},
+                )
+                for _ in range(2)
+            ]
+
+        assert mock_assemble.call_count == 1
+        assert len(STACKTRACE_DECISIONS_CACHE) == 1
+
+        for stacktrace_component in stacktrace_components:
+            self.assert_frame_values_match_expected(
+                stacktrace_component, expected_frame_results=expected_frame_results
+            )
+            assert stacktrace_component.contributes is True
+            assert stacktrace_component.frame_counts == {
+                "system_non_contributing_frames": 1,
+                "in_app_contributing_frames": 1,
+            }
@@ -3,6 +3,7 @@ from unittest import mock
 import pytest
 
 from sentry.grouping.parameterization import (
+    PARAMETERIZED_MESSAGE_CACHE,
     ParameterizationRegexExperiment,
     Parameterizer,
     UniqueIdExperiment,
@@ -268,6 +269,37 @@ def test_parameterize_regex_experiment_cached_compiled():
     mocked_pattern.assert_called_once()
 
 
+def test_parameterize_regex_prefilters(parameterizer):
+    # Only the patterns whose prefilters match end up in the regex
+    regex = parameterizer._get_regex_for_content("A quick brown fox")
+    assert regex is not None
+    assert set(regex.groupindex) == {"sha1", "md5"}
+
+    regex = parameterizer._get_regex_for_content("retry=true")
+    assert regex is not None
+    assert set(regex.groupindex) == {"sha1", "md5", "quoted_str", "bool"}
+
+    assert Parameterizer(regex_pattern_keys=("int",))._get_regex_for_content("no digits") is None
+
+
+def test_parameterize_regex_cached():
+    PARAMETERIZED_MESSAGE_CACHE.clear()
+    input_str = "blah 0x40000015 had 2 problems"
+
+    parameterizer = Parameterizer(regex_pattern_keys=("hex", "int"))
+    assert parameterizer.parametrize_w_regex(input_str) == "blah <hex> had <int> problems"
+
+    with mock.patch.object(Parameterizer, "_get_regex_for_content") as mock_get_regex:
+        cached_parameterizer = Parameterizer(regex_pattern_keys=("hex", "int"))
+        assert (
+            cached_parameterizer.parametrize_w_regex(input_str) == "blah <hex> had <int> problems"
+        )
+
+    mock_get_regex.assert_not_called()
+    # Matches are still counted when the result comes from the cache
+    assert cached_parameterizer.matches_counter == {"hex": 1, "int": 1}
+
+
 # These are test cases that we should fix
 @pytest.mark.xfail()
 @pytest.mark.parametrize(
@@ -19,9 +19,11 @@ from django.conf import settings
 from sentry import eventstore
 from sentry.event_manager import EventManager
 from sentry.ingest.consumer.processors import (
+    ParsedEvent,
     collect_span_metrics,
     process_attachment_chunk,
     process_event,
+    process_event_batch,
     process_individual_attachment,
     process_userreport,
 )
@@ -111,6 +113,71 @@ def test_deduplication_works(default_project, task_runner, preprocess_event):
     }
 
 
+@django_db_all
+def test_batch_deduplication_works(default_project, task_runner, preprocess_event):
+    start_time = time.time() - 3600
+    payloads = [
+        get_normalized_event({"message": f"hello world {i}"}, default_project) for i in range(3)
+    ]
+
+    def parsed_event(payload):
+        return ParsedEvent(
+            {
+                "payload": orjson.dumps(payload).decode(),
+                "start_time": start_time,
+                "event_id": payload["event_id"],
+                "project_id": default_project.id,
+                "remote_addr": "127.0.0.1",
+            },
+            default_project,
+            dict(payload),
+        )
+
+    # The first event is duplicated within the batch.
+    process_event_batch(
+        ConsumerType.Events,
+        [parsed_event(payloads[0]), parsed_event(payloads[0]), parsed_event(payloads[1])],
+    )
+    # The second event was already processed by the previous batch.
+    process_event_batch(
+        ConsumerType.Events,
+        [parsed_event(payloads[1]), parsed_event(payloads[2])],
+    )
+
+    assert [kwargs["event_id"] for kwargs in preprocess_event] == [
+        payload["event_id"] for payload in payloads
+    ]
+    for kwargs, payload in zip(preprocess_event, payloads):
+        assert kwargs["cache_key"] == f"e:{payload['event_id']}:{default_project.id}"
+        assert kwargs["data"] == payload
+
+
+@django_db_all
+def test_batch_killswitch(default_project, task_runner, preprocess_event):
+    payload = get_normalized_event({"message": "hello world"}, default_project)
+
+    with override_options(
+        {"store.load-shed-parsed-pipeline-projects": [{"project_id": default_project.id}]}
+    ):
+        process_event_batch(
+            ConsumerType.Events,
+            [
+                ParsedEvent(
+                    {
+                        "payload": orjson.dumps(payload).decode(),
+                        "start_time": time.time(),
+                        "event_id": payload["event_id"],
+                        "project_id": default_project.id,
+                    },
+                    default_project,
+                    payload,
+                )
+            ],
+        )
+
+    assert preprocess_event == []
+
+
 @django_db_all
 def test_transactions_spawn_save_event_transaction(
     default_project,
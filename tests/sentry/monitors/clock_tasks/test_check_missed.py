@@ -11,6 +11,7 @@ from sentry.constants import ObjectStatus
 from sentry.monitors.clock_tasks.check_missed import (
     dispatch_check_missing,
     mark_environment_missing,
+    mark_environments_missing,
 )
 from sentry.monitors.clock_tasks.producer import MONITORS_CLOCK_TASKS_CODEC
 from sentry.monitors.models import (
@@ -22,6 +23,7 @@ from sentry.monitors.models import (
     ScheduleType,
 )
 from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers import override_options
 
 
 class MonitorClockTasksCheckMissingTest(TestCase):
@@ -596,6 +598,110 @@ class MonitorClockTasksCheckMissingTest(TestCase):
             monitor_environment=successful_monitor_environment.id, status=CheckInStatus.MISSED
         ).exists()
 
+    @override_options({"crons.clock_tasks.scan_page_size": 2})
+    @mock.patch("sentry.monitors.clock_tasks.check_missed.wait_for_tasks")
+    @mock.patch("sentry.monitors.clock_tasks.check_missed.produce_task")
+    def test_missing_checkin_paginated(self, mock_produce_task, mock_wait_for_tasks):
+        ts = timezone.now().replace(second=0, microsecond=0)
+
+        monitor_environments = []
+        for minutes in [1, 2, 2, 2, 3]:
+            monitor = self.create_monitor()
+            monitor_environments.append(
+                MonitorEnvironment.objects.create(
+                    monitor=monitor,
+                    environment_id=self.environment.id,
+                    last_checkin=ts - timedelta(minutes=minutes + 2),
+                    next_checkin=ts - timedelta(minutes=minutes + 1),
+                    next_checkin_latest=ts - timedelta(minutes=minutes),
+                    status=MonitorStatus.OK,
+                )
+            )
+
+        dispatch_check_missing(ts)
+
+        # Every environment is dispatched exactly once, in pages of two
+        assert mock_produce_task.call_count == 5
+        assert [len(call.args[0]) for call in mock_wait_for_tasks.mock_calls] == [2, 2, 1]
+
+        # Pages are ordered by next_checkin_latest, and then id
+        produced_ids = [
+            MONITORS_CLOCK_TASKS_CODEC.decode(call.args[0].value)["monitor_environment_id"]
+            for call in mock_produce_task.mock_calls
+        ]
+        assert produced_ids == [
+            env.id
+            for env in sorted(
+                monitor_environments, key=lambda env: (env.next_checkin_latest, env.id)
+            )
+        ]
+
+    def test_mark_environments_missing(self):
+        ts = timezone.now().replace(second=0, microsecond=0)
+
+        monitor_environments = []
+        for _ in range(3):
+            monitor = self.create_monitor()
+            monitor_environments.append(
+                MonitorEnvironment.objects.create(
+                    monitor=monitor,
+                    environment_id=self.environment.id,
+                    last_checkin=ts - timedelta(minutes=2),
+                    next_checkin=ts - timedelta(minutes=1),
+                    next_checkin_latest=ts,
+                    status=MonitorStatus.OK,
+                )
+            )
+
+        # The last environment was already handled by an earlier task
+        handled = monitor_environments[-1]
+        handled.update(next_checkin_latest=ts + timedelta(minutes=1))
+
+        mark_environments_missing([env.id for env in monitor_environments], ts)
+
+        for monitor_environment in monitor_environments[:-1]:
+            missed_checkin = MonitorCheckIn.objects.get(
+                monitor_environment=monitor_environment.id, status=CheckInStatus.MISSED
+            )
+            assert missed_checkin.expected_time == ts - timedelta(minutes=1)
+            assert MonitorEnvironment.objects.filter(
+                id=monitor_environment.id, status=MonitorStatus.ERROR
+            ).exists()
+
+        assert not MonitorCheckIn.objects.filter(monitor_environment=handled.id).exists()
+
+    @mock.patch("sentry.monitors.clock_tasks.check_missed.mark_failed")
+    def test_mark_environments_missing_failure(self, mock_mark_failed):
+        ts = timezone.now().replace(second=0, microsecond=0)
+
+        monitor_environments = []
+        for _ in range(3):
+            monitor = self.create_monitor()
+            monitor_environments.append(
+                MonitorEnvironment.objects.create(
+                    monitor=monitor,
+                    environment_id=self.environment.id,
+                    last_checkin=ts - timedelta(minutes=2),
+                    next_checkin=ts - timedelta(minutes=1),
+                    next_checkin_latest=ts,
+                    status=MonitorStatus.OK,
+                )
+            )
+        mock_mark_failed.side_effect = [None, Exception, None]
+
+        mark_environments_missing([env.id for env in monitor_environments], ts)
+
+        # A failing environment does not cause the others to be marked failed
+        # again, which would dispatch their issue occurrences twice
+        assert mock_mark_failed.call_count == 3
+        assert sorted(
+            call.args[0].monitor_environment_id for call in mock_mark_failed.mock_calls
+        ) == sorted(env.id for env in monitor_environments)
+        for monitor_environment in monitor_environments:
+            assert MonitorCheckIn.objects.filter(
+                monitor_environment=monitor_environment.id, status=CheckInStatus.MISSED
+            ).exists()
+
     @mock.patch("sentry.monitors.clock_tasks.check_missed.produce_task")
     def test_missed_checkin_backlog_handled(self, mock_produce_task):
         """
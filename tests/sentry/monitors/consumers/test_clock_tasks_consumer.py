@@ -88,3 +88,58 @@ def test_dispatch_mark_unknown(mock_mark_checkin_unknown):
 
     assert mock_mark_checkin_unknown.call_count == 1
     assert mock_mark_checkin_unknown.mock_calls[0] == mock.call(1, ts)
+
+
+@mock.patch("sentry.monitors.consumers.clock_tasks_consumer.mark_checkin_timeout")
+@mock.patch("sentry.monitors.consumers.clock_tasks_consumer.mark_environments_missing")
+def test_batched_mark_missing(mock_mark_environments_missing, mock_mark_checkin_timeout):
+    ts = timezone.now().replace(second=0, microsecond=0)
+
+    factory = MonitorClockTasksStrategyFactory(mode="batched", max_batch_size=5)
+    consumer = factory.create_with_partitions(mock.Mock(), {partition: 0})
+
+    for monitor_environment_id in (1, 2):
+        send_task(
+            consumer,
+            ts,
+            {
+                "type": "mark_missing",
+                "ts": ts.timestamp(),
+                "monitor_environment_id": monitor_environment_id,
+            },
+        )
+    send_task(
+        consumer,
+        ts,
+        {
+            "type": "mark_timeout",
+            "ts": ts.timestamp(),
+            "monitor_environment_id": 3,
+            "checkin_id": 1,
+        },
+    )
+    # A second task for the same environment starts a new bulk update
+    for monitor_environment_id in (3, 3):
+        send_task(
+            consumer,
+            ts,
+            {
+                "type": "mark_missing",
+                "ts": ts.timestamp(),
+                "monitor_environment_id": monitor_environment_id,
+            },
+        )
+
+    # One more task to process the batch
+    send_task(
+        consumer,
+        ts,
+        {"type": "mark_missing", "ts": ts.timestamp(), "monitor_environment_id": 4},
+    )
+
+    assert mock_mark_environments_missing.mock_calls == [
+        mock.call([1, 2], ts),
+        mock.call([3], ts),
+        mock.call([3], ts),
+    ]
+    assert mock_mark_checkin_timeout.mock_calls == [mock.call(1, ts)]
@@ -249,6 +249,89 @@ class MonitorConsumerTest(TestCase):
         # The last group is monitor_2 but with a diff environment
         assert group_3[0].payload.get("environment") == "test"
 
+    def test_bulk(self) -> None:
+        factory = StoreMonitorCheckInStrategyFactory(
+            mode="batched-bulk",
+            max_batch_size=4,
+            max_workers=1,
+        )
+        commit = mock.Mock()
+        consumer = factory.create_with_partitions(commit, {self.partition: 0})
+
+        monitor = self._create_monitor(slug="my-monitor")
+        now = datetime.now().replace(second=0, microsecond=0)
+
+        # Create the monitor environment in an OK state
+        self.send_checkin(monitor.slug, ts=now)
+        monitor_environment = MonitorEnvironment.objects.get(monitor=monitor)
+        assert monitor_environment.status == MonitorStatus.OK
+
+        guids = []
+        for minute in range(1, 5):
+            self.send_checkin(monitor.slug, ts=now + timedelta(minutes=minute), consumer=consumer)
+            guids.append(self.guid)
+
+        # One more check-in to process the batch
+        self.send_checkin(monitor.slug, ts=now + timedelta(minutes=5), consumer=consumer)
+
+        checkins = list(MonitorCheckIn.objects.filter(guid__in=guids).order_by("date_added"))
+        assert len(checkins) == 4
+
+        # Each check-in expected the one before it
+        for previous, checkin in zip(checkins, checkins[1:]):
+            assert checkin.expected_time == monitor.get_next_expected_checkin(previous.date_added)
+
+        monitor_environment.refresh_from_db()
+        assert monitor_environment.last_checkin == checkins[-1].date_added
+        assert monitor_environment.next_checkin == monitor.get_next_expected_checkin(
+            checkins[-1].date_added
+        )
+
+    def test_bulk_error_preserves_order(self) -> None:
+        factory = StoreMonitorCheckInStrategyFactory(
+            mode="batched-bulk",
+            max_batch_size=4,
+            max_workers=1,
+        )
+        commit = mock.Mock()
+        consumer = factory.create_with_partitions(commit, {self.partition: 0})
+
+        monitor = self._create_monitor(slug="my-monitor")
+        now = datetime.now().replace(second=0, microsecond=0)
+        self.send_checkin(monitor.slug, ts=now)
+
+        self.send_checkin(monitor.slug, ts=now + timedelta(minutes=1), consumer=consumer)
+        ok_guid = self.guid
+        self.send_checkin(
+            monitor.slug, ts=now + timedelta(minutes=2), status="error", consumer=consumer
+        )
+        error_guid = self.guid
+        self.send_checkin(
+            monitor.slug, ts=now + timedelta(minutes=3), status="in_progress", consumer=consumer
+        )
+        in_progress_guid = self.guid
+        self.send_checkin(monitor.slug, ts=now + timedelta(minutes=4), consumer=consumer)
+        last_guid = self.guid
+
+        # One more check-in to process the batch
+        self.send_checkin(monitor.slug, ts=now + timedelta(minutes=5), consumer=consumer)
+
+        ok_checkin = MonitorCheckIn.objects.get(guid=ok_guid)
+        error_checkin = MonitorCheckIn.objects.get(guid=error_guid)
+        in_progress_checkin = MonitorCheckIn.objects.get(guid=in_progress_guid)
+        last_checkin = MonitorCheckIn.objects.get(guid=last_guid)
+
+        assert ok_checkin.status == CheckInStatus.OK
+        assert error_checkin.status == CheckInStatus.ERROR
+        assert error_checkin.expected_time == monitor.get_next_expected_checkin(
+            ok_checkin.date_added
+        )
+        assert in_progress_checkin.status == CheckInStatus.IN_PROGRESS
+        assert last_checkin.status == CheckInStatus.OK
+
+        monitor_environment = MonitorEnvironment.objects.get(monitor=monitor)
+        assert monitor_environment.last_checkin == last_checkin.date_added
+
     def test_passing(self) -> None:
         monitor = self._create_monitor(slug="my-monitor")
         self.send_checkin(monitor.slug)
@@ -1,3 +1,4 @@
+import base64
 import pickle
 from datetime import timedelta
 from unittest import mock
@@ -5,9 +6,11 @@ from unittest import mock
 import pytest
 from django.utils import timezone
 
+from sentry.nodestore import compression
 from sentry.nodestore.base import json_dumps
 from sentry.nodestore.django.backend import DjangoNodeStorage
 from sentry.nodestore.django.models import Node
+from sentry.testutils.helpers import override_options
 from sentry.testutils.pytest.fixtures import django_db_all
 from sentry.utils.strings import compress
 
@@ -52,6 +55,28 @@ class TestDjangoNodeStorage:
             b'{"foo":"bar"}'
         )
 
+    @override_options(
+        {"nodestore.compression": "zstd", "nodestore.set-subkeys.enable-set-cache-item": False}
+    )
+    def test_set_compressed(self):
+        self.ns.set("d2502ebbd7df41ceba8d3275595cac33", {"foo": "bar"})
+
+        # Payloads compressed by `NodeStorage` are not compressed again
+        data = Node.objects.get(id="d2502ebbd7df41ceba8d3275595cac33").data
+        assert compression.is_compressed(base64.b64decode(data))
+        assert self.ns.get("d2502ebbd7df41ceba8d3275595cac33") == {"foo": "bar"}
+
+    @override_options(
+        {"nodestore.compression": "zstd", "nodestore.set-subkeys.enable-set-cache-item": False}
+    )
+    def test_get_undecompressable(self):
+        self.ns.set("d2502ebbd7df41ceba8d3275595cac33", {"foo": "bar"})
+
+        with mock.patch.object(
+            compression, "decompress", side_effect=compression.NodeCompressionError
+        ):
+            assert self.ns.get("d2502ebbd7df41ceba8d3275595cac33") is None
+
     def test_delete(self):
         node = Node.objects.create(id="d2502ebbd7df41ceba8d3275595cac33", data='{"foo": "bar"}')
 
@@ -4,10 +4,12 @@ Testsuite of backend-independent nodestore tests. Add your backend to the
 """
 
 from contextlib import nullcontext
+from unittest import mock
 
 import pytest
 
 from sentry.nodestore.django.backend import DjangoNodeStorage
+from sentry.nodestore.request_cache import NodeRequestCache
 from sentry.testutils.helpers import override_options
 from tests.sentry.nodestore.bigtable.test_backend import (
     MockedBigtableNodeStorage,
@@ -98,3 +100,89 @@ def test_set_subkeys(ns):
     ns.delete("node_1")
     assert ns.get("node_1") is None
     assert ns.get("node_1", subkey="other") is None
+
+
+@override_options(
+    {"nodestore.set-subkeys.enable-set-cache-item": False, "nodestore.compression": "zstd"}
+)
+def test_set_subkeys_compressed(ns):
+    ns.set_subkeys("node_1", {None: {"foo": "a", "platform": "python"}, "other": {"foo": "b"}})
+    assert ns.get("node_1") == {"foo": "a", "platform": "python"}
+    assert ns.get("node_1", subkey="other") == {"foo": "b"}
+    assert ns.get_multi(["node_1"]) == {"node_1": {"foo": "a", "platform": "python"}}
+
+
+@override_options(
+    {"nodestore.set-subkeys.enable-set-cache-item": False, "nodestore.indexed-format.enabled": True}
+)
+def test_set_subkeys_indexed(ns):
+    ns.set_subkeys(
+        "node_1", {None: {"foo": "a\nb"}, "other": {"foo": "b"}, "unprocessed": {"foo": "c"}}
+    )
+    assert ns.get("node_1") == {"foo": "a\nb"}
+    assert ns.get("node_1", subkey="other") == {"foo": "b"}
+    assert ns.get("node_1", subkey="unprocessed") == {"foo": "c"}
+    assert ns.get("node_1", subkey="missing") is None
+    assert ns.get_multi(["node_1"], subkey="other") == {"node_1": {"foo": "b"}}
+
+    with override_options({"nodestore.indexed-format.enabled": False}):
+        ns.set_subkeys("node_2", {None: {"foo": "a"}, "other": {"foo": "b"}})
+
+    # blobs written in the legacy format remain readable
+    assert ns.get("node_2") == {"foo": "a"}
+    assert ns.get("node_2", subkey="other") == {"foo": "b"}
+
+
+@override_options(
+    {"nodestore.set-subkeys.enable-set-cache-item": False, "nodestore.request-cache.enabled": True}
+)
+def test_request_cache(ns):
+    ns.set_subkeys("node_1", {None: {"foo": "a"}, "other": {"foo": "b"}})
+    ns.set("node_2", {"foo": "c"})
+    ns.set("node_3", {"foo": "d"})
+
+    with ns.request_cache():
+        with (
+            mock.patch.object(ns, "_get_bytes", wraps=ns._get_bytes) as get_bytes,
+            mock.patch.object(ns, "_get_bytes_multi", wraps=ns._get_bytes_multi) as get_multi,
+        ):
+            # deferred nodes are fetched along with the next read
+            ns.defer("node_2")
+            ns.defer("node_3")
+            assert ns.get("node_1") == {"foo": "a"}
+            assert get_bytes.call_count == 0
+            assert get_multi.call_count == 1
+
+            # all further reads are served from the request cache, including
+            # subkeys and missing nodes
+            assert ns.get("node_1", subkey="other") == {"foo": "b"}
+            assert ns.get("node_2") == {"foo": "c"}
+            assert ns.get_multi(["node_2", "node_3"]) == {
+                "node_2": {"foo": "c"},
+                "node_3": {"foo": "d"},
+            }
+            assert ns.get("node_4") is None
+            assert ns.get("node_4") is None
+            assert get_bytes.call_count == 1
+            assert get_multi.call_count == 1
+
+        # writes and deletes are reflected in the request cache
+        ns.set("node_1", {"foo": "e"})
+        assert ns.get("node_1") == {"foo": "e"}
+        ns.delete("node_1")
+        assert ns.get("node_1") is None
+
+    assert ns._request_cache is None
+
+
+@override_options({"nodestore.request-cache.enabled": True})
+def test_request_cache_dropped_on_error(ns):
+    with (
+        mock.patch.object(NodeRequestCache, "record_metrics", side_effect=ValueError),
+        pytest.raises(ValueError),
+        ns.request_cache(),
+    ):
+        ns.defer("node_1")
+
+    # nothing, including deferred ids, leaks into the next request or task
+    assert ns._request_cache is None
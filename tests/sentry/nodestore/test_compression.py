@@ -0,0 +1,87 @@
+from collections.abc import Generator
+from unittest import mock
+
+import pytest
+import zstandard
+
+from sentry.nodestore import compression
+from sentry.nodestore.base import json_dumps
+from sentry.testutils.helpers import override_options
+
+
+def _sample_payloads(platform: str) -> list[bytes]:
+    return [
+        json_dumps(
+            {
+                "event_id": f"{i:032x}",
+                "platform": platform,
+                "message": f"Something went wrong in handler number {i}",
+                "tags": [["environment", "production"], ["level", "error"]],
+                "sdk": {"name": f"sentry.{platform}", "version": f"1.{i % 7}.0"},
+                "contexts": {"runtime": {"name": "CPython", "version": f"3.{i % 13}"}},
+            }
+        ).encode("utf8")
+        for i in range(1000)
+    ]
+
+
+@pytest.fixture
+def dictionaries() -> Generator[compression.ZstdDictionaryRegistry]:
+    registry = compression.ZstdDictionaryRegistry(
+        {
+            "python": compression.train_dictionary(_sample_payloads("python"), 4096),
+            "default": compression.train_dictionary(_sample_payloads("other"), 4096),
+        }
+    )
+    with mock.patch.object(compression, "get_dictionary_registry", return_value=registry):
+        yield registry
+
+
+def test_passthrough_when_disabled() -> None:
+    value = b'{"foo":"bar"}'
+    assert compression.compress(value) == value
+    assert compression.decompress(value) == value
+
+
+@override_options({"nodestore.compression": "zstd"})
+def test_roundtrip_without_dictionaries() -> None:
+    value = b'{"foo":"bar"}\nunprocessed\n{"foo":"baz"}'
+    with mock.patch.object(
+        compression,
+        "get_dictionary_registry",
+        return_value=compression.ZstdDictionaryRegistry({}),
+    ):
+        rv = compression.compress(value, platform="python")
+        assert compression.is_compressed(rv)
+        assert compression.decompress(rv) == value
+
+
+@override_options({"nodestore.compression": "zstd"})
+def test_roundtrip_with_dictionaries(dictionaries: compression.ZstdDictionaryRegistry) -> None:
+    value = _sample_payloads("python")[0]
+
+    python_compressed = compression.compress(value, platform="python")
+    default_compressed = compression.compress(value, platform="javascript")
+
+    python_dict_id = dictionaries.by_platform["python"].dict_id()
+    default_dict_id = dictionaries.by_platform["default"].dict_id()
+    assert python_dict_id != default_dict_id
+
+    assert zstandard.get_frame_parameters(python_compressed).dict_id == python_dict_id
+    assert zstandard.get_frame_parameters(default_compressed).dict_id == default_dict_id
+
+    assert compression.decompress(python_compressed) == value
+    assert compression.decompress(default_compressed) == value
+
+
+@override_options({"nodestore.compression": "zstd"})
+def test_unknown_dictionary(dictionaries: compression.ZstdDictionaryRegistry) -> None:
+    value = compression.compress(_sample_payloads("python")[0], platform="python")
+
+    with mock.patch.object(
+        compression,
+        "get_dictionary_registry",
+        return_value=compression.ZstdDictionaryRegistry({}),
+    ):
+        with pytest.raises(compression.NodeCompressionError):
+            compression.decompress(value)
@@ -0,0 +1,91 @@
+import pytest
+
+from sentry.ownership.grammar import Matcher, dump_schema, parse_rules
+from sentry.ownership.index import (
+    LiteralAutomaton,
+    OwnershipIndex,
+    get_ownership_index,
+    required_literal,
+)
+
+rules = parse_rules(
+    """
+*.js                         #frontend
+path:src/sentry/*            david@sentry.io
+path:*/other/app.py          other@sentry.io
+path:[abc]*.py               classes@sentry.io
+url:http://example.com/*     #backend
+url:*.org/*                  #backend
+tags.foo:bar                 tagperson@sentry.io
+module:foo.bar               #workflow
+module:baz.*                 #workflow
+codeowners:/src/components/  githubuser@sentry.io
+codeowners:*.py              githubmod@sentry.io
+codeowners:**                everyone@sentry.io
+"""
+)
+
+
+def test_required_literal() -> None:
+    assert required_literal("*.js") == ".js"
+    assert required_literal("src/Sentry/*") == "sentry"
+    assert required_literal("/usr/local/src/*/app.py") == "app.py"
+    assert required_literal("**") is None
+    assert required_literal("[abc]*.py") is None
+    assert required_literal("file\\ with\\ spaces/") is None
+
+
+def test_literal_automaton() -> None:
+    automaton = LiteralAutomaton(["he", "she", "his", "hers"])
+    found: set[int] = set()
+    automaton.search("ushers", found)
+    assert {automaton.literals[i] for i in found} == {"he", "she", "hers"}
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {},
+        {"request": {"url": "http://example.com/foo.js"}},
+        {"request": {"url": "https://sentry.org/"}},
+        {"tags": [["foo", "bar"]]},
+        {
+            "stacktrace": {
+                "frames": [
+                    {"filename": "src/sentry/api.py", "module": "foo.bar"},
+                    {"abs_path": "/usr/local/src/other/app.py", "in_app": False},
+                    {"filename": "src/components/Button.tsx", "module": "baz.qux"},
+                ]
+            }
+        },
+        {
+            "platform": "java",
+            "exception": {
+                "values": [
+                    {
+                        "stacktrace": {
+                            "frames": [
+                                {"module": "io.sentry.example.Application", "filename": "App.java"},
+                                {"filename": "b.py"},
+                            ]
+                        }
+                    }
+                ]
+            },
+        },
+    ],
+)
+def test_matching_rules(data) -> None:
+    munged_data = Matcher.munge_if_needed(data)
+    index = OwnershipIndex(rules)
+    assert index.matching_rules(data, munged_data) == [
+        rule for rule in rules if rule.test(data, munged_data)
+    ]
+
+
+def test_get_ownership_index() -> None:
+    schema = dump_schema(rules)
+    index = get_ownership_index(schema)
+    assert index.rules == rules
+    assert get_ownership_index(dump_schema(rules)) is index
+    assert get_ownership_index(dump_schema(rules[1:])) is not index
@@ -0,0 +1,58 @@
+import zlib
+from datetime import datetime
+from unittest import mock
+
+from sentry.replays.lib.storage import RecordingSegmentStorageMeta
+from sentry.replays.usecases.pack import pack
+from sentry.replays.usecases.reader import (
+    download_segments,
+    iter_decompressed,
+    iter_segment_rrweb,
+)
+
+
+def _segment(segment_id: int) -> RecordingSegmentStorageMeta:
+    return RecordingSegmentStorageMeta(
+        project_id=1,
+        replay_id="a" * 32,
+        segment_id=segment_id,
+        retention_days=30,
+        date_added=datetime.now(),
+    )
+
+
+def test_iter_decompressed():
+    data = b"[" + b"1," * 100_000 + b"1]"
+    chunks = list(iter_decompressed(zlib.compress(data), chunk_size=1024))
+    assert all(len(chunk) <= 1024 for chunk in chunks)
+    assert b"".join(chunks) == data
+
+
+def test_iter_decompressed_uncompressed():
+    assert list(iter_decompressed(b"[1,2]")) == [b"[1,2]"]
+
+
+def test_iter_segment_rrweb():
+    rrweb = b"[" + b"{}," * 10_000 + b"{}]"
+    video = b"\xff" * 50_000
+
+    for packed in (rrweb, pack(rrweb, None), pack(rrweb, video)):
+        result = b"".join(iter_segment_rrweb(zlib.compress(packed), chunk_size=1000))
+        assert result == rrweb
+
+    assert b"".join(iter_segment_rrweb(rrweb)) == rrweb
+
+
+@mock.patch("sentry.replays.usecases.reader._download_compressed_segment")
+def test_download_segments(download_compressed_segment):
+    download_compressed_segment.side_effect = lambda segment: (
+        None
+        if segment.segment_id == 1
+        else zlib.compress(pack(f"[{segment.segment_id}]".encode(), None))
+    )
+
+    segments = [_segment(i) for i in range(25)]
+    result = b"".join(download_segments(segments))
+
+    expected = [[] if i == 1 else [i] for i in range(25)]
+    assert result == str(expected).replace(" ", "").encode()
@@ -242,6 +242,24 @@ class ProcessBufferTest(ProcessDelayedAlertConditionsTestBase):
             self.project_two.id,
         }
 
+    @override_options(
+        {
+            "delayed_processing.cross_project_batching.enabled": True,
+            "delayed_processing.cross_project_batch_size": 10,
+        }
+    )
+    @patch("sentry.rules.processing.delayed_processing.apply_delayed.delay")
+    @patch("sentry.rules.processing.delayed_processing.apply_delayed_bulk.delay")
+    def test_cross_project_batching(self, mock_apply_delayed_bulk, mock_apply_delayed):
+        self._push_base_events()
+        process_buffer()
+
+        assert mock_apply_delayed.call_count == 0
+        mock_apply_delayed_bulk.assert_called_once()
+        assert sorted(mock_apply_delayed_bulk.call_args[0][0]) == sorted(
+            [(self.project.id, None), (self.project_two.id, None)]
+        )
+
 
 class ProcessInBatchesTest(CreateEventTestCase):
     def setUp(self):
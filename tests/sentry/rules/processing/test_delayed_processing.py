@@ -21,12 +21,16 @@ from sentry.rules.conditions.event_frequency import (
 from sentry.rules.processing.buffer_processing import process_in_batches
 from sentry.rules.processing.delayed_processing import (
     DataAndGroups,
+    DelayedProjectData,
     UniqueConditionQuery,
     apply_delayed,
+    apply_delayed_bulk,
     bulk_fetch_events,
     cleanup_redis_buffer,
+    fire_delayed_project,
     generate_unique_queries,
     get_condition_group_results,
+    get_condition_group_results_bulk,
     get_condition_query_groups,
     get_group_to_groupevent,
     get_rules_to_fire,
@@ -653,6 +657,92 @@ class ApplyDelayedTest(ProcessDelayedAlertConditionsTestBase):
         rule_group_data = buffer.backend.get_hash(Project, {"project_id": self.project_two.id})
         assert rule_group_data == {}
 
+    @patch("sentry.rules.conditions.event_frequency.MIN_SESSIONS_TO_FIRE", 1)
+    def test_apply_delayed_bulk(self):
+        self._push_base_events()
+        apply_delayed_bulk([(self.project.id, None), (self.project_two.id, None)])
+
+        rule_fire_histories = RuleFireHistory.objects.filter(
+            rule__in=[self.rule1, self.rule2, self.rule3, self.rule4],
+        ).values_list("rule", "group")
+        assert set(rule_fire_histories) == {
+            (self.rule1.id, self.group1.id),
+            (self.rule2.id, self.group2.id),
+            (self.rule3.id, self.group3.id),
+            (self.rule4.id, self.group4.id),
+        }
+        self.assert_buffer_cleared(project_id=self.project.id)
+        self.assert_buffer_cleared(project_id=self.project_two.id)
+
+    def test_apply_delayed_bulk_skips_failed_project(self):
+        self._push_base_events()
+
+        def fire_or_fail(data, condition_group_results):
+            if data.project.id == self.project.id:
+                raise Exception("boom")
+            return fire_delayed_project(data, condition_group_results)
+
+        with patch(
+            "sentry.rules.processing.delayed_processing.fire_delayed_project",
+            side_effect=fire_or_fail,
+        ):
+            apply_delayed_bulk([(self.project.id, None), (self.project_two.id, None)])
+
+        # the failure is not raised, so the task is not retried, and the other
+        # project is still fired
+        rule_fire_histories = RuleFireHistory.objects.filter(
+            rule__in=[self.rule1, self.rule2, self.rule3, self.rule4],
+        ).values_list("rule", "group")
+        assert set(rule_fire_histories) == {
+            (self.rule3.id, self.group3.id),
+            (self.rule4.id, self.group4.id),
+        }
+        self.assert_buffer_cleared(project_id=self.project_two.id)
+
+    def test_get_condition_group_results_bulk(self):
+        condition_data = self.create_event_frequency_condition(interval="1h")
+        unique_condition = generate_unique_queries(condition_data, self.environment.id)[0]
+        rule_two = self.create_project_rule(
+            project=self.project_two,
+            condition_data=[condition_data],
+            environment_id=self.environment.id,
+        )
+
+        def project_data(project, rule, group):
+            return DelayedProjectData(
+                project=project,
+                batch_key=None,
+                rulegroup_to_event_data={},
+                rules_to_groups=defaultdict(set, {rule.id: {group.id}}),
+                alert_rules=[rule],
+                condition_groups={
+                    unique_condition: DataAndGroups(condition_data, {group.id}, rule.id)
+                },
+            )
+
+        with patch.object(
+            EventFrequencyCondition,
+            "get_rate_bulk",
+            return_value={self.group1.id: 2, self.group3.id: 4},
+        ) as mock_get_rate_bulk:
+            results = get_condition_group_results_bulk(
+                [
+                    project_data(self.project, self.rule1, self.group1),
+                    project_data(self.project_two, rule_two, self.group3),
+                ]
+            )
+
+        # Both projects share a single query.
+        mock_get_rate_bulk.assert_called_once()
+        assert mock_get_rate_bulk.call_args.kwargs["group_ids"] == {
+            self.group1.id,
+            self.group3.id,
+        }
+        assert results == {
+            self.project.id: {unique_condition: {self.group1.id: 2}},
+            self.project_two.id: {unique_condition: {self.group3.id: 4}},
+        }
+
     def test_apply_delayed_issue_platform_event(self):
         """
         Test that we fire rules triggered from issue platform events
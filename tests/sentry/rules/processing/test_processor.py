@@ -20,9 +20,15 @@ from sentry.notifications.types import ActionTargetType
 from sentry.rules import init_registry
 from sentry.rules.conditions import EventCondition
 from sentry.rules.filters.base import EventFilter
-from sentry.rules.processing.processor import PROJECT_ID_BUFFER_LIST_KEY, RuleProcessor
+from sentry.rules.processing.processor import (
+    PROJECT_ID_BUFFER_LIST_KEY,
+    CompiledCondition,
+    RuleProcessor,
+    compile_rule,
+    get_rule_plan,
+)
 from sentry.testutils.cases import PerformanceIssueTestCase, TestCase
-from sentry.testutils.helpers import install_slack
+from sentry.testutils.helpers import install_slack, override_options
 from sentry.testutils.helpers.redis import mock_redis_buffer
 from sentry.testutils.skips import requires_snuba
 from sentry.utils import json
@@ -555,6 +561,102 @@ class RuleProcessorTest(TestCase, PerformanceIssueTestCase):
         # mock condition first.
         assert passes.call_count == 0
 
+    @override_options({"rules.slow-filter-matches": ["tagged_event"]})
+    def test_slow_filters_evaluate_last(self):
+        tagged_event_filter = {
+            "id": "sentry.rules.filters.tagged_event.TaggedEventFilter",
+            "key": "foo",
+            "match": "eq",
+            "value": "bar",
+        }
+        age_comparison_filter = {
+            "id": "sentry.rules.filters.age_comparison.AgeComparisonFilter",
+            "comparison_type": "older",
+            "value": 10,
+            "time": "hour",
+        }
+        self.rule.update(
+            data={
+                "conditions": [tagged_event_filter, age_comparison_filter],
+                "action_match": "all",
+                "filter_match": "all",
+                "actions": [EMAIL_ACTION_DATA],
+            },
+        )
+        compiled_rule = compile_rule(self.rule)
+        assert [f.data if f else None for f in compiled_rule.filters] == [
+            age_comparison_filter,
+            tagged_event_filter,
+        ]
+
+    @override_options({"rules.plan-cache.enabled": True, "rules.plan-cache.version-ttl": 0})
+    def test_rule_plan_cache(self):
+        rp = RuleProcessor(
+            self.group_event,
+            is_new=True,
+            is_regression=True,
+            is_new_group_environment=True,
+            has_reappeared=True,
+        )
+        with patch(
+            "sentry.rules.processing.processor.compile_rule", wraps=compile_rule
+        ) as mock_compile_rule:
+            assert len(list(rp.apply())) == 1
+            assert mock_compile_rule.call_count == 1
+
+            # The plan is reused for following events.
+            GroupRuleStatus.objects.filter(rule=self.rule).update(last_active=None)
+            assert len(list(rp.apply())) == 1
+            assert mock_compile_rule.call_count == 1
+
+            # Changing the rule invalidates the plan.
+            self.rule.update(
+                data={
+                    "conditions": [EVERY_EVENT_COND_DATA],
+                    "filter_match": "all",
+                    "actions": [EMAIL_ACTION_DATA],
+                }
+            )
+            [compiled] = get_rule_plan(self.project)
+            assert compiled.filter_match == "all"
+            assert mock_compile_rule.call_count == 2
+
+    @override_options({"rules.plan-cache.enabled": True, "rules.plan-cache.version-ttl": 60})
+    def test_rule_plan_cache_version_ttl(self):
+        with patch.object(
+            Rule, "get_rules_version", wraps=Rule.get_rules_version
+        ) as mock_get_rules_version:
+            get_rule_plan(self.project)
+            assert mock_get_rules_version.call_count == 1
+
+            # The rules version is not looked up again for every event.
+            get_rule_plan(self.project)
+            get_rule_plan(self.project)
+            assert mock_get_rules_version.call_count == 1
+
+    @override_options({"rules.plan-cache.enabled": True})
+    def test_rule_plan_cache_binds_project(self):
+        rp = RuleProcessor(
+            self.group_event,
+            is_new=True,
+            is_regression=True,
+            is_new_group_environment=True,
+            has_reappeared=True,
+        )
+        [compiled] = get_rule_plan(self.project)
+        [condition] = compiled.fast_conditions
+        assert condition is not None
+
+        # Conditions are instantiated with the project of the event being
+        # evaluated, not the one the plan was compiled for.
+        rp.project = Project.objects.get(id=self.project.id)
+        with patch.object(
+            CompiledCondition, "bind", autospec=True, side_effect=CompiledCondition.bind
+        ) as mock_bind:
+            assert len(list(rp.apply())) == 1
+        mock_bind.assert_called_once_with(condition, rp.project, self.rule)
+        assert mock_bind.call_args.args[1] is rp.project
+
 
 class MockFilterTrue(EventFilter):
     id = "tests.sentry.rules.processing.test_processor.MockFilterTrue"
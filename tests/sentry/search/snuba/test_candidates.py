@@ -0,0 +1,113 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from sentry.models.group import Group, GroupStatus
+from sentry.search.snuba.candidates import CandidateSet, filter_group_ids, get_candidate_set
+from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers import override_options
+
+
+def test_candidate_set() -> None:
+    group_ids = [5, 1, 900_000_000_000, 42, 5]
+    candidates = CandidateSet(group_ids)
+
+    assert len(candidates) == 4
+    assert all(group_id in candidates for group_id in group_ids)
+    assert 2 not in candidates
+    assert 1_000_000_000_000 not in candidates
+
+    loaded = CandidateSet.loads(candidates.dumps())
+    assert len(loaded) == 4
+    assert all(group_id in loaded for group_id in group_ids)
+    assert 2 not in loaded
+
+    assert len(CandidateSet.loads(CandidateSet(()).dumps())) == 0
+
+
+class GetCandidateSetTest(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        self.unresolved = [self.create_group(project=self.project) for _ in range(3)]
+        self.resolved = self.create_group(project=self.project, status=GroupStatus.RESOLVED)
+
+    def test_cached(self) -> None:
+        queryset = Group.objects.filter(project=self.project, status=GroupStatus.UNRESOLVED)
+        candidates = get_candidate_set(queryset)
+        assert candidates is not None
+        assert len(candidates) == 3
+        assert self.resolved.id not in candidates
+
+        self.create_group(project=self.project)
+        with self.assertNumQueries(0):
+            cached = get_candidate_set(queryset)
+        assert cached is not None
+        assert len(cached) == 3
+
+        # Different filters have their own candidate set
+        queryset = Group.objects.filter(project=self.project, status=GroupStatus.RESOLVED)
+        resolved = get_candidate_set(queryset)
+        assert resolved is not None
+        assert self.resolved.id in resolved
+
+    @override_options({"snuba.search.candidate-index.ttl": 60})
+    def test_cached_with_time_bounds(self) -> None:
+        # Searches set their retention window relative to the time of the search
+        retention_window_start = timezone.now().replace(second=0) - timedelta(days=90)
+        queryset = Group.objects.filter(
+            project=self.project, last_seen__gte=retention_window_start
+        )
+        assert get_candidate_set(queryset) is not None
+
+        queryset = Group.objects.filter(
+            project=self.project, last_seen__gte=retention_window_start + timedelta(seconds=30)
+        )
+        with self.assertNumQueries(0):
+            cached = get_candidate_set(queryset)
+        assert cached is not None
+        assert len(cached) == 4
+
+    @override_options({"snuba.search.candidate-index.max-size": 2})
+    def test_too_many_candidates(self) -> None:
+        queryset = Group.objects.filter(project=self.project, status=GroupStatus.UNRESOLVED)
+        assert get_candidate_set(queryset) is None
+        with self.assertNumQueries(0):
+            assert get_candidate_set(queryset) is None
+
+    def test_too_large_to_cache(self) -> None:
+        queryset = Group.objects.filter(project=self.project, status=GroupStatus.UNRESOLVED)
+        with mock.patch("sentry.search.snuba.candidates.MAX_CACHED_SIZE", 1):
+            assert get_candidate_set(queryset) is None
+            with self.assertNumQueries(0):
+                assert get_candidate_set(queryset) is None
+
+    def test_filter_group_ids(self) -> None:
+        queryset = Group.objects.filter(project=self.project, status=GroupStatus.UNRESOLVED)
+        candidates = get_candidate_set(queryset)
+        assert candidates is not None
+
+        # Groups newer than the candidates that started matching are still found
+        new_group = self.create_group(project=self.project)
+        self.resolved.update(status=GroupStatus.UNRESOLVED)
+        group_ids = [new_group.id, self.unresolved[0].id, self.resolved.id]
+        assert filter_group_ids(queryset, candidates, group_ids) == group_ids
+
+        # Groups in the set need no query
+        group_ids = [group.id for group in self.unresolved]
+        with self.assertNumQueries(0):
+            assert filter_group_ids(queryset, candidates, group_ids) == group_ids
+
+    def test_filter_group_ids_trusts_older_groups(self) -> None:
+        queryset = Group.objects.filter(project=self.project, status=GroupStatus.RESOLVED)
+        candidates = get_candidate_set(queryset)
+        assert candidates is not None
+
+        # Groups older than the candidates are not checked again until the set
+        # expires
+        self.unresolved[0].update(status=GroupStatus.RESOLVED)
+        group_ids = [self.unresolved[0].id, self.resolved.id]
+        with self.assertNumQueries(0):
+            assert filter_group_ids(queryset, candidates, group_ids) == [self.resolved.id]
@@ -4,7 +4,13 @@ import pytest
 from django.conf import settings
 from django.utils import timezone
 
-from sentry.sentry_metrics.indexer.cache import StringIndexerCache
+from sentry.sentry_metrics.indexer.base import FetchType
+from sentry.sentry_metrics.indexer.cache import (
+    CachingIndexer,
+    LocalIndexerCache,
+    StringIndexerCache,
+)
+from sentry.sentry_metrics.indexer.mock import RawSimpleIndexer
 from sentry.sentry_metrics.use_case_id_registry import UseCaseID
 from sentry.testutils.helpers.options import override_options
 from sentry.utils.cache import cache
@@ -240,3 +246,36 @@ def test_is_valid_timestamp() -> None:
 
     assert not indexer_cache._is_valid_timestamp(str(stale_ts))
     assert indexer_cache._is_valid_timestamp(str(new_ts))
+
+
+@override_options({"sentry-metrics.indexer.local-cache.enabled": True})
+def test_local_cache() -> None:
+    cache.clear()
+    raw_indexer = RawSimpleIndexer()
+    local_cache = LocalIndexerCache(maxsize=100, ttl=60, negative_ttl=60)
+    caching_indexer = CachingIndexer(indexer_cache, raw_indexer, local_cache)
+
+    # Misses are cached, even if the string is recorded elsewhere in the meantime.
+    assert caching_indexer.resolve(UseCaseID.SESSIONS, 1, "foo") is None
+    raw_id = raw_indexer.record(UseCaseID.SESSIONS, 1, "foo")
+    assert caching_indexer.resolve(UseCaseID.SESSIONS, 1, "foo") is None
+
+    # Recording through the caching indexer replaces the negative entry.
+    results = caching_indexer.bulk_record({UseCaseID.SESSIONS: {1: {"foo", "bar"}}})
+    assert results[UseCaseID.SESSIONS][1]["foo"] == raw_id
+    bar_id = results[UseCaseID.SESSIONS][1]["bar"]
+    assert caching_indexer.resolve(UseCaseID.SESSIONS, 1, "foo") == raw_id
+
+    # Subsequent lookups are served without touching the shared cache or the indexer.
+    cache.clear()
+    raw_indexer._reverse.clear()
+    results = caching_indexer.bulk_record({UseCaseID.SESSIONS: {1: {"foo", "bar"}}})
+    assert results.get_fetch_metadata()[UseCaseID.SESSIONS][1]["bar"].fetch_type == (
+        FetchType.CACHE_HIT
+    )
+    assert caching_indexer.reverse_resolve(UseCaseID.SESSIONS, 1, bar_id) == "bar"
+    assert caching_indexer.bulk_reverse_resolve(UseCaseID.SESSIONS, 1, [raw_id, bar_id]) == {
+        raw_id: "foo",
+        bar_id: "bar",
+    }
+    assert caching_indexer.reverse_resolve(UseCaseID.SESSIONS, 2, bar_id) is None
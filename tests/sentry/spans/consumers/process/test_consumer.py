@@ -1,5 +1,6 @@
 import threading
 from datetime import datetime
+from typing import Any
 
 import rapidjson
 from arroyo.backends.kafka import KafkaPayload
@@ -17,7 +18,10 @@ class FakeProcess(threading.Thread):
         pass
 
 
-def test_basic(monkeypatch, request):
+def _process_span(monkeypatch, request, span: dict[str, Any]) -> dict[str, Any]:
+    """
+    Run a single span through the consumer and return the flushed segment.
+    """
     # Flush very aggressively to make test pass instantly
     monkeypatch.setattr("time.sleep", lambda _: None)
 
@@ -44,17 +48,7 @@ def test_basic(monkeypatch, request):
     step.submit(
         Message(
             Value(
-                KafkaPayload(
-                    None,
-                    rapidjson.dumps(
-                        {
-                            "project_id": 12,
-                            "span_id": "a" * 16,
-                            "trace_id": "b" * 32,
-                        }
-                    ).encode("ascii"),
-                    [],
-                ),
+                KafkaPayload(None, rapidjson.dumps(span).encode("ascii"), []),
                 {},
                 datetime.now(),
             )
@@ -73,7 +67,21 @@ def test_basic(monkeypatch, request):
 
     (msg,) = messages
 
-    assert rapidjson.loads(msg.value) == {
+    return rapidjson.loads(msg.value)
+
+
+def test_basic(monkeypatch, request):
+    segment = _process_span(
+        monkeypatch,
+        request,
+        {
+            "project_id": 12,
+            "span_id": "a" * 16,
+            "trace_id": "b" * 32,
+        },
+    )
+
+    assert segment == {
         "spans": [
             {
                 "data": {
@@ -87,3 +95,19 @@ def test_basic(monkeypatch, request):
             },
         ],
     }
+
+
+def test_oversized_integer(monkeypatch, request):
+    segment = _process_span(
+        monkeypatch,
+        request,
+        {
+            "project_id": 12,
+            "span_id": "a" * 16,
+            "trace_id": "b" * 32,
+            "data": {"big": 2**70},
+        },
+    )
+
+    (span,) = segment["spans"]
+    assert span["data"]["big"] == 2**70
@@ -496,3 +496,40 @@ def test_flush_rebalance(buffer: SpansBuffer):
     assert not rv
 
     assert_clean(buffer.client)
+
+
+def test_iter_flush_segments_chunks(buffer: SpansBuffer):
+    spans = [
+        Span(
+            payload=_payload(span_id.encode("ascii")),
+            trace_id=trace_id,
+            span_id=span_id,
+            parent_span_id=None,
+            project_id=1,
+            is_segment_span=True,
+        )
+        for trace_id, span_id in [("a" * 32, "a" * 16), ("b" * 32, "b" * 16), ("c" * 32, "c" * 16)]
+    ]
+
+    process_spans(spans, buffer, now=0)
+
+    # A tiny byte budget degrades to one segment per chunk after the first
+    # chunk of every shard.
+    chunks = list(buffer.iter_flush_segments(now=11, max_bytes=1))
+    assert all(chunk.shard in buffer.assigned_shards for chunk in chunks)
+
+    rv: dict[SegmentKey, FlushedSegment] = {}
+    for chunk in chunks:
+        assert not rv.keys() & chunk.segments.keys()
+        rv.update(chunk.segments)
+        buffer.done_flush_segments(chunk.segments)
+
+    assert rv == {
+        _segment_id(1, trace_id, span_id): FlushedSegment(
+            queue_key=mock.ANY,
+            spans=[_output_segment(span_id.encode("ascii"), span_id.encode("ascii"), True)],
+        )
+        for trace_id, span_id in [("a" * 32, "a" * 16), ("b" * 32, "b" * 16), ("c" * 32, "c" * 16)]
+    }
+    assert buffer.flush_segments(now=30) == {}
+    assert_clean(buffer.client)
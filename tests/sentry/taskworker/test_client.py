@@ -17,7 +17,7 @@ from sentry_protos.taskbroker.v1.taskbroker_pb2 import (
     TaskActivation,
 )
 
-from sentry.taskworker.client import TaskworkerClient
+from sentry.taskworker.client import TaskworkerClient, UpdateTaskResult
 from sentry.testutils.pytest.fixtures import django_db_all
 
 
@@ -53,6 +53,15 @@ class MockServiceMethod:
             raise res.response
         return res.response
 
+    def future(self, *args, **kwargs):
+        res = self.responses[0]
+        tail = self.responses[1:]
+        self.responses = tail + [res]
+
+        if isinstance(res.response, Exception):
+            return res.response
+        return MockFuture(res.response)
+
     def with_call(self, *args, **kwargs):
         res = self.responses[0]
         if res.metadata:
@@ -62,6 +71,14 @@ class MockServiceMethod:
         return (res.response, None)
 
 
+@dataclasses.dataclass
+class MockFuture:
+    response: Any
+
+    def result(self):
+        return self.response
+
+
 class MockChannel:
     def __init__(self):
         self._responses = defaultdict(list)
@@ -218,6 +235,92 @@ def test_get_task_failure():
             client.get_task()
 
 
+@django_db_all
+def test_get_tasks():
+    channel = MockChannel()
+    for task_id in ("abc123", "def456"):
+        channel.add_response(
+            "/sentry_protos.taskbroker.v1.ConsumerService/GetTask",
+            GetTaskResponse(
+                task=TaskActivation(
+                    id=task_id,
+                    namespace="testing",
+                    taskname="do_thing",
+                    parameters="",
+                    headers={},
+                    processing_deadline_duration=10,
+                )
+            ),
+        )
+    channel.add_response(
+        "/sentry_protos.taskbroker.v1.ConsumerService/GetTask",
+        MockGrpcError(grpc.StatusCode.NOT_FOUND, "no pending task found"),
+    )
+    with patch("sentry.taskworker.client.grpc.insecure_channel") as mock_channel:
+        mock_channel.return_value = channel
+        client = TaskworkerClient("localhost:50051", 1)
+        result = client.get_tasks(count=4)
+
+        assert [task.id for task in result] == ["abc123", "def456", "abc123"]
+        assert client._task_id_to_host == {
+            "abc123": "localhost-0:50051",
+            "def456": "localhost-0:50051",
+        }
+
+
+@django_db_all
+def test_get_tasks_failure():
+    channel = MockChannel()
+    channel.add_response(
+        "/sentry_protos.taskbroker.v1.ConsumerService/GetTask",
+        MockGrpcError(grpc.StatusCode.INTERNAL, "something bad"),
+    )
+    with patch("sentry.taskworker.client.grpc.insecure_channel") as mock_channel:
+        mock_channel.return_value = channel
+        client = TaskworkerClient("localhost:50051", 1)
+        with pytest.raises(grpc.RpcError):
+            client.get_tasks(count=2)
+
+
+@django_db_all
+def test_update_tasks():
+    next_task = TaskActivation(
+        id="next",
+        namespace="testing",
+        taskname="do_thing",
+        parameters="",
+        headers={},
+        processing_deadline_duration=10,
+    )
+    unavailable = MockGrpcError(grpc.StatusCode.UNAVAILABLE, "broker unavailable")
+    channel = MockChannel()
+    channel.add_response(
+        "/sentry_protos.taskbroker.v1.ConsumerService/SetTaskStatus",
+        SetTaskStatusResponse(task=next_task),
+    )
+    channel.add_response("/sentry_protos.taskbroker.v1.ConsumerService/SetTaskStatus", unavailable)
+    with patch("sentry.taskworker.client.grpc.insecure_channel") as mock_channel:
+        mock_channel.return_value = channel
+        client = TaskworkerClient("localhost:50051", 1)
+        client._task_id_to_host = {"a": "localhost-0:50051", "b": "localhost-0:50051"}
+        result = client.update_tasks(
+            [
+                ("a", TASK_ACTIVATION_STATUS_COMPLETE),
+                ("b", TASK_ACTIVATION_STATUS_RETRY),
+                ("unknown", TASK_ACTIVATION_STATUS_COMPLETE),
+            ],
+            fetch_next_task=FetchNextTask(namespace=None),
+            fetch_count=1,
+        )
+
+        assert result == [
+            UpdateTaskResult(task_id="a", next_task=next_task),
+            UpdateTaskResult(task_id="b", error=unavailable),
+            UpdateTaskResult(task_id="unknown"),
+        ]
+        assert client._task_id_to_host == {"next": "localhost-0:50051"}
+
+
 @django_db_all
 def test_update_task_ok_with_next():
     channel = MockChannel()
@@ -91,6 +91,26 @@ def test_register_inherits_default_expires_processing_deadline() -> None:
     assert activation.processing_deadline_duration == 10
 
 
+def test_register_inherits_default_thread_safe() -> None:
+    namespace = TaskNamespace(
+        name="tests",
+        router=DefaultRouter(),
+        retry=None,
+        thread_safe=True,
+    )
+
+    @namespace.register(name="test.inherit")
+    def inherit_thread_safe() -> None:
+        raise NotImplementedError
+
+    @namespace.register(name="test.override", thread_safe=False)
+    def override_thread_safe() -> None:
+        raise NotImplementedError
+
+    assert namespace.get("test.inherit").thread_safe
+    assert not namespace.get("test.override").thread_safe
+
+
 def test_namespace_get_unknown() -> None:
     namespace = TaskNamespace(
         name="tests",
@@ -15,6 +15,7 @@ from sentry_protos.taskbroker.v1.taskbroker_pb2 import (
 )
 from sentry_sdk.crons import MonitorStatus
 
+from sentry.taskworker.client import UpdateTaskResult
 from sentry.taskworker.state import current_task
 from sentry.taskworker.worker import ProcessingResult, TaskWorker, child_worker
 from sentry.testutils.cases import TestCase
@@ -107,6 +108,24 @@ class TestTaskWorker(TestCase):
         assert task
         assert task.id == SIMPLE_TASK.id
 
+    def test_fork_server_context(self) -> None:
+        taskworker = TaskWorker(rpc_host="127.0.0.1:50051", num_brokers=1, max_child_task_count=100)
+        assert taskworker._mp_context.get_start_method() == "fork"
+
+        with mock.patch("sentry.taskworker.worker.multiprocessing.get_context") as mock_context:
+            taskworker = TaskWorker(
+                rpc_host="127.0.0.1:50051",
+                num_brokers=1,
+                max_child_task_count=100,
+                fork_server=True,
+            )
+            mock_context.assert_called_once_with("forkserver")
+
+        context = mock_context.return_value
+        context.set_forkserver_preload.assert_called_once_with(["sentry.taskworker.forkserver"])
+        assert taskworker._child_tasks is context.Queue.return_value
+        assert taskworker._shutdown_event is context.Event.return_value
+
     def test_fetch_no_task(self) -> None:
         taskworker = TaskWorker(rpc_host="127.0.0.1:50051", num_brokers=1, max_child_task_count=100)
         with mock.patch.object(taskworker.client, "get_task") as mock_get:
@@ -173,6 +192,80 @@ class TestTaskWorker(TestCase):
                 task_id=SIMPLE_TASK.id, status=TASK_ACTIVATION_STATUS_COMPLETE, fetch_next_task=None
             )
 
+    def test_add_tasks_batched(self) -> None:
+        taskworker = TaskWorker(
+            rpc_host="127.0.0.1:50051",
+            num_brokers=1,
+            max_child_task_count=100,
+            child_tasks_queue_maxsize=3,
+            rpc_batch_size=5,
+        )
+        with mock.patch.object(taskworker, "client") as mock_client:
+            mock_client.get_tasks.return_value = [SIMPLE_TASK, RETRY_TASK]
+            assert taskworker._add_task()
+
+            # Prefetch depth is bounded by the room left in the child queue
+            mock_client.get_tasks.assert_called_once_with(None, 3)
+            assert taskworker._child_tasks.get(timeout=1) == SIMPLE_TASK
+            assert taskworker._child_tasks.get(timeout=1) == RETRY_TASK
+
+    def test_reserve_child_task_slots(self) -> None:
+        taskworker = TaskWorker(
+            rpc_host="127.0.0.1:50051",
+            num_brokers=1,
+            max_child_task_count=100,
+            child_tasks_queue_maxsize=3,
+            rpc_batch_size=5,
+        )
+        # Concurrent fetches never reserve more slots than the queue has
+        assert taskworker._reserve_child_task_slots(2) == 2
+        assert taskworker._reserve_child_task_slots(5) == 1
+        assert taskworker._reserve_child_task_slots(5) == 0
+
+        # Slots that were not used by the fetch are released again
+        taskworker._put_child_tasks([SIMPLE_TASK], 2)
+        assert taskworker._reserve_child_task_slots(5) == 1
+        assert taskworker._child_tasks.get(timeout=1) == SIMPLE_TASK
+
+    def test_send_results_batched(self) -> None:
+        taskworker = TaskWorker(
+            rpc_host="127.0.0.1:50051",
+            num_brokers=1,
+            max_child_task_count=100,
+            rpc_batch_size=5,
+        )
+        taskworker._processed_tasks = queue.Queue()
+        unavailable = mock.Mock(spec=grpc.RpcError)
+        unavailable.code.return_value = grpc.StatusCode.UNAVAILABLE
+        with mock.patch.object(taskworker, "client") as mock_client:
+            mock_client.update_tasks.return_value = [
+                UpdateTaskResult(task_id=SIMPLE_TASK.id, next_task=FAIL_TASK),
+                UpdateTaskResult(task_id=RETRY_TASK.id, error=unavailable),
+            ]
+            taskworker._processed_tasks.put(
+                ProcessingResult(task_id=RETRY_TASK.id, status=TASK_ACTIVATION_STATUS_RETRY)
+            )
+            results = taskworker._drain_results(
+                ProcessingResult(task_id=SIMPLE_TASK.id, status=TASK_ACTIVATION_STATUS_COMPLETE)
+            )
+            assert [result.task_id for result in results] == [SIMPLE_TASK.id, RETRY_TASK.id]
+
+            taskworker._send_results(results)
+
+            assert mock_client.update_tasks.call_count == 1
+            args, kwargs = mock_client.update_tasks.call_args
+            assert args[0] == [
+                (SIMPLE_TASK.id, TASK_ACTIVATION_STATUS_COMPLETE),
+                (RETRY_TASK.id, TASK_ACTIVATION_STATUS_RETRY),
+            ]
+            assert kwargs["fetch_count"] == 2
+
+            # The next task is queued for children, the unavailable update is retried
+            assert taskworker._child_tasks.get(timeout=1) == FAIL_TASK
+            retried = taskworker._processed_tasks.get(timeout=1)
+            assert retried.task_id == RETRY_TASK.id
+            assert taskworker._setstatus_backoff_seconds == 1
+
     def test_run_once_with_update_failure(self) -> None:
         # Cover the scenario where update_task fails a few times in a row
         # We should retain the result until RPC succeeds.
@@ -269,6 +362,33 @@ def test_child_worker_complete(mock_capture_checkin) -> None:
     assert mock_capture_checkin.call_count == 0
 
 
+@pytest.mark.django_db
+@mock.patch("sentry.taskworker.worker.metrics.distribution")
+def test_child_worker_startup_duration(mock_distribution: mock.Mock) -> None:
+    todo: queue.Queue[TaskActivation] = queue.Queue()
+    processed: queue.Queue[ProcessingResult] = queue.Queue()
+    shutdown = Event()
+
+    todo.put(SIMPLE_TASK)
+    child_worker(
+        todo,
+        processed,
+        shutdown,
+        max_task_count=1,
+        processing_pool_name="test",
+        spawn_time=time.time() - 1,
+    )
+
+    startup_calls = [
+        call
+        for call in mock_distribution.call_args_list
+        if call.args[0] == "taskworker.worker.child_startup.duration"
+    ]
+    assert len(startup_calls) == 1
+    assert startup_calls[0].args[1] >= 1
+    assert startup_calls[0].kwargs["tags"] == {"processing_pool": "test"}
+
+
 @pytest.mark.django_db
 def test_child_worker_retry_task() -> None:
     todo: queue.Queue[TaskActivation] = queue.Queue()
@@ -404,3 +524,69 @@ def test_child_worker_terminate_task(mock_exit: mock.Mock, mock_capture: mock.Mo
 
     assert mock_exit.call_count == 1
     assert mock_capture.call_count == 1
+
+
+@pytest.mark.django_db
+def test_child_worker_thread_pool() -> None:
+    todo: queue.Queue[TaskActivation] = queue.Queue()
+    processed: queue.Queue[ProcessingResult] = queue.Queue()
+    shutdown = Event()
+
+    for i in range(3):
+        todo.put(
+            TaskActivation(
+                id=f"thread-{i}",
+                taskname="examples.timed_thread_safe",
+                namespace="examples",
+                parameters='{"args": [0.5], "kwargs": {}}',
+                processing_deadline_duration=2,
+            )
+        )
+    start = time.monotonic()
+    child_worker(
+        todo,
+        processed,
+        shutdown,
+        max_task_count=3,
+        processing_pool_name="test",
+        thread_pool_size=3,
+    )
+
+    # Activations ran concurrently
+    assert time.monotonic() - start < 1.4
+    results = [processed.get(block=False) for _ in range(3)]
+    assert {result.task_id for result in results} == {"thread-0", "thread-1", "thread-2"}
+    assert {result.status for result in results} == {TASK_ACTIVATION_STATUS_COMPLETE}
+
+
+@pytest.mark.django_db
+@mock.patch("sentry.taskworker.worker._exit_child", side_effect=SystemExit(1))
+@mock.patch("sentry.taskworker.worker.sentry_sdk.capture_exception")
+def test_child_worker_thread_pool_deadline(mock_capture: mock.Mock, mock_exit: mock.Mock) -> None:
+    todo: queue.Queue[TaskActivation] = queue.Queue()
+    processed: queue.Queue[ProcessingResult] = queue.Queue()
+    shutdown = Event()
+
+    sleepy = TaskActivation(
+        id="111",
+        taskname="examples.timed_thread_safe",
+        namespace="examples",
+        parameters='{"args": [3], "kwargs": {}}',
+        processing_deadline_duration=1,
+    )
+    todo.put(sleepy)
+    with pytest.raises(SystemExit):
+        child_worker(
+            todo,
+            processed,
+            shutdown,
+            max_task_count=1,
+            processing_pool_name="test",
+            thread_pool_size=2,
+        )
+
+    result = processed.get(block=False)
+    assert result.task_id == sleepy.id
+    assert result.status == TASK_ACTIVATION_STATUS_FAILURE
+    assert mock_exit.call_count == 1
+    assert mock_capture.call_count == 1
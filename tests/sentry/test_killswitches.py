@@ -2,7 +2,8 @@ from __future__ import annotations
 
 import pytest
 
-from sentry.killswitches import _value_matches, normalize_value
+from sentry.killswitches import KillswitchMatcher, _value_matches, normalize_value
+from sentry.testutils.helpers.options import override_options
 
 
 def test_normalize_value():
@@ -97,3 +98,23 @@ def test_value_matches_positive(cfg, value):
 )
 def test_value_matches_negative(cfg, value):
     assert not _value_matches("store.load-shed-group-creation-projects", cfg, value)
+
+
+def test_killswitch_matcher():
+    killswitch_name = "store.load-shed-group-creation-projects"
+    cfg = [{"project_id": 1}, {"project_id": 2, "platform": "python"}]
+
+    with override_options({killswitch_name: cfg}):
+        matcher = KillswitchMatcher(killswitch_name)
+
+    contexts = [
+        {"project_id": 1, "platform": "native"},
+        {"project_id": 2, "platform": "python"},
+        {"project_id": 2, "platform": "native"},
+        {"project_id": 3, "platform": None},
+        {"project_id": None, "platform": "python"},
+    ]
+    for context in contexts:
+        assert matcher.matches(context) == _value_matches(killswitch_name, cfg, context)
+
+    assert (matcher.matched, matcher.passed) == (2, 3)
@@ -1,9 +1,13 @@
+import threading
+import time
 import unittest
-from datetime import datetime, timedelta
+from datetime import UTC, datetime, timedelta
 from unittest import mock
 
 import pytest
+from django.core.cache import cache
 from django.utils import timezone
+from snuba_sdk import Column, Condition, Entity, Op, Query, Request
 from urllib3 import HTTPConnectionPool
 from urllib3.exceptions import HTTPError, ReadTimeoutError
 
@@ -12,12 +16,18 @@ from sentry.models.project import Project
 from sentry.models.release import Release
 from sentry.snuba.dataset import Dataset
 from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers import override_options
+from sentry.utils.locking import UnableToAcquireLock
 from sentry.utils.snuba import (
     ROUND_UP,
+    BulkQueryExecutor,
     RetrySkipTimeout,
     SnubaQueryParams,
     UnqualifiedQueryError,
     _prepare_query_params,
+    bucket_time_range,
+    bulk_snuba_queries,
+    get_cache_key,
     get_json_type,
     get_query_params_to_update_for_projects,
     get_snuba_column_name,
@@ -443,3 +453,169 @@ def test_retries():
         snuba_pool.urlopen("POST", "/query", body="{}")
 
     assert connection_mock.request.call_count == 1
+
+
+def _request(start: datetime, end: datetime) -> Request:
+    return Request(
+        dataset="events",
+        app_id="tests",
+        query=Query(
+            match=Entity("events"),
+            select=[Column("event_id")],
+            where=[
+                Condition(Column("project_id"), Op.EQ, 1),
+                Condition(Column("timestamp"), Op.GTE, start),
+                Condition(Column("timestamp"), Op.LT, end),
+            ],
+        ),
+        tenant_ids={"organization_id": 1},
+    )
+
+
+def test_bucket_time_range() -> None:
+    start = datetime(2024, 1, 1, 10, 3, 20, tzinfo=UTC)
+    request = _request(start, datetime(2024, 1, 2, 10, 3, 20, tzinfo=UTC))
+    bucketed = bucket_time_range(request, 300)
+
+    assert bucketed.query.where == [
+        Condition(Column("project_id"), Op.EQ, 1),
+        Condition(Column("timestamp"), Op.GTE, datetime(2024, 1, 1, 10, 0, tzinfo=UTC)),
+        Condition(Column("timestamp"), Op.LT, datetime(2024, 1, 2, 10, 5, tzinfo=UTC)),
+    ]
+    # The request itself is left alone
+    assert request.query.where[1].rhs == start
+
+    # Boundaries and naive datetimes are kept as they are
+    request = _request(datetime(2024, 1, 1, 10, 0), datetime(2024, 1, 1, 11, 0))
+    bucketed = bucket_time_range(request, 300)
+    assert bucketed.query.where[1].rhs == datetime(2024, 1, 1, 10, 0)
+    assert bucketed.query.where[2].rhs == datetime(2024, 1, 1, 11, 0)
+
+
+@pytest.mark.django_db
+class SnubaQueryCacheTest(TestCase):
+    referrer = "testing.test"
+
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_referrer_policy(self, mock_query: mock.MagicMock) -> None:
+        mock_query.side_effect = lambda requests: [{"data": [{"count": 1}]} for _ in requests]
+        start = datetime(2024, 1, 1, 10, 3, 20, tzinfo=UTC)
+        end = start + timedelta(days=1)
+
+        # Without a policy queries are not cached
+        bulk_snuba_queries([_request(start, end)], referrer=self.referrer)
+        bulk_snuba_queries([_request(start, end)], referrer=self.referrer)
+        assert mock_query.call_count == 2
+
+        policies = {self.referrer: {"ttl": 60, "granularity": 300}}
+        with override_options({"snuba.query-cache.referrer-policies": policies}):
+            result = bulk_snuba_queries([_request(start, end)], referrer=self.referrer)
+            assert result == [{"data": [{"count": 1}]}]
+            assert mock_query.call_count == 3
+            # Only the cache key is bucketed, the query keeps its time range
+            (snuba_request,) = mock_query.call_args.args[0]
+            assert snuba_request.request.query.where[1].rhs == start
+
+            # A sliding window within the same buckets reuses the result
+            later = timedelta(seconds=60)
+            result = bulk_snuba_queries(
+                [_request(start + later, end + later)], referrer=self.referrer
+            )
+            assert result == [{"data": [{"count": 1}]}]
+            assert mock_query.call_count == 3
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_single_flight(self, mock_query: mock.MagicMock) -> None:
+        start = datetime(2024, 1, 1, 10, 0, tzinfo=UTC)
+        request = _request(start, start + timedelta(hours=1))
+
+        def fill_cache(*args: object) -> None:
+            cache.set(get_cache_key(request), '{"data": [{"count": 2}]}', 60)
+
+        # Another process is running the same query, and fills the cache
+        # while this one waits.
+        with (
+            mock.patch("sentry.utils.snuba.Lock.acquire", side_effect=UnableToAcquireLock),
+            mock.patch("sentry.utils.snuba.Lock.locked", return_value=True),
+            mock.patch("sentry.utils.snuba.time.sleep", side_effect=fill_cache),
+        ):
+            result = bulk_snuba_queries([request], referrer=self.referrer, use_cache=True)
+
+        assert result == [{"data": [{"count": 2}]}]
+        assert mock_query.call_count == 0
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_single_flight_lock_released(self, mock_query: mock.MagicMock) -> None:
+        mock_query.side_effect = lambda requests: [{"data": []} for _ in requests]
+        start = datetime(2024, 1, 1, 10, 0, tzinfo=UTC)
+        request = _request(start, start + timedelta(hours=1))
+
+        # The lock holder failed, so the query is run here instead
+        with (
+            mock.patch("sentry.utils.snuba.Lock.acquire", side_effect=UnableToAcquireLock),
+            mock.patch("sentry.utils.snuba.Lock.locked", return_value=False),
+            mock.patch("sentry.utils.snuba.time.sleep"),
+        ):
+            result = bulk_snuba_queries([request], referrer=self.referrer, use_cache=True)
+
+        assert result == [{"data": []}]
+        assert mock_query.call_count == 1
+        assert cache.get(get_cache_key(request)) is not None
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_single_flight_lock_error(self, mock_query: mock.MagicMock) -> None:
+        mock_query.side_effect = lambda requests: [{"data": []} for _ in requests]
+        start = datetime(2024, 1, 1, 10, 0, tzinfo=UTC)
+        request = _request(start, start + timedelta(hours=1))
+
+        # The lock backend is unavailable, so the query is run anyway
+        with (
+            mock.patch("sentry.utils.snuba.Lock.acquire", side_effect=UnableToAcquireLock),
+            mock.patch("sentry.utils.snuba.Lock.locked", side_effect=ConnectionError),
+            mock.patch("sentry.utils.snuba.time.sleep"),
+        ):
+            result = bulk_snuba_queries([request], referrer=self.referrer, use_cache=True)
+
+        assert result == [{"data": []}]
+        assert mock_query.call_count == 1
+
+
+@override_options({"snuba.bulk-query.batch-concurrency": 2})
+def test_bulk_query_executor() -> None:
+    executor = BulkQueryExecutor(max_workers=4)
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+
+    def query(value: int) -> int:
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        time.sleep(0.01 * (value % 3))
+        with lock:
+            in_flight -= 1
+        return value * 2
+
+    assert executor.map(query, list(range(10))) == [value * 2 for value in range(10)]
+    assert max_in_flight == 2
+
+
+@override_options({"snuba.bulk-query.batch-concurrency": 1})
+def test_bulk_query_executor_cancels_on_error() -> None:
+    executor = BulkQueryExecutor(max_workers=4)
+    called = []
+
+    def query(value: int) -> int:
+        called.append(value)
+        if value == 1:
+            raise UnqualifiedQueryError("bad query")
+        return value
+
+    with pytest.raises(UnqualifiedQueryError):
+        executor.map(query, [0, 1, 2, 3])
+    assert called == [0, 1]
@@ -16,12 +16,14 @@ from sentry.models.groupsubscription import GroupSubscription
 from sentry.notifications.models.notificationsettingoption import NotificationSettingOption
 from sentry.notifications.types import NotificationSettingsOptionEnum
 from sentry.silo.base import SiloMode
+from sentry.snuba.dataset import Dataset
 from sentry.testutils.cases import APITestCase, PerformanceIssueTestCase, SnubaTestCase
 from sentry.testutils.helpers.datetime import before_now
 from sentry.testutils.silo import assume_test_silo_mode
 from sentry.types.group import PriorityLevel
 from sentry.users.models.user_option import UserOption
 from sentry.utils.samples import load_data
+from sentry.utils.snuba import bulk_raw_query
 from tests.sentry.issues.test_utils import SearchIssueTestMixin
 
 
@@ -521,6 +523,38 @@ class PerformanceGroupSerializerSnubaTest(
         assert result["firstSeen"] == (timestamp + timedelta(minutes=1))
         assert result["count"] == str(times + 1)
 
+    def test_seen_stats_single_bulk_query(self):
+        proj = self.create_project()
+        timestamp = (timezone.now() - timedelta(days=1)).replace(microsecond=0)
+
+        error_event = self.store_event(
+            data={"timestamp": timestamp.isoformat(), "user": {"id": 1}},
+            project_id=proj.id,
+        )
+        event_data = load_data(
+            "transaction-n-plus-one",
+            timestamp=timestamp,
+            start_timestamp=timestamp,
+        )
+        perf_event = self.create_performance_issue(event_data=event_data, project_id=proj.id)
+
+        with mock.patch(
+            "sentry.api.serializers.models.group.bulk_raw_query", wraps=bulk_raw_query
+        ) as bulk_raw_query_mock:
+            result = serialize(
+                [error_event.group, perf_event.group],
+                serializer=GroupSerializerSnuba(
+                    start=timezone.now() - timedelta(days=2),
+                    end=timezone.now(),
+                ),
+            )
+
+        (params,) = bulk_raw_query_mock.call_args.args
+        assert bulk_raw_query_mock.call_count == 1
+        assert [p.dataset for p in params] == [Dataset.Events, Dataset.IssuePlatform]
+        assert [r["count"] for r in result] == ["1", "1"]
+        assert [r["lastSeen"] for r in result] == [timestamp, timestamp]
+
 
 class ProfilingGroupSerializerSnubaTest(
     APITestCase,
@@ -32,7 +32,7 @@ from sentry.search.snuba.backend import EventsDatasetSnubaSearchBackend, SnubaSe
 from sentry.search.snuba.executors import TrendsSortWeights
 from sentry.snuba.dataset import Dataset
 from sentry.testutils.cases import SnubaTestCase, TestCase, TransactionTestCase
-from sentry.testutils.helpers import Feature, apply_feature_flag_on_cls
+from sentry.testutils.helpers import Feature, apply_feature_flag_on_cls, override_options
 from sentry.testutils.helpers.datetime import before_now
 from sentry.types.group import GroupSubStatus, PriorityLevel
 from sentry.utils import json
@@ -1886,6 +1886,27 @@ class EventsSnubaSearchTestCases(EventsDatasetTestSetup):
         finally:
             options.set("snuba.search.max-pre-snuba-candidates", prev_max_pre)
 
+    @override_options(
+        {
+            "snuba.search.max-pre-snuba-candidates": 1,
+            "snuba.search.candidate-index.enabled": True,
+            "snuba.search.candidate-index.ttl": 3600,
+        }
+    )
+    def test_candidate_index_shared_between_searches(self):
+        with mock.patch("sentry.search.snuba.candidates.metrics.incr") as metrics_incr:
+            # too many candidates, post-filter against the candidate set
+            for _ in range(2):
+                results = self.make_query()
+                assert set(results) == {self.group1, self.group2}
+
+        results = [
+            kwargs["tags"]["result"]
+            for args, kwargs in metrics_incr.call_args_list
+            if args == ("snuba.search.candidate_index",)
+        ]
+        assert results == ["miss", "hit"]
+
     def test_optimizer_enabled(self):
         prev_optimizer_enabled = options.get("snuba.search.pre-snuba-candidates-optimizer")
         options.set("snuba.search.pre-snuba-candidates-optimizer", True)